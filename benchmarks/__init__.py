@@ -0,0 +1 @@
+"""Offline performance benchmarks for the analysis pipeline (not shipped with the bot)."""
@@ -0,0 +1,203 @@
+"""In-process S3 stand-in (the subset of the MinIO/S3 API `ObjectStorage` uses).
+
+Path-style requests only: PutObject, GetObject, HeadObject, DeleteObject and
+the multipart calls (create, upload part, complete, abort). Signatures are
+not checked, so any access key works. Like `FakeServiceServer` it runs on
+its own loop in a daemon thread and serves 127.0.0.1. It can be used from
+synchronous benchmarks and from async tests with their own loops.
+
+``reject_acl=True`` mimics a bucket with ACLs disabled (Object Ownership
+"bucket owner enforced").
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import threading
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from xml.sax.saxutils import escape
+
+from aiohttp import web
+
+
+@dataclass(slots=True)
+class StoredObject:
+    data: bytes
+    content_type: str
+    acl: str | None
+
+
+def _error(status: int, code: str, message: str) -> web.Response:
+    body = f"<Error><Code>{code}</Code><Message>{escape(message)}</Message></Error>"
+    return web.Response(status=status, body=body, content_type="application/xml")
+
+
+def _xml(body: str) -> web.Response:
+    return web.Response(
+        body=f'<?xml version="1.0" encoding="UTF-8"?>{body}', content_type="application/xml"
+    )
+
+
+@dataclass
+class FakeS3Server:
+    """Buckets are created on first write; objects live in memory."""
+
+    latency_ms: float = 0.0
+    reject_acl: bool = False
+    host: str = "127.0.0.1"
+    port: int = 0
+    objects: dict[tuple[str, str], StoredObject] = field(default_factory=dict)
+    requests: Counter[str] = field(default_factory=Counter)
+
+    def __post_init__(self) -> None:
+        self._uploads: dict[str, dict[int, bytes]] = {}
+        self._upload_meta: dict[str, tuple[str, str, str, str | None]] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._runner: web.AppRunner | None = None
+        self._thread: threading.Thread | None = None
+        self._ready = threading.Event()
+
+    @property
+    def endpoint_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def get(self, bucket: str, key: str) -> StoredObject | None:
+        return self.objects.get((bucket, key))
+
+    # ----- lifecycle -------------------------------------------------------
+
+    def start(self) -> FakeS3Server:
+        self._thread = threading.Thread(target=self._serve, name="bench-fake-s3", daemon=True)
+        self._thread.start()
+        if not self._ready.wait(timeout=10):
+            raise RuntimeError("fake S3 server failed to start")
+        return self
+
+    def stop(self) -> None:
+        if self._loop is None:
+            return
+        fut = asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop)
+        fut.result(timeout=10)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+
+    def __enter__(self) -> FakeS3Server:
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def _serve(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self._startup())
+        self._ready.set()
+        self._loop.run_forever()
+        self._loop.close()
+
+    async def _startup(self) -> None:
+        app = web.Application(client_max_size=256 * 1024**2)
+        app.router.add_route("*", "/{bucket}/{key:.+}", self._object)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        sockets = getattr(site._server, "sockets", None) or []
+        if sockets:
+            self.port = sockets[0].getsockname()[1]
+
+    async def _shutdown(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    # ----- S3 API ------------------------------------------------------------
+
+    async def _object(self, request: web.Request) -> web.StreamResponse:
+        if self.latency_ms > 0:
+            await asyncio.sleep(self.latency_ms / 1000)
+        bucket = request.match_info["bucket"]
+        key = request.match_info["key"]
+        query = request.query
+        acl = request.headers.get("x-amz-acl")
+
+        if request.method == "PUT" and "uploadId" in query:
+            self.requests["upload_part"] += 1
+            parts = self._uploads.get(query["uploadId"])
+            if parts is None:
+                return _error(404, "NoSuchUpload", "unknown upload")
+            data = await request.read()
+            parts[int(query["partNumber"])] = data
+            return web.Response(headers={"ETag": f'"{hashlib.md5(data).hexdigest()}"'})
+
+        if request.method == "PUT":
+            self.requests["put_object"] += 1
+            if acl and self.reject_acl:
+                return _error(
+                    400, "AccessControlListNotSupported", "The bucket does not allow ACLs"
+                )
+            data = await request.read()
+            content_type = request.headers.get("Content-Type", "binary/octet-stream")
+            self.objects[(bucket, key)] = StoredObject(data, content_type, acl)
+            return web.Response(headers={"ETag": f'"{hashlib.md5(data).hexdigest()}"'})
+
+        if request.method == "POST" and "uploads" in query:
+            self.requests["create_multipart_upload"] += 1
+            if acl and self.reject_acl:
+                return _error(
+                    400, "AccessControlListNotSupported", "The bucket does not allow ACLs"
+                )
+            upload_id = uuid.uuid4().hex
+            self._uploads[upload_id] = {}
+            content_type = request.headers.get("Content-Type", "binary/octet-stream")
+            self._upload_meta[upload_id] = (bucket, key, content_type, acl)
+            return _xml(
+                "<InitiateMultipartUploadResult>"
+                f"<Bucket>{escape(bucket)}</Bucket><Key>{escape(key)}</Key>"
+                f"<UploadId>{upload_id}</UploadId>"
+                "</InitiateMultipartUploadResult>"
+            )
+
+        if request.method == "POST" and "uploadId" in query:
+            self.requests["complete_multipart_upload"] += 1
+            upload_id = query["uploadId"]
+            parts = self._uploads.pop(upload_id, None)
+            meta = self._upload_meta.pop(upload_id, None)
+            if parts is None or meta is None:
+                return _error(404, "NoSuchUpload", "unknown upload")
+            data = b"".join(parts[n] for n in sorted(parts))
+            _, _, content_type, upload_acl = meta
+            self.objects[(bucket, key)] = StoredObject(data, content_type, upload_acl)
+            etag = f'"{hashlib.md5(data).hexdigest()}-{len(parts)}"'
+            return _xml(
+                "<CompleteMultipartUploadResult>"
+                f"<Bucket>{escape(bucket)}</Bucket><Key>{escape(key)}</Key>"
+                f"<ETag>{escape(etag)}</ETag>"
+                "</CompleteMultipartUploadResult>"
+            )
+
+        if request.method == "DELETE":
+            if "uploadId" in query:
+                self.requests["abort_multipart_upload"] += 1
+                self._uploads.pop(query["uploadId"], None)
+                self._upload_meta.pop(query["uploadId"], None)
+            else:
+                self.requests["delete_object"] += 1
+                self.objects.pop((bucket, key), None)
+            return web.Response(status=204)
+
+        if request.method in ("GET", "HEAD"):
+            self.requests["get_object"] += 1
+            stored = self.objects.get((bucket, key))
+            if stored is None:
+                return _error(404, "NoSuchKey", "The specified key does not exist.")
+            return web.Response(
+                body=stored.data if request.method == "GET" else None,
+                content_type=stored.content_type,
+                headers={"Content-Length": str(len(stored.data))},
+            )
+
+        return _error(405, "MethodNotAllowed", request.method)
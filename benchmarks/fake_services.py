@@ -0,0 +1,213 @@
+"""Local aiohttp stand-in for Riot, the LLM provider, TTS, Discord and Data Dragon.
+
+The server runs on its own event loop in a daemon thread so the Celery task
+bodies under test can keep creating and closing their private loops. Each
+upstream gets a configurable artificial latency; request counts are kept per
+service so a run can assert that nothing leaked to the real network.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+from aiohttp import web
+
+from benchmarks.fixtures import MatchFixture
+
+_CHAMPION_DATA = {
+    "Yasuo": 157,
+    "LeeSin": 64,
+    "Ahri": 103,
+    "Jinx": 222,
+    "Thresh": 412,
+    "Garen": 86,
+    "Khazix": 121,
+    "Syndra": 134,
+    "Caitlyn": 51,
+    "Leona": 89,
+}
+
+_NARRATIVE = (
+    "这局你的对线期节奏很稳，前十分钟补刀和经济领先对位；中期两次小龙团你都站在了正确的位置，"
+    "但第二十二分钟的大龙团开团过早，导致团队被反打。后期注意视野布置和技能衔接，"
+    "整体发挥可圈可点，继续保持。"
+)
+
+_TEAM_JSON = {
+    "tldr": "整体节奏稳定，中期团战决策是本局的关键。",
+    "summary_text": _NARRATIVE,
+    "team_analysis": [],
+}
+
+
+@dataclass(slots=True)
+class LatencyProfile:
+    """Artificial per-upstream latency in milliseconds (scaled by `scale`)."""
+
+    riot_ms: float = 25.0
+    llm_ms: float = 250.0
+    tts_ms: float = 150.0
+    discord_ms: float = 40.0
+    ddragon_ms: float = 5.0
+    scale: float = 1.0
+
+    async def wait(self, service: str) -> None:
+        delay = getattr(self, f"{service}_ms", 0.0) * self.scale / 1000
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+@dataclass
+class FakeServiceServer:
+    """Serves recorded fixtures and canned upstream responses on 127.0.0.1."""
+
+    fixtures: list[MatchFixture]
+    latency: LatencyProfile = field(default_factory=LatencyProfile)
+    requests: Counter[str] = field(default_factory=Counter)
+    host: str = "127.0.0.1"
+    port: int = 0
+
+    def __post_init__(self) -> None:
+        self._by_id = {f.match_id: f for f in self.fixtures}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._runner: web.AppRunner | None = None
+        self._thread: threading.Thread | None = None
+        self._ready = threading.Event()
+        self._audio = base64.b64encode(b"\xff\xfb\x90\x64" + bytes(4096)).decode("ascii")
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    # ----- lifecycle -------------------------------------------------------
+
+    def start(self) -> FakeServiceServer:
+        self._thread = threading.Thread(target=self._serve, name="bench-fake-services", daemon=True)
+        self._thread.start()
+        if not self._ready.wait(timeout=10):
+            raise RuntimeError("fake service server failed to start")
+        return self
+
+    def stop(self) -> None:
+        if self._loop is None:
+            return
+        fut = asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop)
+        fut.result(timeout=10)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+
+    def __enter__(self) -> FakeServiceServer:
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def _serve(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self._startup())
+        self._ready.set()
+        self._loop.run_forever()
+        self._loop.close()
+
+    async def _startup(self) -> None:
+        app = web.Application(client_max_size=32 * 1024**2)
+        app.router.add_get("/riot/lol/match/v5/matches/{match_id}", self._match_details)
+        app.router.add_get("/riot/lol/match/v5/matches/{match_id}/timeline", self._match_timeline)
+        app.router.add_post("/v1/chat/completions", self._chat_completions)
+        app.router.add_post("/tts", self._tts)
+        app.router.add_route("*", "/discord/{tail:.*}", self._discord)
+        app.router.add_get("/ddragon/api/versions.json", self._ddragon_versions)
+        app.router.add_get("/ddragon/cdn/{version}/data/{lang}/{doc}", self._ddragon_data)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        sockets = getattr(site._server, "sockets", None) or []
+        if sockets:
+            self.port = sockets[0].getsockname()[1]
+
+    async def _shutdown(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    # ----- handlers --------------------------------------------------------
+
+    def _fixture(self, request: web.Request) -> MatchFixture | None:
+        return self._by_id.get(request.match_info["match_id"])
+
+    async def _match_details(self, request: web.Request) -> web.Response:
+        self.requests["riot"] += 1
+        await self.latency.wait("riot")
+        fixture = self._fixture(request)
+        if fixture is None:
+            return web.json_response({"status": {"status_code": 404}}, status=404)
+        return web.json_response(fixture.details)
+
+    async def _match_timeline(self, request: web.Request) -> web.Response:
+        self.requests["riot"] += 1
+        await self.latency.wait("riot")
+        fixture = self._fixture(request)
+        if fixture is None:
+            return web.json_response({"status": {"status_code": 404}}, status=404)
+        return web.json_response(fixture.timeline)
+
+    async def _chat_completions(self, request: web.Request) -> web.Response:
+        self.requests["llm"] += 1
+        body: dict[str, Any] = await request.json()
+        await self.latency.wait("llm")
+        wants_json = (body.get("response_format") or {}).get("type") == "json_object"
+        content = json.dumps(_TEAM_JSON, ensure_ascii=False) if wants_json else _NARRATIVE
+        prompt_chars = sum(len(str(m.get("content", ""))) for m in body.get("messages", []))
+        return web.json_response(
+            {
+                "choices": [{"message": {"role": "assistant", "content": content}}],
+                "usage": {"prompt_tokens": prompt_chars // 4, "completion_tokens": len(content)},
+            }
+        )
+
+    async def _tts(self, request: web.Request) -> web.Response:
+        self.requests["tts"] += 1
+        await request.read()
+        await self.latency.wait("tts")
+        lines = [
+            json.dumps({"code": 0, "data": self._audio}),
+            json.dumps({"code": 20000000, "data": None}),
+        ]
+        return web.Response(text="\n".join(lines), content_type="application/json")
+
+    async def _discord(self, request: web.Request) -> web.Response:
+        self.requests["discord"] += 1
+        await request.read()
+        await self.latency.wait("discord")
+        return web.json_response({"id": "1", "channel_id": "1"})
+
+    async def _ddragon_versions(self, request: web.Request) -> web.Response:
+        self.requests["ddragon"] += 1
+        await self.latency.wait("ddragon")
+        return web.json_response(["14.20.1", "14.19.1"])
+
+    async def _ddragon_data(self, request: web.Request) -> web.Response:
+        self.requests["ddragon"] += 1
+        await self.latency.wait("ddragon")
+        if request.match_info["doc"] != "champion.json":
+            return web.json_response({"type": "data", "data": {}})
+        data = {
+            name: {
+                "id": name,
+                "key": str(key),
+                "name": name,
+                "title": name,
+                "image": {"full": f"{name}.png"},
+                "tags": ["Fighter"],
+            }
+            for name, key in _CHAMPION_DATA.items()
+        }
+        return web.json_response({"type": "champion", "data": data})
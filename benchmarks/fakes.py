@@ -0,0 +1,231 @@
+"""In-process stand-ins and patching for running task bodies fully offline.
+
+- `InMemoryDatabase` / `InMemoryCache` replace asyncpg and Redis. Payloads are
+  JSON-encoded on write exactly like the JSONB columns, so serialization cost
+  stays in the measurement.
+- `LocalRiotAdapter` / `LocalDDragonAdapter` are the real adapters with their
+  hard-coded upstream hosts rewritten to the fake server.
+- `offline_environment()` points settings (LLM provider, TTS, audio storage)
+  and the Discord webhook base URL at the fake server and restores everything
+  on exit.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import re
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from src.adapters.ddragon_adapter import DDragonAdapter
+from src.adapters.riot_api import RiotAPIAdapter
+
+_RIOT_HOST = re.compile(r"^https://[a-z0-9]+\.api\.riotgames\.com")
+
+
+class InMemoryDatabase:
+    """Subset of DatabaseAdapter used by the analysis tasks, backed by dicts."""
+
+    def __init__(self) -> None:
+        self.matches: dict[str, str] = {}
+        self.analyses: dict[str, dict[str, Any]] = {}
+        self.profiles: dict[str, str] = {}
+        self.writes = 0
+
+    async def connect(self) -> None:
+        return None
+
+    async def disconnect(self) -> None:
+        return None
+
+    async def save_match_data(
+        self, match_id: str, match_data: dict[str, Any], timeline_data: dict[str, Any]
+    ) -> bool:
+        self.matches[match_id] = json.dumps(
+            {"match_data": match_data, "timeline_data": timeline_data}, ensure_ascii=False
+        )
+        self.writes += 1
+        return True
+
+    async def get_match_data(self, match_id: str) -> dict[str, Any] | None:
+        raw = self.matches.get(match_id)
+        return json.loads(raw) if raw else None
+
+    async def save_analysis_result(
+        self,
+        match_id: str,
+        puuid: str,
+        score_data: dict[str, Any],
+        region: str = "na1",
+        status: str = "completed",
+        processing_duration_ms: float | None = None,
+        error_message: str | None = None,
+    ) -> bool:
+        self.analyses[match_id] = {
+            "match_id": match_id,
+            "puuid": puuid,
+            "score_data": json.loads(json.dumps(score_data, ensure_ascii=False)),
+            "region": region,
+            "status": status,
+            "processing_duration_ms": processing_duration_ms,
+            "error_message": error_message,
+        }
+        self.writes += 1
+        return True
+
+    async def get_analysis_result(self, match_id: str) -> dict[str, Any] | None:
+        return self.analyses.get(match_id)
+
+    async def update_llm_narrative(
+        self, match_id: str, llm_narrative: str, llm_metadata: dict[str, Any] | None = None
+    ) -> bool:
+        row = self.analyses.setdefault(match_id, {"match_id": match_id})
+        row["llm_narrative"] = llm_narrative
+        row["llm_metadata"] = json.loads(json.dumps(llm_metadata or {}, ensure_ascii=False))
+        self.writes += 1
+        return True
+
+    async def update_analysis_status(
+        self, match_id: str, status: str, error_message: str | None = None
+    ) -> bool:
+        row = self.analyses.setdefault(match_id, {"match_id": match_id})
+        row["status"] = status
+        row["error_message"] = error_message
+        return True
+
+    async def get_user_profile(self, discord_user_id: str) -> dict[str, Any] | None:
+        raw = self.profiles.get(discord_user_id)
+        return json.loads(raw) if raw else None
+
+    async def save_user_profile(
+        self, discord_user_id: str, puuid: str, profile_data: dict[str, Any]
+    ) -> bool:
+        self.profiles[discord_user_id] = json.dumps(profile_data, ensure_ascii=False, default=str)
+        return True
+
+    async def health_check(self) -> bool:
+        return True
+
+
+class InMemoryCache:
+    """Subset of RedisAdapter (JSON values, TTL ignored)."""
+
+    def __init__(self) -> None:
+        self.store: dict[str, str] = {}
+
+    async def connect(self) -> None:
+        return None
+
+    async def disconnect(self) -> None:
+        return None
+
+    async def health_check(self) -> bool:
+        return True
+
+    async def get(self, key: str) -> Any | None:
+        raw = self.store.get(key)
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any, ttl: int | None = None) -> bool:
+        self.store[key] = json.dumps(value, ensure_ascii=False, default=str)
+        return True
+
+    async def delete(self, key: str) -> bool:
+        return self.store.pop(key, None) is not None
+
+
+class _RedirectingSession:
+    """Wraps an aiohttp session and rewrites Riot hosts to the fake server."""
+
+    def __init__(self, session: Any, base_url: str) -> None:
+        self._session = session
+        self._base_url = base_url
+
+    @property
+    def closed(self) -> bool:
+        return bool(self._session.closed)
+
+    def get(self, url: str, **kwargs: Any) -> Any:
+        return self._session.get(_RIOT_HOST.sub(self._base_url, url), **kwargs)
+
+    async def close(self) -> None:
+        await self._session.close()
+
+
+class LocalRiotAdapter(RiotAPIAdapter):
+    """Real RiotAPIAdapter (including timeline conversion) talking to the fake server."""
+
+    def __init__(self, base_url: str) -> None:
+        super().__init__()
+        self._fake_base_url = f"{base_url}/riot"
+
+    async def _ensure_session(self) -> Any:
+        session = await super()._ensure_session()
+        if isinstance(session, _RedirectingSession):
+            return session
+        self._session = _RedirectingSession(session, self._fake_base_url)
+        return self._session
+
+
+def local_ddragon_adapter(base_url: str) -> type[DDragonAdapter]:
+    """Return a DDragonAdapter subclass whose CDN is the fake server."""
+
+    class LocalDDragonAdapter(DDragonAdapter):
+        def __init__(self, version: str | None = None, language: str = "en_US") -> None:
+            super().__init__(version=version, language=language)
+            self.base_url = f"{base_url}/ddragon"
+
+    return LocalDDragonAdapter
+
+
+@contextlib.contextmanager
+def offline_environment(base_url: str, workdir: Path) -> Iterator[None]:
+    """Point every upstream used by the analysis tasks at the fake server.
+
+    Build enrichment (Data Dragon via urllib + OP.GG scraping) is switched off:
+    it is an optional best-effort stage whose HTTP client cannot be redirected.
+    """
+    from src.adapters.discord_webhook import DiscordWebhookAdapter
+    from src.config.settings import settings
+    from src.tasks import analysis_tasks
+
+    overrides: dict[str, Any] = {
+        "llm_provider": "openai",
+        "openai_api_base": base_url,
+        "openai_api_key": "bench",
+        "tts_api_url": f"{base_url}/tts",
+        "tts_api_key": "bench",
+        "audio_storage_path": str(workdir / "audio"),
+        "audio_base_url": f"{base_url}/static/audio",
+        "aws_s3_bucket": None,
+        "feature_team_build_enrichment_enabled": False,
+        "feature_opgg_enrichment_enabled": False,
+    }
+    env_overrides = {"CHIMERA_TEAM_BUILD_ENRICH": "0", "CHIMERA_OPGG_ENABLED": "0"}
+
+    saved_settings = {name: getattr(settings, name, None) for name in overrides}
+    saved_env = {name: os.environ.get(name) for name in env_overrides}
+    saved_webhook_base = DiscordWebhookAdapter.WEBHOOK_BASE_URL
+    saved_ddragon = analysis_tasks.DDragonAdapter
+
+    (workdir / "audio").mkdir(parents=True, exist_ok=True)
+    try:
+        for name, value in overrides.items():
+            setattr(settings, name, value)
+        os.environ.update(env_overrides)
+        DiscordWebhookAdapter.WEBHOOK_BASE_URL = f"{base_url}/discord/api/v10"
+        analysis_tasks.DDragonAdapter = local_ddragon_adapter(base_url)  # type: ignore[misc]
+        yield
+    finally:
+        for name, value in saved_settings.items():
+            setattr(settings, name, value)
+        for name, value in saved_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        DiscordWebhookAdapter.WEBHOOK_BASE_URL = saved_webhook_base
+        analysis_tasks.DDragonAdapter = saved_ddragon  # type: ignore[misc]
@@ -0,0 +1,415 @@
+"""Match-V5 fixtures for the offline pipeline benchmarks.
+
+Recorded payloads are preferred: drop `<match_id>.details.json` and
+`<match_id>.timeline.json` (raw Riot Match-V5 responses) into a directory and
+pass it with `--fixtures`. Without recordings, `synthetic_match()` produces a
+deterministic, schema-complete Match-V5 pair sized like a real ranked game
+(~30 one-minute frames, ~1.5k events) so runs are comparable across machines.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+# (championId, championName) pairs; mix of melee/ranged/AP/AD so scoring hits all branches
+_CHAMPIONS: list[tuple[int, str]] = [
+    (157, "Yasuo"),
+    (64, "LeeSin"),
+    (103, "Ahri"),
+    (222, "Jinx"),
+    (412, "Thresh"),
+    (86, "Garen"),
+    (121, "Khazix"),
+    (134, "Syndra"),
+    (51, "Caitlyn"),
+    (89, "Leona"),
+]
+_POSITIONS = ["TOP", "JUNGLE", "MIDDLE", "BOTTOM", "UTILITY"]
+_ITEMS = [1055, 1056, 2003, 3006, 3031, 3071, 3089, 3153, 3157, 3190, 6672, 6653]
+
+QUEUE_RANKED_SOLO = 420
+QUEUE_ARAM = 450
+
+
+@dataclass(slots=True)
+class MatchFixture:
+    """One match worth of raw Riot payloads plus the requesting player's PUUID."""
+
+    match_id: str
+    details: dict[str, Any]
+    timeline: dict[str, Any]
+
+    @property
+    def target_puuid(self) -> str:
+        return str(self.details["metadata"]["participants"][0])
+
+
+def _participant_frame(pid: int, minute: int, rng: random.Random) -> dict[str, Any]:
+    gold = 500 + minute * (380 + rng.randint(-40, 60))
+    dmg = minute * rng.randint(250, 520)
+    return {
+        "participantId": pid,
+        "championStats": {
+            "abilityHaste": rng.randint(0, 40),
+            "abilityPower": rng.randint(0, 400),
+            "armor": 30 + minute * 3,
+            "attackDamage": 60 + minute * 4,
+            "attackSpeed": 100 + minute,
+            "health": rng.randint(200, 2500),
+            "healthMax": 600 + minute * 90,
+            "magicResist": 30 + minute,
+            "movementSpeed": 345,
+            "power": rng.randint(0, 1200),
+            "powerMax": 300 + minute * 40,
+        },
+        "damageStats": {
+            "magicDamageDone": dmg * 2,
+            "magicDamageDoneToChampions": dmg // 2,
+            "magicDamageTaken": dmg // 3,
+            "physicalDamageDone": dmg * 3,
+            "physicalDamageDoneToChampions": dmg // 2,
+            "physicalDamageTaken": dmg // 3,
+            "totalDamageDone": dmg * 5,
+            "totalDamageDoneToChampions": dmg,
+            "totalDamageTaken": dmg // 2 + 200,
+            "trueDamageDone": dmg // 10,
+            "trueDamageDoneToChampions": dmg // 20,
+            "trueDamageTaken": dmg // 30,
+        },
+        "currentGold": rng.randint(0, 1500),
+        "goldPerSecond": 2,
+        "jungleMinionsKilled": minute * (4 if pid in (2, 7) else 0),
+        "level": min(18, 1 + minute // 2),
+        "minionsKilled": minute * rng.randint(5, 8),
+        "position": {"x": rng.randint(500, 14500), "y": rng.randint(500, 14500)},
+        "timeEnemySpentControlled": minute * rng.randint(0, 900),
+        "totalGold": gold,
+        "xp": minute * 560,
+    }
+
+
+def _frame_events(minute: int, rng: random.Random) -> list[dict[str, Any]]:
+    base_ts = minute * 60000
+    events: list[dict[str, Any]] = []
+    for pid in range(1, 11):
+        for _ in range(rng.randint(1, 3)):
+            events.append(
+                {
+                    "type": "WARD_PLACED",
+                    "timestamp": base_ts + rng.randint(0, 59999),
+                    "creatorId": pid,
+                    "wardType": rng.choice(["YELLOW_TRINKET", "CONTROL_WARD", "SIGHT_WARD"]),
+                }
+            )
+        if rng.random() < 0.35:
+            events.append(
+                {
+                    "type": "ITEM_PURCHASED",
+                    "timestamp": base_ts + rng.randint(0, 59999),
+                    "participantId": pid,
+                    "itemId": rng.choice(_ITEMS),
+                }
+            )
+        if minute < 16 and rng.random() < 0.5:
+            events.append(
+                {
+                    "type": "SKILL_LEVEL_UP",
+                    "timestamp": base_ts + rng.randint(0, 59999),
+                    "participantId": pid,
+                    "skillSlot": rng.randint(1, 4),
+                    "levelUpType": "NORMAL",
+                }
+            )
+    if minute >= 3:
+        # Skirmishes cluster in time and space so teamfight detection has work to do
+        for _ in range(rng.randint(0, 4)):
+            killer = rng.randint(1, 10)
+            victim = rng.choice([p for p in range(1, 11) if (p <= 5) != (killer <= 5)])
+            allies = [p for p in range(1, 11) if (p <= 5) == (killer <= 5) and p != killer]
+            pos = {"x": rng.randint(4000, 11000), "y": rng.randint(4000, 11000)}
+            events.append(
+                {
+                    "type": "CHAMPION_KILL",
+                    "timestamp": base_ts + rng.randint(0, 59999),
+                    "killerId": killer,
+                    "victimId": victim,
+                    "assistingParticipantIds": rng.sample(allies, rng.randint(0, 3)),
+                    "position": pos,
+                    "bounty": 300,
+                    "shutdownBounty": 0,
+                }
+            )
+        if rng.random() < 0.3:
+            killer = rng.randint(1, 10)
+            events.append(
+                {
+                    "type": "WARD_KILL",
+                    "timestamp": base_ts + rng.randint(0, 59999),
+                    "killerId": killer,
+                    "wardType": "YELLOW_TRINKET",
+                }
+            )
+    if minute in (6, 12, 18, 24):
+        killer = rng.randint(1, 10)
+        events.append(
+            {
+                "type": "ELITE_MONSTER_KILL",
+                "timestamp": base_ts + 30000,
+                "killerId": killer,
+                "killerTeamId": 100 if killer <= 5 else 200,
+                "monsterType": "DRAGON",
+                "monsterSubType": "FIRE_DRAGON",
+                "position": {"x": 9866, "y": 4414},
+            }
+        )
+    if minute in (22, 27):
+        killer = rng.randint(1, 10)
+        events.append(
+            {
+                "type": "ELITE_MONSTER_KILL",
+                "timestamp": base_ts + 30000,
+                "killerId": killer,
+                "killerTeamId": 100 if killer <= 5 else 200,
+                "monsterType": "BARON_NASHOR",
+                "position": {"x": 5007, "y": 10471},
+            }
+        )
+    if minute >= 10 and rng.random() < 0.4:
+        killer = rng.randint(1, 10)
+        events.append(
+            {
+                "type": "BUILDING_KILL",
+                "timestamp": base_ts + rng.randint(0, 59999),
+                "killerId": killer,
+                "teamId": 200 if killer <= 5 else 100,
+                "buildingType": rng.choice(["TOWER_BUILDING", "INHIBITOR_BUILDING"]),
+                "laneType": rng.choice(["TOP_LANE", "MID_LANE", "BOT_LANE"]),
+                "towerType": "OUTER_TURRET",
+                "assistingParticipantIds": [],
+                "position": {"x": 5846, "y": 6396},
+            }
+        )
+    events.sort(key=lambda e: e["timestamp"])
+    return events
+
+
+def _participant_details(
+    pid: int,
+    puuid: str,
+    champion: tuple[int, str],
+    win: bool,
+    kda: tuple[int, int, int],
+    rng: random.Random,
+) -> dict[str, Any]:
+    kills, deaths, assists = kda
+    return {
+        "participantId": pid,
+        "puuid": puuid,
+        "teamId": 100 if pid <= 5 else 200,
+        "championId": champion[0],
+        "championName": champion[1],
+        "riotIdGameName": f"BenchPlayer{pid}",
+        "riotIdTagline": "NA1",
+        "summonerName": f"BenchPlayer{pid}",
+        "teamPosition": _POSITIONS[(pid - 1) % 5],
+        "individualPosition": _POSITIONS[(pid - 1) % 5],
+        "lane": _POSITIONS[(pid - 1) % 5],
+        "role": "SOLO",
+        "win": win,
+        "champLevel": rng.randint(13, 18),
+        "kills": kills,
+        "deaths": deaths,
+        "assists": assists,
+        "doubleKills": rng.randint(0, 2),
+        "tripleKills": 0,
+        "quadraKills": 0,
+        "pentaKills": 0,
+        "killingSprees": rng.randint(0, 3),
+        "largestKillingSpree": rng.randint(0, 6),
+        "largestMultiKill": rng.randint(1, 2),
+        "goldEarned": rng.randint(8000, 16000),
+        "goldSpent": rng.randint(7000, 15000),
+        "totalMinionsKilled": rng.randint(20, 260),
+        "neutralMinionsKilled": rng.randint(0, 180),
+        "totalDamageDealt": rng.randint(60000, 220000),
+        "totalDamageDealtToChampions": rng.randint(8000, 45000),
+        "physicalDamageDealtToChampions": rng.randint(2000, 25000),
+        "magicDamageDealtToChampions": rng.randint(2000, 25000),
+        "trueDamageDealtToChampions": rng.randint(0, 4000),
+        "totalDamageTaken": rng.randint(10000, 40000),
+        "damageSelfMitigated": rng.randint(5000, 40000),
+        "damageDealtToObjectives": rng.randint(1000, 30000),
+        "damageDealtToBuildings": rng.randint(0, 10000),
+        "totalHeal": rng.randint(1000, 15000),
+        "totalHealsOnTeammates": rng.randint(0, 5000),
+        "totalTimeCCDealt": rng.randint(0, 900),
+        "timeCCingOthers": rng.randint(0, 60),
+        "timePlayed": 1800,
+        "longestTimeSpentLiving": rng.randint(200, 1200),
+        "visionScore": rng.randint(8, 90),
+        "wardsPlaced": rng.randint(5, 40),
+        "wardsKilled": rng.randint(0, 15),
+        "detectorWardsPlaced": rng.randint(0, 8),
+        "visionWardsBoughtInGame": rng.randint(0, 8),
+        "turretKills": rng.randint(0, 3),
+        "inhibitorKills": rng.randint(0, 1),
+        "dragonKills": rng.randint(0, 2),
+        "baronKills": rng.randint(0, 1),
+        "firstBloodKill": pid == 1,
+        "summoner1Id": 4,
+        "summoner2Id": rng.choice([14, 12, 11, 7, 3]),
+        **{f"item{i}": rng.choice(_ITEMS) for i in range(7)},
+        "perks": {
+            "statPerks": {"defense": 5001, "flex": 5008, "offense": 5005},
+            "styles": [
+                {
+                    "description": "primaryStyle",
+                    "style": 8000,
+                    "selections": [{"perk": p} for p in (8010, 9111, 9104, 8299)],
+                },
+                {
+                    "description": "subStyle",
+                    "style": 8400,
+                    "selections": [{"perk": p} for p in (8444, 8451)],
+                },
+            ],
+        },
+        "challenges": {
+            "kda": round((kills + assists) / max(1, deaths), 2),
+            "killParticipation": round(rng.uniform(0.3, 0.8), 3),
+            "damagePerMinute": round(rng.uniform(300, 1200), 1),
+            "goldPerMinute": round(rng.uniform(250, 520), 1),
+            "visionScorePerMinute": round(rng.uniform(0.2, 2.5), 2),
+            "teamDamagePercentage": round(rng.uniform(0.1, 0.35), 3),
+            "crowdControlScore": rng.randint(0, 60),
+            "soloKills": rng.randint(0, 4),
+            "laneMinionsFirst10Minutes": rng.randint(30, 90),
+        },
+    }
+
+
+def synthetic_match(
+    seed: int = 0,
+    *,
+    queue_id: int = QUEUE_RANKED_SOLO,
+    minutes: int = 30,
+    platform: str = "NA1",
+) -> MatchFixture:
+    """Build a deterministic raw Match-V5 details + timeline pair."""
+    rng = random.Random(seed)
+    match_id = f"{platform}_{9_000_000_000 + seed}"
+    game_id = 9_000_000_000 + seed
+    puuids = [f"bench-puuid-{seed}-{pid:02d}" + "x" * 52 for pid in range(1, 11)]
+    champions = rng.sample(_CHAMPIONS, len(_CHAMPIONS))
+    blue_wins = rng.random() < 0.5
+
+    frames = [
+        {
+            "timestamp": minute * 60000,
+            "participantFrames": {
+                str(pid): _participant_frame(pid, minute, rng) for pid in range(1, 11)
+            },
+            "events": _frame_events(minute, rng) if minute else [],
+        }
+        for minute in range(minutes + 1)
+    ]
+    # Keep details KDA consistent with the timeline so scoring takes the normal path
+    kda = {pid: [0, 0, 0] for pid in range(1, 11)}
+    for frame in frames:
+        for event in frame["events"]:
+            if event["type"] == "CHAMPION_KILL":
+                kda[event["killerId"]][0] += 1
+                kda[event["victimId"]][1] += 1
+                for assist in event["assistingParticipantIds"]:
+                    kda[assist][2] += 1
+
+    participants = [
+        _participant_details(
+            pid,
+            puuids[pid - 1],
+            champions[pid - 1],
+            (pid <= 5) == blue_wins,
+            (kda[pid][0], kda[pid][1], kda[pid][2]),
+            rng,
+        )
+        for pid in range(1, 11)
+    ]
+    details = {
+        "metadata": {"dataVersion": "2", "matchId": match_id, "participants": puuids},
+        "info": {
+            "gameId": game_id,
+            "gameMode": "ARAM" if queue_id == QUEUE_ARAM else "CLASSIC",
+            "gameType": "MATCHED_GAME",
+            "gameVersion": "14.20.615.5519",
+            "mapId": 12 if queue_id == QUEUE_ARAM else 11,
+            "platformId": platform,
+            "queueId": queue_id,
+            "gameCreation": 1_730_000_000_000 + seed * 1000,
+            "gameStartTimestamp": 1_730_000_030_000 + seed * 1000,
+            "gameEndTimestamp": 1_730_000_030_000 + seed * 1000 + minutes * 60000,
+            "gameDuration": minutes * 60,
+            "participants": participants,
+            "teams": [
+                {
+                    "teamId": team_id,
+                    "win": (team_id == 100) == blue_wins,
+                    "bans": [],
+                    "objectives": {
+                        name: {"first": team_id == 100, "kills": rng.randint(0, 4)}
+                        for name in (
+                            "baron",
+                            "champion",
+                            "dragon",
+                            "inhibitor",
+                            "riftHerald",
+                            "tower",
+                        )
+                    },
+                }
+                for team_id in (100, 200)
+            ],
+        },
+    }
+    timeline = {
+        "metadata": {"dataVersion": "2", "matchId": match_id, "participants": puuids},
+        "info": {
+            "frameInterval": 60000,
+            "frames": frames,
+            "gameId": game_id,
+            "participants": [
+                {"participantId": pid, "puuid": puuids[pid - 1]} for pid in range(1, 11)
+            ],
+        },
+    }
+    return MatchFixture(match_id=match_id, details=details, timeline=timeline)
+
+
+def load_recorded(directory: Path) -> list[MatchFixture]:
+    """Load `<match_id>.details.json` / `<match_id>.timeline.json` pairs from a directory."""
+    fixtures: list[MatchFixture] = []
+    for details_path in sorted(directory.glob("*.details.json")):
+        match_id = details_path.name.removesuffix(".details.json")
+        timeline_path = directory / f"{match_id}.timeline.json"
+        if not timeline_path.exists():
+            continue
+        fixtures.append(
+            MatchFixture(
+                match_id=match_id,
+                details=json.loads(details_path.read_text(encoding="utf-8")),
+                timeline=json.loads(timeline_path.read_text(encoding="utf-8")),
+            )
+        )
+    return fixtures
+
+
+def build_fixture_set(count: int, directory: Path | None = None) -> list[MatchFixture]:
+    """Return recorded fixtures if available, else `count` synthetic ranked matches."""
+    if directory is not None:
+        recorded = load_recorded(directory)
+        if recorded:
+            return recorded
+    return [synthetic_match(seed) for seed in range(max(1, count))]
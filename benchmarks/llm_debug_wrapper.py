@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Microbenchmark for llm_debug_wrapper per-call overhead.
+
+Compares a bare function against the decorator in full-trace mode, with
+logging filtered out by level (deferred formatting), and in the sampled-out
+fast path (histogram only). The payload mimics a save_analysis_result score
+dict so serialization cost is realistic.
+
+Usage:
+    poetry run python -m benchmarks.llm_debug_wrapper --iterations 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+
+def _score_payload() -> dict[str, Any]:
+    return {
+        "match_id": "NA1_5390652773",
+        "player_scores": [
+            {
+                "participant_id": pid,
+                "summoner_name": f"Player{pid}",
+                "champion_name": "Yasuo",
+                "combat_efficiency": 71.5,
+                "economic_management": 64.2,
+                "objective_control": 58.9,
+                "vision_control": 33.1,
+                "team_contribution": 70.0,
+                "overall_score": 66.3,
+                "strengths": ["combat", "laning"] * 4,
+                "improvements": ["vision"] * 6,
+                "raw_stats": {f"stat_{i}": i * 1.5 for i in range(40)},
+            }
+            for pid in range(1, 11)
+        ],
+    }
+
+
+def _measure(label: str, fn: Callable[[dict[str, Any]], Any], iterations: int) -> float:
+    payload = _score_payload()
+    fn(payload)  # warm-up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(payload)
+    per_call_us = (time.perf_counter() - start) / iterations * 1e6
+    print(f"  {label:<34} {per_call_us:9.2f} µs/call")
+    return per_call_us
+
+
+async def _measure_async(label: str, fn: Callable[[dict[str, Any]], Any], iterations: int) -> float:
+    payload = _score_payload()
+    await fn(payload)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await fn(payload)
+    per_call_us = (time.perf_counter() - start) / iterations * 1e6
+    print(f"  {label:<34} {per_call_us:9.2f} µs/call")
+    return per_call_us
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="llm_debug_wrapper overhead microbenchmark")
+    p.add_argument("--iterations", type=int, default=20000)
+    p.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = p.parse_args()
+
+    from src.core.observability import llm_debug_wrapper
+
+    # Silence actual log output; level filtering is toggled per scenario below.
+    logging.basicConfig(stream=open("/dev/null", "w"), level=logging.INFO)  # noqa: SIM115
+
+    def bare(payload: dict[str, Any]) -> dict[str, Any]:
+        return payload
+
+    full = llm_debug_wrapper(capture_args=True, capture_result=True, sample_rate=1.0)(bare)
+    fast = llm_debug_wrapper(capture_args=True, capture_result=True, sample_rate=0.0)(bare)
+    sampled = llm_debug_wrapper(capture_args=True, capture_result=True, sample_rate=0.05)(bare)
+
+    async def abare(payload: dict[str, Any]) -> dict[str, Any]:
+        return payload
+
+    afast = llm_debug_wrapper(sample_rate=0.0)(abare)
+
+    n = args.iterations
+    results: dict[str, float] = {}
+    print(f"llm_debug_wrapper overhead ({n} iterations)")
+    results["bare"] = _measure("bare function", bare, n)
+    results["full_trace"] = _measure("full trace (INFO enabled)", full, max(n // 20, 100))
+    logging.getLogger("src.core.observability").setLevel(logging.WARNING)
+    results["full_trace_level_filtered"] = _measure("full trace (INFO filtered)", full, n)
+    logging.getLogger("src.core.observability").setLevel(logging.NOTSET)
+    results["sampled_5pct"] = _measure("sampled 5%", sampled, n)
+    results["fast_path"] = _measure("fast path (sample_rate=0)", fast, n)
+    results["fast_path_async"] = asyncio.run(
+        _measure_async("fast path async (sample_rate=0)", afast, n)
+    )
+
+    if args.json:
+        print(json.dumps({k: round(v, 3) for k, v in results.items()}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
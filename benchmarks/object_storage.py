@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Microbenchmark: per-upload S3 clients vs the shared `ObjectStorage` client.
+
+Uploads clip-sized objects to an in-process `FakeS3Server`. Three approaches
+are compared:
+
+- ``per_upload_client``: what `TTSAdapter` and `TeamBuildsEnricher` used to
+  do, a new session and client per upload.
+- ``shared_client``: sequential `put_bytes` calls on one pooled client.
+- ``put_many``: a concurrent batch on that client.
+
+It also times one large object pushed through the multipart path. Prints
+per-upload latency percentiles as JSON.
+
+Usage:
+    poetry run python -m benchmarks.object_storage --uploads 100 --size-kb 64 --latency-ms 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("RIOT_API_KEY", "RGAPI-bench")
+os.environ.setdefault("DISCORD_BOT_TOKEN", "bench")
+
+from aiobotocore.session import get_session  # noqa: E402
+
+from benchmarks.fake_s3 import FakeS3Server  # noqa: E402
+from benchmarks.run_pipeline import _percentiles  # noqa: E402
+from src.adapters.object_storage import MIN_PART_SIZE, ObjectStorage  # noqa: E402
+
+BUCKET = "bench-audio"
+
+
+async def _run(server: FakeS3Server, uploads: int, size: int, large_mb: int) -> dict[str, Any]:
+    payload = os.urandom(size)
+    client_kwargs = {
+        "endpoint_url": server.endpoint_url,
+        "aws_access_key_id": "bench",
+        "aws_secret_access_key": "bench",
+        "region_name": "us-east-1",
+    }
+
+    per_upload: list[float] = []
+    for i in range(uploads):
+        start = time.perf_counter()
+        async with get_session().create_client("s3", **client_kwargs) as s3:
+            await s3.put_object(Bucket=BUCKET, Key=f"old/{i}.mp3", Body=payload)
+        per_upload.append((time.perf_counter() - start) * 1000.0)
+
+    storage = ObjectStorage(
+        bucket=BUCKET,
+        endpoint_url=server.endpoint_url,
+        access_key="bench",
+        secret_key="bench",
+        region="us-east-1",
+        multipart_threshold=MIN_PART_SIZE,
+    )
+    shared: list[float] = []
+    for i in range(uploads):
+        start = time.perf_counter()
+        await storage.put_bytes(f"shared/{i}.mp3", payload, content_type="audio/mpeg")
+        shared.append((time.perf_counter() - start) * 1000.0)
+
+    start = time.perf_counter()
+    urls = await storage.put_many(
+        [(f"batch/{i}.mp3", payload, "audio/mpeg") for i in range(uploads)]
+    )
+    batch_ms = (time.perf_counter() - start) * 1000.0
+
+    large = os.urandom(large_mb * 1024 * 1024)
+    start = time.perf_counter()
+    await storage.put_bytes("large/clip.mp3", large, content_type="audio/mpeg")
+    multipart_ms = (time.perf_counter() - start) * 1000.0
+    await storage.aclose()
+
+    return {
+        "unit": "ms",
+        "uploads": uploads,
+        "object_bytes": size,
+        "per_upload_client": _percentiles(per_upload),
+        "shared_client": _percentiles(shared),
+        "put_many_total_ms": round(batch_ms, 2),
+        "put_many_failed": sum(url is None for url in urls),
+        "multipart": {"mb": large_mb, "total_ms": round(multipart_ms, 2)},
+        "server_requests": dict(server.requests),
+    }
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Shared S3 client microbenchmark")
+    p.add_argument("--uploads", type=int, default=100)
+    p.add_argument("--size-kb", type=int, default=64, help="object size for single puts")
+    p.add_argument("--large-mb", type=int, default=24, help="object size for the multipart run")
+    p.add_argument("--latency-ms", type=float, default=0.0, help="per-request server latency")
+    args = p.parse_args()
+
+    with FakeS3Server(latency_ms=args.latency_ms) as server:
+        report = asyncio.run(_run(server, args.uploads, args.size_kb * 1024, args.large_mb))
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""Microbenchmark for Discord view rendering (embeds + ASCII cards/receipts).
+
+Renders the /队伍分析 overview embed, the /讲道理 embed and the ASCII receipts
+from CJK-heavy synthetic reports and prints per-call latency percentiles as
+JSON. Exits 1 when the team overview p50 exceeds `--budget-ms`.
+
+Usage:
+    poetry run python -m benchmarks.render_views --iterations 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("RIOT_API_KEY", "RGAPI-bench")
+os.environ.setdefault("DISCORD_BOT_TOKEN", "bench")
+
+from benchmarks.run_pipeline import _percentiles  # noqa: E402
+from src.contracts.team_analysis import (  # noqa: E402
+    TeamAggregates,
+    TeamAnalysisReport,
+    TeamPlayerEntry,
+)
+from src.core.views.analysis_view import render_analysis_embed  # noqa: E402
+from src.core.views.ascii_receipt import build_ascii_receipt  # noqa: E402
+from src.core.views.team_analysis_view import render_team_overview_embed  # noqa: E402
+from src.core.views.team_ascii_receipt import build_team_receipt  # noqa: E402
+
+_NAMES = ("久未晴#sky", "一只可爱的小猫咪#CN1", "Aurora#mid", "夜空中最亮的星#bot", "Rell#sup")
+_ICON_BASE = "https://ddragon.leagueoflegends.com/cdn/14.23.1/img/champion"
+_ROLES = ("TOP", "JUNGLE", "MIDDLE", "BOTTOM", "UTILITY")
+_NARRATIVE = (
+    "AI数据裁判：你在打野节奏上领先全队，三次成功反蹲带动了上路优势；"
+    "然而中后期视野布控不足，导致大龙区连续被断节奏。"
+    "建议继续保持入侵节奏，同时请队友配合布控关键点位。"
+) * 8
+
+
+def _player(idx: int, side: str) -> TeamPlayerEntry:
+    base = 40.0 + idx * 9.5
+    champion = ("Malphite", "Qiyana", "Aurora", "Samira", "Rell")[idx]
+    return TeamPlayerEntry(
+        puuid=f"{side}{idx}".ljust(40, "0"),
+        summoner_name=f"{_NAMES[idx]}{'' if side == 'ally' else '敌'}",
+        champion_name=champion,
+        role=_ROLES[idx],
+        combat_score=base,
+        economy_score=base - 5,
+        vision_score=base / 2,
+        objective_score=base / 3,
+        teamplay_score=base + 3,
+        overall_score=base,
+        survivability_score=base - 10,
+        kills=idx * 2,
+        deaths=idx,
+        assists=idx * 3,
+        damage_dealt=12_000 + idx * 3_100,
+        team_rank=idx + 1,
+        # Set by the pipeline; without it the view asks Data Dragon for a version
+        champion_icon_url=f"{_ICON_BASE}/{champion}.png",
+    )
+
+
+def team_report() -> TeamAnalysisReport:
+    aggregates = TeamAggregates(
+        combat_avg=60.0,
+        economy_avg=55.0,
+        vision_avg=30.0,
+        objective_avg=20.0,
+        teamplay_avg=63.0,
+        overall_avg=60.0,
+    )
+    return TeamAnalysisReport(
+        match_id="NA1_5389795464",
+        team_result="defeat",
+        team_region="na1",
+        game_mode="summoners_rift",
+        players=[_player(i, "ally") for i in range(5)],
+        opponent_players=[_player(i, "enemy") for i in range(5)],
+        aggregates=aggregates,
+        opponent_aggregates=aggregates,
+        summary_text=_NARRATIVE[:1800],
+        target_player_name=_NAMES[1],
+        target_player_puuid="ally1".ljust(40, "0"),
+    )
+
+
+def match_report() -> dict[str, Any]:
+    return {
+        "match_result": "victory",
+        "summoner_name": "一只可爱的小猫咪#CN1",
+        "champion_name": "Ahri",
+        "ai_narrative_text": _NARRATIVE,
+        "llm_sentiment_tag": "鼓励",
+        "v1_score_summary": {
+            "combat_score": 85.0,
+            "economy_score": 72.0,
+            "vision_score": 45.0,
+            "objective_score": 68.0,
+            "teamplay_score": 55.0,
+            "growth_score": 60.0,
+            "tankiness_score": 40.0,
+            "damage_composition_score": 78.0,
+            "survivability_score": 50.0,
+            "cc_contribution_score": 65.0,
+            "overall_score": 66.0,
+            "raw_stats": {"kills": 8, "deaths": 3, "assists": 12, "queue_id": 420},
+        },
+        "champion_assets_url": "https://example.com/ahri.png",
+        "processing_duration_ms": 2100.5,
+        "algorithm_version": "v1",
+        "builds_summary_text": "出装: 无尽之刃 · 饮血剑 · 饮魔刀\n符文: 精密 - 致命节奏 | 次系 主宰",
+    }
+
+
+def _time(fn: Callable[[], Any], iterations: int, warmup: int) -> dict[str, float]:
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return _percentiles(samples)
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Discord view rendering microbenchmark")
+    p.add_argument("--iterations", type=int, default=1000)
+    p.add_argument("--warmup", type=int, default=50)
+    p.add_argument("--budget-ms", type=float, default=1.0, help="team overview p50 budget")
+    args = p.parse_args()
+
+    team = team_report()
+    match = match_report()
+    # build_team_receipt reads the V2 shape (`team_analysis` list)
+    v2_team = SimpleNamespace(
+        team_analysis=team.players, target_player_name=team.target_player_name, game_mode="sr"
+    )
+    cases: dict[str, Callable[[], Any]] = {
+        "team_overview_embed": lambda: render_team_overview_embed(team),
+        "team_receipt": lambda: build_team_receipt(v2_team),
+        "analysis_embed": lambda: render_analysis_embed(match),
+        "ascii_receipt": lambda: build_ascii_receipt(match),
+    }
+    report = {name: _time(fn, args.iterations, args.warmup) for name, fn in cases.items()}
+    print(json.dumps({"unit": "ms", "iterations": args.iterations, "views": report}, indent=2))
+    return 1 if report["team_overview_embed"]["p50"] > args.budget_ms else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
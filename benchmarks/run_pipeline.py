@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""Offline benchmark for the /讲道理 and /队伍分析 Celery task bodies.
+
+Runs the real `analyze_match_task` (→ `_run_analysis_workflow`) and
+`analyze_team_task` code paths against Match-V5 fixtures, with Riot, the LLM
+provider, TTS, Discord and Data Dragon served by a local aiohttp fake and
+Postgres/Redis replaced by in-memory stand-ins. Reports throughput, per-stage
+latency percentiles (from the tasks' own stage waterfall) and peak RSS as JSON.
+
+Usage:
+    poetry run python -m benchmarks.run_pipeline --iterations 20
+    poetry run python -m benchmarks.run_pipeline --pipeline team --latency-scale 0 \\
+        --save benchmarks/results/baseline.json
+    poetry run python -m benchmarks.run_pipeline --compare benchmarks/results/baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import platform
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# Settings validation requires these; the fakes never use them for real calls.
+os.environ.setdefault("RIOT_API_KEY", "RGAPI-bench")
+os.environ.setdefault("DISCORD_BOT_TOKEN", "bench")
+
+from benchmarks.fake_services import FakeServiceServer, LatencyProfile  # noqa: E402
+from benchmarks.fakes import (  # noqa: E402
+    InMemoryCache,
+    InMemoryDatabase,
+    LocalRiotAdapter,
+    offline_environment,
+)
+from benchmarks.fixtures import MatchFixture, build_fixture_set  # noqa: E402
+
+PIPELINES = ("match", "team")
+PERCENTILES = (50, 90, 95, 99)
+# Metrics where a larger value is a regression (everything except throughput)
+_HIGHER_IS_BETTER = {"throughput_per_s"}
+
+
+def _percentiles(samples: list[float]) -> dict[str, float]:
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+    out = {"mean": round(statistics.fmean(ordered), 3), "max": round(ordered[-1], 3)}
+    for p in PERCENTILES:
+        idx = min(len(ordered) - 1, max(0, round(p / 100 * len(ordered) + 0.5) - 1))
+        out[f"p{p}"] = round(ordered[idx], 3)
+    return out
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _payload(fixture: MatchFixture, index: int) -> dict[str, Any]:
+    return {
+        "application_id": "bench-app",
+        "interaction_token": f"bench-token-{index}",
+        "channel_id": "1",
+        "discord_user_id": f"bench-user-{index % 7}",
+        "puuid": fixture.target_puuid,
+        "match_id": fixture.match_id,
+        "region": "na1",
+        "match_index": 1,
+        "correlation_id": f"bench:{index}",
+    }
+
+
+class PipelineRunner:
+    """Binds offline adapters onto a Celery task instance and invokes it in-process."""
+
+    def __init__(self, pipeline: str, base_url: str) -> None:
+        self.pipeline = pipeline
+        self.db = InMemoryDatabase()
+        self.riot = LocalRiotAdapter(base_url)
+        if pipeline == "match":
+            from src.tasks.analysis_tasks import analyze_match_task
+
+            self.task = analyze_match_task
+            self.task._db_adapter = self.db
+            self.task._riot_adapter = self.riot
+            self.task._cache_adapter = InMemoryCache()
+            # Re-created per run so the adapters bind to the task's own event loop
+            self.task._llm_adapter = None
+            self.task._webhook_adapter = None
+            self.task._tts_adapter = None
+        else:
+            from src.tasks.team_tasks import analyze_team_task
+
+            self.task = analyze_team_task
+            self.task._db_adapter = self.db
+            self.task._riot_adapter = self.riot
+
+    def run_once(self, fixture: MatchFixture, index: int) -> tuple[float, dict[str, Any]]:
+        if self.pipeline == "match":
+            self.task._webhook_adapter = None
+            self.task._tts_adapter = None
+        start = time.perf_counter()
+        result = self.task.run(**_payload(fixture, index))
+        return (time.perf_counter() - start) * 1000, result if isinstance(result, dict) else {}
+
+
+def run_benchmark(
+    pipeline: str,
+    fixtures: list[MatchFixture],
+    *,
+    iterations: int,
+    warmup: int,
+    concurrency: int,
+    latency: LatencyProfile,
+) -> dict[str, Any]:
+    """Run one pipeline and return its report section."""
+    with (
+        FakeServiceServer(fixtures, latency=latency) as server,
+        tempfile.TemporaryDirectory(prefix="chimera-bench-") as tmp,
+        offline_environment(server.base_url, Path(tmp)),
+    ):
+        runner = PipelineRunner(pipeline, server.base_url)
+        for i in range(warmup):
+            runner.run_once(fixtures[i % len(fixtures)], -1 - i)
+        server.requests.clear()
+
+        totals: list[float] = []
+        stages: dict[str, list[float]] = defaultdict(list)
+        failures: dict[str, int] = defaultdict(int)
+
+        def _one(i: int) -> tuple[float, dict[str, Any]]:
+            return runner.run_once(fixtures[i % len(fixtures)], i)
+
+        wall_start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            for total_ms, result in pool.map(_one, range(iterations)):
+                totals.append(total_ms)
+                if not result.get("success"):
+                    failures[str(result.get("error_stage") or "unknown")] += 1
+                for entry in result.get("stage_waterfall") or []:
+                    stages[str(entry["stage"])].append(float(entry["duration_ms"]))
+        wall_s = time.perf_counter() - wall_start
+
+    return {
+        "iterations": iterations,
+        "concurrency": concurrency,
+        "throughput_per_s": round(iterations / wall_s, 3) if wall_s else 0.0,
+        "total_ms": _percentiles(totals),
+        "stages_ms": {name: _percentiles(vals) for name, vals in sorted(stages.items())},
+        "failures": dict(failures),
+        "upstream_requests": dict(server.requests),
+    }
+
+
+def _flatten(report: dict[str, Any]) -> dict[str, float]:
+    """Flatten comparable metrics to `pipeline.metric.stat` keys."""
+    flat: dict[str, float] = {"peak_rss_mb": float(report.get("peak_rss_mb", 0.0))}
+    for pipeline, section in (report.get("pipelines") or {}).items():
+        flat[f"{pipeline}.throughput_per_s"] = float(section.get("throughput_per_s", 0.0))
+        for stat in ("p50", "p95"):
+            if stat in section.get("total_ms", {}):
+                flat[f"{pipeline}.total_ms.{stat}"] = float(section["total_ms"][stat])
+            for stage, values in (section.get("stages_ms") or {}).items():
+                if stat in values:
+                    flat[f"{pipeline}.{stage}.{stat}"] = float(values[stat])
+    return flat
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], threshold_pct: float) -> list[dict]:
+    """Return per-metric deltas; `regression` is set when worse than threshold."""
+    cur, base = _flatten(current), _flatten(baseline)
+    rows: list[dict[str, Any]] = []
+    for key in sorted(cur.keys() & base.keys()):
+        before, after = base[key], cur[key]
+        if before == 0:
+            continue
+        delta_pct = (after - before) / before * 100
+        worse = -delta_pct if key.endswith("throughput_per_s") else delta_pct
+        rows.append(
+            {
+                "metric": key,
+                "baseline": before,
+                "current": after,
+                "delta_pct": round(delta_pct, 2),
+                "regression": worse > threshold_pct,
+            }
+        )
+    return rows
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Offline analysis pipeline benchmark")
+    p.add_argument("--pipeline", choices=(*PIPELINES, "all"), default="all")
+    p.add_argument("--iterations", type=int, default=20)
+    p.add_argument("--warmup", type=int, default=2)
+    p.add_argument("--concurrency", type=int, default=1, help="Parallel task invocations")
+    p.add_argument("--matches", type=int, default=5, help="Synthetic fixtures to generate")
+    p.add_argument("--fixtures", type=Path, help="Directory of recorded Match-V5 JSON pairs")
+    p.add_argument(
+        "--latency-scale",
+        type=float,
+        default=1.0,
+        help="Multiply fake upstream latencies (0 = CPU-only measurement)",
+    )
+    p.add_argument("--save", type=Path, help="Write the JSON report to this path")
+    p.add_argument("--compare", type=Path, help="Baseline report to diff against")
+    p.add_argument("--threshold", type=float, default=10.0, help="Regression threshold in %%")
+    p.add_argument("--verbose", action="store_true", help="Keep application logging")
+    args = p.parse_args()
+
+    if not args.verbose:
+        logging.disable(logging.CRITICAL)
+
+    fixtures = build_fixture_set(args.matches, args.fixtures)
+    latency = LatencyProfile(scale=args.latency_scale)
+    pipelines = PIPELINES if args.pipeline == "all" else (args.pipeline,)
+
+    report: dict[str, Any] = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "fixtures": [f.match_id for f in fixtures],
+        "latency_scale": args.latency_scale,
+        "pipelines": {},
+    }
+    for pipeline in pipelines:
+        report["pipelines"][pipeline] = run_benchmark(
+            pipeline,
+            fixtures,
+            iterations=args.iterations,
+            warmup=args.warmup,
+            concurrency=args.concurrency,
+            latency=latency,
+        )
+    report["peak_rss_mb"] = _peak_rss_mb()
+
+    exit_code = 0
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        rows = compare(report, baseline, args.threshold)
+        report["comparison"] = {"baseline": str(args.compare), "metrics": rows}
+        if any(r["regression"] for r in rows):
+            exit_code = 1
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(text + "\n", encoding="utf-8")
+    print(text)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
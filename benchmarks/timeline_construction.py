@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Microbenchmark: validated vs trusted `MatchTimeline` construction.
+
+Converts synthetic Match-V5 timelines with `convert_match_timeline` (the same
+code `RiotAPIAdapter.get_match_timeline` runs), then times building the
+contract with full validation (`MatchTimeline(**data)`) and with
+`MatchTimeline.from_trusted(data)`, alone and followed by V1 scoring
+(`generate_llm_input`). Exits 1 if the two paths score differently. Prints
+per-call latency percentiles as JSON.
+
+Usage:
+    poetry run python -m benchmarks.timeline_construction --iterations 200 --minutes 40
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("RIOT_API_KEY", "RGAPI-bench")
+os.environ.setdefault("DISCORD_BOT_TOKEN", "bench")
+
+from benchmarks.fixtures import synthetic_match  # noqa: E402
+from benchmarks.run_pipeline import _percentiles  # noqa: E402
+from src.adapters.riot_api import convert_match_timeline  # noqa: E402
+from src.contracts.timeline import MatchTimeline  # noqa: E402
+from src.core.scoring import generate_llm_input  # noqa: E402
+
+
+def _time(fn: Callable[[], Any], iterations: int, warmup: int) -> dict[str, float]:
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return _percentiles(samples)
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="MatchTimeline construction microbenchmark")
+    p.add_argument("--iterations", type=int, default=200)
+    p.add_argument("--warmup", type=int, default=10)
+    p.add_argument("--minutes", type=int, default=30, help="game length (frames)")
+    args = p.parse_args()
+
+    fixture = synthetic_match(0, minutes=args.minutes)
+    data = convert_match_timeline(fixture.timeline, fixture.match_id, fixture.details)
+
+    # Both paths must score identically before their timings mean anything
+    trusted_scores = generate_llm_input(MatchTimeline.from_trusted(data), fixture.details)
+    validated_scores = generate_llm_input(MatchTimeline(**data), fixture.details)
+    if trusted_scores.model_dump() != validated_scores.model_dump():
+        print("trusted and validated timelines score differently", file=sys.stderr)
+        return 1
+
+    validated = _time(lambda: MatchTimeline(**data), args.iterations, args.warmup)
+    trusted = _time(lambda: MatchTimeline.from_trusted(data), args.iterations, args.warmup)
+    scoring = {
+        "validated": _time(
+            lambda: generate_llm_input(MatchTimeline(**data), fixture.details),
+            args.iterations,
+            args.warmup,
+        ),
+        "trusted": _time(
+            lambda: generate_llm_input(MatchTimeline.from_trusted(data), fixture.details),
+            args.iterations,
+            args.warmup,
+        ),
+    }
+    report = {
+        "unit": "ms",
+        "frames": len(data["info"]["frames"]),
+        "iterations": args.iterations,
+        "validated": validated,
+        "trusted": trusted,
+        "speedup_p50": round(validated["p50"] / trusted["p50"], 2) if trusted["p50"] else None,
+        "construct_plus_scoring": scoring,
+    }
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
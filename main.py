@@ -183,7 +183,9 @@ async def main() -> None:
 
         riot_api = RiotAPIAdapter()
         task_service = CeleryTaskService()
-        match_history_service = MatchHistoryService(riot_api=riot_api, db=db_adapter)
+        match_history_service = MatchHistoryService(
+            riot_api=riot_api, db=db_adapter, cache=redis_adapter
+        )
 
         # Discord adapter with services injected (enables /讲道理 registration + 方案C)
         discord_adapter = DiscordAdapter(
@@ -192,6 +194,7 @@ async def main() -> None:
             task_service=task_service,
             match_history_service=match_history_service,
             riot_api=riot_api,  # Required for IdentityResolver (方案C)
+            cache_adapter=redis_adapter,  # Pre-rendered /讲道理 messages on cache hits
         )
 
         # RSO callback server
@@ -32,7 +32,7 @@ fi
 WORKER_NAME="${WORKER_NAME:-chimera_worker}"
 CONCURRENCY="${WORKER_CONCURRENCY:-4}"
 LOGLEVEL="${WORKER_LOGLEVEL:-info}"
-QUEUE="${WORKER_QUEUE:-matches,ai,default}"
+QUEUE="${WORKER_QUEUE:-matches,ai,default,webhooks}"
 
 echo -e "${YELLOW}Worker Configuration:${NC}"
 echo "  Name: $WORKER_NAME"
@@ -46,9 +46,17 @@ if [ -z "$PROMETHEUS_MULTIPROC_DIR" ]; then
   export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-.prom_multiproc}"
 fi
 
-# Ensure directory exists and is clean (per prometheus_client docs)
+# Ensure directory exists and drop this host's stale sample files (per prometheus_client
+# docs). The directory is shared with the bot, so only "<type>_<host>-<pid>.db" files
+# written from this host are removed (host tag as built in src/core/metrics.py).
 mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
-find "$PROMETHEUS_MULTIPROC_DIR" -type f -name '*.db' -maxdepth 1 -print -delete >/dev/null 2>&1 || true
+HOST_TAG="$(hostname 2>/dev/null | tr '_/' '--')"
+HOST_TAG="${HOST_TAG:-host}"
+for db in "$PROMETHEUS_MULTIPROC_DIR"/*.db; do
+  if [[ -f "$db" && "$(basename "$db")" =~ _"$HOST_TAG"-[0-9]+\.db$ ]]; then
+    rm -f "$db"
+  fi
+done
 echo "Using PROMETHEUS_MULTIPROC_DIR=$PROMETHEUS_MULTIPROC_DIR"
 
 # Start Celery worker
@@ -8,6 +8,7 @@ import json
 import logging
 import asyncio
 import random
+from collections.abc import Callable
 from datetime import UTC, datetime
 from typing import Any
 
@@ -34,8 +35,24 @@ class DatabaseAdapter(DatabasePort):
     def __init__(self) -> None:
         """Initialize database adapter."""
         self._pool: Any = None  # asyncpg.Pool (untyped library)
+        self._account_listeners: list[Callable[[str], None]] = []
         logger.info("Database adapter initialized")
 
+    def add_account_listener(self, callback: Callable[[str], None]) -> None:
+        """Register a callback invoked with the Discord ID after its bindings change.
+
+        Used to invalidate in-process caches (e.g. autocomplete) on bind, unbind
+        and primary-account switches.
+        """
+        self._account_listeners.append(callback)
+
+    def _notify_account_change(self, discord_id: str) -> None:
+        for callback in self._account_listeners:
+            try:
+                callback(str(discord_id))
+            except Exception as e:
+                logger.warning(f"Account change listener failed for {discord_id}: {e}")
+
     async def connect(self) -> None:
         """Create database connection pool.
 
@@ -318,6 +335,7 @@ class DatabaseAdapter(DatabasePort):
                     datetime.now(UTC),
                 )
                 logger.info(f"Saved binding for Discord ID {discord_id} -> {puuid}")
+                self._notify_account_change(discord_id)
                 return True
 
         except asyncpg.UniqueViolationError:
@@ -526,6 +544,7 @@ class DatabaseAdapter(DatabasePort):
                 deleted = result.split()[-1] != "0"
                 if deleted:
                     logger.info(f"Deleted binding for Discord ID {discord_id}")
+                    self._notify_account_change(discord_id)
                 else:
                     logger.warning(f"No binding found for Discord ID {discord_id}")
                 return deleted
@@ -842,6 +861,59 @@ class DatabaseAdapter(DatabasePort):
             logger.error(f"Error fetching analysis result for {match_id}: {e}")
             return None
 
+    async def get_analysis_with_match(
+        self, match_id: str
+    ) -> tuple[dict[str, Any] | None, dict[str, Any] | None]:
+        """Retrieve the analysis record and its match payload in one round-trip.
+
+        The timeline column is not selected; cached /讲道理 renders only need
+        participant data from `match_data`.
+
+        Args:
+            match_id: Match ID to retrieve
+
+        Returns:
+            (analysis record, {"match_data": ...} or None); (None, None) when no
+            analysis exists
+        """
+        if not self._pool:
+            logger.error("Database pool not initialized")
+            return None, None
+
+        try:
+            async with self._pool.acquire() as conn:
+                row = await conn.fetchrow(
+                    """
+                    SELECT a.match_id, a.puuid, a.region, a.status, a.score_data,
+                           a.llm_narrative, a.llm_metadata, a.algorithm_version,
+                           a.processing_duration_ms, a.error_message,
+                           a.created_at, a.updated_at,
+                           m.match_data AS joined_match_data
+                    FROM match_analytics a
+                    LEFT JOIN match_data m ON m.match_id = a.match_id
+                    WHERE a.match_id = $1
+                    """,
+                    match_id,
+                )
+
+                if not row:
+                    return None, None
+
+                record = dict(row)
+                md = record.pop("joined_match_data", None)
+                if md is None:
+                    return record, None
+                if isinstance(md, str):
+                    import json as _json
+
+                    with contextlib.suppress(Exception):
+                        md = _json.loads(md)
+                return record, {"match_data": md}
+
+        except Exception as e:
+            logger.error(f"Error fetching analysis with match data for {match_id}: {e}")
+            return None, None
+
     async def update_llm_narrative(
         self, match_id: str, llm_narrative: str, llm_metadata: dict[str, Any] | None = None
     ) -> bool:
@@ -1195,6 +1267,7 @@ class DatabaseAdapter(DatabasePort):
                     f"Saved account binding for Discord ID {discord_id} -> {puuid} "
                     f"(primary={is_primary}, nickname={nickname})"
                 )
+                self._notify_account_change(discord_id)
                 return True
 
         except asyncpg.UniqueViolationError:
@@ -1238,6 +1311,7 @@ class DatabaseAdapter(DatabasePort):
                     return False
 
                 logger.info(f"Set {puuid} as primary account for Discord ID {discord_id}")
+                self._notify_account_change(discord_id)
                 return True
 
         except Exception as e:
@@ -1308,6 +1382,7 @@ class DatabaseAdapter(DatabasePort):
                     else:
                         logger.info(f"Removed non-primary account {puuid} for {discord_id}")
 
+                self._notify_account_change(discord_id)
                 return True
 
         except Exception as e:
@@ -7,7 +7,8 @@ import asyncio
 import logging
 import time
 from datetime import UTC, datetime
-from typing import Any, cast
+from collections.abc import Callable
+from typing import Any
 
 import aiohttp
 import discord
@@ -20,7 +21,20 @@ from src.contracts.discord_interactions import (
     EmbedColor,
 )
 from src.core.observability import clear_correlation_id, set_correlation_id
+from src.adapters.discord_voice_session import VoiceSessionManager
+from src.adapters.discord_webhook import DiscordWebhookAdapter
+from src.adapters.local_artifact_store import (
+    LocalArtifactIndex,
+    local_audio_available,
+    local_audio_path,
+)
+from src.adapters.voice_broadcast_client import VoiceBroadcastHttpClient
+from src.adapters.voice_opus_cache import OpusClipCache
+from src.core.services.account_autocomplete_cache import AccountAutocompleteCache
 from src.core.services.celery_task_service import TaskQueueError
+from src.core.services.rendered_message_cache import RenderedMessageCache
+from src.core.services.shard_routing import ShardRouter
+from src.core.services.tts_precompute import await_precomputed_tts
 from src.core.services.voice_broadcast_service import VoiceBroadcastService
 import contextlib
 
@@ -115,6 +129,28 @@ class ChimeraBot(commands.Bot):
         )
 
 
+class ShardedChimeraBot(ChimeraBot, commands.AutoShardedBot):
+    """ChimeraBot on discord.py's AutoShardedClient (one gateway connection per shard).
+
+    ``shard_ids``/``shard_count`` restrict the process to a slice of the shards;
+    left unset, discord.py runs all of Discord's recommended shards.
+    """
+
+    async def on_shard_ready(self, shard_id: int) -> None:
+        logger.info("Shard %s ready (%s shards in process)", shard_id, len(self.shards))
+
+
+def create_bot(settings: Any, router: ShardRouter, **kwargs: Any) -> ChimeraBot:
+    """Plain bot by default; sharded when auto-sharding or a shard layout is configured."""
+    if not (settings.discord_auto_shard or router.shard_count):
+        return ChimeraBot(**kwargs)
+    return ShardedChimeraBot(
+        shard_count=router.shard_count,
+        shard_ids=list(router.shard_ids) if router.shard_ids is not None else None,
+        **kwargs,
+    )
+
+
 class DiscordAdapter:
     """Adapter for Discord interactions following hexagonal architecture."""
 
@@ -125,6 +161,7 @@ class DiscordAdapter:
         task_service: Any | None = None,
         match_history_service: Any | None = None,
         riot_api: Any | None = None,
+        cache_adapter: Any | None = None,
     ) -> None:
         """Initialize the Discord adapter.
 
@@ -134,12 +171,28 @@ class DiscordAdapter:
             task_service: IAsyncTaskService implementation (Celery)
             match_history_service: IMatchHistoryService implementation
             riot_api: RiotAPIPort implementation (for IdentityResolver)
+            cache_adapter: Redis adapter (pre-rendered /讲道理 messages on cache hits)
         """
         self.rso = rso_adapter
         self.db = db_adapter
         self.task_service = task_service
         self.match_history_service = match_history_service
         self.settings = get_settings()
+        self.cache_adapter = cache_adapter
+        # Local audio index (set by the callback server when it runs storage cleanup)
+        self.artifact_index: LocalArtifactIndex | None = None
+        self.rendered_messages = (
+            RenderedMessageCache(cache_adapter) if cache_adapter is not None else None
+        )
+        self._webhook_adapter: DiscordWebhookAdapter | None = None
+        # Autocomplete reads bound accounts from memory; DB writes invalidate them
+        self.account_choices = AccountAutocompleteCache(
+            db_adapter.list_user_accounts,
+            ttl_seconds=self.settings.autocomplete_account_cache_ttl,
+        )
+        add_listener = getattr(db_adapter, "add_account_listener", None)
+        if callable(add_listener):
+            add_listener(self.account_choices.invalidate)
 
         # Initialize IdentityResolver for 方案C multi-account support
         if riot_api:
@@ -154,14 +207,42 @@ class DiscordAdapter:
             if self.settings.discord_application_id
             else None
         )
-        self.bot = ChimeraBot(command_prefix=self.settings.bot_prefix, application_id=app_id)
+        # Guild ownership when shards are spread over several bot processes
+        self.shard_router = ShardRouter.from_settings(self.settings)
+        self.bot = create_bot(
+            self.settings,
+            self.shard_router,
+            command_prefix=self.settings.bot_prefix,
+            application_id=app_id,
+        )
         self._setup_commands()
         self._setup_event_handlers()
+        # Voice connections are kept per guild between clips (idle-disconnect timer)
+        self.voice_sessions = VoiceSessionManager(
+            self.bot, idle_timeout=self.settings.voice_idle_disconnect_seconds
+        )
+        # Replayed URL clips are played from a pre-transcoded Opus copy when available
+        self.opus_cache: OpusClipCache | None = None
+        if self.settings.voice_opus_cache_enabled:
+            self.opus_cache = OpusClipCache(
+                self.settings.voice_opus_cache_path,
+                bitrate_kbps=self.settings.voice_opus_bitrate_kbps,
+            )
+        # Peer callback servers receive voice jobs for guilds on other processes' shards
+        self.broadcast_peers: VoiceBroadcastHttpClient | None = None
+        if self.shard_router.partitioned:
+            self.broadcast_peers = VoiceBroadcastHttpClient(
+                request_timeout=30.0, router=self.shard_router
+            )
         # Optional: voice broadcast service (single-lane per guild)
         self.voice_broadcast: VoiceBroadcastService | None = None
         if self.settings.feature_voice_enabled:
             try:
-                self.voice_broadcast = VoiceBroadcastService(self)
+                self.voice_broadcast = VoiceBroadcastService(
+                    self,
+                    router=self.shard_router,
+                    forward=self.broadcast_peers.post if self.broadcast_peers else None,
+                )
                 logger.info("VoiceBroadcastService initialized")
             except Exception:
                 logger.exception("Failed to initialize VoiceBroadcastService")
@@ -222,8 +303,10 @@ class DiscordAdapter:
                 choices: list[app_commands.Choice[str]] = []
 
                 try:
-                    # Fetch user's bound accounts
-                    accounts = await self.db.list_user_accounts(user_id)
+                    # Bound accounts from the in-process cache (no DB query per keystroke)
+                    accounts = await self.account_choices.accounts(user_id)
+                    if accounts is None:
+                        raise TimeoutError("account list not loaded yet")
 
                     for idx, account in enumerate(accounts, start=1):
                         # Format display name
@@ -246,6 +329,12 @@ class DiscordAdapter:
 
                         choices.append(app_commands.Choice(name=display, value=value))
 
+                    # Riot IDs this user analysed recently via Name#TAG
+                    for riot_id in self.account_choices.recent_riot_ids(user_id):
+                        choices.append(
+                            app_commands.Choice(name=f"🕘 最近查询 - {riot_id}", value=riot_id)
+                        )
+
                     # Add hint for RiotID input
                     if len(choices) < 25:  # Discord limit is 25 choices
                         choices.append(
@@ -740,6 +829,25 @@ class DiscordAdapter:
 
         logger.info(f"Account management UI shown to user {user_id} ({len(accounts)} accounts)")
 
+    async def _send_rendered_analysis(
+        self, interaction: discord.Interaction, match_id: str
+    ) -> bool:
+        """Replay the cached final message for `match_id`; False on miss or send failure."""
+        if self.rendered_messages is None:
+            return False
+        rendered = await self.rendered_messages.get(match_id)
+        if rendered is None:
+            return False
+        if self._webhook_adapter is None:
+            self._webhook_adapter = DiscordWebhookAdapter()
+        try:
+            return await self._webhook_adapter.publish_rendered_message(
+                str(self.bot.application_id), interaction.token, rendered
+            )
+        except Exception as e:
+            logger.warning(f"Failed to send pre-rendered analysis for {match_id}: {e}")
+            return False
+
     async def _handle_analyze_command(
         self, interaction: discord.Interaction, match_index: int, target: str | None = None
     ) -> None:
@@ -753,7 +861,9 @@ class DiscordAdapter:
         - @mention → mentioned user's primary account
         """
         # [STEP 1: DELAYED RESPONSE - IRON LAW]
-        await interaction.response.defer(ephemeral=False)
+        # Sent first, but awaited only before the first followup so the defer
+        # round-trip overlaps identity resolution.
+        defer_task = asyncio.create_task(interaction.response.defer(ephemeral=False))
 
         # Bind correlation id early
         _cid = f"discord:{interaction.id}:{int(time.time() * 1000) % 1000000}"
@@ -767,6 +877,7 @@ class DiscordAdapter:
 
         # [STEP 2: IDENTITY RESOLUTION - 方案C]
         if not self.identity_resolver:
+            await defer_task
             # Fallback: IdentityResolver not initialized (missing riot_api in __init__)
             error_embed = self._create_error_embed(
                 "身份解析服务未初始化，请联系管理员。\n"
@@ -784,14 +895,19 @@ class DiscordAdapter:
                 InvalidInputError,
             )
 
-            identity = await self.identity_resolver.resolve(
-                invoker_discord_id=invoker_discord_id,
-                target=target,
-                guild_id=guild_id,
-            )
+            try:
+                identity = await self.identity_resolver.resolve(
+                    invoker_discord_id=invoker_discord_id,
+                    target=target,
+                    guild_id=guild_id,
+                )
+            finally:
+                await defer_task
 
             puuid = identity.puuid
             region = identity.region
+            if identity.source == "riot_api" and target:
+                self.account_choices.remember_riot_id(invoker_discord_id, target)
 
             logger.info(
                 f"Identity resolved: invoker={invoker_discord_id}, target={target}, "
@@ -824,6 +940,11 @@ class DiscordAdapter:
             await interaction.followup.send(embed=error_embed, epheminal=True)
             return
 
+        if self.match_history_service is None:
+            error_embed = self._create_error_embed("比赛历史服务未初始化，请联系管理员。")
+            await interaction.followup.send(embed=error_embed, ephemeral=True)
+            return
+
         try:
             # [STEP 3: FETCH MATCH HISTORY]
             match_id_list = await self.match_history_service.get_match_id_list(
@@ -843,8 +964,21 @@ class DiscordAdapter:
 
             target_match_id = match_id_list[match_index - 1]
 
-            # [STEP 4: CHECK EXISTING ANALYSIS STATUS]
-            analysis_status = await self.match_history_service.get_analysis_status(target_match_id)
+            # [STEP 4a: PRE-RENDERED CACHE HIT] one Redis GET + one PATCH of the
+            # message the analysis task rendered at completion; no DB query
+            if self.settings.analysis_cache_enabled and await self._send_rendered_analysis(
+                interaction, target_match_id
+            ):
+                logger.info(
+                    f"Returned pre-rendered analysis for {target_match_id} "
+                    f"(match_index={match_index})"
+                )
+                return
+
+            # [STEP 4: CHECK EXISTING ANALYSIS] the analysis record joined with its
+            # match row (one DB query)
+            bundle = await self.match_history_service.get_analysis_bundle(target_match_id)
+            analysis_status, record, match_row = bundle
 
             if analysis_status:
                 status = analysis_status.get("status")
@@ -855,9 +989,12 @@ class DiscordAdapter:
 
                         from src.core.views import render_analysis_embed
 
-                        # Fetch full analysis record and match data from DB
-                        record = await self.db.get_analysis_result(target_match_id)
-                        match_row = await self.db.get_match_data(target_match_id)
+                        # Ports without a joined query only report status
+                        if record is None:
+                            record, match_row = await asyncio.gather(
+                                self.db.get_analysis_result(target_match_id),
+                                self.db.get_match_data(target_match_id),
+                            )
 
                         if not record:
                             raise RuntimeError("cached_record_missing")
@@ -1528,6 +1665,13 @@ class DiscordAdapter:
     async def stop(self) -> None:
         """Stop the Discord bot."""
         logger.info("Stopping Discord bot...")
+        if self._webhook_adapter is not None:
+            await self._webhook_adapter.close()
+        self.voice_sessions.close()
+        if self.opus_cache is not None:
+            self.opus_cache.close()
+        if self.broadcast_peers is not None:
+            await self.broadcast_peers.close()
         await self.bot.close()
 
     async def start_async(self) -> None:
@@ -1695,6 +1839,23 @@ class DiscordAdapter:
 
             audio_url = llm_metadata.get("tts_audio_url")
             personal_summary = _select_personal_tts_summary(llm_metadata)
+            if (
+                audio_url
+                and await local_audio_available(self.artifact_index, audio_url, self.settings)
+                is False
+            ):
+                # Evicted from local storage: synthesize again below
+                logger.info("tts_audio_evicted", extra={"match_id": match_id})
+                audio_url = None
+
+            if not audio_url:
+                # The analysis worker may still be synthesizing it (parallel precompute)
+                audio_url = await await_precomputed_tts(
+                    self.cache_adapter,
+                    self.db,
+                    match_id,
+                    timeout=self.settings.tts_precompute_wait_seconds,
+                )
 
             # 3. If no audio_url, synthesize from narrative
             if not audio_url:
@@ -1956,6 +2117,99 @@ class DiscordAdapter:
         else:
             logger.info("FEEDBACK_API_URL not set; skipping backend POST")
 
+    def build_voice_source(
+        self,
+        *,
+        audio_url: str = "",
+        audio_bytes: bytes | None = None,
+        volume: float = 0.5,
+        normalize: bool = False,
+        max_seconds: int | None = None,
+    ) -> discord.AudioSource:
+        """Spawn the FFmpeg decoder for one clip (URL or in-memory MP3 bytes).
+
+        The process starts decoding immediately, so a queue can build the next
+        clip's source while the current one is still playing. A URL clip already
+        in the Opus cache is streamed as-is (no decode, filters or re-encode).
+        """
+        if audio_bytes is None and self.opus_cache is not None:
+            cached = self.opus_cache.lookup(
+                audio_url, volume=volume, normalize=normalize, max_seconds=max_seconds
+            )
+            if cached is not None:
+                return discord.FFmpegOpusAudio(str(cached), codec="copy")
+
+        ff_opts = "-vn"
+        # Optional audio normalization
+        if normalize:
+            ff_opts = f"{ff_opts} -filter:a loudnorm"
+        # Optional duration cap (seconds)
+        if isinstance(max_seconds, int) and max_seconds > 0:
+            ff_opts = f"{ff_opts} -t {max_seconds}"
+
+        if audio_bytes is not None:
+            import io
+
+            # Pipe the bytes through FFmpeg's stdin to avoid disk I/O
+            source = FFmpegPCMAudio(io.BytesIO(audio_bytes), pipe=True, options=ff_opts)
+        elif (local_path := local_audio_path(audio_url, self.settings)) is not None:
+            # Clip stored on this host: read the file instead of looping through HTTP
+            source = FFmpegPCMAudio(str(local_path), options=ff_opts)
+        else:
+            # Reconnect flags support HTTP streaming resilience
+            source = FFmpegPCMAudio(
+                audio_url,
+                before_options="-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5",
+                options=ff_opts,
+            )
+        return discord.PCMVolumeTransformer(source, volume=volume)
+
+    async def _play_clip(
+        self,
+        *,
+        guild_id: int,
+        voice_channel_id: int,
+        build: Callable[[], discord.AudioSource],
+        source: discord.AudioSource | None,
+    ) -> bool:
+        """Play one clip on the guild's voice session and wait for it to finish.
+
+        ``source`` is a decoder prepared ahead of time (see `build_voice_source`);
+        otherwise ``build`` creates one once the connection is ready. The session
+        stays connected for the idle timeout so the next clip skips the handshake.
+        """
+        try:
+            # Best-effort runtime dependency check for voice
+            try:
+                import discord.opus as _opus
+
+                if not _opus.is_loaded():
+                    logger.warning("Opus not loaded; ensure libopus is installed and discoverable")
+            except Exception:
+                logger.warning("Could not verify libopus; PyNaCl/libopus may be missing")
+
+            guild = self.bot.get_guild(guild_id) or await self.bot.fetch_guild(guild_id)
+            channel = guild.get_channel(voice_channel_id)
+            if channel is None:
+                channel = await self.bot.fetch_channel(voice_channel_id)
+            if not isinstance(channel, discord.VoiceChannel):
+                logger.error("Target channel is not a voice channel")
+                return False
+
+            async with self.voice_sessions.lock(guild.id):
+                try:
+                    vc = await self.voice_sessions.connect(guild, channel)
+                    player, source = source or build(), None
+                    await self.voice_sessions.play(vc, player)
+                finally:
+                    await self.voice_sessions.release(guild.id)
+            return True
+        finally:
+            # A prepared decoder that never reached the player must not linger
+            if source is not None:
+                with contextlib.suppress(Exception):
+                    source.cleanup()
+
     async def play_tts_in_voice_channel(
         self,
         *,
@@ -1965,6 +2219,7 @@ class DiscordAdapter:
         volume: float = 0.5,
         normalize: bool = False,
         max_seconds: int | None = None,
+        source: discord.AudioSource | None = None,
     ) -> bool:
         """Join a voice channel and play a remote MP3/HTTP audio.
 
@@ -1981,6 +2236,10 @@ class DiscordAdapter:
                     "voice_channel_id": voice_channel_id,
                 },
             )
+            # The queue may have prefetched the decoder: stop its FFmpeg process
+            if source is not None:
+                with contextlib.suppress(Exception):
+                    source.cleanup()
             return False
         voice_channel_id = normalized_channel_id
 
@@ -2001,60 +2260,18 @@ class DiscordAdapter:
                 logger.info(f"✅ TTS URL validation passed: {audio_url[:100]}...")
 
             playback_start = asyncio.get_running_loop().time()
-            # Best-effort runtime dependency check for voice
-            try:
-                import discord.opus as _opus
-
-                if not _opus.is_loaded():
-                    logger.warning("Opus not loaded; ensure libopus is installed and discoverable")
-            except Exception:
-                logger.warning("Could not verify libopus; PyNaCl/libopus may be missing")
-            guild = self.bot.get_guild(guild_id)
-            if guild is None:
-                guild = await self.bot.fetch_guild(guild_id)
-
-            channel = guild.get_channel(voice_channel_id)
-            if channel is None:
-                channel = await self.bot.fetch_channel(voice_channel_id)
-
-            if not isinstance(channel, discord.VoiceChannel):
-                logger.error("Target channel is not a voice channel")
-                return False
-
-            # Reuse or create voice client
-            vc: discord.VoiceClient | None = cast(
-                discord.VoiceClient | None,
-                discord.utils.get(self.bot.voice_clients, guild=guild),
-            )
-            if vc and vc.is_connected():
-                if vc.channel.id != channel.id:
-                    await vc.move_to(channel)
-            else:
-                vc = await channel.connect()
-
-            # Prepare FFmpeg source (reconnect flags support HTTP streaming resilience)
-            ff_before = "-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5"
-            ff_opts = "-vn"
-            # Optional audio normalization
-            if normalize:
-                ff_opts = f"{ff_opts} -filter:a loudnorm"
-            # Optional duration cap (seconds)
-            if isinstance(max_seconds, int) and max_seconds > 0:
-                ff_opts = f"{ff_opts} -t {max_seconds}"
-
-            source = FFmpegPCMAudio(
-                audio_url,
-                before_options=ff_before,
-                options=ff_opts,
+            ok = await self._play_clip(
+                guild_id=guild_id,
+                voice_channel_id=voice_channel_id,
+                build=lambda: self.build_voice_source(
+                    audio_url=audio_url,
+                    volume=volume,
+                    normalize=normalize,
+                    max_seconds=max_seconds,
+                ),
+                source=source,
             )
-            player = discord.PCMVolumeTransformer(source, volume=volume)
-
-            vc.play(player)
-            while vc.is_playing():
-                await asyncio.sleep(1)
-
-            await vc.disconnect()
-            try:
+            if ok:
                 elapsed = (asyncio.get_running_loop().time() - playback_start) * 1000
                 logger.info(
                     "Voice playback finished guild=%s channel=%s ms=%.0f",
@@ -2062,9 +2279,12 @@ class DiscordAdapter:
                     voice_channel_id,
                     elapsed,
                 )
-            except Exception:
-                pass
-            return True
+                # Transcode once in the background so replays skip FFmpeg decoding
+                if self.opus_cache is not None:
+                    self.opus_cache.schedule(
+                        audio_url, volume=volume, normalize=normalize, max_seconds=max_seconds
+                    )
+            return ok
         except Exception as e:
             logger.error(f"Voice playback error: {e}", exc_info=True)
             return False
@@ -2078,6 +2298,7 @@ class DiscordAdapter:
         volume: float = 0.5,
         normalize: bool = False,
         max_seconds: int | None = None,
+        source: discord.AudioSource | None = None,
     ) -> bool:
         """Join a voice channel and play in-memory MP3 bytes via FFmpeg pipe.
 
@@ -2092,58 +2313,27 @@ class DiscordAdapter:
                     "voice_channel_id": voice_channel_id,
                 },
             )
+            # The queue may have prefetched the decoder: stop its FFmpeg process
+            if source is not None:
+                with contextlib.suppress(Exception):
+                    source.cleanup()
             return False
         voice_channel_id = normalized_channel_id
 
         try:
-            import io
-
             playback_start = asyncio.get_running_loop().time()
-
-            # Opus/lib checks as above (best-effort)
-            try:
-                import discord.opus as _opus
-
-                if not _opus.is_loaded():
-                    logger.warning("Opus not loaded; ensure libopus is installed and discoverable")
-            except Exception:
-                logger.warning("Could not verify libopus; PyNaCl/libopus may be missing")
-
-            guild = self.bot.get_guild(guild_id) or await self.bot.fetch_guild(guild_id)
-            channel = guild.get_channel(voice_channel_id)
-            if channel is None:
-                channel = await self.bot.fetch_channel(voice_channel_id)
-            if not isinstance(channel, discord.VoiceChannel):
-                logger.error("Target channel is not a voice channel")
-                return False
-
-            vc: discord.VoiceClient | None = cast(
-                discord.VoiceClient | None,
-                discord.utils.get(self.bot.voice_clients, guild=guild),
+            ok = await self._play_clip(
+                guild_id=guild_id,
+                voice_channel_id=voice_channel_id,
+                build=lambda: self.build_voice_source(
+                    audio_bytes=audio_bytes,
+                    volume=volume,
+                    normalize=normalize,
+                    max_seconds=max_seconds,
+                ),
+                source=source,
             )
-            if vc and vc.is_connected():
-                if vc.channel.id != channel.id:
-                    await vc.move_to(channel)
-            else:
-                vc = await channel.connect()
-
-            # Prepare BytesIO stream and ffmpeg pipe
-            audio_stream = io.BytesIO(audio_bytes)
-            ff_opts = "-vn"
-            if normalize:
-                ff_opts = f"{ff_opts} -filter:a loudnorm"
-            if isinstance(max_seconds, int) and max_seconds > 0:
-                ff_opts = f"{ff_opts} -t {max_seconds}"
-
-            source = FFmpegPCMAudio(audio_stream, pipe=True, options=ff_opts)
-            player = discord.PCMVolumeTransformer(source, volume=volume)
-            vc.play(player)
-
-            while vc.is_playing():
-                await asyncio.sleep(0.1)
-
-            await vc.disconnect()
-            try:
+            if ok:
                 elapsed = (asyncio.get_running_loop().time() - playback_start) * 1000
                 logger.info(
                     "Voice (bytes) playback finished guild=%s channel=%s ms=%.0f",
@@ -2151,9 +2341,7 @@ class DiscordAdapter:
                     voice_channel_id,
                     elapsed,
                 )
-            except Exception:
-                pass
-            return True
+            return ok
         except Exception as e:
             logger.error(f"Voice bytes playback error: {e}", exc_info=True)
             return False
@@ -0,0 +1,159 @@
+"""Discord REST rate-limit bucket tracking.
+
+Discord assigns every route to a bucket, reported in `X-RateLimit-Bucket`
+together with `X-RateLimit-Remaining` / `X-RateLimit-Reset-After`. Limits apply
+per bucket *and* major parameter (webhook id+token, channel id), so two
+interaction tokens never share a budget. A 429 carries `Retry-After` and, for
+the global limit, `X-RateLimit-Global` (or `"global": true` in the body).
+
+`DiscordRateLimiter` remembers route → bucket and bucket → reset time so the
+next request on an exhausted bucket waits *before* hitting Discord instead of
+collecting another 429. State is time-based (no asyncio primitives), so one
+process-wide instance is safe to share across the per-task event loops used by
+Celery workers.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import urlparse
+
+# Expired buckets are pruned once this many are tracked (one per interaction token)
+_MAX_TRACKED_BUCKETS = 512
+
+
+@dataclass(slots=True)
+class _Bucket:
+    remaining: int | None = None
+    reset_at: float = 0.0
+
+
+def _header(headers: Mapping[str, Any] | Any, name: str) -> str | None:
+    try:
+        value = headers.get(name)
+    except Exception:
+        return None
+    return value if isinstance(value, str) else None
+
+
+def _float(value: Any) -> float | None:
+    if isinstance(value, int | float):
+        return float(value)
+    try:
+        return float(value) if isinstance(value, str) else None
+    except ValueError:
+        return None
+
+
+def route_key(method: str, url: str) -> str:
+    """Rate-limit route for a request: method plus API path (e.g. `PATCH webhooks/...`)."""
+    path = urlparse(url).path
+    marker = "/api/v10/"
+    if marker in path:
+        path = path.split(marker, 1)[1]
+    return f"{method.upper()} {path.strip('/')}"
+
+
+def _major_parameter(route: str) -> str:
+    """`webhooks/{id}/{token}` or `channels/{id}` part of a route."""
+    parts = route.split(" ", 1)[-1].split("/")
+    return "/".join(parts[:3] if parts[0] == "webhooks" else parts[:2])
+
+
+def rate_limit_scope(headers: Mapping[str, Any] | Any, body_global: bool = False) -> str:
+    """Return `global` when a 429 hit the global limit, else `bucket`."""
+    header = (_header(headers, "X-RateLimit-Global") or "").lower() == "true"
+    return "global" if header or body_global else "bucket"
+
+
+def jittered(delay: float, spread: float = 0.25) -> float:
+    """Add up to `spread` (fraction) of random jitter so retries do not align."""
+    return delay + random.uniform(0, max(0.05, delay * spread))
+
+
+class DiscordRateLimiter:
+    """Process-wide view of Discord rate-limit buckets."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._route_buckets: dict[str, str] = {}
+        self._buckets: dict[str, _Bucket] = {}
+        self._global_reset_at = 0.0
+
+    def _key(self, route: str) -> str:
+        bucket_id = self._route_buckets.get(route)
+        return f"{bucket_id}:{_major_parameter(route)}" if bucket_id else route
+
+    def delay_for(self, route: str, now: float | None = None) -> float:
+        """Seconds to wait before sending on `route` (0 when capacity is available)."""
+        now = time.time() if now is None else now
+        with self._lock:
+            delay = max(0.0, self._global_reset_at - now)
+            bucket = self._buckets.get(self._key(route))
+            if bucket is not None and bucket.remaining == 0:
+                delay = max(delay, bucket.reset_at - now)
+            return delay
+
+    def update(
+        self,
+        route: str,
+        status: int,
+        headers: Mapping[str, Any] | Any,
+        body_retry_after: Any = None,
+        body_global: bool = False,
+        now: float | None = None,
+    ) -> float | None:
+        """Record response headers; return the retry delay for a 429, else None."""
+        now = time.time() if now is None else now
+        bucket_id = _header(headers, "X-RateLimit-Bucket")
+        remaining = _float(_header(headers, "X-RateLimit-Remaining"))
+        reset_after = _float(_header(headers, "X-RateLimit-Reset-After"))
+        retry_after = _float(_header(headers, "Retry-After"))
+        if retry_after is None:
+            retry_after = _float(body_retry_after)
+
+        with self._lock:
+            if bucket_id:
+                self._route_buckets[route] = bucket_id
+            if len(self._buckets) >= _MAX_TRACKED_BUCKETS:
+                self._prune(now)
+            bucket = self._buckets.setdefault(self._key(route), _Bucket())
+            if remaining is not None:
+                bucket.remaining = int(remaining)
+            if reset_after is not None:
+                bucket.reset_at = now + reset_after
+
+            if status != 429:
+                return None
+
+            delay = retry_after if retry_after is not None else (reset_after or 1.0)
+            if rate_limit_scope(headers, body_global) == "global":
+                self._global_reset_at = max(self._global_reset_at, now + delay)
+            else:
+                bucket.remaining = 0
+                bucket.reset_at = max(bucket.reset_at, now + delay)
+            return delay
+
+    def _prune(self, now: float) -> None:
+        self._buckets = {k: b for k, b in self._buckets.items() if b.reset_at > now}
+        live = {k.split(":", 1)[0] for k in self._buckets}
+        self._route_buckets = {r: b for r, b in self._route_buckets.items() if b in live}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._route_buckets.clear()
+            self._buckets.clear()
+            self._global_reset_at = 0.0
+
+
+_limiter = DiscordRateLimiter()
+
+
+def get_rate_limiter() -> DiscordRateLimiter:
+    """Return the process-wide limiter shared by all webhook adapters."""
+    return _limiter
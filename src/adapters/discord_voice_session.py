@@ -0,0 +1,130 @@
+"""Per-guild voice sessions for back-to-back TTS playback.
+
+Connecting to a Discord voice channel is a multi-second handshake (gateway
+voice state, voice websocket, UDP discovery). Post-game summaries for several
+teammates tend to arrive together, so instead of connect -> play -> disconnect
+per clip, a guild's connection stays open across clips and is only dropped
+after ``idle_timeout`` seconds without playback.
+
+Playback completion is signalled by the player's ``after=`` callback (run on
+discord.py's audio thread and marshalled back to the loop) rather than by
+polling ``is_playing()``, so the next clip can start as soon as one ends.
+"""
+
+import asyncio
+import contextlib
+import logging
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+
+class VoiceSessionManager:
+    """Reuse one voice connection per guild, with an idle-disconnect timer.
+
+    Callers hold `lock(guild_id)` around `connect` + `play` + `release` so
+    clips in one guild never overlap and an idle disconnect cannot fire in the
+    middle of a clip. An ``idle_timeout`` of 0 disconnects right after each
+    clip.
+    """
+
+    def __init__(self, bot: discord.Client, *, idle_timeout: float) -> None:
+        self._bot = bot
+        self._idle_timeout = max(0.0, float(idle_timeout))
+        self._locks: dict[int, asyncio.Lock] = {}
+        self._idle: dict[int, asyncio.TimerHandle] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def lock(self, guild_id: int) -> asyncio.Lock:
+        lock = self._locks.get(guild_id)
+        if lock is None:
+            lock = self._locks[guild_id] = asyncio.Lock()
+        return lock
+
+    def _voice_client(self, guild_id: int) -> discord.VoiceClient | None:
+        for vc in self._bot.voice_clients:
+            if isinstance(vc, discord.VoiceClient) and vc.guild.id == guild_id:
+                return vc
+        return None
+
+    def _cancel_idle(self, guild_id: int) -> None:
+        handle = self._idle.pop(guild_id, None)
+        if handle is not None:
+            handle.cancel()
+
+    async def connect(
+        self, guild: discord.Guild, channel: discord.VoiceChannel
+    ) -> discord.VoiceClient:
+        """Return the guild's live connection (moved to ``channel``) or open one."""
+        self._cancel_idle(guild.id)
+        vc = self._voice_client(guild.id)
+        if vc is not None and vc.is_connected():
+            if vc.channel.id != channel.id:
+                await vc.move_to(channel)
+            logger.debug("voice_session_reused", extra={"guild_id": guild.id})
+            return vc
+        return await channel.connect()
+
+    async def play(self, vc: discord.VoiceClient, source: discord.AudioSource) -> None:
+        """Play ``source`` and wait until the player reports it finished.
+
+        Raises the player's error, if any, once playback has stopped.
+        """
+        loop = asyncio.get_running_loop()
+        finished = asyncio.Event()
+        errors: list[Exception] = []
+
+        def _after(error: Exception | None) -> None:
+            if error is not None:
+                errors.append(error)
+            loop.call_soon_threadsafe(finished.set)
+
+        try:
+            vc.play(source, after=_after)
+        except Exception:
+            source.cleanup()
+            raise
+        await finished.wait()
+        if errors:
+            raise errors[0]
+
+    async def release(self, guild_id: int) -> None:
+        """Mark the guild idle: disconnect now or after ``idle_timeout`` seconds."""
+        self._cancel_idle(guild_id)
+        if self._idle_timeout <= 0:
+            await self._disconnect(guild_id)
+            return
+        loop = asyncio.get_running_loop()
+        handle: asyncio.TimerHandle | None = None
+
+        def _expire() -> None:
+            task = loop.create_task(self._idle_disconnect(guild_id, handle))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        handle = loop.call_later(self._idle_timeout, _expire)
+        self._idle[guild_id] = handle
+
+    async def _idle_disconnect(self, guild_id: int, handle: asyncio.TimerHandle | None) -> None:
+        async with self.lock(guild_id):
+            # A clip that started meanwhile cancelled (or replaced) this timer
+            if self._idle.get(guild_id) is not handle:
+                return
+            del self._idle[guild_id]
+            await self._disconnect(guild_id)
+            logger.info("voice_session_idle_disconnect", extra={"guild_id": guild_id})
+
+    async def _disconnect(self, guild_id: int) -> None:
+        vc = self._voice_client(guild_id)
+        if vc is not None and vc.is_connected():
+            with contextlib.suppress(Exception):
+                await vc.disconnect()
+
+    def close(self) -> None:
+        """Cancel pending idle timers (the bot disconnects its voice clients on close)."""
+        for handle in self._idle.values():
+            handle.cancel()
+        self._idle.clear()
+        for task in self._tasks:
+            task.cancel()
@@ -9,14 +9,22 @@ Key Features:
 - Structured data contracts (FinalAnalysisReport, AnalysisErrorReport)
 - Error message delivery with user-friendly degradation
 - 15-minute token validity window (Discord limitation)
+- Per-route rate-limit buckets with jittered retries (see discord_rate_limit)
+- Optional delivery queue: with an `enqueue` callable the publish methods hand a
+  rendered WebhookDeliveryPayload to the `webhooks` Celery queue and return
 
 Reference:
 https://discord.com/developers/docs/interactions/receiving-and-responding#edit-original-interaction-response
 """
 
 import asyncio
+import functools
+import hashlib
 import json
 import logging
+import os
+import time
+from collections.abc import Callable
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
@@ -26,8 +34,17 @@ from urllib.parse import urlparse
 
 import aiohttp
 
+from src.adapters.discord_rate_limit import (
+    get_rate_limiter,
+    jittered,
+    rate_limit_scope,
+    route_key,
+)
 from src.config.settings import get_settings
+from src.config.settings import settings as runtime_settings
 from src.contracts.analysis_results import AnalysisErrorReport, FinalAnalysisReport
+from src.contracts.tasks import RenderedDiscordMessage, WebhookDeliveryPayload
+from src.core.metrics import mark_discord_rate_limited, observe_discord_delivery
 from src.core.ports import DiscordWebhookPort
 from src.core.views.voice_button_helper import build_voice_custom_id
 
@@ -42,6 +59,55 @@ class DiscordWebhookError(Exception):
         self.status_code = status_code
 
 
+class DiscordRetryableError(DiscordWebhookError):
+    """Discord asked us to back off (429/5xx) for longer than the caller will block.
+
+    Queued deliveries catch this and reschedule themselves after `retry_after`.
+    """
+
+    def __init__(self, retry_after: float, status_code: int, scope: str = "bucket") -> None:
+        super().__init__(
+            f"Discord API busy ({status_code}, {scope}); retry after {retry_after:.2f}s",
+            status_code=status_code,
+        )
+        self.retry_after = retry_after
+        self.scope = scope
+
+
+@functools.cache
+def _renderer_source_digest() -> str:
+    from src.core.views import analysis_view
+
+    digest = hashlib.sha256()
+    for source in (analysis_view.__file__, __file__):
+        if source:
+            digest.update(Path(source).read_bytes())
+    return digest.hexdigest()
+
+
+def rendered_message_version(settings: Any | None = None) -> str:
+    """Fingerprint of everything that shapes a rendered analysis message.
+
+    Hashes the embed view and this adapter's payload assembly plus the settings
+    that toggle components/attachments, so cached messages from an older view
+    are treated as misses without a manual version bump.
+    """
+    settings = settings or get_settings()
+    flags = (
+        f"{settings.feature_feedback_enabled}:{settings.feature_voice_enabled}:"
+        f"{settings.build_visual_base_url}"
+    )
+    return hashlib.sha256(f"{_renderer_source_digest()}:{flags}".encode()).hexdigest()[:16]
+
+
+def _json_body(text: str) -> dict[str, Any]:
+    try:
+        body = json.loads(text) if text else {}
+    except ValueError:
+        return {}
+    return body if isinstance(body, dict) else {}
+
+
 class DiscordWebhookAdapter(DiscordWebhookPort):
     """Discord webhook adapter for async interaction followup.
 
@@ -57,11 +123,19 @@ class DiscordWebhookAdapter(DiscordWebhookPort):
 
     WEBHOOK_BASE_URL = "https://discord.com/api/v10"
     REQUEST_TIMEOUT = 10  # seconds
+    FALLBACK_MAX_WAIT_SECONDS = 30.0  # channel posts are not bound to the interaction window
+
+    def __init__(self, enqueue: Callable[[WebhookDeliveryPayload], bool] | None = None) -> None:
+        """Initialize Discord webhook adapter.
 
-    def __init__(self) -> None:
-        """Initialize Discord webhook adapter."""
+        Args:
+            enqueue: Optional delivery-queue hook. When set, interaction PATCHes are
+                rendered here and handed to it instead of being sent inline; a False
+                return (broker unavailable) falls back to inline delivery.
+        """
         self._session: aiohttp.ClientSession | None = None
         self._session_loop: asyncio.AbstractEventLoop | None = None
+        self._enqueue = enqueue
         logger.info("Discord webhook adapter initialized")
 
     async def _ensure_session(self) -> aiohttp.ClientSession:
@@ -105,30 +179,42 @@ class DiscordWebhookAdapter(DiscordWebhookPort):
 
     def _select_local_visual(self, visuals: list[dict[str, Any]]) -> tuple[str, bytes] | None:
         """Pick the first build visual that has an existing local PNG on disk."""
+        path_obj = self._select_local_visual_path(visuals)
+        return self._read_visual(path_obj) if path_obj else None
+
+    @staticmethod
+    def _select_local_visual_path(visuals: list[dict[str, Any]]) -> Path | None:
         for visual in visuals or []:
             local_path = visual.get("local_path")
-            if not local_path:
-                continue
-            path_obj = Path(local_path)
-            if not path_obj.exists():
-                continue
-            try:
-                return path_obj.name, path_obj.read_bytes()
-            except Exception as exc:
-                logger.warning(
-                    "build_visual_read_failed",
-                    extra={"path": str(path_obj), "error": str(exc)},
-                )
+            if local_path and Path(local_path).exists():
+                return Path(local_path)
         return None
 
-    def _patch_with_optional_attachments(
+    @staticmethod
+    def _read_visual(path_obj: Path) -> tuple[str, bytes] | None:
+        if not path_obj.exists():
+            return None
+        try:
+            return path_obj.name, path_obj.read_bytes()
+        except Exception as exc:
+            logger.warning(
+                "build_visual_read_failed",
+                extra={"path": str(path_obj), "error": str(exc)},
+            )
+        return None
+
+    def _request_with_optional_attachments(
         self,
         session: aiohttp.ClientSession,
+        method: str,
         url: str,
         payload: dict[str, Any],
         attachments: list[tuple[str, bytes]] | None = None,
+        headers: dict[str, str] | None = None,
     ):
-        """Send PATCH request, auto切换 multipart/form-data 以附带本地图片。"""
+        """Send request, auto切换 multipart/form-data 以附带本地图片。"""
+        send = getattr(session, method.lower())
+        kwargs: dict[str, Any] = {"headers": headers} if headers else {}
         if attachments:
             form = aiohttp.FormData()
             form.add_field("payload_json", json.dumps(payload), content_type="application/json")
@@ -139,8 +225,85 @@ class DiscordWebhookAdapter(DiscordWebhookPort):
                     filename=filename,
                     content_type="image/png",
                 )
-            return session.patch(url, data=form)
-        return session.patch(url, json=payload)
+            return send(url, data=form, **kwargs)
+        return send(url, json=payload, **kwargs)
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        payload: dict[str, Any],
+        *,
+        attachments: list[tuple[str, bytes]] | None = None,
+        headers: dict[str, str] | None = None,
+        deadline: float | None = None,
+        max_wait: float | None = None,
+    ) -> tuple[int, str]:
+        """Send one Discord request against its rate-limit bucket.
+
+        Waits out exhausted buckets and retries 429/5xx with jitter, up to
+        `discord_webhook_max_attempts` and the interaction `deadline`. When the
+        accumulated wait would exceed `max_wait` seconds, raises
+        DiscordRetryableError so queued deliveries reschedule instead of holding
+        a worker slot. Returns (status, body); the body is only read on non-2xx.
+        """
+        limiter = get_rate_limiter()
+        route = route_key(method, url)
+        if max_wait is None:
+            max_wait = runtime_settings.discord_webhook_inline_wait_seconds
+        attempts = max(1, runtime_settings.discord_webhook_max_attempts)
+        waited = 0.0
+        status, text = 0, ""
+
+        for attempt in range(attempts):
+            delay = limiter.delay_for(route)
+            if delay > 0:
+                if waited + delay > max_wait:
+                    raise DiscordRetryableError(delay, status_code=429)
+                await asyncio.sleep(jittered(delay))
+                waited += delay
+
+            session = await self._ensure_session()
+            response_ctx = self._request_with_optional_attachments(
+                session, method, url, payload, attachments, headers
+            )
+            async with response_ctx as response:
+                status = response.status
+                text = "" if 200 <= status < 300 else await response.text()
+                response_headers = getattr(response, "headers", None)
+            body = _json_body(text) if status == 429 else {}
+            retry_after = limiter.update(
+                route,
+                status,
+                response_headers,
+                body_retry_after=body.get("retry_after"),
+                body_global=body.get("global") is True,
+            )
+
+            if status == 429:
+                scope = rate_limit_scope(response_headers, body.get("global") is True)
+                mark_discord_rate_limited(scope)
+                delay = retry_after or 1.0
+            elif status >= 500:
+                scope = "server"
+                delay = 0.5 * 2**attempt
+            else:
+                return status, text
+
+            if attempt + 1 >= attempts:
+                break
+            if deadline is not None and time.time() + delay >= deadline:
+                break
+            if waited + delay > max_wait:
+                raise DiscordRetryableError(delay, status_code=status, scope=scope)
+            logger.info(
+                "discord_request_retry",
+                extra={"route": route.split(" ")[0], "status": status, "delay": delay},
+            )
+            await asyncio.sleep(jittered(delay))
+            waited += delay
+
+        return status, text
 
     async def publish_channel_message(
         self, channel_id: str, embed_dict: dict[str, Any], content: str | None = None
@@ -156,13 +319,17 @@ class DiscordWebhookAdapter(DiscordWebhookPort):
         }
         if content:
             payload["content"] = content
-        session = await self._ensure_session()
         headers = {"Authorization": f"Bot {settings.discord_bot_token}"}
-        async with session.post(url, json=payload, headers=headers) as response:
-            return response.status == 200
+        status, _ = await self._send("POST", url, payload, headers=headers)
+        return status == 200
 
     async def _post_channel_message(
-        self, channel_id: str, embed_dict: dict[str, Any], content: str | None = None
+        self,
+        channel_id: str,
+        embed_dict: dict[str, Any],
+        content: str | None = None,
+        *,
+        max_wait: float | None = None,
     ) -> bool:
         """Post message to channel using bot token."""
         settings = get_settings()
@@ -177,10 +344,306 @@ class DiscordWebhookAdapter(DiscordWebhookPort):
         if content:
             payload["content"] = content
 
-        session = await self._ensure_session()
         headers = {"Authorization": f"Bot {settings.discord_bot_token}"}
-        async with session.post(url, json=payload, headers=headers) as response:
-            return response.status == 200
+        status, _ = await self._send("POST", url, payload, headers=headers, max_wait=max_wait)
+        return status == 200
+
+    async def _deliver_or_enqueue(
+        self,
+        delivery: WebhookDeliveryPayload,
+        attachments: list[tuple[str, bytes]] | None = None,
+    ) -> tuple[int, str] | None:
+        """Hand the rendered PATCH to the delivery queue, or send it inline.
+
+        Returns None when the delivery was enqueued, else the inline (status, body).
+        """
+        if self._enqueue is not None:
+            try:
+                if self._enqueue(delivery):
+                    return None
+            except Exception as exc:
+                logger.warning("discord_webhook_enqueue_failed", extra={"error": str(exc)})
+
+        if attachments is None:
+            attachments = self._load_attachments(delivery.attachment_paths)
+        # Nothing will reschedule an inline send: wait out Retry-After up to the deadline
+        status, text = await self._send(
+            "PATCH",
+            self._build_webhook_url(delivery.application_id, delivery.interaction_token),
+            delivery.payload,
+            attachments=attachments or None,
+            deadline=delivery.deadline,
+            max_wait=max(0.0, delivery.deadline - time.time()),
+        )
+        outcome = "delivered" if status == 200 else "failed"
+        observe_discord_delivery(delivery.kind, outcome, time.time() - delivery.enqueued_at)
+        return status, text
+
+    def _load_attachments(self, paths: list[str]) -> list[tuple[str, bytes]]:
+        return [loaded for p in paths if (loaded := self._read_visual(Path(p)))]
+
+    def _new_delivery(
+        self,
+        kind: str,
+        application_id: str,
+        interaction_token: str,
+        payload: dict[str, Any],
+        *,
+        attachment_paths: list[str] | None = None,
+        channel_id: str | None = None,
+        fallback_content: str | None = None,
+        match_id: str | None = None,
+    ) -> WebhookDeliveryPayload:
+        now = time.time()
+        return WebhookDeliveryPayload(
+            kind=kind,  # type: ignore[arg-type]
+            application_id=application_id,
+            interaction_token=interaction_token,
+            payload=payload,
+            attachment_paths=attachment_paths or [],
+            channel_id=channel_id,
+            fallback_content=fallback_content,
+            match_id=match_id,
+            enqueued_at=now,
+            deadline=now + runtime_settings.discord_interaction_window_seconds,
+        )
+
+    async def deliver_prepared(
+        self, delivery: WebhookDeliveryPayload, max_wait: float | None = None
+    ) -> bool:
+        """Send a queued delivery (used by the `webhooks` Celery task).
+
+        Falls back to a bot-token channel message when the interaction token is
+        rejected (400/403/404). Raises DiscordRetryableError when Discord asks
+        for a longer back-off than `max_wait`, so the task can reschedule.
+        """
+        if time.time() >= delivery.deadline:
+            return await self.deliver_fallback(delivery)
+
+        url = self._build_webhook_url(delivery.application_id, delivery.interaction_token)
+        attachments = self._load_attachments(delivery.attachment_paths)
+        status, text = await self._send(
+            "PATCH",
+            url,
+            delivery.payload,
+            attachments=attachments or None,
+            deadline=delivery.deadline,
+            max_wait=max_wait,
+        )
+        outcome = "delivered" if status == 200 else "failed"
+        if status in (404, 403, 400) and await self._post_fallback(delivery):
+            outcome = "fallback"
+        observe_discord_delivery(delivery.kind, outcome, time.time() - delivery.enqueued_at)
+        if outcome == "failed":
+            logger.error(
+                "discord_delivery_failed",
+                extra={
+                    "kind": delivery.kind,
+                    "match_id": delivery.match_id,
+                    "status": status,
+                    "body": text[:200],
+                    "token": self._mask_token(delivery.interaction_token),
+                },
+            )
+        return outcome != "failed"
+
+    async def deliver_fallback(self, delivery: WebhookDeliveryPayload) -> bool:
+        """Deliver past the interaction deadline: post the embed to the channel instead.
+
+        Records "fallback" when the bot-token channel post succeeds, else "expired".
+        """
+        outcome = "fallback" if await self._post_fallback(delivery) else "expired"
+        observe_discord_delivery(delivery.kind, outcome, time.time() - delivery.enqueued_at)
+        if outcome == "expired":
+            logger.warning(
+                "discord_delivery_expired",
+                extra={"kind": delivery.kind, "match_id": delivery.match_id},
+            )
+        return outcome == "fallback"
+
+    async def _post_fallback(self, delivery: WebhookDeliveryPayload) -> bool:
+        embeds = delivery.payload.get("embeds")
+        if not delivery.channel_id or not embeds:
+            return False
+        try:
+            return await self._post_channel_message(
+                str(delivery.channel_id),
+                embeds[0],
+                delivery.fallback_content,
+                max_wait=self.FALLBACK_MAX_WAIT_SECONDS,
+            )
+        except DiscordRetryableError as exc:
+            logger.warning(
+                "discord_fallback_rate_limited",
+                extra={"kind": delivery.kind, "retry_after": exc.retry_after},
+            )
+            return False
+
+    def render_match_analysis(self, analysis_report: FinalAnalysisReport) -> RenderedDiscordMessage:
+        """Render the final interaction message (embed, components, attachments).
+
+        Split from publishing so the same payload can be cached and re-sent
+        verbatim on analysis-cache hits.
+        """
+        # [CRITICAL: View-Layer Decoupling]
+        # Delegate to CLI 1's view renderer for consistent UX
+        # [DEV MODE: Pre-flight validation]
+        # Validate data contract before rendering
+        from src.core.views.analysis_view import render_analysis_embed
+
+        if os.getenv("CHIMERA_DEV_VALIDATE_DISCORD", "").lower() in ("1", "true", "yes"):
+            from src.core.validation import validate_analysis_data
+
+            data_validation = validate_analysis_data(analysis_report.model_dump())
+            if not data_validation.is_valid:
+                logger.error(
+                    f"❌ Analysis data validation failed before rendering:\n{data_validation}"
+                )
+                # In strict dev mode, fail fast
+                if os.getenv("CHIMERA_DEV_STRICT", "").lower() in ("1", "true"):
+                    raise ValueError(f"Invalid analysis data: {data_validation.errors}")
+            if data_validation.warnings:
+                logger.warning(f"⚠️  Data validation warnings:\n{data_validation}")
+
+        embed = render_analysis_embed(analysis_report.model_dump())
+
+        settings = get_settings()
+        visuals = []
+        if analysis_report.builds_metadata:
+            visuals = list(analysis_report.builds_metadata.get("visuals") or [])
+
+        attachment_paths: list[str] = []
+        is_attachment_mode = self._is_attachment_mode(settings.build_visual_base_url)
+        logger.info(
+            "discord_webhook_image_mode",
+            extra={
+                "is_attachment_mode": is_attachment_mode,
+                "build_visual_base_url": settings.build_visual_base_url,
+                "visuals_count": len(visuals),
+            },
+        )
+
+        if is_attachment_mode:
+            visual_path = self._select_local_visual_path(visuals)
+            if visual_path:
+                filename = visual_path.name
+                attachment_paths.append(str(visual_path))
+                logger.info(
+                    "discord_webhook_using_attachment",
+                    extra={
+                        "attachment_filename": filename,
+                        "file_size_bytes": visual_path.stat().st_size,
+                        "attachment_url": f"attachment://{filename}",
+                    },
+                )
+                # Override the HTTP URL set by render_analysis_embed
+                embed.set_image(url=f"attachment://{filename}")
+            else:
+                logger.warning(
+                    "discord_webhook_no_local_visual",
+                    extra={"visuals": visuals},
+                )
+
+        # [DEV MODE: Validate rendered embed]
+        if os.getenv("CHIMERA_DEV_VALIDATE_DISCORD", "").lower() in ("1", "true", "yes"):
+            from src.core.validation import validate_embed_strict
+
+            embed_validation = validate_embed_strict(embed)
+            if not embed_validation.is_valid:
+                logger.error(f"❌ Embed validation failed:\n{embed_validation}")
+                # In strict dev mode, fail fast
+                if os.getenv("CHIMERA_DEV_STRICT", "").lower() in ("1", "true"):
+                    raise ValueError(f"Invalid Discord embed: {embed_validation.errors}")
+            if embed_validation.warnings:
+                logger.warning(f"⚠️  Embed validation warnings:\n{embed_validation}")
+            logger.info(f"✅ Embed validation passed: {embed_validation.total_chars}/6000 chars")
+
+        # Prepare PATCH payload
+        payload: dict[str, Any] = {
+            "content": None,  # Clear the "thinking..." message
+            "allowed_mentions": {"parse": []},  # Disable @mentions for safety
+        }
+        payload["embeds"] = [embed.to_dict()]
+        payload["components"] = []
+
+        # Optionally attach feedback buttons as message components
+        try:
+            if settings.feature_feedback_enabled:
+                match_id = analysis_report.match_id
+                # Discord component payload (Action Row with buttons)
+                buttons = [
+                    {
+                        "type": 2,  # Button
+                        "style": 3,  # Success (green)
+                        "label": "有用",
+                        "emoji": {"name": "👍"},
+                        "custom_id": f"chimera:fb:up:{match_id}",
+                    },
+                    {
+                        "type": 2,
+                        "style": 4,  # Danger (red)
+                        "label": "无用",
+                        "emoji": {"name": "👎"},
+                        "custom_id": f"chimera:fb:down:{match_id}",
+                    },
+                    {
+                        "type": 2,
+                        "style": 1,  # Primary (blurple)
+                        "label": "收藏",
+                        "emoji": {"name": "⭐"},
+                        "custom_id": f"chimera:fb:star:{match_id}",
+                    },
+                ]
+
+                # Add voice play button if voice feature enabled
+                if settings.feature_voice_enabled:
+                    buttons.append(
+                        {
+                            "type": 2,  # Button
+                            "style": 1,  # Primary (blurple)
+                            "label": "播报到我所在频道",
+                            "emoji": {"name": "🔊"},
+                            "custom_id": build_voice_custom_id(match_id),
+                        }
+                    )
+
+                payload["components"] = [
+                    {
+                        "type": 1,  # Action Row
+                        "components": buttons[:5],  # Discord limit: max 5 buttons per row
+                    }
+                ]
+        except Exception as e:
+            # Components are optional; never fail webhook due to UI attachment
+            logger.warning(f"Failed to attach feedback components: {e}")
+
+        return RenderedDiscordMessage(
+            payload=payload,
+            attachment_paths=attachment_paths,
+            render_version=rendered_message_version(settings),
+            match_id=analysis_report.match_id,
+        )
+
+    async def publish_rendered_message(
+        self,
+        application_id: str,
+        interaction_token: str,
+        rendered: RenderedDiscordMessage,
+    ) -> bool:
+        """PATCH a previously rendered message as-is (analysis-cache hit path)."""
+        attachments = self._load_attachments(rendered.attachment_paths)
+        status, text = await self._send(
+            "PATCH",
+            self._build_webhook_url(application_id, interaction_token),
+            rendered.payload,
+            attachments=attachments or None,
+        )
+        if status != 200:
+            logger.warning(
+                "discord_rendered_message_failed",
+                extra={"match_id": rendered.match_id, "status": status, "body": text[:200]},
+            )
+        return status == 200
 
     async def publish_match_analysis(
         self,
@@ -188,6 +651,7 @@ class DiscordWebhookAdapter(DiscordWebhookPort):
         interaction_token: str,
         analysis_report: FinalAnalysisReport,
         channel_id: str | None = None,
+        rendered: RenderedDiscordMessage | None = None,
     ) -> bool:
         """Publish match analysis results to Discord via webhook.
 
@@ -199,6 +663,7 @@ class DiscordWebhookAdapter(DiscordWebhookPort):
             interaction_token: Interaction token (15min validity)
             analysis_report: Structured FinalAnalysisReport Pydantic object
             channel_id: Optional channel ID for fallback delivery
+            rendered: Message already produced by render_match_analysis()
 
         Returns:
             True if webhook delivery succeeded
@@ -207,144 +672,9 @@ class DiscordWebhookAdapter(DiscordWebhookPort):
             DiscordWebhookError: If webhook delivery fails or token expired
         """
         try:
-            # Build webhook URL
-            url = self._build_webhook_url(application_id, interaction_token)
-
-            # [CRITICAL: View-Layer Decoupling]
-            # Delegate to CLI 1's view renderer for consistent UX
-            # [DEV MODE: Pre-flight validation]
-            # Validate data contract before rendering
-            import os
-
-            from src.core.views.analysis_view import render_analysis_embed
-
-            if os.getenv("CHIMERA_DEV_VALIDATE_DISCORD", "").lower() in ("1", "true", "yes"):
-                from src.core.validation import validate_analysis_data
-
-                data_validation = validate_analysis_data(analysis_report.model_dump())
-                if not data_validation.is_valid:
-                    logger.error(
-                        f"❌ Analysis data validation failed before rendering:\n{data_validation}"
-                    )
-                    # In strict dev mode, fail fast
-                    if os.getenv("CHIMERA_DEV_STRICT", "").lower() in ("1", "true"):
-                        raise ValueError(f"Invalid analysis data: {data_validation.errors}")
-                if data_validation.warnings:
-                    logger.warning(f"⚠️  Data validation warnings:\n{data_validation}")
-
-            embed = render_analysis_embed(analysis_report.model_dump())
-
-            settings = get_settings()
-            visuals = []
-            if analysis_report.builds_metadata:
-                visuals = list(analysis_report.builds_metadata.get("visuals") or [])
-
-            attachments: list[tuple[str, bytes]] = []
-            is_attachment_mode = self._is_attachment_mode(settings.build_visual_base_url)
-            logger.info(
-                "discord_webhook_image_mode",
-                extra={
-                    "is_attachment_mode": is_attachment_mode,
-                    "build_visual_base_url": settings.build_visual_base_url,
-                    "visuals_count": len(visuals),
-                },
-            )
-
-            if is_attachment_mode:
-                attachment = self._select_local_visual(visuals)
-                if attachment:
-                    filename, file_bytes = attachment
-                    attachments.append((filename, file_bytes))
-                    logger.info(
-                        "discord_webhook_using_attachment",
-                        extra={
-                            "attachment_filename": filename,
-                            "file_size_bytes": len(file_bytes),
-                            "attachment_url": f"attachment://{filename}",
-                        },
-                    )
-                    # Override the HTTP URL set by render_analysis_embed
-                    embed.set_image(url=f"attachment://{filename}")
-                else:
-                    logger.warning(
-                        "discord_webhook_no_local_visual",
-                        extra={"visuals": visuals},
-                    )
-
-            # [DEV MODE: Validate rendered embed]
-            if os.getenv("CHIMERA_DEV_VALIDATE_DISCORD", "").lower() in ("1", "true", "yes"):
-                from src.core.validation import validate_embed_strict
-
-                embed_validation = validate_embed_strict(embed)
-                if not embed_validation.is_valid:
-                    logger.error(f"❌ Embed validation failed:\n{embed_validation}")
-                    # In strict dev mode, fail fast
-                    if os.getenv("CHIMERA_DEV_STRICT", "").lower() in ("1", "true"):
-                        raise ValueError(f"Invalid Discord embed: {embed_validation.errors}")
-                if embed_validation.warnings:
-                    logger.warning(f"⚠️  Embed validation warnings:\n{embed_validation}")
-                logger.info(
-                    f"✅ Embed validation passed: {embed_validation.total_chars}/6000 chars"
-                )
-
-            # Prepare PATCH payload
-            payload: dict[str, Any] = {
-                "content": None,  # Clear the "thinking..." message
-                "allowed_mentions": {"parse": []},  # Disable @mentions for safety
-            }
-            payload["embeds"] = [embed.to_dict()]
-            payload["components"] = []
-
-            # Optionally attach feedback buttons as message components
-            try:
-                if settings.feature_feedback_enabled:
-                    match_id = analysis_report.match_id
-                    # Discord component payload (Action Row with buttons)
-                    buttons = [
-                        {
-                            "type": 2,  # Button
-                            "style": 3,  # Success (green)
-                            "label": "有用",
-                            "emoji": {"name": "👍"},
-                            "custom_id": f"chimera:fb:up:{match_id}",
-                        },
-                        {
-                            "type": 2,
-                            "style": 4,  # Danger (red)
-                            "label": "无用",
-                            "emoji": {"name": "👎"},
-                            "custom_id": f"chimera:fb:down:{match_id}",
-                        },
-                        {
-                            "type": 2,
-                            "style": 1,  # Primary (blurple)
-                            "label": "收藏",
-                            "emoji": {"name": "⭐"},
-                            "custom_id": f"chimera:fb:star:{match_id}",
-                        },
-                    ]
-
-                    # Add voice play button if voice feature enabled
-                    if settings.feature_voice_enabled:
-                        buttons.append(
-                            {
-                                "type": 2,  # Button
-                                "style": 1,  # Primary (blurple)
-                                "label": "播报到我所在频道",
-                                "emoji": {"name": "🔊"},
-                                "custom_id": build_voice_custom_id(match_id),
-                            }
-                        )
-
-                    payload["components"] = [
-                        {
-                            "type": 1,  # Action Row
-                            "components": buttons[:5],  # Discord limit: max 5 buttons per row
-                        }
-                    ]
-            except Exception as e:
-                # Components are optional; never fail webhook due to UI attachment
-                logger.warning(f"Failed to attach feedback components: {e}")
+            if rendered is None:
+                rendered = self.render_match_analysis(analysis_report)
+            payload = rendered.payload
 
             # [DEV MODE: Validate complete payload before sending]
             if os.getenv("CHIMERA_DEV_VALIDATE_DISCORD", "").lower() in ("1", "true", "yes"):
@@ -366,53 +696,65 @@ class DiscordWebhookAdapter(DiscordWebhookPort):
                     f"{payload_validation.total_chars} chars total"
                 )
 
-            # Send PATCH request
-            session = await self._ensure_session()
-            response_ctx = self._patch_with_optional_attachments(
-                session, url, payload, attachments or None
+            # Send PATCH request (or hand it to the delivery queue)
+            fallback_content = "原交互响应已过期，这是分析结果的备用发送："
+            delivery = self._new_delivery(
+                "match_analysis",
+                application_id,
+                interaction_token,
+                payload,
+                attachment_paths=rendered.attachment_paths,
+                channel_id=channel_id,
+                fallback_content=fallback_content,
+                match_id=analysis_report.match_id,
             )
-            async with response_ctx as response:
-                if response.status == 200:
-                    logger.info(
-                        f"Successfully published analysis for match {analysis_report.match_id} "
-                        f"via webhook (token: {self._mask_token(interaction_token)})"
+            result = await self._deliver_or_enqueue(delivery)
+            if result is None:
+                logger.info(
+                    f"Queued analysis delivery for match {analysis_report.match_id} "
+                    f"(token: {self._mask_token(interaction_token)})"
+                )
+                return True
+            status, error_text = result
+            if status == 200:
+                logger.info(
+                    f"Successfully published analysis for match {analysis_report.match_id} "
+                    f"via webhook (token: {self._mask_token(interaction_token)})"
+                )
+                return True
+            elif status in (404, 403, 400) and channel_id:
+                # Try fallback to channel message
+                settings = get_settings()
+                if settings.discord_bot_token:
+                    success = await self._post_channel_message(
+                        channel_id, payload["embeds"][0], fallback_content
                     )
-                    return True
-                elif response.status in (404, 403, 400) and channel_id:
-                    # Try fallback to channel message
-                    settings = get_settings()
-                    if settings.discord_bot_token:
-                        content = "原交互响应已过期，这是分析结果的备用发送："
-                        success = await self._post_channel_message(
-                            channel_id, embed.to_dict(), content
-                        )
-                        if success:
-                            logger.info(
-                                f"Successfully published analysis via fallback channel message "
-                                f"for match {analysis_report.match_id}"
-                            )
-                            return True
-                        else:
-                            logger.warning(
-                                f"Failed to publish analysis via fallback for match {analysis_report.match_id}"
-                            )
-                    # Fall through to raise error if no fallback or fallback failed
-                    if response.status == 404:
-                        raise DiscordWebhookError(
-                            "Interaction token expired or invalid (15min window)",
-                            status_code=404,
+                    if success:
+                        logger.info(
+                            f"Successfully published analysis via fallback channel message "
+                            f"for match {analysis_report.match_id}"
                         )
+                        return True
                     else:
-                        raise DiscordWebhookError(
-                            f"Discord API error: {response.status}",
-                            status_code=response.status,
+                        logger.warning(
+                            f"Failed to publish analysis via fallback for match {analysis_report.match_id}"
                         )
+                # Fall through to raise error if no fallback or fallback failed
+                if status == 404:
+                    raise DiscordWebhookError(
+                        "Interaction token expired or invalid (15min window)",
+                        status_code=404,
+                    )
                 else:
-                    error_text = await response.text()
                     raise DiscordWebhookError(
-                        f"Discord API error: {response.status} - {error_text}",
-                        status_code=response.status,
+                        f"Discord API error: {status}",
+                        status_code=status,
                     )
+            else:
+                raise DiscordWebhookError(
+                    f"Discord API error: {status} - {error_text}",
+                    status_code=status,
+                )
 
         except DiscordWebhookError:
             raise
@@ -430,20 +772,22 @@ class DiscordWebhookAdapter(DiscordWebhookPort):
     ) -> bool:
         """Publish team overview作为主 webhook 消息（仅单页嵌入）。"""
         try:
-            url = self._build_webhook_url(application_id, interaction_token)
             from src.core.views.team_analysis_view import render_team_overview_embed
 
             embed = render_team_overview_embed(team_report)
 
             settings = get_settings()
             attachments: list[tuple[str, bytes]] = []
+            attachment_paths: list[str] = []
             metadata = getattr(team_report, "builds_metadata", None)
             visuals = list(metadata.get("visuals") or []) if isinstance(metadata, dict) else []
             if self._is_attachment_mode(settings.build_visual_base_url):
-                attachment = self._select_local_visual(visuals)
+                visual_path = self._select_local_visual_path(visuals)
+                attachment = self._read_visual(visual_path) if visual_path else None
                 if attachment:
                     filename, file_bytes = attachment
                     attachments.append((filename, file_bytes))
+                    attachment_paths.append(str(visual_path))
                     embed.set_image(url=f"attachment://{filename}")
 
             payload: dict[str, Any] = {
@@ -469,32 +813,40 @@ class DiscordWebhookAdapter(DiscordWebhookPort):
             except Exception as _e:
                 logger.warning(f"Failed to attach voice button: {_e}")
 
-            session = await self._ensure_session()
-            response_ctx = self._patch_with_optional_attachments(
-                session, url, payload, attachments or None
+            fallback_content = "原交互响应已过期，这是团队概览的备用发送："
+            delivery = self._new_delivery(
+                "team_overview",
+                application_id,
+                interaction_token,
+                payload,
+                attachment_paths=attachment_paths,
+                channel_id=channel_id,
+                fallback_content=fallback_content,
+                match_id=team_report.match_id,
             )
-            async with response_ctx as response:
-                if response.status == 200:
-                    logger.info(
-                        f"Successfully published TEAM overview for match {team_report.match_id} "
-                        f"(token: {self._mask_token(interaction_token)})"
-                    )
-                    return True
-                elif response.status in (404, 403, 400) and channel_id:
-                    settings = get_settings()
-                    if settings.discord_bot_token:
-                        content = "原交互响应已过期，这是团队概览的备用发送："
-                        success = await self._post_channel_message(
-                            channel_id, embed.to_dict(), content
-                        )
-                        return bool(success)
-                    return False
-                else:
-                    error_text = await response.text()
-                    raise DiscordWebhookError(
-                        f"Discord API error: {response.status} - {error_text}",
-                        status_code=response.status,
+            result = await self._deliver_or_enqueue(delivery, attachments)
+            if result is None:
+                return True
+            status, error_text = result
+            if status == 200:
+                logger.info(
+                    f"Successfully published TEAM overview for match {team_report.match_id} "
+                    f"(token: {self._mask_token(interaction_token)})"
+                )
+                return True
+            elif status in (404, 403, 400) and channel_id:
+                settings = get_settings()
+                if settings.discord_bot_token:
+                    success = await self._post_channel_message(
+                        channel_id, embed.to_dict(), fallback_content
                     )
+                    return bool(success)
+                return False
+            else:
+                raise DiscordWebhookError(
+                    f"Discord API error: {status} - {error_text}",
+                    status_code=status,
+                )
         except DiscordWebhookError:
             raise
         except Exception as e:
@@ -523,9 +875,6 @@ class DiscordWebhookAdapter(DiscordWebhookPort):
             True if webhook delivery succeeded
         """
         try:
-            # Build webhook URL
-            url = self._build_webhook_url(application_id, interaction_token)
-
             # [CRITICAL: View-Layer Decoupling]
             # Delegate to CLI 1's error renderer
             from src.core.views.analysis_view import render_error_embed
@@ -543,38 +892,48 @@ class DiscordWebhookAdapter(DiscordWebhookPort):
                 "allowed_mentions": {"parse": []},
             }
 
-            # Send PATCH request
-            session = await self._ensure_session()
-            async with session.patch(url, json=payload) as response:
-                if response.status == 200:
-                    logger.info(
-                        f"Successfully sent error notification via webhook "
-                        f"(error_type: {error_report.error_type}, token: {self._mask_token(interaction_token)})"
+            # Send PATCH request (or hand it to the delivery queue)
+            fallback_content = "原交互响应已过期，这是错误通知的备用发送："
+            delivery = self._new_delivery(
+                "error",
+                application_id,
+                interaction_token,
+                payload,
+                channel_id=channel_id,
+                fallback_content=fallback_content,
+                match_id=error_report.match_id,
+            )
+            result = await self._deliver_or_enqueue(delivery, [])
+            if result is None:
+                return True
+            status, error_text = result
+            if status == 200:
+                logger.info(
+                    f"Successfully sent error notification via webhook "
+                    f"(error_type: {error_report.error_type}, token: {self._mask_token(interaction_token)})"
+                )
+                return True
+            elif status in (404, 403, 400) and channel_id:
+                # Try fallback to channel message
+                settings = get_settings()
+                if settings.discord_bot_token:
+                    success = await self._post_channel_message(
+                        channel_id, embed.to_dict(), fallback_content
                     )
-                    return True
-                elif response.status in (404, 403, 400) and channel_id:
-                    # Try fallback to channel message
-                    settings = get_settings()
-                    if settings.discord_bot_token:
-                        content = "原交互响应已过期，这是错误通知的备用发送："
-                        success = await self._post_channel_message(
-                            channel_id, embed.to_dict(), content
+                    if success:
+                        logger.info(
+                            f"Successfully sent error notification via fallback channel message "
+                            f"(error_type: {error_report.error_type})"
                         )
-                        if success:
-                            logger.info(
-                                f"Successfully sent error notification via fallback channel message "
-                                f"(error_type: {error_report.error_type})"
-                            )
-                            return True
-                        else:
-                            logger.warning(
-                                f"Failed to send error notification via fallback "
-                                f"(error_type: {error_report.error_type})"
-                            )
-                # Fall through to existing error handling
-                error_text = await response.text()
-                logger.error(f"Failed to send error webhook: {response.status} - {error_text}")
-                return False
+                        return True
+                    else:
+                        logger.warning(
+                            f"Failed to send error notification via fallback "
+                            f"(error_type: {error_report.error_type})"
+                        )
+            # Fall through to existing error handling
+            logger.error(f"Failed to send error webhook: {status} - {error_text}")
+            return False
 
         except Exception as e:
             logger.error(f"Failed to send error webhook: {e}", exc_info=True)
@@ -17,11 +17,14 @@ Design Principles:
 """
 
 import asyncio
+import contextlib
 import logging
 import time
 from typing import Any
 
 import google.generativeai as genai
+from google.generativeai.generative_models import GenerativeModel
+from google.generativeai.types import GenerationConfigDict
 
 from src.config.settings import settings
 from src.core.metrics import (
@@ -32,11 +35,44 @@ from src.core.metrics import (
     observe_llm_latency,
     observe_llm_latency_by_mode,
 )
+from src.adapters.llm_context_cache import GeminiContextCache, get_gemini_context_cache
 from src.core.ports import LLMPort
+from src.prompts.compiler import CompiledPrompt, compile_prompt, static_prompt
 from src.prompts.system_prompts import DEFAULT_SYSTEM_PROMPT
 
 logger = logging.getLogger(__name__)
 
+# Legacy user message (used when the task did not supply a sanitized llm_context)
+_MATCH_USER_PROMPT = compile_prompt(
+    """Analyze this match performance:
+
+**Match**: {match_id} | **Duration**: {game_length:.1f} min | **Player**: {target_name} ({target_champion})
+
+**Performance Scores (0-100)**
+- Overall: {score_overall:.1f}
+- ⚔️ Combat: {score_combat:.1f}
+- 💰 Economy: {score_economy:.1f}
+- 🎯 Objectives: {score_objective:.1f}
+- 👁️ Vision: {score_vision:.1f}
+- 🤝 Teamwork: {score_teamwork:.1f}
+
+**Key Metrics**
+- KDA: {kda:.1f}
+- Kill Participation: {kill_participation:.1f}%
+- CS/min: {cs_per_min:.1f}
+- Gold Diff: {gold_difference:.0f}
+
+**Strength Tags**: {strengths}
+**Improvement Tags**: {improvements}
+
+**Full Data Context**:
+```json
+{target!j}
+```
+"""
+)
+_PLAYER_SCORE_LINE = compile_prompt("**{name} ({champion})** — Total {total:.1f}/100")
+
 
 class GeminiAPIError(Exception):
     """Custom exception for Gemini API failures.
@@ -70,6 +106,8 @@ class GeminiLLMAdapter(LLMPort):
         self._active_model_name: str | None = None
         self._active_model_index: int = 0
         self._gemini_models_initialized = False
+        # Hash of the last system prompt sent (stable across processes, see src.prompts.compiler)
+        self.last_prompt_prefix_hash: str | None = None
 
         gemini_api_key = getattr(settings, "gemini_api_key", None)
         if gemini_api_key:
@@ -128,23 +166,116 @@ class GeminiLLMAdapter(LLMPort):
 
         self.model = genai.GenerativeModel(
             model_name=model_name,
-            generation_config={
-                "temperature": settings.gemini_temperature,
-                "max_output_tokens": settings.gemini_max_output_tokens,
-            },
+            generation_config=self._generation_config(json_mode=False),
         )
         self.model_json = genai.GenerativeModel(
             model_name=model_name,
-            generation_config={
-                "temperature": settings.gemini_temperature,
-                "max_output_tokens": settings.gemini_max_output_tokens,
-                "response_mime_type": "application/json",
-            },
+            generation_config=self._generation_config(json_mode=True),
         )
         self._active_model_name = model_name
         self._gemini_models_initialized = True
         logger.debug("Gemini model initialized", extra={"model": model_name})
 
+    @staticmethod
+    def _generation_config(*, json_mode: bool) -> GenerationConfigDict:
+        config: GenerationConfigDict = {
+            "temperature": settings.gemini_temperature,
+            "max_output_tokens": settings.gemini_max_output_tokens,
+        }
+        if json_mode:
+            config["response_mime_type"] = "application/json"
+        return config
+
+    def _context_cache(self) -> GeminiContextCache | None:
+        """Process-wide Gemini cached-content registry, or None when disabled."""
+        if getattr(settings, "llm_context_cache_enabled", False) is not True:
+            return None
+        return get_gemini_context_cache(
+            ttl_seconds=settings.llm_context_cache_ttl_seconds,
+            refresh_margin_seconds=settings.llm_context_cache_refresh_margin_seconds,
+        )
+
+    async def _generate_gemini(
+        self, system: CompiledPrompt, prompt: str, *, json_mode: bool
+    ) -> Any:
+        """One Gemini call, naming the cached system prompt when a handle is available."""
+        cache = self._context_cache()
+        model_name = self._active_model_name
+        if cache is not None and model_name and cache.accepts(system):
+            handle = await asyncio.to_thread(cache.acquire, model_name, system)
+            if handle is not None:
+                cached_model = handle.model_for(
+                    "json" if json_mode else "text",
+                    lambda resource: GenerativeModel.from_cached_content(
+                        resource, generation_config=self._generation_config(json_mode=json_mode)
+                    ),
+                )
+                try:
+                    return await asyncio.to_thread(
+                        cached_model.generate_content, [{"role": "user", "parts": [prompt]}]
+                    )
+                except Exception as err:
+                    if "cache" not in str(err).lower():
+                        raise
+                    # Handle deleted or expired provider-side: forget it, send inline
+                    cache.invalidate(model_name, system.prefix_hash)
+                    logger.warning(
+                        "llm_context_cache_handle_rejected",
+                        extra={"model": model_name, "cache_name": handle.name, "reason": str(err)},
+                    )
+
+        model = self.model_json if json_mode else self.model
+        content = [
+            {"role": "system", "parts": [system.source]},
+            {"role": "user", "parts": [prompt]},
+        ]
+        return await asyncio.to_thread(model.generate_content, content)
+
+    def _record_usage(
+        self,
+        model_label: str,
+        game_mode: str | None,
+        *,
+        prompt_tokens: int | None,
+        completion_tokens: int | None,
+        cached_tokens: int | None,
+    ) -> None:
+        """Token and cost metrics; prompt tokens are split into cached and uncached."""
+        prompt_total = int(prompt_tokens or 0)
+        cached = min(int(cached_tokens or 0), prompt_total)
+        counts = {
+            "prompt": prompt_total,
+            "prompt_cached": cached,
+            "prompt_uncached": prompt_total - cached,
+            "completion": int(completion_tokens or 0),
+        }
+        # Default and by-mode helpers feed the same counters: record each request once
+        for token_type, count in counts.items():
+            if not count:
+                continue
+            if game_mode:
+                add_llm_tokens_by_mode(token_type, model_label, game_mode, count)
+            else:
+                add_llm_tokens(token_type, model_label, count)
+        cost = (
+            counts["prompt_uncached"] / 1000.0 * settings.finops_prompt_token_price_usd
+            + cached / 1000.0 * settings.finops_cached_prompt_token_price_usd
+            + counts["completion"] / 1000.0 * settings.finops_completion_token_price_usd
+        )
+        if cost:
+            if game_mode:
+                add_llm_cost_usd_by_mode(model_label, game_mode, cost)
+            else:
+                add_llm_cost_usd(model_label, cost)
+
+    def _openai_cache_hint(self, prefix_hash: str | None) -> dict[str, Any]:
+        if (
+            not prefix_hash
+            or getattr(settings, "openai_prompt_cache_key_enabled", False) is not True
+        ):
+            return {}
+        return {"prompt_cache_key": f"chimera-{prefix_hash}"}
+
     def _maybe_switch_gemini_model(self, error_message: str) -> bool:
         """Attempt to switch to the next Gemini model candidate when available."""
 
@@ -195,6 +326,7 @@ class GeminiLLMAdapter(LLMPort):
         prompt: str,
         system_prompt: str,
         game_mode: str | None,
+        prefix_hash: str | None = None,
     ) -> str:
         """Invoke OpenAI-compatible Chat Completions endpoint via reverse proxy."""
 
@@ -213,6 +345,7 @@ class GeminiLLMAdapter(LLMPort):
             ],
             "temperature": float(getattr(settings, "openai_temperature", 0.7)),
             "max_tokens": int(getattr(settings, "openai_max_tokens", 1024)),
+            **self._openai_cache_hint(prefix_hash),
         }
         base_delay = 1.0
         model_label = self._active_model_name or settings.openai_model or "openai"
@@ -239,29 +372,38 @@ class GeminiLLMAdapter(LLMPort):
                         raise GeminiAPIError("OpenAI-compatible API returned empty content")
 
                     narrative = str(content).strip()
-                    try:
-                        usage = data.get("usage") or {}
-                        in_tok = usage.get("prompt_tokens")
-                        out_tok = usage.get("completion_tokens")
-                        add_llm_tokens(model_label, prompt=in_tok, completion=out_tok)
-                        if game_mode:
-                            add_llm_tokens_by_mode(model_label, game_mode, in_tok, out_tok)
-                        cost = 0.0
-                        if in_tok:
-                            cost += (in_tok / 1000.0) * settings.finops_prompt_token_price_usd
-                        if out_tok:
-                            cost += (out_tok / 1000.0) * settings.finops_completion_token_price_usd
-                        if cost:
-                            add_llm_cost_usd(model_label, cost)
-                            if game_mode:
-                                add_llm_cost_usd_by_mode(model_label, game_mode, cost)
-                    except Exception:
-                        pass
+                    with contextlib.suppress(Exception):
+                        self._record_openai_usage(model_label, game_mode, data)
 
                     return narrative
 
         raise GeminiAPIError("OpenAI-compatible API rate limit retries exhausted")
 
+    def _record_openai_usage(
+        self, model_label: str, game_mode: str | None, data: dict[str, Any]
+    ) -> None:
+        usage = data.get("usage") or {}
+        details = usage.get("prompt_tokens_details") or {}
+        self._record_usage(
+            model_label,
+            game_mode,
+            prompt_tokens=usage.get("prompt_tokens"),
+            completion_tokens=usage.get("completion_tokens"),
+            cached_tokens=details.get("cached_tokens"),
+        )
+
+    def _record_gemini_usage(self, response: Any, game_mode: str | None) -> None:
+        usage = getattr(response, "usage_metadata", None)
+        if not usage or not self._active_model_name:
+            return
+        self._record_usage(
+            self._active_model_name,
+            game_mode,
+            prompt_tokens=getattr(usage, "prompt_token_count", None),
+            completion_tokens=getattr(usage, "candidates_token_count", None),
+            cached_tokens=getattr(usage, "cached_content_token_count", None),
+        )
+
     def _maybe_switch_from_openai(self, error_message: str) -> bool:
         """Switch from reverse-proxy OpenAI provider back to Gemini when possible."""
 
@@ -290,6 +432,8 @@ class GeminiLLMAdapter(LLMPort):
         *,
         prompt: str,
         system_prompt: str,
+        game_mode: str | None = None,
+        prefix_hash: str | None = None,
     ) -> dict[str, Any]:
         """Invoke OpenAI-compatible endpoint with JSON schema response."""
 
@@ -310,6 +454,7 @@ class GeminiLLMAdapter(LLMPort):
             "temperature": float(getattr(settings, "openai_temperature", 0.7)),
             "max_tokens": int(getattr(settings, "openai_max_tokens", 1024)),
             "response_format": {"type": "json_object"},
+            **self._openai_cache_hint(prefix_hash),
         }
 
         async with (
@@ -324,6 +469,10 @@ class GeminiLLMAdapter(LLMPort):
             content = ((data.get("choices") or [{}])[0].get("message") or {}).get("content")
             if not content:
                 raise GeminiAPIError("OpenAI-compatible API returned empty JSON content")
+            with contextlib.suppress(Exception):
+                self._record_openai_usage(
+                    self._active_model_name or settings.openai_model or "openai", game_mode, data
+                )
 
             return _json.loads(content)
 
@@ -382,6 +531,8 @@ class GeminiLLMAdapter(LLMPort):
         try:
             # Format prompt with system instructions + structured data
             prompt = self._format_prompt(system_prompt, match_data)
+            system = static_prompt(system_prompt or DEFAULT_SYSTEM_PROMPT)
+            self.last_prompt_prefix_hash = system.prefix_hash
 
             # Chaos: inject latency or error
             chaos_delay_ms = int(getattr(settings, "chaos_llm_latency_ms", 0) or 0)
@@ -403,18 +554,12 @@ class GeminiLLMAdapter(LLMPort):
                             prompt=prompt,
                             system_prompt=system_prompt,
                             game_mode=game_mode,
+                            prefix_hash=system.prefix_hash,
                         )
                         response = None
                         break
 
-                    content = [
-                        {
-                            "role": "system",
-                            "parts": [system_prompt or DEFAULT_SYSTEM_PROMPT],
-                        },
-                        {"role": "user", "parts": [prompt]},
-                    ]
-                    response = await asyncio.to_thread(self.model.generate_content, content)
+                    response = await self._generate_gemini(system, prompt, json_mode=False)
                     if not response or not getattr(response, "text", None):
                         raise GeminiAPIError("Empty response from Gemini API")
                     narrative = response.text.strip()
@@ -432,32 +577,10 @@ class GeminiLLMAdapter(LLMPort):
                         continue
                     raise GeminiAPIError(f"Gemini API error: {err}") from err
 
-            try:  # google SDK: usage metadata may exist
-                if self._provider == "gemini" and response is not None:
-                    usage = getattr(response, "usage_metadata", None)
-                    if usage:
-                        in_tok = getattr(usage, "input_token_count", None)
-                        out_tok = getattr(usage, "output_token_count", None)
-                        add_llm_tokens(self._active_model_name, prompt=in_tok, completion=out_tok)
-                        if game_mode:
-                            add_llm_tokens_by_mode(
-                                self._active_model_name, game_mode, in_tok, out_tok
-                            )
-                        try:
-                            cost = 0.0
-                            if in_tok:
-                                cost += (in_tok / 1000.0) * settings.finops_prompt_token_price_usd
-                            if out_tok:
-                                cost += (
-                                    out_tok / 1000.0
-                                ) * settings.finops_completion_token_price_usd
-                            add_llm_cost_usd(self._active_model_name, cost)
-                            if game_mode:
-                                add_llm_cost_usd_by_mode(self._active_model_name, game_mode, cost)
-                        except Exception:
-                            pass
-            except Exception:
-                pass
+            # google SDK: usage metadata may exist
+            if self._provider == "gemini" and response is not None:
+                with contextlib.suppress(Exception):
+                    self._record_gemini_usage(response, game_mode)
 
             try:
                 elapsed = time.perf_counter() - t0
@@ -473,7 +596,8 @@ class GeminiLLMAdapter(LLMPort):
                 pass
 
             logger.info(
-                f"Generated narrative for match {match_id}: {len(narrative)} chars (provider={self._provider})"
+                f"Generated narrative for match {match_id}: {len(narrative)} chars (provider={self._provider})",
+                extra={"prompt_prefix_hash": system.prefix_hash},
             )
 
             return narrative
@@ -546,36 +670,18 @@ class GeminiLLMAdapter(LLMPort):
         strengths = target.get("strengths") or []
         improvements = target.get("improvements") or []
 
-        import json as _json
-
         # USER MESSAGE: Pure data, no instructions (instructions are in system prompt)
-        prompt = f"""Analyze this match performance:
-
-**Match**: {match_id} | **Duration**: {game_length:.1f} min | **Player**: {target_name} ({target_champion})
-
-**Performance Scores (0-100)**
-- Overall: {target_scores["overall"]:.1f}
-- ⚔️ Combat: {target_scores["combat"]:.1f}
-- 💰 Economy: {target_scores["economy"]:.1f}
-- 🎯 Objectives: {target_scores["objective"]:.1f}
-- 👁️ Vision: {target_scores["vision"]:.1f}
-- 🤝 Teamwork: {target_scores["teamwork"]:.1f}
-
-**Key Metrics**
-- KDA: {raw_metrics["kda"]:.1f}
-- Kill Participation: {raw_metrics["kill_participation"]:.1f}%
-- CS/min: {raw_metrics["cs_per_min"]:.1f}
-- Gold Diff: {raw_metrics["gold_difference"]:.0f}
-
-**Strength Tags**: {", ".join(strengths) if strengths else "None"}
-**Improvement Tags**: {", ".join(improvements) if improvements else "None"}
-
-**Full Data Context**:
-```json
-{_json.dumps(target, indent=2, ensure_ascii=False)}
-```
-"""
-        return prompt
+        return _MATCH_USER_PROMPT.render(
+            match_id=match_id,
+            game_length=game_length,
+            target_name=target_name,
+            target_champion=target_champion,
+            **{f"score_{key}": value for key, value in target_scores.items()},
+            **raw_metrics,
+            strengths=", ".join(strengths) if strengths else "None",
+            improvements=", ".join(improvements) if improvements else "None",
+            target=target,
+        )
 
     def _format_player_scores(self, players: list[dict[str, Any]]) -> str:
         """Render player score summary for debugging/testing scenarios."""
@@ -592,7 +698,7 @@ class GeminiLLMAdapter(LLMPort):
                 total_val = float(total)
             except Exception:
                 total_val = 0.0
-            lines.append(f"**{name} ({champion})** — Total {total_val:.1f}/100")
+            lines.append(_PLAYER_SCORE_LINE.render(name=name, champion=champion, total=total_val))
 
         return "\n".join(lines)
 
@@ -638,24 +744,24 @@ class GeminiLLMAdapter(LLMPort):
                 system_prompt = DEFAULT_SYSTEM_PROMPT
 
             prompt = self._format_prompt(system_prompt, match_data)
+            system = static_prompt(system_prompt or DEFAULT_SYSTEM_PROMPT)
+            self.last_prompt_prefix_hash = system.prefix_hash
 
             while True:
                 try:
                     if self._provider == "openai":
                         return await self._call_openai_json_completion(
-                            prompt=prompt, system_prompt=system_prompt
+                            prompt=prompt,
+                            system_prompt=system_prompt,
+                            game_mode=game_mode,
+                            prefix_hash=system.prefix_hash,
                         )
 
-                    content = [
-                        {
-                            "role": "system",
-                            "parts": [system_prompt or DEFAULT_SYSTEM_PROMPT],
-                        },
-                        {"role": "user", "parts": [prompt]},
-                    ]
-                    response = await asyncio.to_thread(self.model_json.generate_content, content)
+                    response = await self._generate_gemini(system, prompt, json_mode=True)
                     if not response or not getattr(response, "text", None):
                         raise GeminiAPIError("Empty JSON response from Gemini API")
+                    with contextlib.suppress(Exception):
+                        self._record_gemini_usage(response, game_mode)
                     return _json.loads(response.text)
                 except GeminiAPIError as err:
                     if self._provider == "openai" and self._maybe_switch_from_openai(str(err)):
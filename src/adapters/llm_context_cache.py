@@ -0,0 +1,209 @@
+"""Provider-side caching of the long, static system prompts.
+
+Every analysis sends one of a handful of system prompts (``system_prompts``,
+``v2_team_relative_prompt``, ``v2_team_full_token_prompt``,
+``jiangli_prompt``). They are thousands of tokens and identical across
+requests. Two mechanisms keep providers from re-processing them:
+
+- Gemini: an explicit cached-content resource per (model, prompt hash). A
+  request then names the handle and sends only the user turn. Handles live
+  for ``LLM_CONTEXT_CACHE_TTL_SECONDS``. A handle used within
+  ``LLM_CONTEXT_CACHE_REFRESH_MARGIN_SECONDS`` of expiry has its TTL extended
+  first, so a busy prompt never lapses mid-request while idle ones expire on
+  their own. A prompt the provider refuses to cache (too short for the model,
+  or a model without caching) is not retried until the backoff has passed.
+  Only the registered static prompts above get a handle: one-shot prompts
+  built per request (TTS scripts, key-moment summaries) are sent inline, as
+  a cache resource for them would never be read twice.
+- OpenAI-compatible endpoints cache prompt prefixes automatically. The
+  adapter keeps the system message first and sends ``prompt_cache_key`` (the
+  prompt's prefix hash) so requests sharing a prefix are routed to the same
+  cache.
+
+The registry is per process and thread-safe. Creation and refresh are
+blocking SDK calls made through ``asyncio.to_thread``, so it works from
+Celery's per-task event loops as well as from the bot's loop.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import logging
+import threading
+import time
+from collections.abc import Callable, Collection
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+
+from src.prompts.compiler import CompiledPrompt, static_prompt
+
+logger = logging.getLogger(__name__)
+
+# Refused prompts (below the model's minimum cacheable size, unsupported model) retry after this
+FAILURE_BACKOFF_SECONDS = 3600.0
+
+
+@dataclass(slots=True)
+class CachedPromptHandle:
+    """One provider cache resource holding a system prompt for one model."""
+
+    model: str
+    prefix_hash: str
+    name: str
+    expires_at: float
+    resource: Any = None
+    # generation-config key → GenerativeModel bound to this cached content
+    _models: dict[str, Any] = field(default_factory=dict)
+
+    def model_for(self, key: str, factory: Callable[[Any], Any]) -> Any:
+        bound = self._models.get(key)
+        if bound is None:
+            bound = self._models[key] = factory(self.resource)
+        return bound
+
+
+class GeminiContextCache:
+    """Per-process registry of Gemini cached-content handles, keyed by (model, prompt hash)."""
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: int,
+        refresh_margin_seconds: int,
+        create: Callable[..., Any] | None = None,
+        failure_backoff_seconds: float = FAILURE_BACKOFF_SECONDS,
+        clock: Callable[[], float] = time.time,
+        cacheable: Collection[str] | None = None,
+    ) -> None:
+        self._ttl = max(60, int(ttl_seconds))
+        self._margin = min(max(0, int(refresh_margin_seconds)), self._ttl // 2)
+        self._create = create
+        self._backoff = failure_backoff_seconds
+        self._clock = clock
+        # Prefix hashes worth a provider resource (default: the static system prompts)
+        self._cacheable = static_system_prompt_hashes() if cacheable is None else cacheable
+        self._handles: dict[tuple[str, str], CachedPromptHandle] = {}
+        self._refused_until: dict[tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+
+    def accepts(self, prompt: CompiledPrompt) -> bool:
+        """Whether this prompt is one of the registered static prompts."""
+        return prompt.prefix_hash in self._cacheable
+
+    def acquire(self, model: str, prompt: CompiledPrompt) -> CachedPromptHandle | None:
+        """Live handle for this prompt on this model, created or refreshed as needed.
+
+        Blocking (SDK calls): run it via ``asyncio.to_thread``. None means
+        "send the prompt inline".
+        """
+        if not self.accepts(prompt):
+            return None
+        key = (model, prompt.prefix_hash)
+        with self._lock:
+            now = self._clock()
+            self._prune(now)
+            handle = self._handles.get(key)
+            if handle is not None and now < handle.expires_at - self._margin:
+                return handle
+            if self._refused_until.get(key, 0.0) > now:
+                return None
+            if handle is not None and now < handle.expires_at:
+                try:
+                    handle.resource.update(ttl=dt.timedelta(seconds=self._ttl))
+                    handle.expires_at = now + self._ttl
+                    return handle
+                except Exception:
+                    logger.info(
+                        "llm_context_cache_refresh_failed",
+                        extra={"model": model, "prefix_hash": prompt.prefix_hash},
+                        exc_info=True,
+                    )
+            self._handles.pop(key, None)
+            return self._create_handle(key, prompt, now)
+
+    def invalidate(self, model: str, prefix_hash: str) -> None:
+        """Forget a handle the provider no longer recognises (deleted or expired early)."""
+        with self._lock:
+            self._handles.pop((model, prefix_hash), None)
+
+    def _prune(self, now: float) -> None:
+        """Drop lapsed handles and refusals whose backoff has passed."""
+        for key in [k for k, h in self._handles.items() if h.expires_at <= now]:
+            del self._handles[key]
+        for key in [k for k, until in self._refused_until.items() if until <= now]:
+            del self._refused_until[key]
+
+    def _create_handle(
+        self, key: tuple[str, str], prompt: CompiledPrompt, now: float
+    ) -> CachedPromptHandle | None:
+        model, prefix_hash = key
+        create = self._create or _sdk_create
+        try:
+            resource = create(
+                model=model if model.startswith("models/") else f"models/{model}",
+                display_name=f"chimera-{prefix_hash}",
+                system_instruction=prompt.source,
+                ttl=dt.timedelta(seconds=self._ttl),
+            )
+        except Exception as exc:
+            self._refused_until[key] = now + self._backoff
+            logger.info(
+                "llm_context_cache_unavailable",
+                extra={"model": model, "prefix_hash": prefix_hash, "reason": str(exc)[:200]},
+            )
+            return None
+        handle = CachedPromptHandle(
+            model=model,
+            prefix_hash=prefix_hash,
+            name=str(getattr(resource, "name", "") or ""),
+            expires_at=now + self._ttl,
+            resource=resource,
+        )
+        self._handles[key] = handle
+        logger.info(
+            "llm_context_cache_created",
+            extra={"model": model, "prefix_hash": prefix_hash, "cache_name": handle.name},
+        )
+        return handle
+
+
+@lru_cache(maxsize=1)
+def static_system_prompt_hashes() -> frozenset[str]:
+    """Prefix hashes of the system prompts that are identical across requests."""
+    from src.prompts.jiangli_prompt import JIANGLI_SYSTEM_PROMPT
+    from src.prompts.system_prompts import DEFAULT_SYSTEM_PROMPT, PROMPT_VERSIONS
+    from src.prompts.v2_team_full_token_prompt import TEAM_FULL_TOKEN_SYSTEM_PROMPT
+    from src.prompts.v2_team_relative_prompt import V2_TEAM_RELATIVE_SYSTEM_PROMPT
+
+    texts = (
+        DEFAULT_SYSTEM_PROMPT,
+        *PROMPT_VERSIONS.values(),
+        JIANGLI_SYSTEM_PROMPT,
+        TEAM_FULL_TOKEN_SYSTEM_PROMPT,
+        V2_TEAM_RELATIVE_SYSTEM_PROMPT,
+    )
+    return frozenset(static_prompt(text).prefix_hash for text in texts)
+
+
+def _sdk_create(**kwargs: Any) -> Any:
+    from google.generativeai import caching
+
+    return caching.CachedContent.create(**kwargs)
+
+
+_gemini_cache: GeminiContextCache | None = None
+_gemini_cache_lock = threading.Lock()
+
+
+def get_gemini_context_cache(
+    *, ttl_seconds: int, refresh_margin_seconds: int
+) -> GeminiContextCache:
+    """Process-wide registry (adapters are created per task, handles must outlive them)."""
+    global _gemini_cache
+    with _gemini_cache_lock:
+        if _gemini_cache is None:
+            _gemini_cache = GeminiContextCache(
+                ttl_seconds=ttl_seconds, refresh_margin_seconds=refresh_margin_seconds
+            )
+        return _gemini_cache
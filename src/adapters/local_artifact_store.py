@@ -0,0 +1,347 @@
+"""Redis index and TTL/size eviction for locally stored audio and build visuals.
+
+When S3 is not configured, TTS clips land under ``AUDIO_STORAGE_PATH`` and build
+visuals under ``BUILD_VISUAL_STORAGE_PATH``, and the callback server serves
+them from ``/static/audio/`` and ``/static/builds/``. Before this module,
+nothing ever deleted them, and every replay re-checked a clip with a
+filesystem stat.
+
+Every artifact is indexed as ``<area>:<relative path>`` in one sorted set,
+scored by last access, with its size kept in a hash. The index lives in Redis
+because the files are written by Celery workers and served by the bot process.
+
+- Writers call `record_local_artifact` after saving a file.
+- Static downloads and replays bump the score.
+- `LocalArtifactIndex.contains` answers "is this clip still there?" with a
+  single ``ZSCORE``. A miss falls back to a stat, so a clip whose writer could
+  not reach Redis is still found. The index is only consulted while the
+  janitor runs (``LOCAL_STORAGE_CLEANUP_ENABLED``).
+- `LocalStorageJanitor` runs in the process that serves the files. It indexes
+  files the writers failed to record, drops entries whose file is gone, then
+  evicts everything idle for longer than the TTL, followed by the least
+  recently used files until the total fits ``LOCAL_STORAGE_MAX_MB``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import os
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import redis.asyncio as aioredis
+
+from src.config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+INDEX_KEY = "chimera:storage:artifacts"  # member → last access (unix seconds)
+SIZES_KEY = "chimera:storage:artifact_sizes"  # member → bytes
+# Eviction deletes in batches so one cycle never holds Redis or the disk for long
+EVICT_BATCH = 200
+
+
+def storage_roots(settings: Any) -> dict[str, Path]:
+    """Area name → absolute directory for the local artifact trees."""
+    roots: dict[str, Path] = {}
+    for area, raw in (
+        ("audio", settings.audio_storage_path),
+        ("builds", settings.build_visual_storage_path),
+    ):
+        path = Path(raw)
+        roots[area] = path if path.is_absolute() else Path.cwd() / path
+    return roots
+
+
+@dataclass(slots=True)
+class EvictionStats:
+    indexed: int = 0
+    dropped: int = 0
+    expired: int = 0
+    over_budget: int = 0
+    freed_bytes: int = 0
+    total_bytes: int = 0
+
+
+class LocalArtifactIndex:
+    """Sorted-set index of local artifacts over a `redis.asyncio` client (decoded)."""
+
+    def __init__(
+        self,
+        client: Any,
+        roots: Mapping[str, Path],
+        *,
+        ttl_seconds: int,
+        max_bytes: int = 0,
+    ) -> None:
+        self._client = client
+        self._roots = {area: Path(root) for area, root in roots.items()}
+        self._ttl = ttl_seconds
+        self._max_bytes = max_bytes
+
+    @classmethod
+    def from_settings(cls, client: Any, settings: Any) -> LocalArtifactIndex:
+        return cls(
+            client,
+            storage_roots(settings),
+            ttl_seconds=settings.audio_file_ttl_seconds,
+            max_bytes=settings.local_storage_max_mb * 1024 * 1024,
+        )
+
+    # ----- members -------------------------------------------------------------
+
+    def member_for(self, path: str | Path) -> str | None:
+        """``<area>:<relative path>`` for a file under one of the roots, else None."""
+        target = Path(path)
+        if not target.is_absolute():
+            target = Path.cwd() / target
+        for area, root in self._roots.items():
+            with contextlib.suppress(ValueError):
+                return f"{area}:{target.relative_to(root).as_posix()}"
+        return None
+
+    def path_for(self, member: str) -> Path | None:
+        area, _, rel = member.partition(":")
+        root = self._roots.get(area)
+        return root / rel if root is not None and rel else None
+
+    # ----- writes and lookups ----------------------------------------------------
+
+    async def record(self, path: str | Path, size: int, *, at: float | None = None) -> bool:
+        member = self.member_for(path)
+        if member is None:
+            return False
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.zadd(INDEX_KEY, {member: at if at is not None else time.time()})
+            pipe.hset(SIZES_KEY, member, int(size))
+            await pipe.execute()
+        return True
+
+    async def touch(self, area: str, rel_path: str) -> None:
+        """Bump last access of an indexed artifact (unknown paths are ignored)."""
+        await self._client.zadd(INDEX_KEY, {f"{area}:{rel_path.lstrip('/')}": time.time()}, xx=True)
+
+    async def contains(self, area: str, rel_path: str) -> bool:
+        """O(1) existence check; a hit counts as an access."""
+        member = f"{area}:{rel_path.lstrip('/')}"
+        if await self._client.zscore(INDEX_KEY, member) is None:
+            return False
+        await self._client.zadd(INDEX_KEY, {member: time.time()}, xx=True)
+        return True
+
+    # ----- maintenance -----------------------------------------------------------
+
+    async def reconcile(self) -> tuple[int, int]:
+        """Index unrecorded files (by mtime) and drop entries whose file is gone."""
+        scan_started = time.time()
+        on_disk = await asyncio.to_thread(self._scan)
+        indexed = await self._client.hgetall(SIZES_KEY)
+        missing = {m: v for m, v in on_disk.items() if m not in indexed}
+        # Entries recorded or touched during the scan may belong to files it missed
+        settled = set(await self._client.zrangebyscore(INDEX_KEY, "-inf", scan_started))
+        gone = [m for m in indexed if m not in on_disk and m in settled]
+        if missing:
+            async with self._client.pipeline(transaction=False) as pipe:
+                pipe.zadd(INDEX_KEY, {m: mtime for m, (_, mtime) in missing.items()}, nx=True)
+                pipe.hset(SIZES_KEY, mapping={m: size for m, (size, _) in missing.items()})
+                await pipe.execute()
+        for start in range(0, len(gone), EVICT_BATCH):
+            batch = gone[start : start + EVICT_BATCH]
+            async with self._client.pipeline(transaction=False) as pipe:
+                pipe.zrem(INDEX_KEY, *batch)
+                pipe.hdel(SIZES_KEY, *batch)
+                await pipe.execute()
+        return len(missing), len(gone)
+
+    def _scan(self) -> dict[str, tuple[int, float]]:
+        found: dict[str, tuple[int, float]] = {}
+        for area, root in self._roots.items():
+            if not root.is_dir():
+                continue
+            for dirpath, _, filenames in os.walk(root):
+                for name in filenames:
+                    if name.startswith("."):
+                        continue  # in-flight temp files of write_local_file
+                    full = Path(dirpath) / name
+                    with contextlib.suppress(OSError):
+                        st = full.stat()
+                        rel = full.relative_to(root).as_posix()
+                        found[f"{area}:{rel}"] = (st.st_size, st.st_mtime)
+        return found
+
+    async def evict(self, *, now: float | None = None) -> EvictionStats:
+        """Delete artifacts idle past the TTL, then LRU ones until under the size budget."""
+        stats = EvictionStats()
+        now = time.time() if now is None else now
+        if self._ttl > 0:
+            while True:
+                expired = await self._client.zrangebyscore(
+                    INDEX_KEY, "-inf", now - self._ttl, start=0, num=EVICT_BATCH
+                )
+                if not expired:
+                    break
+                stats.freed_bytes += await self._delete(expired)
+                stats.expired += len(expired)
+
+        sizes = await self._client.hgetall(SIZES_KEY)
+        stats.total_bytes = sum(int(v) for v in sizes.values())
+        while self._max_bytes > 0 and stats.total_bytes > self._max_bytes:
+            oldest = await self._client.zrange(INDEX_KEY, 0, EVICT_BATCH - 1)
+            if not oldest:
+                break
+            victims: list[str] = []
+            for member in oldest:
+                victims.append(member)
+                stats.total_bytes -= int(sizes.get(member, 0))
+                if stats.total_bytes <= self._max_bytes:
+                    break
+            stats.freed_bytes += await self._delete(victims)
+            stats.over_budget += len(victims)
+        return stats
+
+    async def _delete(self, members: list[str]) -> int:
+        # Unindex first so lookups stop reporting the file before it disappears
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.hmget(SIZES_KEY, members)
+            pipe.zrem(INDEX_KEY, *members)
+            pipe.hdel(SIZES_KEY, *members)
+            sizes, _, _ = await pipe.execute()
+        paths = [p for p in (self.path_for(m) for m in members) if p is not None]
+        await asyncio.to_thread(_unlink_all, paths)
+        return sum(int(s) for s in sizes if s is not None)
+
+
+def _unlink_all(paths: list[Path]) -> None:
+    for path in paths:
+        with contextlib.suppress(FileNotFoundError):
+            path.unlink()
+
+
+class LocalStorageJanitor:
+    """Periodic reconcile + eviction loop for the process serving ``/static``."""
+
+    def __init__(self, index: LocalArtifactIndex, *, interval_seconds: float) -> None:
+        self._index = index
+        self._interval = interval_seconds
+        self._runner: asyncio.Task[None] | None = None
+
+    @property
+    def index(self) -> LocalArtifactIndex:
+        return self._index
+
+    def start(self) -> None:
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            self._runner.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._runner
+            self._runner = None
+
+    async def run_once(self) -> EvictionStats:
+        indexed, dropped = await self._index.reconcile()
+        stats = await self._index.evict()
+        stats.indexed, stats.dropped = indexed, dropped
+        logger.info(
+            "local_storage_cleanup",
+            extra={
+                "indexed": stats.indexed,
+                "dropped": stats.dropped,
+                "expired": stats.expired,
+                "over_budget": stats.over_budget,
+                "freed_bytes": stats.freed_bytes,
+                "total_bytes": stats.total_bytes,
+            },
+        )
+        return stats
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("local_storage_cleanup_failed")
+            await asyncio.sleep(self._interval)
+
+
+def resolve_media_path(root: Path, rel_path: str) -> Path | None:
+    """File under ``root`` for a request path; None for traversal, dotfiles or misses."""
+    parts = [p for p in rel_path.split("/") if p]
+    if not parts or any(p.startswith(".") or "\\" in p for p in parts):
+        return None
+    candidate = root.joinpath(*parts)
+    try:
+        resolved = candidate.resolve(strict=True)
+        resolved.relative_to(root.resolve())
+    except (OSError, ValueError):
+        return None
+    return resolved if resolved.is_file() else None
+
+
+def local_audio_path(audio_url: str, settings: Any) -> Path | None:
+    """Local file behind an ``AUDIO_BASE_URL`` clip URL, so this host can skip HTTP."""
+    base_url = getattr(settings, "audio_base_url", None)
+    if not isinstance(base_url, str) or not base_url.rstrip("/"):
+        return None
+    prefix = f"{base_url.rstrip('/')}/"
+    if not audio_url.startswith(prefix):
+        return None
+    root = Path(settings.audio_storage_path)
+    root = root if root.is_absolute() else Path.cwd() / root
+    return resolve_media_path(root, audio_url[len(prefix) :].split("?", 1)[0])
+
+
+async def local_audio_available(
+    index: LocalArtifactIndex | None, audio_url: str, settings: Any
+) -> bool | None:
+    """Whether a clip served from ``AUDIO_BASE_URL`` still exists; None for other URLs.
+
+    Answered from the index when there is one. A miss (or no index) falls back
+    to a stat of the file, and a file found that way is indexed for next time.
+    """
+    base_url = getattr(settings, "audio_base_url", None)
+    if not isinstance(base_url, str) or not base_url.rstrip("/"):
+        return None
+    base_url = base_url.rstrip("/")
+    if not audio_url.startswith(base_url):
+        return None
+    rel_path = audio_url[len(base_url) :].lstrip("/")
+    if index is not None:
+        try:
+            if await index.contains("audio", rel_path):
+                return True
+        except Exception:
+            logger.debug("local_artifact_index_lookup_failed", exc_info=True)
+    path = Path(settings.audio_storage_path) / rel_path
+    try:
+        size = path.stat().st_size
+    except OSError:
+        return False
+    if index is not None:
+        # Written by a process that could not reach Redis, or not reconciled yet
+        with contextlib.suppress(Exception):
+            await index.record(path, size)
+    return True
+
+
+async def record_local_artifact(path: str | Path, size: int) -> None:
+    """Index a file just written by this process (one-shot client; never raises)."""
+    settings = get_settings()
+    try:
+        client = aioredis.from_url(settings.redis_url, encoding="utf-8", decode_responses=True)
+        try:
+            await LocalArtifactIndex.from_settings(client, settings).record(path, size)
+        finally:
+            await client.aclose()
+    except Exception:
+        # The janitor's next reconcile indexes it from disk
+        logger.warning("local_artifact_index_failed", extra={"path": str(path)}, exc_info=True)
@@ -0,0 +1,309 @@
+"""Shared S3-compatible object storage for TTS audio and build visuals.
+
+Uploads used to build a fresh ``aioboto3.Session()`` and S3 client for every
+object: a new connection pool and TLS handshake per clip or image. The local
+fallback also wrote files with blocking ``open()`` on the event loop.
+
+`ObjectStorage` keeps one long-lived client per event loop. That client has a
+bounded connection pool (``max_pool_connections``) and is reused by every
+upload on that loop. The bot process therefore gets a single client. Celery
+tasks, each running on a private loop, share one client across their uploads,
+and `close_object_storage` releases it before the loop is closed.
+
+Features:
+
+- Objects at or above ``multipart_threshold`` are streamed as a multipart
+  upload, with up to ``upload_concurrency`` parts in flight.
+- `ObjectStorage.put_many` uploads a batch concurrently.
+- The object ACL is sent until the bucket rejects ACLs
+  (``AccessControlListNotSupported``). After that, puts go out without it.
+
+`write_local_file` performs fallback writes in the default thread pool.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import os
+import uuid
+from collections.abc import AsyncIterable, AsyncIterator, Sequence
+from pathlib import Path
+from typing import Any
+
+from aiobotocore.config import AioConfig
+from aiobotocore.session import get_session
+from botocore.exceptions import ClientError
+
+from src.config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# S3 rejects non-final multipart parts smaller than 5 MiB
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+
+class ObjectStorage:
+    """Long-lived S3 client pool with single-put, multipart and batch uploads."""
+
+    def __init__(
+        self,
+        *,
+        bucket: str,
+        endpoint_url: str,
+        access_key: str,
+        secret_key: str,
+        region: str | None = None,
+        public_base_url: str | None = None,
+        path_style: bool = True,
+        acl: str | None = "public-read",
+        max_pool_connections: int = 32,
+        multipart_threshold: int = 8 * 1024 * 1024,
+        upload_concurrency: int = 4,
+    ) -> None:
+        self.bucket = bucket
+        self.endpoint_url = endpoint_url.rstrip("/")
+        self._client_kwargs: dict[str, Any] = {
+            "endpoint_url": endpoint_url,
+            "aws_access_key_id": access_key,
+            "aws_secret_access_key": secret_key,
+            "config": AioConfig(
+                max_pool_connections=max(1, max_pool_connections),
+                s3={"addressing_style": "path" if path_style else "virtual"},
+            ),
+        }
+        if region:
+            self._client_kwargs["region_name"] = region
+        self._public_base_url = public_base_url.rstrip("/") if public_base_url else None
+        self._path_style = path_style
+        self._acl = acl or None
+        self.multipart_threshold = max(MIN_PART_SIZE, multipart_threshold)
+        self._upload_concurrency = max(1, upload_concurrency)
+        self._clients: dict[asyncio.AbstractEventLoop, tuple[Any, contextlib.AsyncExitStack]] = {}
+        self._client_locks: dict[asyncio.AbstractEventLoop, asyncio.Lock] = {}
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> ObjectStorage | None:
+        """Storage for the ``AUDIO_S3_*`` bucket; None unless fully configured."""
+        bucket = getattr(settings, "audio_s3_bucket", None)
+        endpoint = getattr(settings, "audio_s3_endpoint", None)
+        access_key = getattr(settings, "audio_s3_access_key", None)
+        secret_key = getattr(settings, "audio_s3_secret_key", None)
+        if not (bucket and endpoint and access_key and secret_key):
+            return None
+        return cls(
+            bucket=bucket,
+            endpoint_url=endpoint,
+            access_key=access_key,
+            secret_key=secret_key,
+            region=getattr(settings, "audio_s3_region", None),
+            public_base_url=getattr(settings, "audio_s3_public_base_url", None),
+            path_style=getattr(settings, "audio_s3_path_style", True),
+            acl=getattr(settings, "audio_s3_acl", "public-read"),
+            max_pool_connections=getattr(settings, "object_storage_max_connections", 32),
+            multipart_threshold=getattr(settings, "object_storage_multipart_threshold_mb", 8)
+            * 1024
+            * 1024,
+            upload_concurrency=getattr(settings, "object_storage_upload_concurrency", 4),
+        )
+
+    def public_url(self, key: str) -> str:
+        if self._public_base_url:
+            return f"{self._public_base_url}/{key}"
+        if self._path_style:
+            return f"{self.endpoint_url}/{self.bucket}/{key}"
+        # Virtual-hosted style: https://bucket.s3.region.amazonaws.com/key
+        scheme, sep, host = self.endpoint_url.partition("://")
+        return f"{scheme}{sep}{self.bucket}.{host}/{key}"
+
+    # ----- client lifecycle --------------------------------------------------
+
+    async def _client(self) -> Any:
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get(loop)
+        if entry is not None:
+            return entry[0]
+        lock = self._client_locks.setdefault(loop, asyncio.Lock())
+        async with lock:
+            entry = self._clients.get(loop)
+            if entry is None:
+                # Clients of loops that were closed without aclose() cannot be shut down any more
+                for stale in [lp for lp in self._clients if lp.is_closed()]:
+                    self._clients.pop(stale, None)
+                    self._client_locks.pop(stale, None)
+                stack = contextlib.AsyncExitStack()
+                client = await stack.enter_async_context(
+                    get_session().create_client("s3", **self._client_kwargs)
+                )
+                entry = (client, stack)
+                self._clients[loop] = entry
+        return entry[0]
+
+    async def aclose(self) -> None:
+        """Close the client bound to the running loop (its connection pool)."""
+        loop = asyncio.get_running_loop()
+        self._client_locks.pop(loop, None)
+        entry = self._clients.pop(loop, None)
+        if entry is not None:
+            await entry[1].aclose()
+
+    # ----- uploads -------------------------------------------------------------
+
+    def _object_args(self, key: str, content_type: str) -> dict[str, Any]:
+        args: dict[str, Any] = {"Bucket": self.bucket, "Key": key, "ContentType": content_type}
+        if self._acl:
+            args["ACL"] = self._acl
+        return args
+
+    def _drop_acl_if_unsupported(self, exc: Exception) -> bool:
+        response: dict[str, Any] = getattr(exc, "response", None) or {}
+        code = response.get("Error", {}).get("Code")
+        if self._acl and code == "AccessControlListNotSupported":
+            logger.info("object_storage_acl_disabled", extra={"bucket": self.bucket})
+            self._acl = None
+            return True
+        return False
+
+    async def put_bytes(self, key: str, data: bytes, *, content_type: str) -> str:
+        """Upload ``data`` (multipart when large); returns the object's public URL."""
+        if len(data) >= self.multipart_threshold:
+            return await self.put_stream(
+                key, _chunks(data, self.multipart_threshold), content_type=content_type
+            )
+        client = await self._client()
+        try:
+            await client.put_object(Body=data, **self._object_args(key, content_type))
+        except ClientError as exc:
+            if not self._drop_acl_if_unsupported(exc):
+                raise
+            await client.put_object(Body=data, **self._object_args(key, content_type))
+        return self.public_url(key)
+
+    async def put_stream(self, key: str, chunks: AsyncIterable[bytes], *, content_type: str) -> str:
+        """Multipart-upload an async byte stream without holding all of it in memory.
+
+        Parts of ``multipart_threshold`` bytes are uploaded while the stream is
+        still being read; the upload is aborted if anything fails.
+        """
+        client = await self._client()
+        try:
+            created = await client.create_multipart_upload(**self._object_args(key, content_type))
+        except ClientError as exc:
+            if not self._drop_acl_if_unsupported(exc):
+                raise
+            created = await client.create_multipart_upload(**self._object_args(key, content_type))
+        upload_id = created["UploadId"]
+        slots = asyncio.Semaphore(self._upload_concurrency)
+        parts: list[asyncio.Task[dict[str, Any]]] = []
+
+        async def upload_part(number: int, body: bytes) -> dict[str, Any]:
+            try:
+                resp = await client.upload_part(
+                    Bucket=self.bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                    PartNumber=number,
+                    Body=body,
+                )
+                return {"PartNumber": number, "ETag": resp["ETag"]}
+            finally:
+                slots.release()
+
+        try:
+            buffer = bytearray()
+            async for chunk in chunks:
+                buffer += chunk
+                while len(buffer) >= self.multipart_threshold:
+                    body = bytes(buffer[: self.multipart_threshold])
+                    del buffer[: self.multipart_threshold]
+                    await slots.acquire()
+                    parts.append(asyncio.create_task(upload_part(len(parts) + 1, body)))
+            if buffer or not parts:
+                await slots.acquire()
+                parts.append(asyncio.create_task(upload_part(len(parts) + 1, bytes(buffer))))
+            completed = await asyncio.gather(*parts)
+            await client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": list(completed)},
+            )
+        except BaseException:
+            for task in parts:
+                task.cancel()
+            await asyncio.gather(*parts, return_exceptions=True)
+            with contextlib.suppress(Exception):
+                await client.abort_multipart_upload(Bucket=self.bucket, Key=key, UploadId=upload_id)
+            raise
+        logger.info(
+            "object_storage_multipart_uploaded",
+            extra={"bucket": self.bucket, "key": key, "parts": len(parts)},
+        )
+        return self.public_url(key)
+
+    async def put_many(
+        self, items: Sequence[tuple[str, bytes, str]], *, concurrency: int | None = None
+    ) -> list[str | None]:
+        """Upload ``(key, data, content_type)`` items concurrently; None where one failed."""
+        slots = asyncio.Semaphore(concurrency or self._upload_concurrency)
+
+        async def one(key: str, data: bytes, content_type: str) -> str | None:
+            async with slots:
+                try:
+                    return await self.put_bytes(key, data, content_type=content_type)
+                except Exception:
+                    logger.error(
+                        "object_storage_upload_failed",
+                        exc_info=True,
+                        extra={"bucket": self.bucket, "key": key},
+                    )
+                    return None
+
+        return list(await asyncio.gather(*(one(*item) for item in items)))
+
+
+async def _chunks(data: bytes, size: int) -> AsyncIterator[bytes]:
+    view = memoryview(data)
+    for start in range(0, len(view), size):
+        yield bytes(view[start : start + size])
+
+
+_storage: ObjectStorage | None = None
+_storage_loaded = False
+
+
+def get_object_storage() -> ObjectStorage | None:
+    """Process-wide storage built from settings; None when S3 is not configured."""
+    global _storage, _storage_loaded
+    if not _storage_loaded:
+        _storage = ObjectStorage.from_settings(get_settings())
+        _storage_loaded = True
+    return _storage
+
+
+async def close_object_storage() -> None:
+    """Release the running loop's S3 client (call before closing a private loop)."""
+    if _storage is not None:
+        await _storage.aclose()
+
+
+def _write_file(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write-then-rename so the static server never serves a half-written file
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        with tmp.open("wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            tmp.unlink()
+        raise
+
+
+async def write_local_file(path: str | Path, data: bytes) -> Path:
+    """Write ``data`` to ``path`` on the default thread pool, off the event loop."""
+    target = Path(path)
+    await asyncio.to_thread(_write_file, target, data)
+    return target
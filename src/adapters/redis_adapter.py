@@ -20,6 +20,11 @@ class RedisAdapter(CachePort):
         self.settings = get_settings()
         self._client: Any = None  # aioredis.Redis (untyped library)
 
+    @property
+    def client(self) -> Any:
+        """Underlying `redis.asyncio` client (None until connected), for stream consumers."""
+        return self._client
+
     async def connect(self) -> None:
         """Connect to Redis."""
         if self._client:
@@ -207,128 +207,8 @@ class RiotAPIAdapter(RiotAPIPort):
                     if not (isinstance(raw, dict) and "info" in raw and "metadata" in raw):
                         logger.error("Unexpected timeline payload shape")
                         return None
-                    # Participants mapping
                     match_details = await self.get_match_details(match_id, region)
-                    participants_map: list[dict[str, Any]] = []
-                    if match_details and isinstance(match_details.get("info"), dict):
-                        info_md = match_details["info"]
-                        parts = info_md.get("participants", [])
-                        if isinstance(parts, list):
-                            for i, p in enumerate(parts[:10]):
-                                participants_map.append(
-                                    {
-                                        "participant_id": int(p.get("participantId", i + 1)),
-                                        "puuid": str(p.get("puuid", "")),
-                                    }
-                                )
-                    if not participants_map:
-                        meta_parts = raw.get("metadata", {}).get("participants", [])
-                        if isinstance(meta_parts, list) and len(meta_parts) == 10:
-                            participants_map = [
-                                {"participant_id": i + 1, "puuid": str(p)}
-                                for i, p in enumerate(meta_parts)
-                            ]
-
-                    # Convert frames
-                    def _cs_map(d: dict[str, Any]) -> dict[str, Any]:
-                        m = {
-                            "abilityHaste": "ability_haste",
-                            "abilityPower": "ability_power",
-                            "armor": "armor",
-                            "armorPen": "armor_pen",
-                            "armorPenPercent": "armor_pen_percent",
-                            "attackDamage": "attack_damage",
-                            "attackSpeed": "attack_speed",
-                            "bonusArmorPenPercent": "bonus_armor_pen_percent",
-                            "bonusMagicPenPercent": "bonus_magic_pen_percent",
-                            "ccReduction": "cc_reduction",
-                            "cooldownReduction": "cooldown_reduction",
-                            "health": "health",
-                            "healthMax": "health_max",
-                            "healthRegen": "health_regen",
-                            "lifesteal": "lifesteal",
-                            "magicPen": "magic_pen",
-                            "magicPenPercent": "magic_pen_percent",
-                            "magicResist": "magic_resist",
-                            "movementSpeed": "movement_speed",
-                            "omnivamp": "omnivamp",
-                            "physicalVamp": "physical_vamp",
-                            "power": "power",
-                            "powerMax": "power_max",
-                            "powerRegen": "power_regen",
-                            "spellVamp": "spell_vamp",
-                        }
-                        return {m.get(k, k): v for k, v in d.items()}
-
-                    def _ds_map(d: dict[str, Any]) -> dict[str, Any]:
-                        m = {
-                            "magicDamageDone": "magic_damage_done",
-                            "magicDamageDoneToChampions": "magic_damage_done_to_champions",
-                            "magicDamageTaken": "magic_damage_taken",
-                            "physicalDamageDone": "physical_damage_done",
-                            "physicalDamageDoneToChampions": "physical_damage_done_to_champions",
-                            "physicalDamageTaken": "physical_damage_taken",
-                            "totalDamageDone": "total_damage_done",
-                            "totalDamageDoneToChampions": "total_damage_done_to_champions",
-                            "totalDamageTaken": "total_damage_taken",
-                            "trueDamageDone": "true_damage_done",
-                            "trueDamageDoneToChampions": "true_damage_done_to_champions",
-                            "trueDamageTaken": "true_damage_taken",
-                        }
-                        return {m.get(k, k): v for k, v in d.items()}
-
-                    frames: list[dict[str, Any]] = []
-                    for fr in raw.get("info", {}).get("frames", []) or []:
-                        pf_raw = fr.get("participantFrames", {}) or {}
-                        pf_conv: dict[str, Any] = {}
-                        for key, val in pf_raw.items():
-                            if isinstance(val, dict):
-                                pf_conv[str(key)] = {
-                                    "participant_id": int(val.get("participantId", key)),
-                                    "champion_stats": _cs_map(val.get("championStats", {})),
-                                    "damage_stats": _ds_map(val.get("damageStats", {})),
-                                    "current_gold": val.get("currentGold", 0),
-                                    "gold_per_second": val.get("goldPerSecond", 0),
-                                    "jungle_minions_killed": val.get("jungleMinionsKilled", 0),
-                                    "level": val.get("level", 1),
-                                    "minions_killed": val.get("minionsKilled", 0),
-                                    "position": val.get("position", {}),
-                                    "time_enemy_spent_controlled": val.get(
-                                        "timeEnemySpentControlled", 0
-                                    ),
-                                    "total_gold": val.get("totalGold", 0),
-                                    "xp": val.get("xp", 0),
-                                }
-                        frames.append(
-                            {
-                                "timestamp": fr.get("timestamp", 0),
-                                "participant_frames": pf_conv,
-                                "events": fr.get("events", []),
-                            }
-                        )
-
-                    meta = raw.get("metadata", {})
-                    info = raw.get("info", {})
-                    game_id = 0
-                    if match_details and isinstance(match_details.get("info"), dict):
-                        try:
-                            game_id = int(match_details["info"].get("gameId", 0))
-                        except Exception:
-                            game_id = 0
-
-                    return {
-                        "metadata": {
-                            "data_version": meta.get("dataVersion", ""),
-                            "match_id": meta.get("matchId", match_id),
-                            "participants": meta.get("participants", []),
-                        },
-                        "info": {
-                            "frame_interval": info.get("frameInterval", 60000),
-                            "frames": frames,
-                            "game_id": game_id,
-                            "participants": participants_map,
-                        },
-                    }
+                    return convert_match_timeline(raw, match_id, match_details)
                 if resp.status == 404:
                     return None
                 if resp.status == 429:
@@ -374,3 +254,133 @@ class RiotAPIAdapter(RiotAPIPort):
         if pr in sea:
             return "sea"
         return "americas"
+
+
+_CHAMPION_STATS_KEYS = {
+    "abilityHaste": "ability_haste",
+    "abilityPower": "ability_power",
+    "armor": "armor",
+    "armorPen": "armor_pen",
+    "armorPenPercent": "armor_pen_percent",
+    "attackDamage": "attack_damage",
+    "attackSpeed": "attack_speed",
+    "bonusArmorPenPercent": "bonus_armor_pen_percent",
+    "bonusMagicPenPercent": "bonus_magic_pen_percent",
+    "ccReduction": "cc_reduction",
+    "cooldownReduction": "cooldown_reduction",
+    "health": "health",
+    "healthMax": "health_max",
+    "healthRegen": "health_regen",
+    "lifesteal": "lifesteal",
+    "magicPen": "magic_pen",
+    "magicPenPercent": "magic_pen_percent",
+    "magicResist": "magic_resist",
+    "movementSpeed": "movement_speed",
+    "omnivamp": "omnivamp",
+    "physicalVamp": "physical_vamp",
+    "power": "power",
+    "powerMax": "power_max",
+    "powerRegen": "power_regen",
+    "spellVamp": "spell_vamp",
+}
+
+_DAMAGE_STATS_KEYS = {
+    "magicDamageDone": "magic_damage_done",
+    "magicDamageDoneToChampions": "magic_damage_done_to_champions",
+    "magicDamageTaken": "magic_damage_taken",
+    "physicalDamageDone": "physical_damage_done",
+    "physicalDamageDoneToChampions": "physical_damage_done_to_champions",
+    "physicalDamageTaken": "physical_damage_taken",
+    "totalDamageDone": "total_damage_done",
+    "totalDamageDoneToChampions": "total_damage_done_to_champions",
+    "totalDamageTaken": "total_damage_taken",
+    "trueDamageDone": "true_damage_done",
+    "trueDamageDoneToChampions": "true_damage_done_to_champions",
+    "trueDamageTaken": "true_damage_taken",
+}
+
+
+def convert_match_timeline(
+    raw: dict[str, Any], match_id: str, match_details: dict[str, Any] | None
+) -> dict[str, Any]:
+    """Convert a raw Match-V5 timeline into the snake_case `MatchTimeline` shape.
+
+    The result is safe for `MatchTimeline.from_trusted` (no re-validation).
+    """
+    # Participants mapping
+    participants_map: list[dict[str, Any]] = []
+    if match_details and isinstance(match_details.get("info"), dict):
+        info_md = match_details["info"]
+        parts = info_md.get("participants", [])
+        if isinstance(parts, list):
+            for i, p in enumerate(parts[:10]):
+                participants_map.append(
+                    {
+                        "participant_id": int(p.get("participantId", i + 1)),
+                        "puuid": str(p.get("puuid", "")),
+                    }
+                )
+    if not participants_map:
+        meta_parts = raw.get("metadata", {}).get("participants", [])
+        if isinstance(meta_parts, list) and len(meta_parts) == 10:
+            participants_map = [
+                {"participant_id": i + 1, "puuid": str(p)} for i, p in enumerate(meta_parts)
+            ]
+
+    # Convert frames
+    frames: list[dict[str, Any]] = []
+    for fr in raw.get("info", {}).get("frames", []) or []:
+        pf_raw = fr.get("participantFrames", {}) or {}
+        pf_conv: dict[str, Any] = {}
+        for key, val in pf_raw.items():
+            if isinstance(val, dict):
+                pf_conv[str(key)] = {
+                    "participant_id": int(val.get("participantId", key)),
+                    "champion_stats": {
+                        _CHAMPION_STATS_KEYS.get(k, k): v
+                        for k, v in val.get("championStats", {}).items()
+                    },
+                    "damage_stats": {
+                        _DAMAGE_STATS_KEYS.get(k, k): v
+                        for k, v in val.get("damageStats", {}).items()
+                    },
+                    "current_gold": val.get("currentGold", 0),
+                    "gold_per_second": val.get("goldPerSecond", 0),
+                    "jungle_minions_killed": val.get("jungleMinionsKilled", 0),
+                    "level": val.get("level", 1),
+                    "minions_killed": val.get("minionsKilled", 0),
+                    "position": val.get("position", {}),
+                    "time_enemy_spent_controlled": val.get("timeEnemySpentControlled", 0),
+                    "total_gold": val.get("totalGold", 0),
+                    "xp": val.get("xp", 0),
+                }
+        frames.append(
+            {
+                "timestamp": fr.get("timestamp", 0),
+                "participant_frames": pf_conv,
+                "events": fr.get("events", []),
+            }
+        )
+
+    meta = raw.get("metadata", {})
+    info = raw.get("info", {})
+    game_id = 0
+    if match_details and isinstance(match_details.get("info"), dict):
+        try:
+            game_id = int(match_details["info"].get("gameId", 0))
+        except Exception:
+            game_id = 0
+
+    return {
+        "metadata": {
+            "data_version": meta.get("dataVersion", ""),
+            "match_id": meta.get("matchId", match_id),
+            "participants": meta.get("participants", []),
+        },
+        "info": {
+            "frame_interval": info.get("frameInterval", 60000),
+            "frames": frames,
+            "game_id": game_id,
+            "participants": participants_map,
+        },
+    }
@@ -32,13 +32,13 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
 
-import aioboto3
 import aiohttp
 
+from src.adapters.local_artifact_store import record_local_artifact
+from src.adapters.object_storage import get_object_storage, write_local_file
 from src.config.settings import settings
 from src.core.ports import TTSPort
 from src.core.observability import llm_debug_wrapper
-import contextlib
 
 logger = logging.getLogger(__name__)
 
@@ -859,11 +859,10 @@ class TTSAdapter(TTSPort):
             Exception: If file save fails or configuration is missing
 
         Implementation Notes:
-            - Saves files to local static directory
+            - Uploads through the shared ObjectStorage client when S3 is configured
+            - Otherwise saves to the local static directory (written off the event loop)
             - Organizes files by date and match_id for easy cleanup
-            - Returns URL served by local web server
         """
-        import aiofiles
         from pathlib import Path
 
         timestamp = datetime.utcnow()
@@ -873,49 +872,17 @@ class TTSAdapter(TTSPort):
         relative_path = f"{date_prefix}/{match_id}{emotion_suffix}_{file_uuid}.mp3"
         object_key = relative_path.replace("\\", "/")
 
-        s3_bucket = getattr(settings, "audio_s3_bucket", None)
-        s3_access_key = getattr(settings, "audio_s3_access_key", None)
-        s3_secret_key = getattr(settings, "audio_s3_secret_key", None)
-        s3_endpoint = getattr(settings, "audio_s3_endpoint", None)
-
-        if s3_bucket and s3_access_key and s3_secret_key and s3_endpoint:
+        storage = get_object_storage()
+        if storage is not None:
             try:
-                session = aioboto3.Session()
-                client_kwargs: dict[str, Any] = {
-                    "endpoint_url": s3_endpoint,
-                    "aws_access_key_id": s3_access_key,
-                    "aws_secret_access_key": s3_secret_key,
-                }
-                region = getattr(settings, "audio_s3_region", None)
-                if region:
-                    client_kwargs["region_name"] = region
-
-                async with session.client("s3", **client_kwargs) as s3:
-                    put_kwargs: dict[str, Any] = {
-                        "Bucket": s3_bucket,
-                        "Key": object_key,
-                        "Body": audio_data,
-                        "ContentType": "audio/mpeg",
-                    }
-                    # Public read access if bucket policy allows ACLs
-                    with contextlib.suppress(Exception):
-                        put_kwargs["ACL"] = "public-read"
-                    await s3.put_object(**put_kwargs)
-
-                public_base = getattr(settings, "audio_s3_public_base_url", None)
-                if public_base:
-                    public_url = f"{public_base.rstrip('/')}/{object_key}"
-                else:
-                    endpoint = s3_endpoint.rstrip("/")
-                    if getattr(settings, "audio_s3_path_style", True):
-                        public_url = f"{endpoint}/{s3_bucket}/{object_key}"
-                    else:
-                        public_url = f"{endpoint.replace('https://', f'https://{s3_bucket}.').replace('http://', f'http://{s3_bucket}.')}/{object_key}"
-
+                # Shared pooled client; large clips go up as a streamed multipart upload
+                public_url = await storage.put_bytes(
+                    object_key, audio_data, content_type="audio/mpeg"
+                )
                 logger.info(
                     "S3 audio upload successful",
                     extra={
-                        "bucket": s3_bucket,
+                        "bucket": storage.bucket,
                         "key": object_key,
                         "public_url": public_url,
                     },
@@ -932,17 +899,16 @@ class TTSAdapter(TTSPort):
         storage_path = getattr(settings, "audio_storage_path", "static/audio")
         base_url = getattr(settings, "audio_base_url", "http://localhost:3000/static/audio")
 
-        full_dir = Path(storage_path) / date_prefix
-        full_dir.mkdir(parents=True, exist_ok=True)
-        file_path = full_dir / f"{match_id}{emotion_suffix}_{file_uuid}.mp3"
+        file_path = Path(storage_path) / date_prefix / f"{match_id}{emotion_suffix}_{file_uuid}.mp3"
 
         logger.info(
             f"Saving audio to local storage (path: {file_path}, size: {len(audio_data)} bytes)"
         )
 
         try:
-            async with aiofiles.open(file_path, "wb") as f:
-                await f.write(audio_data)
+            await write_local_file(file_path, audio_data)
+            # Indexed for replay checks and TTL/size eviction by the serving process
+            await record_local_artifact(file_path, len(audio_data))
 
             logger.info(f"Local storage save successful (path: {file_path})")
 
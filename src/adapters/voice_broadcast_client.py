@@ -9,12 +9,17 @@ import aiohttp
 
 from src.config.settings import get_settings
 from src.core.ports import VoiceBroadcastPort
+from src.core.services.shard_routing import FORWARDED_HEADER, ShardRouter
 
 logger = logging.getLogger(__name__)
 
 
 class VoiceBroadcastHttpClient(VoiceBroadcastPort):
-    """Invoke the callback server's /broadcast endpoint."""
+    """Invoke the callback server's /broadcast endpoint.
+
+    With a `ShardRouter`, requests go straight to the bot process that owns the
+    guild's shard instead of hopping through the default server.
+    """
 
     def __init__(
         self,
@@ -23,6 +28,7 @@ class VoiceBroadcastHttpClient(VoiceBroadcastPort):
         secret: str | None = None,
         session: aiohttp.ClientSession | None = None,
         request_timeout: float = 5.0,
+        router: ShardRouter | None = None,
     ) -> None:
         settings = get_settings()
         self._base_url = (base_url or settings.broadcast_server_url).rstrip("/")
@@ -30,6 +36,7 @@ class VoiceBroadcastHttpClient(VoiceBroadcastPort):
         self._timeout = aiohttp.ClientTimeout(total=request_timeout)
         self._session = session
         self._owns_session = session is None
+        self._router = router
 
     async def broadcast_to_user(
         self, *, guild_id: int, user_id: int, match_id: str
@@ -39,12 +46,24 @@ class VoiceBroadcastHttpClient(VoiceBroadcastPort):
             "guild_id": guild_id,
             "user_id": user_id,
         }
+        owner = self._router.owner_url(guild_id) if self._router is not None else None
+        return await self.post(payload, base_url=owner or self._base_url)
+
+    async def post(
+        self, payload: dict[str, Any], *, base_url: str, forwarded: bool = False
+    ) -> tuple[bool, str]:
+        """POST ``payload`` to ``{base_url}/broadcast`` and return (ok, message)."""
+        match_id = payload.get("match_id")
+        guild_id = payload.get("guild_id")
+        user_id = payload.get("user_id")
         headers: dict[str, str] = {}
         if self._secret:
             headers["X-Auth-Token"] = self._secret
+        if forwarded:
+            headers[FORWARDED_HEADER] = "1"
 
         session = await self._ensure_session()
-        url = f"{self._base_url}/broadcast"
+        url = f"{base_url.rstrip('/')}/broadcast"
 
         try:
             async with session.post(url, json=payload, headers=headers) as resp:
@@ -0,0 +1,335 @@
+"""Redis Streams bus for voice broadcast requests.
+
+``POST /broadcast`` used to run the whole request inline: DB lookups, possibly
+a TTS synthesis, then playback, with the caller's HTTP request (and an aiohttp
+handler) held open throughout, so long syntheses timed callers out.
+
+Instead, producers (Celery workers, the HTTP endpoint) append a
+`VoiceBroadcastJob` to a stream and return. Each guild's shard has its own
+stream (``chimera:voice:broadcast:<shard>``, or a single unsuffixed stream
+when unsharded). The bot process owning those shards reads them through the
+``bot`` consumer group, so a job only ever reaches a process that can join
+the guild's voice.
+
+Delivery is at-least-once:
+
+- An entry is acked once its handler returns, whether or not playback worked.
+- If the handler raised, or the process died mid-job, the entry stays pending.
+  Once idle for ``claim_idle_ms`` it is claimed again.
+- After ``max_attempts`` deliveries the entry is acked as failed.
+
+Callers that want the outcome set ``reply`` and block on the job's reply key
+(a short-lived Redis list).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import redis.asyncio as aioredis
+from redis.exceptions import ResponseError
+
+from src.config.settings import get_settings
+from src.contracts.tasks import VoiceBroadcastJob
+from src.core.ports import VoiceBroadcastPort
+from src.core.services.shard_routing import ShardRouter
+
+logger = logging.getLogger(__name__)
+
+STREAM_PREFIX = "chimera:voice:broadcast"
+REPLY_PREFIX = "chimera:voice:reply"
+CONSUMER_GROUP = "bot"
+REPLY_TTL_SECONDS = 300
+
+# Runs one job's /broadcast payload and returns the JSON result ({"ok": ..., ...})
+BroadcastHandler = Callable[[dict[str, Any]], Awaitable[dict[str, Any]]]
+
+
+def stream_key(shard_id: int | None) -> str:
+    return STREAM_PREFIX if shard_id is None else f"{STREAM_PREFIX}:{shard_id}"
+
+
+def reply_key(job_id: str) -> str:
+    return f"{REPLY_PREFIX}:{job_id}"
+
+
+class VoiceBroadcastBus:
+    """Publish jobs and exchange replies over a `redis.asyncio` client (decoded responses)."""
+
+    def __init__(self, client: Any, router: ShardRouter, *, maxlen: int = 10_000) -> None:
+        self._client = client
+        self._router = router
+        self._maxlen = maxlen
+
+    @property
+    def client(self) -> Any:
+        return self._client
+
+    async def publish(self, payload: dict[str, Any], *, reply: bool = False) -> str:
+        """Append a /broadcast payload to its guild's shard stream; returns the job ID."""
+        guild_id = int(payload["guild_id"])
+        job = VoiceBroadcastJob(
+            job_id=uuid.uuid4().hex,
+            guild_id=guild_id,
+            payload=payload,
+            enqueued_at=time.time(),
+            reply=reply,
+        )
+        stream = stream_key(self._router.shard_for(guild_id))
+        await self._client.xadd(
+            stream, {"job": job.model_dump_json()}, maxlen=self._maxlen, approximate=True
+        )
+        logger.info(
+            "voice_broadcast_published",
+            extra={"job_id": job.job_id, "guild_id": guild_id, "stream": stream},
+        )
+        return job.job_id
+
+    async def wait_reply(self, job_id: str, timeout: float) -> dict[str, Any] | None:
+        """Block until the job's result arrives; None on timeout."""
+        # BLPOP treats 0 as "wait forever"
+        popped = await self._client.blpop([reply_key(job_id)], timeout=max(timeout, 0.01))
+        if not popped:
+            return None
+        try:
+            result = json.loads(popped[1])
+        except (TypeError, ValueError):
+            return None
+        return result if isinstance(result, dict) else None
+
+    async def reply(self, job_id: str, result: dict[str, Any]) -> None:
+        key = reply_key(job_id)
+        async with self._client.pipeline(transaction=False) as pipe:
+            pipe.rpush(key, json.dumps(result, default=str))
+            pipe.expire(key, REPLY_TTL_SECONDS)
+            await pipe.execute()
+
+
+async def publish_voice_broadcast(payload: dict[str, Any]) -> str:
+    """One-shot publish for processes without a long-lived client (Celery tasks)."""
+    settings = get_settings()
+    client = aioredis.from_url(settings.redis_url, encoding="utf-8", decode_responses=True)
+    try:
+        bus = VoiceBroadcastBus(
+            client,
+            ShardRouter.from_settings(settings),
+            maxlen=settings.voice_broadcast_stream_maxlen,
+        )
+        return await bus.publish(payload)
+    finally:
+        await client.aclose()
+
+
+class VoiceBroadcastStreamClient(VoiceBroadcastPort):
+    """`VoiceBroadcastPort` over the stream: publish, then wait for the bot's reply."""
+
+    def __init__(self, bus: VoiceBroadcastBus, *, reply_timeout: float) -> None:
+        self._bus = bus
+        self._reply_timeout = reply_timeout
+
+    async def broadcast_to_user(
+        self, *, guild_id: int, user_id: int, match_id: str
+    ) -> tuple[bool, str]:
+        payload = {"match_id": match_id, "guild_id": guild_id, "user_id": user_id}
+        try:
+            job_id = await self._bus.publish(payload, reply=True)
+            result = await self._bus.wait_reply(job_id, self._reply_timeout)
+        except Exception as exc:
+            logger.error(
+                "Broadcast publish failed match=%s guild=%s user=%s error=%s",
+                match_id,
+                guild_id,
+                user_id,
+                exc,
+            )
+            return False, "redis_error"
+        if result is None:
+            return False, "reply_timeout"
+        ok = bool(result.get("ok"))
+        return ok, str(result.get("message") or result.get("error") or "unknown")
+
+
+class VoiceBroadcastConsumer:
+    """Consume the shard streams owned by this process and run their jobs.
+
+    Up to ``concurrency`` jobs run at once (they usually target different
+    guilds; per-guild ordering of playback is kept by VoiceBroadcastService).
+    """
+
+    def __init__(
+        self,
+        bus: VoiceBroadcastBus,
+        handler: BroadcastHandler,
+        *,
+        streams: list[str],
+        consumer: str | None = None,
+        concurrency: int = 8,
+        max_attempts: int = 3,
+        claim_idle_ms: int = 120_000,
+        block_ms: int = 5_000,
+    ) -> None:
+        self._bus = bus
+        self._client = bus.client
+        self._handler = handler
+        self._streams = streams
+        self._consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+        self._concurrency = max(1, concurrency)
+        self._slots = asyncio.Semaphore(self._concurrency)
+        self._max_attempts = max(1, max_attempts)
+        self._claim_idle_ms = claim_idle_ms
+        self._block_ms = block_ms
+        self._active: set[str] = set()
+        self._jobs: set[asyncio.Task[None]] = set()
+        self._runner: asyncio.Task[None] | None = None
+
+    async def ensure_groups(self) -> None:
+        for stream in self._streams:
+            try:
+                await self._client.xgroup_create(stream, CONSUMER_GROUP, id="0", mkstream=True)
+            except ResponseError as exc:
+                if "BUSYGROUP" not in str(exc):
+                    raise
+
+    def start(self) -> None:
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            self._runner.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._runner
+            self._runner = None
+        # Unfinished jobs stay pending and are reclaimed after a restart
+        for task in list(self._jobs):
+            task.cancel()
+        if self._jobs:
+            await asyncio.gather(*self._jobs, return_exceptions=True)
+
+    async def _run(self) -> None:
+        await self.ensure_groups()
+        next_claim = 0.0
+        while True:
+            try:
+                if time.monotonic() >= next_claim:
+                    await self.reclaim()
+                    next_claim = time.monotonic() + self._claim_idle_ms / 2000
+                await self.poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("voice_broadcast_consumer_error")
+                await asyncio.sleep(1.0)
+
+    async def poll(self) -> int:
+        """Read new entries into free job slots; returns how many were started."""
+        free = self._concurrency - len(self._active)
+        if free <= 0:
+            await asyncio.sleep(0.05)
+            return 0
+        batches = await self._client.xreadgroup(
+            CONSUMER_GROUP,
+            self._consumer,
+            {stream: ">" for stream in self._streams},
+            count=free,
+            block=self._block_ms,
+        )
+        started = 0
+        for stream, entries in batches or []:
+            for entry_id, fields in entries:
+                await self._spawn(stream, entry_id, fields)
+                started += 1
+        return started
+
+    async def reclaim(self) -> int:
+        """Retry entries left pending by failed or dead consumers; drop exhausted ones."""
+        retried = 0
+        for stream in self._streams:
+            pending = await self._client.xpending_range(
+                stream, CONSUMER_GROUP, min="-", max="+", count=50, idle=self._claim_idle_ms
+            )
+            for info in pending:
+                entry_id = info["message_id"]
+                if entry_id in self._active:
+                    continue  # still running here (long synthesis)
+                claimed = await self._client.xclaim(
+                    stream, CONSUMER_GROUP, self._consumer, self._claim_idle_ms, [entry_id]
+                )
+                for claimed_id, fields in claimed:
+                    if info["times_delivered"] >= self._max_attempts:
+                        await self._give_up(stream, claimed_id, fields, info["times_delivered"])
+                        continue
+                    await self._spawn(stream, claimed_id, fields)
+                    retried += 1
+        return retried
+
+    async def _spawn(self, stream: str, entry_id: str, fields: dict[str, Any]) -> None:
+        await self._slots.acquire()
+        self._active.add(entry_id)
+        task = asyncio.create_task(self._process(stream, entry_id, fields))
+        self._jobs.add(task)
+        task.add_done_callback(self._jobs.discard)
+
+    async def _process(self, stream: str, entry_id: str, fields: dict[str, Any]) -> None:
+        try:
+            job = self._parse(fields)
+            if job is None:
+                logger.warning("voice_broadcast_bad_entry", extra={"entry_id": entry_id})
+                await self._client.xack(stream, CONSUMER_GROUP, entry_id)
+                return
+            try:
+                result = await self._handler(job.payload)
+            except Exception:
+                # Left pending: reclaimed and retried once idle for claim_idle_ms
+                logger.exception(
+                    "voice_broadcast_job_error",
+                    extra={"job_id": job.job_id, "guild_id": job.guild_id},
+                )
+                return
+            await self._client.xack(stream, CONSUMER_GROUP, entry_id)
+            if job.reply:
+                await self._bus.reply(job.job_id, result)
+            logger.info(
+                "voice_broadcast_job_done",
+                extra={
+                    "job_id": job.job_id,
+                    "guild_id": job.guild_id,
+                    "ok": bool(result.get("ok")),
+                    "queue_ms": int((time.time() - job.enqueued_at) * 1000),
+                },
+            )
+        finally:
+            self._active.discard(entry_id)
+            self._slots.release()
+
+    async def _give_up(
+        self, stream: str, entry_id: str, fields: dict[str, Any], attempts: int
+    ) -> None:
+        job = self._parse(fields)
+        logger.error(
+            "voice_broadcast_job_exhausted",
+            extra={
+                "entry_id": entry_id,
+                "job_id": job.job_id if job else None,
+                "attempts": attempts,
+            },
+        )
+        await self._client.xack(stream, CONSUMER_GROUP, entry_id)
+        if job is not None and job.reply:
+            await self._bus.reply(job.job_id, {"ok": False, "error": "max_attempts_exceeded"})
+
+    @staticmethod
+    def _parse(fields: dict[str, Any]) -> VoiceBroadcastJob | None:
+        try:
+            return VoiceBroadcastJob.model_validate_json(fields["job"])
+        except Exception:
+            return None
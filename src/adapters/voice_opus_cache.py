@@ -0,0 +1,181 @@
+"""On-disk cache of TTS clips pre-transcoded to Ogg/Opus.
+
+Playing an MP3 through `FFmpegPCMAudio` decodes it to PCM, optionally runs the
+CPU-heavy ``loudnorm`` filter, and then discord.py re-encodes every 20 ms frame
+to Opus through libopus. A clip replayed via the voice button paid all of that
+on every play.
+
+Here a clip is transcoded once, with its loudness, volume and duration cap
+baked in, to an Ogg/Opus file under the audio storage tree. Replays use
+``FFmpegOpusAudio(codec="copy")``: FFmpeg only demuxes the Ogg pages and
+discord.py sends the Opus packets as they are, with no decode, filter or
+re-encode on the bot host.
+
+Cache entries are keyed by source URL plus the playback parameters, because
+each of those changes the audio that gets baked in. Transcodes run in
+the background after a first (PCM) playback. Concurrent requests for the
+same clip share one FFmpeg run.
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import logging
+import os
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class OpusClipCache:
+    """Transcode-once store for voice clips, played back via Opus passthrough."""
+
+    def __init__(
+        self,
+        directory: str | Path,
+        *,
+        bitrate_kbps: int = 64,
+        executable: str = "ffmpeg",
+        timeout_seconds: float = 60.0,
+    ) -> None:
+        self._dir = Path(directory)
+        self._bitrate_kbps = int(bitrate_kbps)
+        self._executable = executable
+        self._timeout = timeout_seconds
+        self._inflight: dict[str, asyncio.Task[Path | None]] = {}
+
+    @staticmethod
+    def key(audio_url: str, *, volume: float, normalize: bool, max_seconds: int | None) -> str:
+        cap = max_seconds if isinstance(max_seconds, int) and max_seconds > 0 else 0
+        raw = f"{audio_url}|v={volume:.3f}|n={int(bool(normalize))}|t={cap}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+    def path_for(self, key: str) -> Path:
+        # Two-level fan-out keeps directories small
+        return self._dir / key[:2] / f"{key}.opus"
+
+    def lookup(
+        self, audio_url: str, *, volume: float, normalize: bool, max_seconds: int | None
+    ) -> Path | None:
+        """Cached Opus file for this clip, or None if it has not been transcoded yet."""
+        if not audio_url:
+            return None
+        path = self.path_for(
+            self.key(audio_url, volume=volume, normalize=normalize, max_seconds=max_seconds)
+        )
+        try:
+            return path if path.stat().st_size > 0 else None
+        except OSError:
+            return None
+
+    def ffmpeg_args(
+        self,
+        audio_url: str,
+        output: Path,
+        *,
+        volume: float,
+        normalize: bool,
+        max_seconds: int | None,
+    ) -> list[str]:
+        args = [self._executable, "-hide_banner", "-loglevel", "error", "-nostdin", "-y"]
+        if audio_url.startswith(("http://", "https://")):
+            args += ["-reconnect", "1", "-reconnect_streamed", "1", "-reconnect_delay_max", "5"]
+        args += ["-i", audio_url, "-vn"]
+        filters = ["loudnorm"] if normalize else []
+        filters.append(f"volume={volume:.3f}")
+        args += ["-filter:a", ",".join(filters)]
+        if isinstance(max_seconds, int) and max_seconds > 0:
+            args += ["-t", str(max_seconds)]
+        # Discord voice is 48 kHz stereo Opus; 20 ms frames match its packetisation
+        args += ["-ac", "2", "-ar", "48000", "-c:a", "libopus"]
+        args += ["-b:a", f"{self._bitrate_kbps}k", "-frame_duration", "20"]
+        args += ["-f", "ogg", str(output)]
+        return args
+
+    async def ensure(
+        self, audio_url: str, *, volume: float, normalize: bool, max_seconds: int | None
+    ) -> Path | None:
+        """Return the cached clip, transcoding it first if needed (None on failure)."""
+        cached = self.lookup(audio_url, volume=volume, normalize=normalize, max_seconds=max_seconds)
+        if cached is not None or not audio_url:
+            return cached
+        task = self._start(audio_url, volume=volume, normalize=normalize, max_seconds=max_seconds)
+        return await asyncio.shield(task)
+
+    def schedule(
+        self, audio_url: str, *, volume: float, normalize: bool, max_seconds: int | None
+    ) -> None:
+        """Start a background transcode unless the clip is cached or already in progress."""
+        if not audio_url or self.lookup(
+            audio_url, volume=volume, normalize=normalize, max_seconds=max_seconds
+        ):
+            return
+        self._start(audio_url, volume=volume, normalize=normalize, max_seconds=max_seconds)
+
+    def _start(
+        self, audio_url: str, *, volume: float, normalize: bool, max_seconds: int | None
+    ) -> asyncio.Task[Path | None]:
+        key = self.key(audio_url, volume=volume, normalize=normalize, max_seconds=max_seconds)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(
+                self._transcode(
+                    key, audio_url, volume=volume, normalize=normalize, max_seconds=max_seconds
+                )
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t: self._inflight.pop(key, None))
+        return task
+
+    async def _transcode(
+        self,
+        key: str,
+        audio_url: str,
+        *,
+        volume: float,
+        normalize: bool,
+        max_seconds: int | None,
+    ) -> Path | None:
+        dest = self.path_for(key)
+        tmp = dest.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            proc = await asyncio.create_subprocess_exec(
+                *self.ffmpeg_args(
+                    audio_url, tmp, volume=volume, normalize=normalize, max_seconds=max_seconds
+                ),
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            try:
+                _, stderr = await asyncio.wait_for(proc.communicate(), timeout=self._timeout)
+            except TimeoutError:
+                proc.kill()
+                await proc.wait()
+                raise
+            if proc.returncode != 0 or not tmp.exists() or tmp.stat().st_size == 0:
+                logger.warning(
+                    "opus_transcode_failed",
+                    extra={
+                        "key": key,
+                        "returncode": proc.returncode,
+                        "stderr": (stderr or b"").decode("utf-8", "replace")[-300:],
+                    },
+                )
+                return None
+            # Atomic publish: readers never see a half-written file
+            os.replace(tmp, dest)
+            logger.info("opus_transcode_cached", extra={"key": key, "bytes": dest.stat().st_size})
+            return dest
+        except Exception:
+            logger.warning("opus_transcode_error", extra={"key": key}, exc_info=True)
+            return None
+        finally:
+            with contextlib.suppress(OSError):
+                tmp.unlink()
+
+    def close(self) -> None:
+        for task in list(self._inflight.values()):
+            task.cancel()
+        self._inflight.clear()
@@ -11,20 +11,36 @@ Critical handlers are traced via `llm_debug_wrapper` for production
 observability (RSO and feedback flows).
 """
 
+import contextlib
 import logging
+from collections.abc import Awaitable, Callable
+from pathlib import Path
 from typing import Any
 import time
 
 from aiohttp import web
 import aiohttp
-from pathlib import Path
 
 from src.adapters.database import DatabaseAdapter
+from src.adapters.local_artifact_store import (
+    LocalArtifactIndex,
+    LocalStorageJanitor,
+    local_audio_available,
+)
 from src.adapters.redis_adapter import RedisAdapter
 from src.adapters.rso_adapter import RSOAdapter
 from src.adapters.tts_adapter import TTSAdapter, TTSError
+from src.adapters.voice_opus_cache import OpusClipCache
 from src.config.settings import get_settings
 from src.core.observability import clear_correlation_id, llm_debug_wrapper, set_correlation_id
+from src.api.static_media import StaticMediaHandler
+from src.adapters.voice_broadcast_stream import (
+    VoiceBroadcastBus,
+    VoiceBroadcastConsumer,
+    stream_key,
+)
+from src.core.services.shard_routing import FORWARDED_HEADER, ShardRouter
+from src.core.services.tts_precompute import await_precomputed_tts
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +57,16 @@ def _select_personal_tts_summary(meta: dict[str, Any]) -> str | None:
     return candidate
 
 
+def _int_field(data: dict[str, Any], key: str) -> int | None:
+    """Integer id from a JSON body (number or digit string); None if absent or malformed."""
+    value = data.get(key)
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value)
+    return None
+
+
 class RSOCallbackServer:
     """HTTP server for handling RSO OAuth callbacks."""
 
@@ -63,8 +89,19 @@ class RSOCallbackServer:
         self.redis = redis_adapter
         self.app = web.Application()
         self.discord_adapter = discord_adapter
+        # Shared with the bot's voice playback: clips it transcoded are served as Opus
+        self.opus_cache: OpusClipCache | None = getattr(discord_adapter, "opus_cache", None)
         # 短期播放防抖（guild_id, channel_id) → last_ts
         self._recent_voice_keys: dict[tuple[int, int], float] = {}
+        # Broadcasts for guilds on another process's shards are forwarded to it
+        self.shard_router = ShardRouter.from_settings(get_settings())
+        # Redis stream bus (VOICE_BROADCAST_STREAM_ENABLED): set up in start()
+        self.broadcast_bus: VoiceBroadcastBus | None = None
+        self._broadcast_consumer: VoiceBroadcastConsumer | None = None
+        # Local audio/build-visual index + eviction loop: set up in start()
+        self.artifact_index: LocalArtifactIndex | None = None
+        self._storage_janitor: LocalStorageJanitor | None = None
+        self.app.middlewares.append(self._track_static_access)
         self._setup_routes()
 
     def _setup_routes(self) -> None:
@@ -76,6 +113,8 @@ class RSOCallbackServer:
         self.app.router.add_get("/health", self.health_check)
         # /metrics endpoint for Prometheus scraping
         self.app.router.add_get("/metrics", self.metrics)
+        # Collapsed-stack profiles captured by the Celery task sampler
+        self.app.router.add_get("/admin/profile", self.profile)
         # Optional tournament callback/broadcast (dev/testing)
         self.app.router.add_post("/riot/tournament_callback", self.riot_tournament_callback)
         self.app.router.add_post("/broadcast", self.trigger_broadcast)
@@ -84,44 +123,38 @@ class RSOCallbackServer:
         # Feedback collection endpoint (CLI 1 → CLI 2)
         self.app.router.add_post("/api/v1/feedback", self.handle_feedback)
 
-        # Serve generated static assets (e.g., TTS audio) via callback server
-        try:
-            from pathlib import Path
-
-            settings = get_settings()
-            audio_dir = Path(settings.audio_storage_path)
-            if not audio_dir.is_absolute():
-                audio_dir = Path.cwd() / audio_dir
-            if audio_dir.exists():
-                # Mount at /static/audio/... so existing URLs keep working
-                self.app.router.add_static("/static/audio/", audio_dir, show_index=False)
-                logger.info(f"Serving static audio from {audio_dir}")
-            else:
-                logger.warning(
-                    "Audio storage directory %s does not exist; static route not registered",
-                    audio_dir,
-                )
-        except Exception as exc:
-            logger.error(f"Failed to configure static audio route: {exc}")
+        # Generated TTS audio and build visuals (sendfile, Range, ETag, Cache-Control).
+        # Routes are registered even before the first file creates the directory.
+        settings = get_settings()
+        self.audio_media = StaticMediaHandler(
+            settings.audio_storage_path,
+            base_url=settings.audio_base_url,
+            immutable_max_age=settings.static_media_immutable_max_age_seconds,
+            max_age=settings.static_media_max_age_seconds,
+            variant_lookup=self._opus_variant,
+        )
+        self.build_media = StaticMediaHandler(
+            settings.build_visual_storage_path,
+            immutable_max_age=settings.static_media_immutable_max_age_seconds,
+            max_age=settings.static_media_max_age_seconds,
+        )
+        self.app.router.add_get("/static/audio/{path:.+}", self.audio_media.handle)
+        self.app.router.add_get("/static/builds/{path:.+}", self.build_media.handle)
+        logger.info(
+            "Serving static media from %s and %s", self.audio_media.root, self.build_media.root
+        )
 
-        # Serve build visual assets (出装图) if路径存在
-        try:
-            from pathlib import Path
-
-            settings = get_settings()
-            builds_dir = Path(settings.build_visual_storage_path)
-            if not builds_dir.is_absolute():
-                builds_dir = Path.cwd() / builds_dir
-            if builds_dir.exists():
-                self.app.router.add_static("/static/builds/", builds_dir, show_index=False)
-                logger.info(f"Serving build visuals from {builds_dir}")
-            else:
-                logger.debug(
-                    "Build visual directory %s does not exist; static route not registered",
-                    builds_dir,
-                )
-        except Exception as exc:
-            logger.error(f"Failed to configure static build visual route: {exc}")
+    def _opus_variant(self, audio_url: str) -> Path | None:
+        """Precomputed Opus file of a clip at the default voice settings, if cached."""
+        if self.opus_cache is None:
+            return None
+        settings = get_settings()
+        return self.opus_cache.lookup(
+            audio_url,
+            volume=settings.voice_volume_default,
+            normalize=settings.voice_normalize_default,
+            max_seconds=settings.voice_max_seconds_default,
+        )
 
     @llm_debug_wrapper(
         capture_result=False,
@@ -408,7 +441,8 @@ class RSOCallbackServer:
     async def metrics(self, request: web.Request) -> web.Response:
         """Prometheus metrics endpoint.
 
-        KISS: Pull dynamic gauges on demand to avoid background schedulers.
+        Queue gauges are kept fresh by the background refresher started in
+        `start()`; the call below is a throttled no-op when the cache is fresh.
         """
         try:
             from src.core.metrics import render_latest, update_dynamic_gauges
@@ -422,6 +456,22 @@ class RSOCallbackServer:
             logger.error(f"/metrics handler error: {e}")
             return web.Response(status=500, text="metrics unavailable")
 
+    async def profile(self, request: web.Request) -> web.Response:
+        """Serve merged collapsed stacks from the task profiler (flamegraph input).
+
+        Query: ?task=analyze_team_task to filter. Requires the broadcast token.
+        """
+        if not self._authorize_broadcast(request):
+            return web.json_response({"ok": False, "error": "unauthorized"}, status=401)
+        try:
+            from src.core.profiling import load_collapsed
+
+            body = load_collapsed(request.query.get("task"))
+            return web.Response(text=body, content_type="text/plain")
+        except Exception as e:
+            logger.error(f"/admin/profile handler error: {e}")
+            return web.Response(status=500, text="profile unavailable")
+
     def _authorize_broadcast(self, request: web.Request) -> bool:
         """Authorize broadcast/tournament callbacks using BROADCAST_WEBHOOK_SECRET."""
         settings = get_settings()
@@ -465,6 +515,14 @@ class RSOCallbackServer:
         match_id = str(data.get("match_id"))
         guild_id = int(data.get("guild_id"))
         channel_id = int(data.get("voice_channel_id"))
+        queued = await self._enqueue_broadcast(
+            {"match_id": match_id, "guild_id": guild_id, "voice_channel_id": channel_id}
+        )
+        if queued is not None:
+            return queued
+        routed = await self._route_to_shard_owner(request, guild_id, data)
+        if routed is not None:
+            return routed
 
         ok, msg = await self._broadcast_match_tts(guild_id, channel_id, match_id, None)
         return web.json_response({"ok": ok, "message": msg})
@@ -475,18 +533,50 @@ class RSOCallbackServer:
         JSON body: {"audio_url": "https://...", "guild_id": 123, "voice_channel_id": 456}
         or:        {"match_id": "NA1_...", "guild_id": 123, "voice_channel_id": 456}
         or:        {"match_id"|"audio_url": ..., "guild_id": 123, "user_id": 789}  # join user's channel
+
+        With the broadcast stream enabled the request is only queued (202);
+        the owning bot process runs it via `execute_broadcast`.
         """
-        correlation_token: str | None = None
+        if not self._authorize_broadcast(request):
+            return web.Response(status=401, text="unauthorized")
+
+        data = await request.json()
+        guild_id = _int_field(data, "guild_id")
+        if guild_id is None or (
+            data.get("user_id") is not None and _int_field(data, "user_id") is None
+        ):
+            return web.json_response({"ok": False, "error": "missing required fields"}, status=400)
+        queued = await self._enqueue_broadcast(data)
+        if queued is not None:
+            return queued
+        routed = await self._route_to_shard_owner(request, guild_id, data)
+        if routed is not None:
+            return routed
+        return web.json_response(await self.execute_broadcast(data))
+
+    async def _enqueue_broadcast(self, data: dict[str, Any]) -> web.Response | None:
+        """Publish to the broadcast stream when enabled; None means run inline."""
+        if self.broadcast_bus is None:
+            return None
         try:
-            if not self._authorize_broadcast(request):
-                return web.Response(status=401, text="unauthorized")
+            job_id = await self.broadcast_bus.publish(data)
+        except Exception as exc:
+            logger.error("broadcast_enqueue_failed", extra={"error": str(exc)})
+            return web.json_response({"ok": False, "error": "enqueue_failed"}, status=503)
+        return web.json_response({"ok": True, "queued": True, "job_id": job_id}, status=202)
 
-            data = await request.json()
+    async def execute_broadcast(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Run one /broadcast request body and return its JSON result."""
+        correlation_token: str | None = None
+        try:
             audio_url = data.get("audio_url")
-            guild_id = int(data.get("guild_id"))
+            guild_id = _int_field(data, "guild_id")
+            user_id = _int_field(data, "user_id")
+            # Stream jobs are checked again: a malformed one is dropped rather than retried
+            if guild_id is None or (data.get("user_id") is not None and user_id is None):
+                return {"ok": False, "error": "missing required fields"}
             channel_id_raw = data.get("voice_channel_id")
             channel_id = int(channel_id_raw) if channel_id_raw is not None else -1
-            user_id = int(data.get("user_id")) if data.get("user_id") is not None else None
 
             match_for_trace = data.get("match_id") or audio_url or "unknown"
             correlation_token = f"broadcast:{guild_id}:{match_for_trace}"
@@ -506,24 +596,24 @@ class RSOCallbackServer:
                                 "tts_url_enqueued_successfully",
                                 extra={"guild_id": guild_id, "channel_id": channel_id},
                             )
-                            return web.json_response({"ok": True, "queued": True})
+                            return {"ok": True, "queued": True}
                         logger.warning(
                             "voice_enqueue_failed_fallback_to_direct",
                             extra={"guild_id": guild_id, "channel_id": channel_id},
                         )
                         # Fallback to direct playback
                     ok = await self._play_audio(guild_id, channel_id, audio_url)
-                    return web.json_response({"ok": ok, "queued": False})
+                    return {"ok": ok, "queued": False}
                 if user_id is not None:
                     if not self.discord_adapter:
-                        return web.json_response({"ok": False, "error": "no_discord_adapter"})
+                        return {"ok": False, "error": "no_discord_adapter"}
                     ok = await self.discord_adapter.play_tts_to_user_channel(
                         guild_id=guild_id,
                         user_id=user_id,
                         audio_url=audio_url,
                     )
-                    return web.json_response({"ok": ok, "by_user": True})
-                return web.json_response({"ok": False, "error": "no_channel_or_user"})
+                    return {"ok": ok, "by_user": True}
+                return {"ok": False, "error": "no_channel_or_user"}
 
             match_id = str(data.get("match_id"))
             logger.info(
@@ -534,11 +624,64 @@ class RSOCallbackServer:
             logger.info(
                 "broadcast_tts_result", extra={"match_id": match_id, "ok": ok, "status": msg}
             )
-            return web.json_response({"ok": ok, "message": msg})
+            return {"ok": ok, "message": msg}
         finally:
             if correlation_token:
                 clear_correlation_id()
 
+    async def _route_to_shard_owner(
+        self, request: web.Request, guild_id: int, data: dict[str, Any]
+    ) -> web.Response | None:
+        """Relay a broadcast for a guild this process does not own; None if it is ours.
+
+        Only the process running the guild's shard can join its voice channels.
+        Requests already forwarded once are refused rather than bounced again.
+        """
+        if self.shard_router.is_local(guild_id):
+            return None
+        shard_id = self.shard_router.shard_for(guild_id)
+        owner = self.shard_router.owner_url(guild_id)
+        if owner is None or request.headers.get(FORWARDED_HEADER):
+            logger.warning(
+                "broadcast_shard_not_owned",
+                extra={"guild_id": guild_id, "shard_id": shard_id, "owner": owner},
+            )
+            return web.json_response(
+                {"ok": False, "error": "shard_not_owned", "shard_id": shard_id}, status=421
+            )
+
+        headers = {FORWARDED_HEADER: "1"}
+        token = request.headers.get("X-Auth-Token") or request.query.get("token")
+        if token:
+            headers["X-Auth-Token"] = token
+        try:
+            # Generous timeout: the owner may synthesize TTS before answering
+            timeout = aiohttp.ClientTimeout(total=60)
+            async with aiohttp.ClientSession(timeout=timeout) as session:
+                async with session.post(
+                    f"{owner}{request.path}", json=data, headers=headers
+                ) as resp:
+                    body = await resp.json(content_type=None)
+                    status = resp.status
+        except Exception as exc:
+            logger.error(
+                "broadcast_forward_failed",
+                extra={
+                    "guild_id": guild_id,
+                    "shard_id": shard_id,
+                    "owner": owner,
+                    "error": str(exc),
+                },
+            )
+            return web.json_response(
+                {"ok": False, "error": "shard_forward_failed", "shard_id": shard_id}, status=502
+            )
+        logger.info(
+            "broadcast_forwarded",
+            extra={"guild_id": guild_id, "shard_id": shard_id, "owner": owner, "status": status},
+        )
+        return web.json_response(body, status=status)
+
     async def alert_webhook(self, request: web.Request) -> web.Response:
         """Accept Alertmanager webhook and forward to Discord webhook.
 
@@ -635,6 +778,15 @@ class RSOCallbackServer:
                 )
                 audio_url = None
 
+        if not audio_url:
+            # The analysis worker may be synthesizing this match right now
+            audio_url = await await_precomputed_tts(
+                self.redis,
+                self.db,
+                match_id,
+                timeout=get_settings().tts_precompute_wait_seconds,
+            )
+
         # If no audio yet, try to synthesize from narrative
         if not audio_url:
             logger.info("tts_audio_url_missing_synthesizing", extra={"match_id": match_id})
@@ -798,14 +950,10 @@ class RSOCallbackServer:
     async def _audio_url_exists(self, audio_url: str) -> bool:
         """Validate cached音频是否仍然可下载。"""
 
-        settings = get_settings()
-        base_url = (settings.audio_base_url or "").rstrip("/")
-        storage_root = Path(settings.audio_storage_path)
-
-        if base_url and audio_url.startswith(base_url):
-            rel_path = audio_url[len(base_url) :].lstrip("/")
-            candidate = storage_root / Path(rel_path)
-            return candidate.exists()
+        # Local clips: answered by the artifact index (one ZSCORE) instead of a stat
+        local = await local_audio_available(self.artifact_index, audio_url, get_settings())
+        if local is not None:
+            return local
 
         try:
             timeout = aiohttp.ClientTimeout(total=2)
@@ -991,8 +1139,75 @@ class RSOCallbackServer:
         site = web.TCPSite(runner, host, port)
         await site.start()
         logger.info(f"RSO callback server started on {host}:{port}")
+        self._start_broadcast_stream()
+        self._start_storage_janitor()
+
+        from src.core.metrics import start_gauge_refresher
+
+        start_gauge_refresher()
+
+    def _start_broadcast_stream(self) -> None:
+        """Queue /broadcast requests on Redis and consume this process's shard streams."""
+        settings = get_settings()
+        client = getattr(self.redis, "client", None)
+        if not settings.voice_broadcast_stream_enabled or client is None:
+            return
+        self.broadcast_bus = VoiceBroadcastBus(
+            client, self.shard_router, maxlen=settings.voice_broadcast_stream_maxlen
+        )
+        if self.discord_adapter is None:
+            return
+        shards = self.shard_router.local_shards()
+        self._broadcast_consumer = VoiceBroadcastConsumer(
+            self.broadcast_bus,
+            self.execute_broadcast,
+            streams=[stream_key(s) for s in shards] if shards else [stream_key(None)],
+            concurrency=settings.voice_broadcast_stream_concurrency,
+            max_attempts=settings.voice_broadcast_stream_max_attempts,
+            claim_idle_ms=int(settings.voice_broadcast_stream_claim_idle_seconds * 1000),
+        )
+        self._broadcast_consumer.start()
+        logger.info("Voice broadcast stream consumer started", extra={"shards": shards})
+
+    def _start_storage_janitor(self) -> None:
+        """Index locally served artifacts and evict them by TTL and size budget."""
+        settings = get_settings()
+        client = getattr(self.redis, "client", None)
+        # Without the janitor nothing reconciles the index with disk: keep stat lookups
+        if client is None or not settings.local_storage_cleanup_enabled:
+            return
+        self.artifact_index = LocalArtifactIndex.from_settings(client, settings)
+        if self.discord_adapter is not None:
+            self.discord_adapter.artifact_index = self.artifact_index
+        self._storage_janitor = LocalStorageJanitor(
+            self.artifact_index,
+            interval_seconds=settings.local_storage_cleanup_interval_seconds,
+        )
+        self._storage_janitor.start()
+
+    @web.middleware
+    async def _track_static_access(
+        self, request: web.Request, handler: Callable[[web.Request], Awaitable[web.StreamResponse]]
+    ) -> web.StreamResponse:
+        """Count downloads of local artifacts as accesses for LRU eviction."""
+        response = await handler(request)
+        index = self.artifact_index
+        if index is not None and request.method == "GET" and response.status == 200:
+            for area, prefix in (("audio", "/static/audio/"), ("builds", "/static/builds/")):
+                if request.path.startswith(prefix):
+                    with contextlib.suppress(Exception):
+                        await index.touch(area, request.path[len(prefix) :])
+                    break
+        return response
 
     async def stop(self) -> None:
         """Stop the HTTP server."""
+        from src.core.metrics import stop_gauge_refresher
+
+        await stop_gauge_refresher()
+        if self._broadcast_consumer is not None:
+            await self._broadcast_consumer.stop()
+        if self._storage_janitor is not None:
+            await self._storage_janitor.stop()
         await self.app.cleanup()
         logger.info("RSO callback server stopped")
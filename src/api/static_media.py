@@ -0,0 +1,92 @@
+"""Static media handler for locally stored TTS audio and build visuals.
+
+The callback server serves ``/static/audio/`` and ``/static/builds/``. Its
+clients are FFmpeg, which streams clips during voice playback, and Discord's
+image proxy, which fetches build cards.
+
+Files go out through `aiohttp.web.FileResponse`. That gives ``sendfile(2)``
+(the kernel copies file to socket, with no read loop in Python), an exact
+``Content-Length``, ``Range``/``If-Range`` (206/416) and an mtime/size
+``ETag`` answered with 304 on ``If-None-Match``. What this handler adds:
+
+- Safe path resolution. Dotfiles (in-flight writes) and anything outside the
+  root are 404.
+- ``Cache-Control`` per file. Content-addressed names (a hex digest or UUID
+  suffix, as on TTS clips and Opus cache entries) never change and are
+  ``immutable``. Other names get a short max-age plus ETag revalidation.
+- An optional precomputed Opus variant of a clip (``?format=opus``), looked
+  up by the clip's public URL, so a peer can stream it without transcoding.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Callable
+from pathlib import Path
+
+from aiohttp import web
+
+from src.adapters.local_artifact_store import resolve_media_path
+
+# TTS clips end in a 12-hex uuid fragment, Opus cache entries are 32-hex digests
+_CONTENT_ADDRESSED = re.compile(r"[_.-]?[0-9a-f]{12,64}\.[A-Za-z0-9]+$")
+
+_CONTENT_TYPES = {
+    ".mp3": "audio/mpeg",
+    ".opus": "audio/ogg; codecs=opus",
+    ".ogg": "audio/ogg",
+    ".png": "image/png",
+}
+
+# public URL of a clip → its precomputed Opus file, if one exists
+VariantLookup = Callable[[str], Path | None]
+
+
+def is_content_addressed(name: str) -> bool:
+    return bool(_CONTENT_ADDRESSED.search(name))
+
+
+class StaticMediaHandler:
+    """GET/HEAD handler for one static tree (registered as ``<prefix>{path:.+}``)."""
+
+    def __init__(
+        self,
+        root: str | Path,
+        *,
+        base_url: str | None = None,
+        immutable_max_age: int = 31_536_000,
+        max_age: int = 3_600,
+        variant_lookup: VariantLookup | None = None,
+        chunk_size: int = 256 * 1024,
+    ) -> None:
+        root_path = Path(root)
+        self.root = root_path if root_path.is_absolute() else Path.cwd() / root_path
+        self._base_url = base_url.rstrip("/") if base_url else None
+        self._immutable_max_age = immutable_max_age
+        self._max_age = max_age
+        self._variant_lookup = variant_lookup
+        self._chunk_size = chunk_size
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        rel_path = request.match_info.get("path", "")
+        path = resolve_media_path(self.root, rel_path)
+        if path is None:
+            raise web.HTTPNotFound()
+
+        if request.query.get("format") == "opus" and self._variant_lookup and self._base_url:
+            variant = self._variant_lookup(f"{self._base_url}/{rel_path}")
+            if variant is not None and variant.is_file():
+                path = variant
+
+        response = web.FileResponse(path, chunk_size=self._chunk_size)
+        content_type = _CONTENT_TYPES.get(path.suffix.lower())
+        if content_type:
+            # FileResponse only guesses the type when none is set
+            response.headers["Content-Type"] = content_type
+        if is_content_addressed(path.name):
+            response.headers["Cache-Control"] = (
+                f"public, max-age={self._immutable_max_age}, immutable"
+            )
+        else:
+            response.headers["Cache-Control"] = f"public, max-age={self._max_age}"
+        return response
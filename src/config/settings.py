@@ -58,7 +58,31 @@ class Settings(BaseSettings):
     discord_defer_timeout: int = Field(3, alias="DISCORD_DEFER_TIMEOUT")
     discord_application_id: str | None = Field(None, alias="DISCORD_APPLICATION_ID")
     discord_guild_id: str | None = Field(None, alias="DISCORD_GUILD_ID")
+    # Webhook delivery: workers enqueue PATCHes onto the `webhooks` queue instead of
+    # blocking on Discord; the delivery task honours per-route rate-limit buckets.
+    discord_webhook_queue_enabled: bool = Field(False, alias="DISCORD_WEBHOOK_QUEUE_ENABLED")
+    discord_webhook_max_attempts: int = Field(5, alias="DISCORD_WEBHOOK_MAX_ATTEMPTS")
+    # Longest back-off a queued delivery absorbs in-process before rescheduling;
+    # inline (queue disabled) sends wait out Retry-After up to the deadline instead.
+    discord_webhook_inline_wait_seconds: float = Field(
+        1.0, alias="DISCORD_WEBHOOK_INLINE_WAIT_SECONDS"
+    )
+    # Interaction tokens are valid for 15 minutes; keep a safety margin
+    discord_interaction_window_seconds: int = Field(840, alias="DISCORD_INTERACTION_WINDOW_SECONDS")
+    # Queued deliveries stay alive this long past the deadline to fall back to a channel post
+    discord_webhook_fallback_window_seconds: int = Field(
+        600, alias="DISCORD_WEBHOOK_FALLBACK_WINDOW_SECONDS"
+    )
     bot_prefix: str = Field("!", alias="BOT_PREFIX")
+    # Sharding: DISCORD_AUTO_SHARD runs every shard in this process (AutoShardedBot,
+    # Discord-recommended count unless DISCORD_SHARD_COUNT is set). For several
+    # processes, give each one DISCORD_SHARD_COUNT plus its own DISCORD_SHARD_IDS
+    # ("0-3") and list every process's callback server in DISCORD_SHARD_PEERS
+    # ("0-3=http://bot-0:3000;4-7=http://bot-1:3000") so broadcasts reach the owner.
+    discord_auto_shard: bool = Field(False, alias="DISCORD_AUTO_SHARD")
+    discord_shard_count: int | None = Field(None, alias="DISCORD_SHARD_COUNT")
+    discord_shard_ids: str | None = Field(None, alias="DISCORD_SHARD_IDS")
+    discord_shard_peers: str | None = Field(None, alias="DISCORD_SHARD_PEERS")
 
     # Database Configuration
     database_url: str = Field("postgresql://localhost/lolbot", alias="DATABASE_URL")
@@ -72,6 +96,12 @@ class Settings(BaseSettings):
     redis_match_cache_ttl: int = Field(86400, alias="REDIS_MATCH_CACHE_TTL")
     llm_cache_enabled: bool = Field(True, alias="LLM_CACHE_ENABLED")
     analysis_cache_enabled: bool = Field(True, alias="ANALYSIS_CACHE_ENABLED")
+    # Pre-rendered /讲道理 messages served on analysis-cache hits (Redis, seconds)
+    rendered_message_cache_ttl: int = Field(604800, alias="RENDERED_MESSAGE_CACHE_TTL")
+    # Recent match-ID lists per PUUID for /讲道理 (seconds; the watcher invalidates early)
+    match_id_list_cache_ttl: int = Field(60, alias="MATCH_ID_LIST_CACHE_TTL")
+    # In-process bound-account cache for /讲道理 target autocomplete (seconds)
+    autocomplete_account_cache_ttl: int = Field(60, alias="AUTOCOMPLETE_ACCOUNT_CACHE_TTL")
 
     # Google Gemini Configuration
     gemini_api_key: str | None = Field(None, alias="GEMINI_API_KEY")
@@ -91,12 +121,25 @@ class Settings(BaseSettings):
 
     # LLM Provider selection (gemini | openai)
     llm_provider: str = Field("gemini", alias="LLM_PROVIDER")
+    # Provider-side caching of the static system prompts: Gemini cached-content handles
+    # (per model, TTL extended when used within the refresh margin of expiry) and the
+    # prompt_cache_key routing hint for OpenAI-compatible endpoints
+    llm_context_cache_enabled: bool = Field(True, alias="LLM_CONTEXT_CACHE_ENABLED")
+    llm_context_cache_ttl_seconds: int = Field(3600, alias="LLM_CONTEXT_CACHE_TTL_SECONDS")
+    llm_context_cache_refresh_margin_seconds: int = Field(
+        300, alias="LLM_CONTEXT_CACHE_REFRESH_MARGIN_SECONDS"
+    )
+    openai_prompt_cache_key_enabled: bool = Field(True, alias="OPENAI_PROMPT_CACHE_KEY_ENABLED")
 
     # FinOps pricing (USD per 1K tokens)
     finops_prompt_token_price_usd: float = Field(0.0005, alias="FINOPS_PROMPT_TOKEN_PRICE_USD")
     finops_completion_token_price_usd: float = Field(
         0.0015, alias="FINOPS_COMPLETION_TOKEN_PRICE_USD"
     )
+    # Prompt tokens served from a provider cache are billed at a discount
+    finops_cached_prompt_token_price_usd: float = Field(
+        0.000125, alias="FINOPS_CACHED_PROMPT_TOKEN_PRICE_USD"
+    )
     finops_monthly_budget_usd: float = Field(100.0, alias="FINOPS_MONTHLY_BUDGET_USD")
 
     # Chaos Engineering toggles
@@ -114,12 +157,24 @@ class Settings(BaseSettings):
     tts_voice_id: str = Field("zh_female_vv_uranus_bigtts", alias="TTS_VOICE_ID")
     tts_timeout_seconds: int = Field(15, alias="TTS_TIMEOUT_SECONDS")
     tts_upload_timeout_seconds: int = Field(10, alias="TTS_UPLOAD_TIMEOUT_SECONDS")
+    # Synthesize alongside builds enrichment and the final webhook instead of before them;
+    # the audio field is edited into the live message afterwards (inline delivery only)
+    tts_precompute_parallel: bool = Field(True, alias="TTS_PRECOMPUTE_PARALLEL")
+    tts_precompute_pending_ttl_seconds: int = Field(120, alias="TTS_PRECOMPUTE_PENDING_TTL_SECONDS")
+    # Voice requests wait this long for an in-flight precompute before synthesizing lazily
+    tts_precompute_wait_seconds: float = Field(30.0, alias="TTS_PRECOMPUTE_WAIT_SECONDS")
 
     # Voice Playback Default Parameters
     voice_volume_default: float = Field(0.5, alias="VOICE_VOLUME_DEFAULT")
     voice_normalize_default: bool = Field(False, alias="VOICE_NORMALIZE_DEFAULT")
     voice_max_seconds_default: int | None = Field(90, alias="VOICE_MAX_SECONDS_DEFAULT")
     voice_button_ttl_seconds: int = Field(900, alias="VOICE_BUTTON_TTL_SECONDS")
+    # Keep a guild's voice connection open this long after the last clip (0 = disconnect at once)
+    voice_idle_disconnect_seconds: float = Field(20.0, alias="VOICE_IDLE_DISCONNECT_SECONDS")
+    # Replayed clips are transcoded once to Ogg/Opus and played without re-encoding
+    voice_opus_cache_enabled: bool = Field(True, alias="VOICE_OPUS_CACHE_ENABLED")
+    voice_opus_cache_path: str = Field("static/audio/opus", alias="VOICE_OPUS_CACHE_PATH")
+    voice_opus_bitrate_kbps: int = Field(64, alias="VOICE_OPUS_BITRATE_KBPS")
 
     # Audio Storage Configuration (Local file serving)
     audio_storage_path: str = Field("static/audio", alias="AUDIO_STORAGE_PATH")
@@ -135,6 +190,14 @@ class Settings(BaseSettings):
         description="Optional override for public audio URL base",
     )
     audio_s3_path_style: bool = Field(True, alias="AUDIO_S3_PATH_STYLE")
+    # Canned ACL sent with uploads (blank = none); dropped automatically if the bucket rejects ACLs
+    audio_s3_acl: str | None = Field("public-read", alias="AUDIO_S3_ACL")
+    # Shared S3 client: connection pool size, multipart part size, parallel part/batch uploads
+    object_storage_max_connections: int = Field(32, alias="OBJECT_STORAGE_MAX_CONNECTIONS")
+    object_storage_multipart_threshold_mb: int = Field(
+        8, alias="OBJECT_STORAGE_MULTIPART_THRESHOLD_MB"
+    )
+    object_storage_upload_concurrency: int = Field(4, alias="OBJECT_STORAGE_UPLOAD_CONCURRENCY")
     build_visual_storage_path: str = Field("static/builds", alias="BUILD_VISUAL_STORAGE_PATH")
     build_visual_base_url: str = Field(
         "http://localhost:3000/static/builds", alias="BUILD_VISUAL_BASE_URL"
@@ -147,6 +210,19 @@ class Settings(BaseSettings):
     aws_s3_region: str = Field("us-east-1", alias="AWS_S3_REGION")
     cdn_base_url: str | None = Field(None, alias="CDN_BASE_URL")
     audio_file_ttl_seconds: int = Field(604800, alias="AUDIO_FILE_TTL_SECONDS")  # 7 days
+    # Local audio/build-visual files: evicted after AUDIO_FILE_TTL_SECONDS without access,
+    # then least recently used first while the total exceeds LOCAL_STORAGE_MAX_MB (0 = no cap)
+    local_storage_cleanup_enabled: bool = Field(True, alias="LOCAL_STORAGE_CLEANUP_ENABLED")
+    local_storage_cleanup_interval_seconds: int = Field(
+        600, alias="LOCAL_STORAGE_CLEANUP_INTERVAL_SECONDS"
+    )
+    local_storage_max_mb: int = Field(2048, alias="LOCAL_STORAGE_MAX_MB")
+    # /static/audio and /static/builds: content-addressed names (hex digest suffix) never
+    # change and are cached as immutable; other files revalidate by ETag after max-age
+    static_media_immutable_max_age_seconds: int = Field(
+        31536000, alias="STATIC_MEDIA_IMMUTABLE_MAX_AGE_SECONDS"
+    )
+    static_media_max_age_seconds: int = Field(3600, alias="STATIC_MEDIA_MAX_AGE_SECONDS")
 
     # Application Configuration
     app_name: str = Field("蔚-上城人", alias="APP_NAME")
@@ -155,6 +231,24 @@ class Settings(BaseSettings):
     app_debug: bool = Field(False, alias="APP_DEBUG")
     app_log_level: str = Field("INFO", alias="APP_LOG_LEVEL")
 
+    # Observability: fraction of llm_debug_wrapper calls that get full tracing
+    # (args/result capture + entry/exit logs). Unsampled calls only record a
+    # duration/status histogram; errors are always logged in full.
+    observability_trace_sample_rate: float = Field(
+        1.0, ge=0.0, le=1.0, alias="OBSERVABILITY_TRACE_SAMPLE_RATE"
+    )
+    # Prometheus queue gauges: broker queues to report and how often to refresh them
+    metrics_queue_names: str = Field(
+        "ai,matches,celery,default,webhooks", alias="METRICS_QUEUE_NAMES"
+    )
+    metrics_gauge_refresh_seconds: int = Field(15, alias="METRICS_GAUGE_REFRESH_SECONDS")
+    # Sampling profiler for Celery tasks (collapsed stacks under PROFILING_OUTPUT_DIR)
+    profiling_enabled: bool = Field(False, alias="PROFILING_ENABLED")
+    profiling_sample_rate: float = Field(0.05, ge=0.0, le=1.0, alias="PROFILING_SAMPLE_RATE")
+    profiling_interval_ms: int = Field(10, ge=1, alias="PROFILING_INTERVAL_MS")
+    profiling_tasks: str = Field("analyze_match_task,analyze_team_task", alias="PROFILING_TASKS")
+    profiling_output_dir: str = Field("logs/profiles", alias="PROFILING_OUTPUT_DIR")
+
     # Celery Configuration (for /讲道理 async tasks)
     celery_broker_url: str = Field("redis://localhost:6379/0", alias="CELERY_BROKER_URL")
     celery_result_backend: str = Field("redis://localhost:6379/1", alias="CELERY_RESULT_BACKEND")
@@ -220,6 +314,20 @@ class Settings(BaseSettings):
 
     # Broadcast webhook authentication for post-game voice announcements
     broadcast_webhook_secret: str | None = Field(None, alias="BROADCAST_WEBHOOK_SECRET")
+    # Voice broadcast bus: /broadcast requests (and worker auto-TTS) are appended to a
+    # Redis stream per shard and consumed by the owning bot process instead of being
+    # executed inside the HTTP request. Failed jobs are retried after the claim idle time.
+    voice_broadcast_stream_enabled: bool = Field(False, alias="VOICE_BROADCAST_STREAM_ENABLED")
+    voice_broadcast_stream_maxlen: int = Field(10_000, alias="VOICE_BROADCAST_STREAM_MAXLEN")
+    voice_broadcast_stream_concurrency: int = Field(8, alias="VOICE_BROADCAST_STREAM_CONCURRENCY")
+    voice_broadcast_stream_max_attempts: int = Field(3, alias="VOICE_BROADCAST_STREAM_MAX_ATTEMPTS")
+    voice_broadcast_stream_claim_idle_seconds: float = Field(
+        120.0, alias="VOICE_BROADCAST_STREAM_CLAIM_IDLE_SECONDS"
+    )
+    # How long VoiceBroadcastStreamClient waits on the reply key for a job's outcome
+    voice_broadcast_reply_timeout_seconds: float = Field(
+        90.0, alias="VOICE_BROADCAST_REPLY_TIMEOUT_SECONDS"
+    )
     # Callback/broadcast server base URL for voice jobs (bot process HTTP server)
     # Default aligns with RSOCallbackServer.start(..., port=3000) to avoid port mismatch.
     broadcast_server_url: str = Field("http://localhost:3000", alias="BROADCAST_SERVER_URL")
@@ -8,6 +8,8 @@ DRY: To avoid duplicate definitions, the payload contract is centralized in
 with existing imports.
 """
 
+from typing import Any
+
 from pydantic import BaseModel, Field
 
 # Re-export the canonical payload definition to maintain a single source of truth
@@ -42,10 +44,21 @@ class AnalysisTaskResult(BaseModel):
     tts_duration_ms: float | None = Field(
         default=None, description="Time for TTS voice synthesis (P5)"
     )
+    tts_join_wait_ms: float | None = Field(
+        default=None,
+        description="Time spent waiting on the parallel TTS precompute after the webhook",
+    )
     webhook_duration_ms: float | None = Field(
         default=None, description="Time for Discord webhook delivery (P4)"
     )
     total_duration_ms: float | None = Field(default=None, description="Total task duration")
+    queue_wait_ms: float | None = Field(
+        default=None, description="Time between Celery publish and worker start"
+    )
+    stage_waterfall: list[dict[str, Any]] = Field(
+        default_factory=list,
+        description="Per-stage timings [{stage, start_ms, duration_ms}] relative to task start",
+    )
 
     # Error handling
     error_message: str | None = Field(default=None, description="Error message if failed")
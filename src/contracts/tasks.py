@@ -4,6 +4,8 @@ This module defines Pydantic models for task payloads that will be
 serialized and sent to the Celery task queue for background processing.
 """
 
+from typing import Any, Literal
+
 from pydantic import BaseModel, Field
 
 
@@ -87,9 +89,70 @@ class TeamAnalysisTaskPayload(BaseModel):
     )
 
 
+class WebhookDeliveryPayload(BaseModel):
+    """Pre-rendered Discord interaction PATCH handed to the webhook delivery queue.
+
+    Analysis workers render the message, enqueue this payload and return; the
+    delivery task sends it against Discord's rate-limit buckets and retries
+    until `deadline` (the interaction token's 15min window).
+    """
+
+    kind: Literal["match_analysis", "team_overview", "error"] = Field(
+        description="Message type (metrics label and fallback wording)"
+    )
+    application_id: str = Field(description="Discord application ID for webhook URL construction")
+    interaction_token: str = Field(description="Interaction token of the deferred response")
+    payload: dict[str, Any] = Field(description="JSON body for PATCH messages/@original")
+    attachment_paths: list[str] = Field(
+        default_factory=list, description="Local PNG files uploaded as multipart attachments"
+    )
+    channel_id: str | None = Field(
+        default=None, description="Channel for bot-token fallback when the token is invalid"
+    )
+    fallback_content: str | None = Field(
+        default=None, description="Message text used with the channel fallback"
+    )
+    match_id: str | None = Field(default=None, description="Match ID (logging only)")
+    enqueued_at: float = Field(description="Epoch seconds when the worker enqueued delivery")
+    deadline: float = Field(description="Epoch seconds after which the token is unusable")
+
+
+class RenderedDiscordMessage(BaseModel):
+    """Final interaction message as sent to Discord, cached for analysis-cache hits.
+
+    `render_version` fingerprints the view/payload code that produced it, so a
+    view change turns old entries into misses instead of stale embeds.
+    """
+
+    payload: dict[str, Any] = Field(description="JSON body (embeds, components, mentions)")
+    attachment_paths: list[str] = Field(
+        default_factory=list, description="Local PNG files referenced as attachment://"
+    )
+    render_version: str = Field(description="Fingerprint of the rendering code")
+    match_id: str | None = Field(default=None, description="Match ID (logging only)")
+
+
+class VoiceBroadcastJob(BaseModel):
+    """A /broadcast request carried over the Redis voice broadcast stream.
+
+    Producers append it to the stream of the guild's shard; the bot process
+    owning that shard runs it and, when `reply` is set, pushes the result
+    to the job's reply key for the waiting caller.
+    """
+
+    job_id: str = Field(description="Unique job ID (reply key suffix)")
+    guild_id: int = Field(description="Target guild; selects the shard stream")
+    payload: dict[str, Any] = Field(description="Body as accepted by POST /broadcast")
+    enqueued_at: float = Field(description="Epoch seconds when the job was published")
+    reply: bool = Field(default=False, description="Whether a caller waits on the reply key")
+
+
 # Task name constants (shared contract between CLI 1 and CLI 2)
 TASK_ANALYZE_MATCH = "src.tasks.analysis_tasks.analyze_match_task"
 """Celery task name for match analysis job (fully-qualified)."""
 
 TASK_ANALYZE_TEAM = "src.tasks.team_tasks.analyze_team_task"
 """Celery task name for V2 team analysis job (fully-qualified)."""
+
+TASK_DELIVER_WEBHOOK = "src.tasks.webhook_tasks.deliver_webhook_task"
+"""Celery task name for queued Discord webhook delivery (fully-qualified)."""
@@ -3,9 +3,9 @@ Match Timeline data contracts for Riot API Match-V5.
 This is the core data structure for match analysis.
 """
 
-from typing import Any
+from typing import Any, ClassVar
 
-from pydantic import Field, field_validator
+from pydantic import AliasChoices, Field
 
 from .common import BaseContract, Position
 
@@ -60,7 +60,12 @@ class DamageStats(BaseContract):
 class ParticipantFrame(BaseContract):
     """Participant state at a specific frame."""
 
-    participant_id: int = Field(..., ge=1, le=16)  # Support Arena (2v2v2v2)
+    participant_id: int = Field(
+        ...,
+        ge=1,
+        le=16,  # Support Arena (2v2v2v2)
+        validation_alias=AliasChoices("participant_id", "participantId"),
+    )
     champion_stats: ChampionStats
     damage_stats: DamageStats
     current_gold: int = Field(0)
@@ -85,27 +90,6 @@ class Frame(BaseContract):
         default_factory=list, description="Events that occurred during this frame"
     )
 
-    @field_validator("participant_frames", mode="before")
-    @classmethod
-    def convert_participant_frames(cls, v: Any) -> dict[str, ParticipantFrame]:
-        """Convert raw participant frames to typed models."""
-        if isinstance(v, dict):
-            result = {}
-            for key, value in v.items():
-                if isinstance(value, dict):
-                    # Ensure participant_id is in the data
-                    if "participantId" in value:
-                        value["participant_id"] = value["participantId"]
-                    result[key] = (
-                        ParticipantFrame(**value)
-                        if not isinstance(value, ParticipantFrame)
-                        else value
-                    )
-                else:
-                    result[key] = value
-            return result
-        return v  # type: ignore[no-any-return]
-
 
 class TimelineParticipant(BaseContract):
     """Participant mapping in timeline."""
@@ -139,6 +123,22 @@ class MatchTimeline(BaseContract):
     metadata: TimelineMetadata
     info: TimelineInfo
 
+    @classmethod
+    def from_trusted(cls, data: dict[str, Any]) -> "MatchTimeline":
+        """Build from a dict we produced ourselves, skipping field validation.
+
+        For payloads from `RiotAPIAdapter.get_match_timeline` (or their cached
+        copies), which already have the snake_case contract shape. Frames are
+        assembled with `model_construct` and participant frames become
+        read-only slotted views over the input dicts instead of validated
+        models; a payload missing required keys falls back to full validation.
+        Use `MatchTimeline(**data)` for untrusted sources.
+        """
+        try:
+            return _construct_timeline(data)
+        except (KeyError, TypeError, AttributeError):
+            return cls.model_validate(data)
+
     def get_participant_by_puuid(self, puuid: str) -> int | None:
         """Get participant ID by PUUID."""
         for participant in self.info.participants:
@@ -196,3 +196,112 @@ class MatchTimeline(BaseContract):
             return 0.0
 
         return (participant_kills / total_team_kills) * 100
+
+
+class _ContractView:
+    """Read-only attribute view over a contract-shaped dict (trusted timelines).
+
+    Attribute access mirrors the pydantic model it stands in for: missing keys
+    return the model's field default and nested dicts are wrapped on access.
+    """
+
+    __slots__ = ("_data",)
+    _defaults: ClassVar[dict[str, Any]] = {}
+    _nested: ClassVar[dict[str, type["_ContractView"]]] = {}
+
+    def __init__(self, data: dict[str, Any]) -> None:
+        self._data = data
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            value = self._data[name]
+        except KeyError:
+            try:
+                return self._defaults[name]
+            except KeyError:
+                raise AttributeError(name) from None
+        view = self._nested.get(name)
+        return view(value) if view is not None else value
+
+    def model_dump(self, **_: Any) -> dict[str, Any]:
+        dumped = {**self._defaults, **self._data}
+        for name, view in self._nested.items():
+            if isinstance(dumped.get(name), dict):
+                dumped[name] = view(dumped[name]).model_dump()
+        return dumped
+
+
+def _field_defaults(model: type[BaseContract]) -> dict[str, Any]:
+    return {name: f.default for name, f in model.model_fields.items() if not f.is_required()}
+
+
+class _ChampionStatsView(_ContractView):
+    __slots__ = ()
+    _defaults = _field_defaults(ChampionStats)
+
+
+class _DamageStatsView(_ContractView):
+    __slots__ = ()
+    _defaults = _field_defaults(DamageStats)
+
+
+class _PositionView(_ContractView):
+    __slots__ = ()
+
+
+class _ParticipantFrameView(_ContractView):
+    """Stands in for `ParticipantFrame` without building ~40 validated fields."""
+
+    __slots__ = ()
+    _defaults = _field_defaults(ParticipantFrame)
+    _nested = {
+        "champion_stats": _ChampionStatsView,
+        "damage_stats": _DamageStatsView,
+        "position": _PositionView,
+    }
+
+
+_REQUIRED_FRAME_KEYS = frozenset({"participant_id", "champion_stats", "damage_stats", "position"})
+
+
+def _participant_frame_view(value: Any) -> Any:
+    if isinstance(value, ParticipantFrame):
+        return value
+    position = value["position"]
+    if not _REQUIRED_FRAME_KEYS.issubset(value) or "x" not in position or "y" not in position:
+        raise KeyError("participant frame is missing required fields")
+    return _ParticipantFrameView(value)
+
+
+def _construct_timeline(data: dict[str, Any]) -> MatchTimeline:
+    metadata = data["metadata"]
+    info = data["info"]
+    frames = [
+        Frame.model_construct(
+            timestamp=frame["timestamp"],
+            participant_frames={
+                str(key): _participant_frame_view(value)
+                for key, value in frame["participant_frames"].items()
+            },
+            events=frame.get("events") or [],
+        )
+        for frame in info["frames"]
+    ]
+    return MatchTimeline.model_construct(
+        metadata=TimelineMetadata.model_construct(
+            data_version=metadata["data_version"],
+            match_id=metadata["match_id"],
+            participants=list(metadata["participants"]),
+        ),
+        info=TimelineInfo.model_construct(
+            frame_interval=info.get("frame_interval", 60000),
+            frames=frames,
+            game_id=info["game_id"],
+            participants=[
+                TimelineParticipant.model_construct(
+                    participant_id=p["participant_id"], puuid=p["puuid"]
+                )
+                for p in info["participants"]
+            ],
+        ),
+    )
@@ -4,13 +4,24 @@ Prometheus metrics utilities (process-safe, optional dependency).
 KISS: Import `prometheus_client` if available; otherwise no-op stubs keep
 runtime stable. Metrics exposure is optional and controlled by code paths.
 
+Multiprocess: when PROMETHEUS_MULTIPROC_DIR is set (Celery prefork workers and
+the bot share it via the `.prom_multiproc` volume), every process writes its
+samples to mmap files in that directory and `render_latest()` aggregates all of
+them with `MultiProcessCollector`, so `/metrics` on the bot reflects the work
+done inside worker children.
+
 DRY: Centralize metric definitions and helpers here to avoid scattered
 instrumentation across modules.
 """
 
 from __future__ import annotations
 
+import asyncio
 import contextlib
+import os
+import socket
+import time
+from collections.abc import Mapping
 from typing import Any
 
 from src.config.settings import get_settings
@@ -54,6 +65,32 @@ except Exception:  # pragma: no cover - keep runtime safe without dependency
     Histogram = _Noop  # type: ignore
     _PROMETHEUS_AVAILABLE = False
 
+
+def _configure_multiprocess() -> bool:
+    """Enable prometheus_client multiprocess mode if PROMETHEUS_MULTIPROC_DIR is set.
+
+    Must run before any metric is constructed. Sample files are keyed by
+    "<host>-<pid>" rather than the bare PID so containers sharing one volume
+    (bot PID 1 and worker PID 1) never write to the same file.
+    """
+    if not _PROMETHEUS_AVAILABLE:
+        return False
+    multiproc_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if not multiproc_dir:
+        return False
+    try:
+        from prometheus_client import values
+
+        os.makedirs(multiproc_dir, exist_ok=True)
+        host = socket.gethostname().replace("_", "-").replace("/", "-") or "host"
+        values.ValueClass = values.MultiProcessValue(lambda: f"{host}-{os.getpid()}")  # type: ignore[no-untyped-call]
+        return True
+    except Exception:  # pragma: no cover - fall back to in-process registry
+        return False
+
+
+_MULTIPROCESS = _configure_multiprocess()
+
 # Global registry
 _registry = CollectorRegistry() if _PROMETHEUS_AVAILABLE else None
 
@@ -103,6 +140,13 @@ chimera_riot_api_requests_total = Counter(
     registry=_registry,
 )
 
+chimera_discord_rate_limited_total = Counter(
+    "chimera_discord_rate_limited_total",
+    "Discord 429 responses by scope (bucket/global)",
+    labelnames=("scope",),
+    registry=_registry,
+)
+
 # ============================================================================
 # Gauges (dynamic)
 # ============================================================================
@@ -112,6 +156,8 @@ chimera_celery_queue_length = Gauge(
     "Celery queue length by queue name",
     labelnames=("queue",),
     registry=_registry,
+    # Only the scraping process sets this; report its latest value across processes
+    multiprocess_mode="mostrecent",
 )
 
 # ============================================================================
@@ -126,6 +172,38 @@ chimera_request_duration_seconds = Histogram(
     registry=_registry,
 )
 
+chimera_stage_duration_seconds = Histogram(
+    "chimera_stage_duration_seconds",
+    "Analysis pipeline stage duration in seconds by pipeline, stage and game mode",
+    labelnames=("pipeline", "stage", "game_mode"),
+    buckets=(0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0, 90.0),
+    registry=_registry,
+)
+
+chimera_celery_queue_wait_seconds = Histogram(
+    "chimera_celery_queue_wait_seconds",
+    "Time between Celery task publish and worker start, by task name",
+    labelnames=("task",),
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0),
+    registry=_registry,
+)
+
+chimera_discord_delivery_seconds = Histogram(
+    "chimera_discord_delivery_seconds",
+    "Time from webhook delivery request to Discord acknowledgement, by kind and outcome",
+    labelnames=("kind", "outcome"),
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0),
+    registry=_registry,
+)
+
+chimera_traced_call_duration_seconds = Histogram(
+    "chimera_traced_call_duration_seconds",
+    "Duration of llm_debug_wrapper-decorated calls by function and status",
+    labelnames=("function", "status"),
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 120.0),
+    registry=_registry,
+)
+
 
 # ============================================================================
 # Helper Functions
@@ -160,6 +238,25 @@ def observe_request_latency(endpoint: str, duration_seconds: float) -> None:
         )
 
 
+def observe_traced_call(function_name: str, status: str, duration_seconds: float) -> None:
+    """Observe the duration of a traced (llm_debug_wrapper) call.
+
+    This is the only work done for calls that are not sampled for full tracing,
+    so it must stay cheap: one label lookup and one observe.
+
+    Args:
+        function_name: Fully qualified function name
+        status: 'success' or 'error'
+        duration_seconds: Call duration in seconds
+    """
+    if not _PROMETHEUS_AVAILABLE:
+        return
+    with contextlib.suppress(Exception):
+        chimera_traced_call_duration_seconds.labels(function=function_name, status=status).observe(
+            duration_seconds
+        )
+
+
 def mark_llm(status: str, model: str, mode: str = "default") -> None:
     """Mark LLM request outcome.
 
@@ -244,7 +341,8 @@ def add_llm_tokens(token_type: str, model: str, count: int) -> None:
     """Add LLM token usage.
 
     Args:
-        token_type: Token type ('input' or 'output')
+        token_type: Token type ('prompt', 'completion', or the prompt split
+            'prompt_cached' / 'prompt_uncached' by provider-side caching)
         model: Model name
         count: Number of tokens
     """
@@ -302,49 +400,202 @@ def observe_llm_latency_by_mode(model: str, game_mode: str, duration_seconds: fl
         )
 
 
-def observe_analyze_e2e(total_ms: float | None, stages_ms: dict[str, float | None]) -> None:
+def observe_stage_latency(
+    pipeline: str, stage: str, game_mode: str, duration_seconds: float
+) -> None:
+    """Observe a single pipeline stage duration.
+
+    Args:
+        pipeline: Pipeline name (e.g., 'analyze', 'team_analyze')
+        stage: Stage name (e.g., 'fetch', 'llm', 'webhook')
+        game_mode: Game mode label (e.g., 'SR', 'ARAM', 'unknown')
+        duration_seconds: Stage duration in seconds
+    """
+    if not _PROMETHEUS_AVAILABLE:
+        return
+    with contextlib.suppress(Exception):
+        chimera_stage_duration_seconds.labels(
+            pipeline=pipeline, stage=stage, game_mode=game_mode
+        ).observe(duration_seconds)
+
+
+def observe_queue_wait(task_name: str, wait_seconds: float) -> None:
+    """Observe Celery queue wait (publish -> worker start).
+
+    Args:
+        task_name: Celery task name
+        wait_seconds: Seconds spent waiting in the broker queue
+    """
+    if not _PROMETHEUS_AVAILABLE or wait_seconds < 0:
+        return
+    with contextlib.suppress(Exception):
+        chimera_celery_queue_wait_seconds.labels(task=task_name).observe(wait_seconds)
+
+
+def observe_discord_delivery(kind: str, outcome: str, duration_seconds: float) -> None:
+    """Observe Discord webhook delivery latency (enqueue -> Discord response).
+
+    Args:
+        kind: Delivery kind (match_analysis, team_overview, error)
+        outcome: delivered, fallback, failed or expired
+        duration_seconds: Seconds since the delivery was requested
+    """
+    if not _PROMETHEUS_AVAILABLE or duration_seconds < 0:
+        return
+    with contextlib.suppress(Exception):
+        chimera_discord_delivery_seconds.labels(kind=kind, outcome=outcome).observe(
+            duration_seconds
+        )
+
+
+def mark_discord_rate_limited(scope: str) -> None:
+    """Increment Discord 429 counter (scope: bucket or global)."""
+    if not _PROMETHEUS_AVAILABLE:
+        return
+    with contextlib.suppress(Exception):
+        chimera_discord_rate_limited_total.labels(scope=scope).inc()
+
+
+def observe_analyze_e2e(
+    total_ms: float | None,
+    stages_ms: Mapping[str, float | None],
+    game_mode: str = "unknown",
+    pipeline: str = "analyze",
+) -> None:
     """Record end-to-end and per-stage durations.
 
     KISS: accept milliseconds from existing code, convert internally.
 
     Args:
         total_ms: Total duration in milliseconds
-        stages_ms: Dict of stage name -> duration in milliseconds
+        stages_ms: Mapping of stage name -> duration in milliseconds
+        game_mode: Game mode label for the stage histograms
+        pipeline: Pipeline label ("analyze" or "team_analyze")
     """
-    # Currently just a placeholder - can extend with histograms per stage if needed
-    pass
+    for stage, value in stages_ms.items():
+        if value is not None:
+            observe_stage_latency(pipeline, stage, game_mode, value / 1000.0)
+    if total_ms is not None:
+        observe_stage_latency(pipeline, "total", game_mode, total_ms / 1000.0)
+
+
+# Queue gauge refresh state (one long-lived Redis client per process)
+_gauge_redis: Any = None
+_gauge_last_refresh = 0.0
+_gauge_lock: asyncio.Lock | None = None
+_gauge_task: asyncio.Task[None] | None = None
 
 
-async def update_dynamic_gauges() -> None:
+def _queue_names() -> list[str]:
+    raw = get_settings().metrics_queue_names
+    return [q.strip() for q in raw.split(",") if q.strip()]
+
+
+async def _get_gauge_redis() -> Any:
+    global _gauge_redis
+    if _gauge_redis is None:
+        import redis.asyncio as aioredis
+
+        _gauge_redis = aioredis.from_url(
+            get_settings().celery_broker_url, encoding="utf-8", decode_responses=True
+        )
+    return _gauge_redis
+
+
+async def update_dynamic_gauges(force: bool = False) -> None:
     """Update dynamic gauges (e.g., queue lengths).
 
-    KISS: Pull metrics on demand to avoid background schedulers.
+    Reuses one Redis connection per process and only queries the broker when
+    the cached values are older than METRICS_GAUGE_REFRESH_SECONDS, so a scrape
+    normally costs nothing. All queues in METRICS_QUEUE_NAMES are read in a
+    single pipelined round-trip.
+
+    Args:
+        force: Refresh even if the cached values are still fresh
     """
+    global _gauge_last_refresh, _gauge_lock, _gauge_redis
     if not _PROMETHEUS_AVAILABLE:
         return
 
-    try:
-        from src.adapters.redis_adapter import RedisAdapter
-
-        settings = get_settings()
-        redis = RedisAdapter(redis_url=settings.redis_url)
-        await redis.connect()
+    interval = float(get_settings().metrics_gauge_refresh_seconds)
+    if not force and time.monotonic() - _gauge_last_refresh < interval:
+        return
 
-        # Get queue lengths
+    if _gauge_lock is None:
+        _gauge_lock = asyncio.Lock()
+    async with _gauge_lock:
+        # Another caller may have refreshed while we waited
+        if not force and time.monotonic() - _gauge_last_refresh < interval:
+            return
         try:
-            queue_length = await redis.client.llen("celery")  # type: ignore
-            chimera_celery_queue_length.labels(queue="celery").set(queue_length)  # type: ignore
+            client = await _get_gauge_redis()
+            queues = _queue_names()
+            pipe = client.pipeline(transaction=False)
+            for queue in queues:
+                pipe.llen(queue)
+            lengths = await pipe.execute()
+            for queue, length in zip(queues, lengths, strict=False):
+                chimera_celery_queue_length.labels(queue=queue).set(int(length or 0))
+            _gauge_last_refresh = time.monotonic()
         except Exception:
-            pass
+            # Drop the client so the next refresh reconnects
+            with contextlib.suppress(Exception):
+                if _gauge_redis is not None:
+                    await _gauge_redis.aclose()
+            _gauge_redis = None
+
+
+async def _gauge_refresh_loop(interval: float) -> None:
+    while True:
+        await update_dynamic_gauges(force=True)
+        await asyncio.sleep(interval)
 
-        await redis.disconnect()
-    except Exception:
-        pass
+
+def start_gauge_refresher() -> asyncio.Task[None] | None:
+    """Start the background queue-gauge refresh loop on the running event loop.
+
+    Idempotent; returns the running task (None when metrics are unavailable).
+    """
+    global _gauge_task
+    if not _PROMETHEUS_AVAILABLE:
+        return None
+    if _gauge_task is None or _gauge_task.done():
+        interval = float(get_settings().metrics_gauge_refresh_seconds)
+        _gauge_task = asyncio.get_running_loop().create_task(_gauge_refresh_loop(interval))
+    return _gauge_task
+
+
+async def stop_gauge_refresher() -> None:
+    """Cancel the background refresh loop and close its Redis connection."""
+    global _gauge_task, _gauge_redis
+    if _gauge_task is not None:
+        _gauge_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError, Exception):
+            await _gauge_task
+        _gauge_task = None
+    if _gauge_redis is not None:
+        with contextlib.suppress(Exception):
+            await _gauge_redis.aclose()
+        _gauge_redis = None
+
+
+def mark_process_dead(pid: int) -> None:
+    """Release multiprocess sample files of an exited worker child (live gauges)."""
+    if not _MULTIPROCESS:
+        return
+    with contextlib.suppress(Exception):
+        from prometheus_client import multiprocess
+
+        host = socket.gethostname().replace("_", "-").replace("/", "-") or "host"
+        multiprocess.mark_process_dead(f"{host}-{pid}")  # type: ignore[no-untyped-call]
 
 
 def render_latest() -> tuple[bytes, str]:
     """Render latest metrics for Prometheus scraping.
 
+    In multiprocess mode, samples from every process sharing
+    PROMETHEUS_MULTIPROC_DIR are aggregated into one exposition.
+
     Returns:
         Tuple of (payload bytes, content_type string)
     """
@@ -352,7 +603,14 @@ def render_latest() -> tuple[bytes, str]:
         return (b"# Prometheus metrics not available\n", "text/plain; charset=utf-8")
 
     try:
-        payload = generate_latest(_registry)  # type: ignore
+        if _MULTIPROCESS:
+            from prometheus_client import multiprocess
+
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)  # type: ignore[no-untyped-call]
+            payload = generate_latest(registry)
+        else:
+            payload = generate_latest(_registry)  # type: ignore
         return (payload, CONTENT_TYPE_LATEST)  # type: ignore
     except Exception:
         return (b"# Error generating metrics\n", "text/plain; charset=utf-8")
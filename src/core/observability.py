@@ -6,12 +6,13 @@ through the llm_debug_wrapper decorator and structured logging.
 
 import asyncio
 import functools
-import json
+import logging
+import random
 import re
 import sys
 import time
 import traceback
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
 from datetime import UTC, datetime
 from typing import Any, TypeVar, cast
 
@@ -20,6 +21,9 @@ from pydantic import BaseModel, ConfigDict, Field
 from structlog.contextvars import bind_contextvars, merge_contextvars, unbind_contextvars
 import contextlib
 
+from src.config.settings import get_settings
+from src.core.metrics import observe_stage_latency, observe_traced_call
+
 # Configure structured logging
 structlog.configure(
     processors=[
@@ -119,35 +123,114 @@ class FunctionTrace(BaseModel):
     metadata: dict[str, Any] = Field(default_factory=dict, description="Additional metadata")
 
 
+_MAX_SERIALIZE_DEPTH = 6
+_TRUNCATION_MARKER = "..."
+
+
+def _serialize_bounded(value: Any, budget: list[int], depth: int) -> Any:
+    """Walk ``value`` into a JSON-compatible structure within a size budget.
+
+    ``budget`` is a single-element list holding the remaining character budget
+    (approximate JSON size). Containers stop expanding once it reaches zero, so
+    large payloads are never materialized in full.
+    """
+    if value is None or isinstance(value, bool):
+        budget[0] -= 5
+        return value
+    if isinstance(value, int | float):
+        budget[0] -= 8
+        return value
+    if isinstance(value, str):
+        remaining = budget[0]
+        budget[0] -= len(value) + 2
+        if len(value) > remaining:
+            return value[: max(remaining, 0)] + _TRUNCATION_MARKER
+        return value
+    if isinstance(value, datetime):
+        budget[0] -= 32
+        return value.isoformat()
+    if depth >= _MAX_SERIALIZE_DEPTH:
+        return _serialize_bounded(str(value), budget, depth)
+
+    if isinstance(value, BaseModel):
+        # Mirror model_dump(exclude_unset=True) without dumping the whole model
+        fields_set = value.model_fields_set
+        value = {
+            name: getattr(value, name) for name in type(value).model_fields if name in fields_set
+        }
+
+    if isinstance(value, dict):
+        out: dict[str, Any] = {}
+        for k, v in value.items():
+            if budget[0] <= 0:
+                out[_TRUNCATION_MARKER] = f"+{len(value) - len(out)} keys"
+                break
+            key = str(k)
+            budget[0] -= len(key) + 4
+            out[key] = _serialize_bounded(v, budget, depth + 1)
+        return out
+    if isinstance(value, list | tuple | set | frozenset):
+        items: list[Any] = []
+        for item in value:
+            if budget[0] <= 0:
+                items.append(f"{_TRUNCATION_MARKER} +{len(value) - len(items)} items")
+                break
+            budget[0] -= 2
+            items.append(_serialize_bounded(item, budget, depth + 1))
+        return items
+
+    # Fallback to string representation (matches json.dumps(default=str))
+    return _serialize_bounded(str(value), budget, depth)
+
+
 def _serialize_value(value: Any, max_length: int = 1000) -> Any:
     """Safely serialize a value for logging.
 
+    Serialization is size-bounded: strings are clipped and containers stop
+    expanding once roughly ``max_length`` characters have been emitted, so the
+    cost is proportional to ``max_length`` rather than to the size of ``value``.
+
     Args:
         value: Value to serialize
-        max_length: Maximum string length for truncation
+        max_length: Approximate maximum serialized size in characters
 
     Returns:
         Serializable representation of the value
     """
     try:
-        # Handle Pydantic models
-        if isinstance(value, BaseModel):
-            return value.model_dump(mode="json", exclude_unset=True)
-
-        # Handle other complex objects
-        json_str = json.dumps(value, default=str)
-        if len(json_str) > max_length:
-            return json_str[:max_length] + "..."
-        return json.loads(json_str)  # Parse back to keep consistent types
-
-    except (TypeError, ValueError):
+        return _serialize_bounded(value, [max_length], 0)
+    except Exception:
         # Fallback to string representation
         str_repr = str(value)
         if len(str_repr) > max_length:
-            return str_repr[:max_length] + "..."
+            return str_repr[:max_length] + _TRUNCATION_MARKER
         return str_repr
 
 
+def _log_enabled(level_no: int) -> bool:
+    """Return True if an event at ``level_no`` would survive level filtering.
+
+    Level filtering only applies when structlog routes through stdlib
+    (``filter_by_level`` or ``ProcessorFormatter``); other configurations such
+    as ``structlog.testing.capture_logs`` receive every event.
+    """
+    processors = structlog.get_config()["processors"]
+    if not any(
+        p is structlog.stdlib.filter_by_level
+        or p is structlog.stdlib.ProcessorFormatter.wrap_for_formatter
+        for p in processors
+    ):
+        return True
+    return logging.getLogger(__name__).isEnabledFor(level_no)
+
+
+def _default_sample_rate() -> float:
+    try:
+        return float(get_settings().observability_trace_sample_rate)
+    except Exception:
+        return 1.0
+
+
 def llm_debug_wrapper(
     *,
     capture_result: bool = True,
@@ -156,6 +239,7 @@ def llm_debug_wrapper(
     log_level: str = "INFO",
     add_metadata: dict[str, Any] | None = None,
     warn_over_ms: float | None = None,
+    sample_rate: float | None = None,
 ) -> Callable[[F], F]:
     """Decorator for comprehensive function tracing and debugging.
 
@@ -167,223 +251,158 @@ def llm_debug_wrapper(
     - Structured JSON logging output
     - Support for both sync and async functions
 
+    Every call records its duration and status in the
+    ``chimera_traced_call_duration_seconds`` histogram. Only a sampled fraction
+    of calls pays for full tracing (argument/result serialization and
+    entry/exit logs); unsampled calls take a fast path that does nothing else.
+    Failures are always logged in full regardless of sampling. Serialization
+    is skipped entirely when the configured log level would drop the event.
+
     Args:
         capture_result: Whether to capture and log the return value
         capture_args: Whether to capture and log input arguments
-        max_arg_length: Maximum length for serialized arguments
+        max_arg_length: Approximate size bound for each serialized argument
         log_level: Log level for successful executions
         add_metadata: Additional metadata to include in logs
+        warn_over_ms: Log a warning when a call exceeds this duration
+        sample_rate: Fraction of calls traced in full (0.0-1.0). Defaults to
+            ``settings.observability_trace_sample_rate``.
 
     Returns:
         Decorated function with observability features
 
     Example:
-        >>> @llm_debug_wrapper(capture_result=True)
+        >>> @llm_debug_wrapper(capture_result=True, sample_rate=0.1)
         ... async def fetch_match_data(match_id: str) -> dict:
         ...     return {"match_id": match_id, "data": "..."}
     """
+    level_name = log_level.lower()
+    level_no = logging.getLevelName(log_level.upper())
+    if not isinstance(level_no, int):
+        level_no = logging.INFO
 
     def decorator(func: F) -> F:
         # Determine if function is async
         is_async = asyncio.iscoroutinefunction(func)
+        function_name = f"{func.__module__}.{func.__name__}"
+        kind = "async function" if is_async else "function"
 
-        @functools.wraps(func)
-        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
-            """Async version of the wrapper."""
-            # Generate execution ID
-            execution_id = f"{func.__module__}.{func.__name__}_{int(time.time() * 1000000)}"
+        def _sampled() -> bool:
+            rate = sample_rate if sample_rate is not None else _default_sample_rate()
+            return rate >= 1.0 or (rate > 0.0 and random.random() < rate)
 
-            # Prepare trace object
-            trace = FunctionTrace(
-                function_name=f"{func.__module__}.{func.__name__}",
-                module=func.__module__,
-                execution_id=execution_id,
-                is_async=True,
-                metadata=add_metadata or {},
+        def _capture_args(args: tuple[Any, ...], kwargs: dict[str, Any]) -> tuple[Any, Any]:
+            return (
+                [_serialize_value(arg, max_arg_length) for arg in args],
+                {k: _safe_serialize_kv(k, v, max_arg_length) for k, v in kwargs.items()},
             )
 
-            # Capture arguments if enabled
-            if capture_args:
-                trace.args = [_serialize_value(arg, max_arg_length) for arg in args]
-                trace.kwargs = {
-                    k: _safe_serialize_kv(k, v, max_arg_length) for k, v in kwargs.items()
-                }
-
+        def _on_start(args: tuple[Any, ...], kwargs: dict[str, Any]) -> tuple[str, bool]:
+            execution_id = f"{function_name}_{int(time.time() * 1000000)}"
             # Bind context variables for correlation
             # Keep existing correlation_id if already bound by caller
             bind_contextvars(execution_id=execution_id)
 
-            # Log function entry (sync logging from async context is fine)
-            getattr(logger, log_level.lower())(
-                f"Executing async function: {trace.function_name}",
+            verbose = _log_enabled(level_no)
+            if verbose:
+                arg_repr, kwarg_repr = _capture_args(args, kwargs) if capture_args else (None, None)
+                getattr(logger, level_name)(
+                    f"Executing {kind}: {function_name}",
+                    execution_id=execution_id,
+                    args=arg_repr,
+                    kwargs=kwarg_repr,
+                    **({"metadata": add_metadata} if add_metadata else {}),
+                )
+            return execution_id, verbose
+
+        def _on_success(
+            execution_id: str | None, verbose: bool, result: Any, duration_ms: float
+        ) -> None:
+            if verbose:
+                getattr(logger, level_name)(
+                    f"Successfully executed: {function_name}",
+                    execution_id=execution_id,
+                    duration_ms=duration_ms,
+                    result=(
+                        _redact_obj(_serialize_value(result, max_arg_length))
+                        if capture_result
+                        else None
+                    ),
+                )
+
+            # Optional performance warning when exceeding threshold
+            if warn_over_ms is not None and duration_ms > warn_over_ms:
+                logger.warning(
+                    "Operation exceeded performance threshold",
+                    function_name=function_name,
+                    execution_id=execution_id,
+                    duration_ms=duration_ms,
+                    warn_over_ms=warn_over_ms,
+                )
+
+        def _on_error(
+            execution_id: str | None,
+            exc: Exception,
+            args: tuple[Any, ...],
+            kwargs: dict[str, Any],
+            duration_ms: float,
+        ) -> None:
+            arg_repr, kwarg_repr = _capture_args(args, kwargs) if capture_args else (None, None)
+            logger.error(
+                f"Error in function: {function_name}",
+                function_name=function_name,
                 execution_id=execution_id,
-                args=trace.args if capture_args else None,
-                kwargs=trace.kwargs if capture_args else None,
+                duration_ms=duration_ms,
+                error_type=type(exc).__name__,
+                error_message=str(exc),
+                traceback=traceback.format_exc(),
+                args=arg_repr,
+                kwargs=kwarg_repr,
             )
 
+        @functools.wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            """Async version of the wrapper."""
+            traced = _sampled()
+            execution_id, verbose = _on_start(args, kwargs) if traced else (None, False)
             start_time = time.perf_counter()
-
+            status = "error"
             try:
-                # Execute the actual function
                 result = await func(*args, **kwargs)
-
-                # Calculate duration
-                trace.duration_ms = (time.perf_counter() - start_time) * 1000
-                trace.is_success = True
-
-                # Capture result if enabled
-                if capture_result:
-                    trace.result = _redact_obj(_serialize_value(result, max_arg_length))
-
-                # Log success
-                getattr(logger, log_level.lower())(
-                    f"Successfully executed: {trace.function_name}",
-                    execution_id=execution_id,
-                    duration_ms=trace.duration_ms,
-                    result=trace.result if capture_result else None,
+                status = "success"
+                _on_success(
+                    execution_id, verbose, result, (time.perf_counter() - start_time) * 1000
                 )
-
-                # Optional performance warning when exceeding threshold
-                if warn_over_ms is not None and trace.duration_ms is not None:
-                    try:
-                        if trace.duration_ms > warn_over_ms:
-                            logger.warning(
-                                "Operation exceeded performance threshold",
-                                function_name=trace.function_name,
-                                execution_id=execution_id,
-                                duration_ms=trace.duration_ms,
-                                warn_over_ms=warn_over_ms,
-                            )
-                    except Exception:
-                        pass
-
                 return result
-
             except Exception as e:
-                # Calculate duration even on failure
-                trace.duration_ms = (time.perf_counter() - start_time) * 1000
-                trace.is_success = False
-                trace.error_type = type(e).__name__
-                trace.error_message = str(e)
-                trace.error_traceback = traceback.format_exc()
-
-                # Log error with full context
-                logger.error(
-                    "Error in function",
-                    function_name=trace.function_name,
-                    execution_id=execution_id,
-                    duration_ms=trace.duration_ms,
-                    error_type=trace.error_type,
-                    error_message=trace.error_message,
-                    traceback=trace.error_traceback,
-                    args=trace.args if capture_args else None,
-                    kwargs=trace.kwargs if capture_args else None,
-                )
-
-                # Re-raise the exception
+                _on_error(execution_id, e, args, kwargs, (time.perf_counter() - start_time) * 1000)
                 raise
-
             finally:
-                # Clear context variables
-                unbind_contextvars("execution_id")
+                observe_traced_call(function_name, status, time.perf_counter() - start_time)
+                if execution_id is not None:
+                    unbind_contextvars("execution_id")
 
         @functools.wraps(func)
         def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
             """Sync version of the wrapper."""
-            # Generate execution ID
-            execution_id = f"{func.__module__}.{func.__name__}_{int(time.time() * 1000000)}"
-
-            # Prepare trace object
-            trace = FunctionTrace(
-                function_name=f"{func.__module__}.{func.__name__}",
-                module=func.__module__,
-                execution_id=execution_id,
-                is_async=False,
-                metadata=add_metadata or {},
-            )
-
-            # Capture arguments if enabled
-            if capture_args:
-                trace.args = [_serialize_value(arg, max_arg_length) for arg in args]
-                trace.kwargs = {
-                    k: _safe_serialize_kv(k, v, max_arg_length) for k, v in kwargs.items()
-                }
-
-            # Bind context variables for correlation
-            bind_contextvars(execution_id=execution_id)
-
-            # Log function entry
-            getattr(logger, log_level.lower())(
-                f"Executing function: {trace.function_name}",
-                execution_id=execution_id,
-                args=trace.args if capture_args else None,
-                kwargs=trace.kwargs if capture_args else None,
-            )
-
+            traced = _sampled()
+            execution_id, verbose = _on_start(args, kwargs) if traced else (None, False)
             start_time = time.perf_counter()
-
+            status = "error"
             try:
-                # Execute the actual function
                 result = func(*args, **kwargs)
-
-                # Calculate duration
-                trace.duration_ms = (time.perf_counter() - start_time) * 1000
-                trace.is_success = True
-
-                # Capture result if enabled
-                if capture_result:
-                    trace.result = _redact_obj(_serialize_value(result, max_arg_length))
-
-                # Log success
-                getattr(logger, log_level.lower())(
-                    f"Successfully executed: {trace.function_name}",
-                    execution_id=execution_id,
-                    duration_ms=trace.duration_ms,
-                    result=trace.result if capture_result else None,
+                status = "success"
+                _on_success(
+                    execution_id, verbose, result, (time.perf_counter() - start_time) * 1000
                 )
-
-                # Optional performance warning when exceeding threshold
-                if warn_over_ms is not None and trace.duration_ms is not None:
-                    try:
-                        if trace.duration_ms > warn_over_ms:
-                            logger.warning(
-                                "Operation exceeded performance threshold",
-                                function_name=trace.function_name,
-                                execution_id=execution_id,
-                                duration_ms=trace.duration_ms,
-                                warn_over_ms=warn_over_ms,
-                            )
-                    except Exception:
-                        pass
-
                 return result
-
             except Exception as e:
-                # Calculate duration even on failure
-                trace.duration_ms = (time.perf_counter() - start_time) * 1000
-                trace.is_success = False
-                trace.error_type = type(e).__name__
-                trace.error_message = str(e)
-                trace.error_traceback = traceback.format_exc()
-
-                # Log error with full context
-                logger.error(
-                    f"Error in function: {trace.function_name}",
-                    execution_id=execution_id,
-                    duration_ms=trace.duration_ms,
-                    error_type=trace.error_type,
-                    error_message=trace.error_message,
-                    traceback=trace.error_traceback,
-                    args=trace.args if capture_args else None,
-                    kwargs=trace.kwargs if capture_args else None,
-                )
-
-                # Re-raise the exception
+                _on_error(execution_id, e, args, kwargs, (time.perf_counter() - start_time) * 1000)
                 raise
-
             finally:
-                # Clear context variables
-                unbind_contextvars("execution_id")
+                observe_traced_call(function_name, status, time.perf_counter() - start_time)
+                if execution_id is not None:
+                    unbind_contextvars("execution_id")
 
         # Return appropriate wrapper based on function type
         if is_async:
@@ -422,6 +441,85 @@ def trace_adapter(func: F) -> F:
     )(func)
 
 
+# -------------------------
+# Stage timing
+# -------------------------
+class StageTimer:
+    """Stopwatch for the stages of one pipeline run.
+
+    Each stage is recorded as (name, start offset, duration) relative to the
+    run origin, which yields both Prometheus stage histograms (via ``emit``)
+    and a compact waterfall that can be attached to task results.
+
+    Example:
+        >>> timer = StageTimer("analyze")
+        >>> with timer.stage("fetch"):
+        ...     ...
+        >>> timer.game_mode = "SR"
+        >>> timer.emit()
+        >>> timer.waterfall()
+        [{'stage': 'fetch', 'start_ms': 0.0, 'duration_ms': 0.0}]
+    """
+
+    def __init__(self, pipeline: str, origin: float | None = None) -> None:
+        self.pipeline = pipeline
+        self.game_mode = "unknown"
+        self._origin = origin if origin is not None else time.perf_counter()
+        self._stages: list[tuple[str, float, float]] = []
+        self._emitted = False
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as stage ``name`` (recorded even on error)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start)
+
+    def record(self, name: str, start: float, end: float | None = None) -> float:
+        """Record a stage from explicit perf_counter timestamps.
+
+        Returns:
+            The stage duration in milliseconds.
+        """
+        stop = end if end is not None else time.perf_counter()
+        duration_ms = (stop - start) * 1000
+        self._stages.append((name, (start - self._origin) * 1000, duration_ms))
+        return duration_ms
+
+    def duration_ms(self, name: str) -> float | None:
+        """Total time spent in stage ``name`` (None if never recorded)."""
+        durations = [d for n, _, d in self._stages if n == name]
+        return sum(durations) if durations else None
+
+    def stage_totals_ms(self) -> dict[str, float]:
+        """Time per stage name, summed over repeated records, in first-seen order."""
+        totals: dict[str, float] = {}
+        for name, _, duration in self._stages:
+            totals[name] = totals.get(name, 0.0) + duration
+        return totals
+
+    def elapsed_ms(self) -> float:
+        """Milliseconds since the run origin."""
+        return (time.perf_counter() - self._origin) * 1000
+
+    def waterfall(self) -> list[dict[str, Any]]:
+        """Compact, start-ordered list of recorded stages."""
+        return [
+            {"stage": name, "start_ms": round(start, 1), "duration_ms": round(duration, 1)}
+            for name, start, duration in sorted(self._stages, key=lambda s: s[1])
+        ]
+
+    def emit(self) -> None:
+        """Observe every recorded stage in the stage histogram (once per run)."""
+        if self._emitted:
+            return
+        self._emitted = True
+        for name, _, duration in self._stages:
+            observe_stage_latency(self.pipeline, name, self.game_mode, duration / 1000.0)
+
+
 # -------------------------
 # Correlation ID management
 # -------------------------
@@ -452,8 +550,6 @@ def configure_stdlib_json_logging(level: str = "INFO", file_target: str | None =
         level: Root log level (e.g., "INFO", "DEBUG").
         file_target: Optional path to a logfile to receive structured logs.
     """
-    import logging
-
     from structlog.stdlib import ProcessorFormatter
 
     timestamper = structlog.processors.TimeStamper(fmt="iso")
@@ -4,6 +4,7 @@ Abstracts the Riot API match history operations for dependency inversion.
 """
 
 from abc import ABC, abstractmethod
+from typing import Any
 
 
 class IMatchHistoryService(ABC):
@@ -51,3 +52,17 @@ class IMatchHistoryService(ABC):
             DatabaseError: If query fails
         """
         pass
+
+    async def get_analysis_bundle(
+        self, match_id: str
+    ) -> tuple[dict[str, str] | None, dict[str, Any] | None, dict[str, Any] | None]:
+        """Status plus the full analysis record and match row, when available.
+
+        Implementations backed by a database should override this with a single
+        joined query. The default only reports status; callers fetch the record
+        and match row themselves when they are None.
+
+        Returns:
+            (status info as in `get_analysis_status`, analysis record, match row)
+        """
+        return await self.get_analysis_status(match_id), None, None
@@ -0,0 +1,189 @@
+"""Opt-in sampling profiler for Celery tasks.
+
+A background thread snapshots the task thread's Python stack at a fixed
+interval while a sampled task runs. Samples are aggregated per task into
+collapsed stacks ("frame;frame;frame count"), the input format of
+flamegraph.pl / speedscope / inferno, and flushed to PROFILING_OUTPUT_DIR so
+the callback server can serve the merged profile of every worker process.
+
+Overhead is bounded twice: only PROFILING_SAMPLE_RATE of executions are
+profiled, and the sampler stretches its own sleep so the time spent walking
+stacks never exceeds ~2% of the profiled task's wall time.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+import random
+import socket
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+
+from src.config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Sampler may use at most this fraction of the profiled thread's wall time
+MAX_OVERHEAD_RATIO = 0.02
+COLLAPSED_SUFFIX = ".collapsed"
+
+_lock = threading.Lock()
+_profiles: dict[str, Counter[str]] = {}
+_active: dict[str, StackSampler] = {}
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{code.co_name}"
+
+
+def collapse_stack(frame: FrameType | None) -> str:
+    """Render a frame chain root-first as a collapsed-stack key."""
+    labels: list[str] = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return ";".join(labels)
+
+
+class StackSampler:
+    """Samples one thread's stack on a daemon thread until stopped."""
+
+    def __init__(self, thread_id: int, interval_s: float) -> None:
+        self.thread_id = thread_id
+        self.interval_s = max(0.001, interval_s)
+        self.samples: Counter[str] = Counter()
+        self.sampling_seconds = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="chimera-stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> Counter[str]:
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+        return self.samples
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            t0 = time.perf_counter()
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.samples[collapse_stack(frame)] += 1
+            del frame
+            cost = time.perf_counter() - t0
+            self.sampling_seconds += cost
+            # Keep sampling cost under MAX_OVERHEAD_RATIO of elapsed time
+            self._stop.wait(max(self.interval_s, cost / MAX_OVERHEAD_RATIO))
+
+
+def _short_task_name(task_name: str) -> str:
+    return task_name.rsplit(".", 1)[-1]
+
+
+def _profiled_tasks() -> set[str]:
+    raw = get_settings().profiling_tasks
+    return {name.strip() for name in raw.split(",") if name.strip()}
+
+
+def _output_dir() -> Path:
+    path = Path(get_settings().profiling_output_dir)
+    return path if path.is_absolute() else Path.cwd() / path
+
+
+def _process_tag() -> str:
+    host = socket.gethostname().replace("_", "-").replace("/", "-") or "host"
+    return f"{host}-{os.getpid()}"
+
+
+def should_profile(task_name: str) -> bool:
+    """Return True if this execution of `task_name` should be sampled."""
+    settings = get_settings()
+    if not settings.profiling_enabled:
+        return False
+    if task_name not in _profiled_tasks() and _short_task_name(task_name) not in _profiled_tasks():
+        return False
+    return random.random() < settings.profiling_sample_rate
+
+
+def start_task_profile(task_name: str, task_id: str) -> bool:
+    """Start sampling the calling thread for one task execution.
+
+    Returns True if a sampler was started (the execution was sampled).
+    """
+    if not should_profile(task_name):
+        return False
+    sampler = StackSampler(threading.get_ident(), get_settings().profiling_interval_ms / 1000)
+    with _lock:
+        _active[task_id] = sampler
+    sampler.start()
+    return True
+
+
+def stop_task_profile(task_name: str, task_id: str) -> None:
+    """Stop the sampler for `task_id` (if any), merge and flush its samples."""
+    with _lock:
+        sampler = _active.pop(task_id, None)
+    if sampler is None:
+        return
+    samples = sampler.stop()
+    short = _short_task_name(task_name)
+    with _lock:
+        profile = _profiles.setdefault(short, Counter())
+        profile.update(samples)
+        snapshot = dict(profile)
+    with contextlib.suppress(Exception):
+        _write_collapsed(short, snapshot)
+    logger.info(
+        "task_profile_captured",
+        extra={
+            "task_name": task_name,
+            "task_id": task_id,
+            "samples": sum(samples.values()),
+            "sampling_ms": round(sampler.sampling_seconds * 1000, 3),
+        },
+    )
+
+
+def _write_collapsed(short_task: str, stacks: dict[str, int]) -> None:
+    out_dir = _output_dir()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    target = out_dir / f"{short_task}.{_process_tag()}{COLLAPSED_SUFFIX}"
+    tmp = target.with_suffix(".tmp")
+    tmp.write_text(
+        "".join(f"{stack} {count}\n" for stack, count in sorted(stacks.items())),
+        encoding="utf-8",
+    )
+    os.replace(tmp, target)
+
+
+def load_collapsed(task: str | None = None) -> str:
+    """Merge collapsed-stack files from every process in PROFILING_OUTPUT_DIR.
+
+    Args:
+        task: Optional task name (short or dotted) to filter on
+
+    Returns:
+        Collapsed stacks, one "stack count" line per unique stack
+    """
+    out_dir = _output_dir()
+    if not out_dir.exists():
+        return ""
+    prefix = f"{_short_task_name(task)}." if task else ""
+    merged: Counter[str] = Counter()
+    for path in out_dir.glob(f"{prefix}*{COLLAPSED_SUFFIX}"):
+        with contextlib.suppress(OSError):
+            for line in path.read_text(encoding="utf-8").splitlines():
+                stack, _, count = line.rpartition(" ")
+                if stack and count.isdigit():
+                    merged[stack] += int(count)
+    return "".join(f"{stack} {count}\n" for stack, count in sorted(merged.items()))
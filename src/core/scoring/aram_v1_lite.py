@@ -21,6 +21,8 @@ from src.contracts.v23_multi_mode_analysis import (
     V23ARAMBuildAdaptation,
     V23ARAMTeamfightMetrics,
 )
+from src.core.scoring.compact_timeline import CompactTimeline
+from src.core.scoring.teamfight_engine import detect_teamfights, team_ids
 
 
 # =============================================================================
@@ -29,52 +31,47 @@ from src.contracts.v23_multi_mode_analysis import (
 
 
 def detect_aram_teamfights(
-    timeline_data: dict[str, Any],
+    timeline_data: dict[str, Any] | CompactTimeline,
     player_puuid: str,
+    match_data: dict[str, Any] | None = None,
 ) -> list[dict[str, Any]]:
-    """Detect teamfights from Timeline API events.
+    """Detect teamfights from Timeline API positions and events.
 
     In ARAM, teamfights are frequent and occur around mid-lane.
-    Definition: 3+ champions from each team within 2000 units, lasting 10+ seconds.
+    Definition: 3+ champions from each team within 2000 units of an enemy in a
+    frame around a kill/objective (shared engine with SR teamfight summaries).
 
     Args:
-        timeline_data: Match-V5 Timeline API response
+        timeline_data: Match-V5 Timeline API response (or a prebuilt `CompactTimeline`)
         player_puuid: Target player's PUUID
+        match_data: Optional Match-V5 response for team/participant mapping
 
     Returns:
         List of teamfight events with metrics
     """
-    teamfights = []
-
-    # Parse CHAMPION_KILL events to cluster teamfights
-    # (Simplified logic - production should use spatial clustering)
-    frames = timeline_data.get("info", {}).get("frames", [])
-
-    for frame in frames:
-        events = frame.get("events", [])
-
-        # Find clusters of kills/deaths within 30-second windows
-        kill_events = [e for e in events if e.get("type") == "CHAMPION_KILL"]
-
-        if len(kill_events) >= 3:  # At least 3 kills = teamfight
-            teamfight = {
-                "start_timestamp": kill_events[0]["timestamp"],
-                "end_timestamp": kill_events[-1]["timestamp"],
-                "kills_in_fight": len(kill_events),
-                "player_participated": any(
-                    e.get("killerId") == player_puuid
-                    or player_puuid in e.get("assistingParticipantIds", [])
-                    for e in kill_events
-                ),
-            }
-            teamfights.append(teamfight)
-
-    return teamfights
+    timeline = CompactTimeline.coerce(timeline_data)
+    pid = timeline.participant_id_for(player_puuid) or 0
+    if not pid and match_data:
+        for p in match_data.get("info", {}).get("participants", []) or []:
+            if p.get("puuid") == player_puuid:
+                pid = int(p.get("participantId", 0) or 0)
+                break
+
+    teams = team_ids(timeline, match_data)
+    return [
+        {
+            "start_timestamp": fight.start_ms,
+            "end_timestamp": fight.end_ms,
+            "kills_in_fight": fight.kills,
+            "player_participated": fight.participated(pid),
+        }
+        for fight in detect_teamfights(timeline, teams, radius=2000.0, min_engaged=3)
+    ]
 
 
 def calculate_aram_teamfight_metrics(
     match_data: dict[str, Any],
-    timeline_data: dict[str, Any],
+    timeline_data: dict[str, Any] | CompactTimeline,
     player_puuid: str,
 ) -> V23ARAMTeamfightMetrics:
     """Calculate ARAM-specific teamfight performance metrics.
@@ -92,7 +89,7 @@ def calculate_aram_teamfight_metrics(
     player_data = next(p for p in participants if p["puuid"] == player_puuid)
 
     # Detect teamfights
-    teamfights = detect_aram_teamfights(timeline_data, player_puuid)
+    teamfights = detect_aram_teamfights(timeline_data, player_puuid, match_data)
     total_teamfights = len([tf for tf in teamfights if tf["player_participated"]])
 
     # Calculate damage share in teamfights
@@ -311,7 +308,7 @@ def calculate_aram_overall_score(
 
 def generate_aram_analysis_report(
     match_data: dict[str, Any],
-    timeline_data: dict[str, Any],
+    timeline_data: dict[str, Any] | CompactTimeline,
     player_puuid: str,
     summoner_name: str,
 ) -> V23ARAMAnalysisReport:
@@ -21,6 +21,8 @@ Design Principles:
 
 from typing import Any
 
+import numpy as np
+
 from src.core.observability import llm_debug_wrapper
 
 from src.contracts.v23_multi_mode_analysis import (
@@ -29,6 +31,7 @@ from src.contracts.v23_multi_mode_analysis import (
     V23ArenaRoundPerformance,
 )
 from src.core.data.arena_augments import ArenaAugmentCatalog
+from src.core.scoring.compact_timeline import CompactTimeline
 
 
 # =============================================================================
@@ -37,65 +40,42 @@ from src.core.data.arena_augments import ArenaAugmentCatalog
 
 
 def detect_arena_rounds(
-    timeline_data: dict[str, Any],
+    timeline_data: dict[str, Any] | CompactTimeline,
     player_puuid: str,
 ) -> list[V23ArenaRoundPerformance]:
     """Detect Arena rounds from Timeline API events (participant_id-based).
 
     Uses participantId mapping from match_details (baked into timeline.info.participants).
+    Accepts a prebuilt `CompactTimeline` to share one parse across extractors.
     """
     rounds: list[V23ArenaRoundPerformance] = []
-    info = (timeline_data or {}).get("info", {})
-    frames = info.get("frames", []) or []
-    parts = info.get("participants", []) or []
-
-    # Map puuid -> participant_id
-    pid = None
-    for p in parts:
-        if isinstance(p, dict) and p.get("puuid") == player_puuid:
-            pid = int(p.get("participant_id", 0))
-            break
+    timeline = CompactTimeline.coerce(timeline_data)
+    pid = timeline.participant_id_for(player_puuid)
     if not pid:
         return rounds
 
-    current = {"round_number": 1, "damage_dealt": 0, "damage_taken": 0, "kills": 0, "deaths": 0}
+    # Timeline API returns CUMULATIVE totals, not per-frame deltas; a frame missing the
+    # player reads as 0, so the following frame counts its full cumulative total again
+    dealt = timeline.series("damage_to_champions", pid).astype(np.int64)
+    taken = timeline.series("damage_taken", pid).astype(np.int64)
+    delta_dealt = np.maximum(0, np.diff(dealt, prepend=0))
+    delta_taken = np.maximum(0, np.diff(taken, prepend=0))
 
-    # Track previous round's ending totals for delta calculation
-    # Timeline API returns CUMULATIVE totals, not per-frame deltas
-    prev_total_damage_dealt = 0
-    prev_total_damage_taken = 0
-
-    for fr in frames:
-        # Riot API adapter returns snake_case fields after transformation
-        pf = fr.get("participant_frames", {}).get(str(pid), {}) or {}
-        ds = pf.get("damage_stats", {}) or {}
-
-        # Get current frame's CUMULATIVE totals
-        frame_total_dealt = int(ds.get("total_damage_done_to_champions", 0))
-        frame_total_taken = int(ds.get("total_damage_taken", 0))
-
-        # Calculate DELTA since last round
-        delta_dealt = max(0, frame_total_dealt - prev_total_damage_dealt)
-        delta_taken = max(0, frame_total_taken - prev_total_damage_taken)
-
-        # Accumulate delta for current round
-        current["damage_dealt"] += delta_dealt
-        current["damage_taken"] += delta_taken
-
-        # Update previous totals for next frame
-        prev_total_damage_dealt = frame_total_dealt
-        prev_total_damage_taken = frame_total_taken
-
-        # deaths/kills per frame not exposed; infer via events
-        for ev in fr.get("events", []) or []:
-            if ev.get("type") == "CHAMPION_KILL":
-                if int(ev.get("killerId", 0)) == pid:
-                    current["kills"] += 1
-                if int(ev.get("victimId", 0)) == pid:
-                    current["deaths"] += 1
+    # deaths/kills per frame not exposed; infer via events
+    kills = timeline.events_of("CHAMPION_KILL")
+    n_frames = timeline.n_frames
+    frame_kills = np.bincount(kills["frame"], minlength=n_frames)
+    my_kills = np.bincount(kills["frame"][kills["killer"] == pid], minlength=n_frames)
+    my_deaths = np.bincount(kills["frame"][kills["victim"] == pid], minlength=n_frames)
+
+    current = {"round_number": 1, "damage_dealt": 0, "damage_taken": 0, "kills": 0, "deaths": 0}
+    for f in range(n_frames):
+        current["damage_dealt"] += int(delta_dealt[f])
+        current["damage_taken"] += int(delta_taken[f])
+        current["kills"] += int(my_kills[f])
+        current["deaths"] += int(my_deaths[f])
         # naive round boundary: 2+ kills in frame or both teams trade in short window
-        kill_events = [e for e in fr.get("events", []) or [] if e.get("type") == "CHAMPION_KILL"]
-        if len(kill_events) >= 2:
+        if frame_kills[f] >= 2:
             pos = 75.0
             if current["deaths"] == 0:
                 pos = 90.0
@@ -113,7 +93,7 @@ def detect_arena_rounds(
                     positioning_score=pos,
                 )
             )
-            # Reset for next round but DON'T reset prev_total (it continues accumulating)
+            # Reset for next round; cumulative deltas carry on across rounds
             current = {
                 "round_number": current["round_number"] + 1,
                 "damage_dealt": 0,
@@ -287,7 +267,7 @@ def calculate_arena_overall_score(
 )
 def generate_arena_analysis_report(
     match_data: dict[str, Any],
-    timeline_data: dict[str, Any],
+    timeline_data: dict[str, Any] | CompactTimeline,
     player_puuid: str,
     summoner_name: str,
 ) -> V23ArenaAnalysisReport:
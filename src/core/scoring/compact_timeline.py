@@ -0,0 +1,379 @@
+"""Array-backed timeline representation for scoring and enrichment.
+
+Converted Match-V5 timelines are nested dicts keyed by stringified participant
+IDs, so every extractor walking them pays for `.get()` chains, `str(pid)` keys
+and `int()` coercions on each frame. `CompactTimeline` does that walk once:
+
+- per-participant stats live in one ``int32`` array shaped
+  ``(frames, participants, stats)`` with a parallel presence mask, so a series
+  such as a player's gold curve is a strided view rather than a dict walk;
+- events are a time-sorted NumPy structured array (`EVENT_DTYPE`) whose string
+  fields (type, monster, building) are interned into small integer codes; only
+  kill/objective events have their participant and objective fields decoded;
+- frame lookup by timestamp is a binary search over the frame timestamps.
+
+Both the snake_case keys produced by `convert_match_timeline` and raw camelCase
+Riot keys are accepted. Missing numeric fields read as 0 with their presence
+bit cleared, which mirrors the ``int(x.get(key, 0))`` idiom the dict-walking
+extractors used.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+import numpy as np
+
+# Stat columns (last axis of `CompactTimeline.values`) and the keys each is read from
+STAT_KEYS: dict[str, tuple[str, ...]] = {
+    "total_gold": ("total_gold", "totalGold", "gold", "goldEarned"),
+    "current_gold": ("current_gold", "currentGold"),
+    "xp": ("xp", "experience", "totalExperience"),
+    "level": ("level",),
+    "minions_killed": ("minions_killed", "minionsKilled"),
+    "jungle_minions_killed": ("jungle_minions_killed", "jungleMinionsKilled"),
+}
+_DAMAGE_KEYS: dict[str, tuple[str, ...]] = {
+    "damage_to_champions": (
+        "total_damage_done_to_champions",
+        "totalDamageDoneToChampions",
+    ),
+    "damage_taken": ("total_damage_taken", "totalDamageTaken"),
+}
+STATS: tuple[str, ...] = (*STAT_KEYS, *_DAMAGE_KEYS, "position_x", "position_y")
+_STAT_KEY_LIST = tuple(STAT_KEYS.values())
+_DAMAGE_KEY_LIST = tuple(_DAMAGE_KEYS.values())
+_POSITION_KEY_LIST = (("x",), ("y",))
+_STAT_INDEX = {name: i for i, name in enumerate(STATS)}
+
+EVENT_DTYPE = np.dtype(
+    [
+        ("timestamp", np.int64),
+        ("frame", np.int32),
+        ("type", np.int16),
+        ("killer", np.int16),
+        ("victim", np.int16),
+        ("team", np.int16),
+        ("monster", np.int16),
+        ("building", np.int16),
+        ("assists", np.uint32),  # bit n set => participant n assisted
+        ("x", np.int32),
+        ("y", np.int32),
+    ]
+)
+
+
+# Event types whose actor/target/objective fields are decoded; every other event
+# (wards, item purchases, skill level-ups: ~85% of a timeline) keeps only its
+# timestamp, frame and type so building stays cheap
+_DETAILED_EVENTS = frozenset(
+    {
+        "CHAMPION_KILL",
+        "CHAMPION_SPECIAL_KILL",
+        "ELITE_MONSTER_KILL",
+        "BUILDING_KILL",
+        "TURRET_PLATE_DESTROYED",
+    }
+)
+
+
+_DETAILED_FIELDS = ("killer", "victim", "team", "monster", "building", "assists", "x", "y")
+
+
+def _to_int(value: Any) -> int | None:
+    if value is None or value.__class__ is int:
+        return value
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        try:
+            return int(float(value))
+        except (TypeError, ValueError):
+            return None
+
+
+def _first_int(source: Mapping[str, Any], keys: tuple[str, ...]) -> int | None:
+    for key in keys:
+        value = source.get(key)
+        if value.__class__ is int:
+            return value
+        value = _to_int(value)
+        if value is not None:
+            return value
+    return None
+
+
+def _read_stats(
+    source: Any, key_list: tuple[tuple[str, ...], ...], values: list[int], has: list[bool]
+) -> None:
+    if not isinstance(source, dict):
+        values.extend([0] * len(key_list))
+        has.extend([False] * len(key_list))
+        return
+    for keys in key_list:
+        # Converted timelines hit the first (snake_case) key with a plain int
+        v = source.get(keys[0])
+        if v.__class__ is not int:
+            v = _first_int(source, keys)
+        if v is None:
+            values.append(0)
+            has.append(False)
+        else:
+            values.append(v)
+            has.append(True)
+
+
+def _participant_key(key: Any, value: Mapping[str, Any]) -> int | None:
+    pid = _to_int(key)
+    if pid is None:
+        pid = _to_int(value.get("participant_id", value.get("participantId")))
+    return pid if pid is not None and 0 < pid < 32 else None
+
+
+class CompactTimeline:
+    """Columnar, read-only view of a converted Match-V5 timeline."""
+
+    __slots__ = (
+        "timestamps",
+        "values",
+        "has",
+        "present",
+        "events",
+        "_codes",
+        "_labels",
+        "_puuids",
+    )
+
+    def __init__(
+        self,
+        timestamps: np.ndarray,
+        values: np.ndarray,
+        has: np.ndarray,
+        present: np.ndarray,
+        events: np.ndarray,
+        codes: dict[str, int],
+        puuids: dict[str, int],
+    ) -> None:
+        self.timestamps = timestamps
+        self.values = values
+        self.has = has
+        # A participant is present in a frame when it had a non-empty frame dict
+        self.present = present
+        self.events = events
+        self._codes = codes
+        self._labels = tuple(codes)  # insertion order == code order
+        self._puuids = puuids
+
+    def __repr__(self) -> str:
+        return (
+            f"CompactTimeline(frames={self.n_frames}, width={self.width}, "
+            f"events={len(self.events)})"
+        )
+
+    # ------------------------------------------------------------------ build
+    @classmethod
+    def coerce(cls, timeline: CompactTimeline | Mapping[str, Any] | None) -> CompactTimeline:
+        """Return ``timeline`` unchanged if already compact, else build one from the dict."""
+        if isinstance(timeline, CompactTimeline):
+            return timeline
+        return cls.from_timeline(timeline or {})
+
+    @classmethod
+    def from_timeline(cls, timeline_data: Mapping[str, Any]) -> CompactTimeline:
+        info = timeline_data.get("info") or {}
+        frames = info.get("frames") or []
+
+        timestamps: list[int] = []
+        width = 1
+        codes: dict[str, int] = {"": 0}
+        # Event columns for every event; decoded fields only for `_DETAILED_EVENTS`
+        ev_stamps: list[int] = []
+        ev_frames: list[int] = []
+        ev_types: list[int] = []
+        detailed: list[tuple[int, ...]] = []
+        # Flat (frame, participant) coordinates + row-major stat values/masks
+        cell_frames: list[int] = []
+        cell_pids: list[int] = []
+        flat_values: list[int] = []
+        flat_has: list[bool] = []
+
+        def code(label: Any) -> int:
+            found = codes.get(label)
+            if found is None:
+                label = str(label or "")
+                found = codes.get(label)
+                if found is None:
+                    found = codes[label] = len(codes)
+            return found
+
+        for f_idx, fr in enumerate(frames):
+            ts = _to_int(fr.get("timestamp")) or 0
+            timestamps.append(ts)
+            pframes = fr.get("participant_frames") or fr.get("participantFrames") or {}
+            for key, pf in pframes.items():
+                if not isinstance(pf, dict) or not pf:
+                    continue
+                pid = _participant_key(key, pf)
+                if pid is None:
+                    continue
+                if pid >= width:
+                    width = pid + 1
+                cell_frames.append(f_idx)
+                cell_pids.append(pid)
+                _read_stats(pf, _STAT_KEY_LIST, flat_values, flat_has)
+                ds = pf.get("damage_stats") or pf.get("damageStats")
+                _read_stats(ds, _DAMAGE_KEY_LIST, flat_values, flat_has)
+                _read_stats(pf.get("position"), _POSITION_KEY_LIST, flat_values, flat_has)
+
+            for ev in fr.get("events") or []:
+                if not isinstance(ev, dict):
+                    continue
+                ev_ts = _to_int(ev.get("timestamp"))
+                ev_type = ev.get("type")
+                ev_stamps.append(ts if ev_ts is None else ev_ts)
+                ev_frames.append(f_idx)
+                ev_types.append(code(ev_type))
+                if ev_type not in _DETAILED_EVENTS:
+                    continue
+                assists = 0
+                for a in ev.get("assistingParticipantIds") or ():
+                    a_id = _to_int(a)
+                    if a_id is not None and 0 < a_id < 32:
+                        assists |= 1 << a_id
+                pos = ev.get("position") or {}
+                detailed.append(
+                    (
+                        len(ev_types) - 1,
+                        _to_int(ev.get("killerId", ev.get("killer_id"))) or 0,
+                        _to_int(ev.get("victimId", ev.get("victim_id"))) or 0,
+                        _to_int(ev.get("teamId", ev.get("team_id"))) or 0,
+                        code(ev.get("monsterType", ev.get("monster_type"))),
+                        code(ev.get("buildingType", ev.get("building_type"))),
+                        assists,
+                        (_to_int(pos.get("x")) or 0) if isinstance(pos, dict) else 0,
+                        (_to_int(pos.get("y")) or 0) if isinstance(pos, dict) else 0,
+                    )
+                )
+
+        n_stats = len(STATS)
+        values = np.zeros((len(frames), width, n_stats), dtype=np.int32)
+        has = np.zeros(values.shape, dtype=bool)
+        present = np.zeros(values.shape[:2], dtype=bool)
+        if cell_frames:
+            cells = (np.asarray(cell_frames), np.asarray(cell_pids))
+            values[cells] = np.asarray(flat_values, dtype=np.int32).reshape(-1, n_stats)
+            has[cells] = np.asarray(flat_has, dtype=bool).reshape(-1, n_stats)
+            present[cells] = True
+
+        events = np.zeros(len(ev_types), dtype=EVENT_DTYPE)
+        events["timestamp"] = ev_stamps
+        events["frame"] = ev_frames
+        events["type"] = ev_types
+        if detailed:
+            columns = np.array(detailed, dtype=np.int64).T
+            rows = columns[0]
+            for name, column in zip(_DETAILED_FIELDS, columns[1:], strict=True):
+                events[name][rows] = column
+        if len(events):
+            events = events[np.argsort(events["timestamp"], kind="stable")]
+
+        puuids: dict[str, int] = {}
+        for p in info.get("participants") or []:
+            if isinstance(p, Mapping) and p.get("puuid"):
+                pid = _to_int(p.get("participant_id", p.get("participantId")))
+                if pid:
+                    puuids[str(p["puuid"])] = pid
+
+        return cls(
+            np.asarray(timestamps, dtype=np.int64), values, has, present, events, codes, puuids
+        )
+
+    # ----------------------------------------------------------------- frames
+    @property
+    def n_frames(self) -> int:
+        return int(self.timestamps.shape[0])
+
+    @property
+    def width(self) -> int:
+        """One more than the highest participant ID seen (index 0 is unused)."""
+        return int(self.values.shape[1])
+
+    @property
+    def duration_ms(self) -> int:
+        return int(self.timestamps[-1]) if self.n_frames else 0
+
+    def first_frame_at_or_after(self, ts: int) -> int | None:
+        idx = int(np.searchsorted(self.timestamps, ts, side="left"))
+        return idx if idx < self.n_frames else None
+
+    def last_frame_at_or_before(self, ts: int) -> int | None:
+        idx = int(np.searchsorted(self.timestamps, ts, side="right")) - 1
+        return idx if idx >= 0 else None
+
+    def frames_between(self, start_ms: int, end_ms: int) -> range:
+        """Indices of frames with ``start_ms <= timestamp <= end_ms``."""
+        lo = int(np.searchsorted(self.timestamps, start_ms, side="left"))
+        hi = int(np.searchsorted(self.timestamps, end_ms, side="right"))
+        return range(lo, hi)
+
+    def has_participants(self, frame_idx: int, pids: Iterable[int]) -> bool:
+        present = self.present[frame_idx]
+        return all(0 < pid < len(present) and present[pid] for pid in pids)
+
+    def participants_in(self, frame_idx: int) -> np.ndarray:
+        return np.flatnonzero(self.present[frame_idx])
+
+    # ------------------------------------------------------------------ stats
+    def stat(self, name: str, frame_idx: int, pid: int) -> int | None:
+        """Single stat value, or None when the frame did not carry it."""
+        s = _STAT_INDEX[name]
+        if not 0 < pid < self.width or not self.has[frame_idx, pid, s]:
+            return None
+        return int(self.values[frame_idx, pid, s])
+
+    def series(self, name: str, pid: int) -> np.ndarray:
+        """Per-frame values for one participant (0 where missing)."""
+        if not 0 < pid < self.width:
+            return np.zeros(self.n_frames, dtype=np.int32)
+        return self.values[:, pid, _STAT_INDEX[name]]
+
+    def column(self, name: str) -> np.ndarray:
+        """``(frames, participants)`` matrix of one stat (0 where missing)."""
+        return self.values[:, :, _STAT_INDEX[name]]
+
+    def has_column(self, name: str) -> np.ndarray:
+        """``(frames, participants)`` mask of cells where the frame carried the stat."""
+        return self.has[:, :, _STAT_INDEX[name]]
+
+    def positions(self, frame_idx: int) -> np.ndarray:
+        """``(participants, 2)`` x/y matrix for one frame."""
+        s = _STAT_INDEX["position_x"]
+        return self.values[frame_idx, :, s : s + 2]
+
+    # ----------------------------------------------------------------- events
+    def code(self, label: str) -> int:
+        """Interned code of an event type/monster/building label (-1 if unseen)."""
+        return self._codes.get(label, -1)
+
+    def events_of(self, *types: str) -> np.ndarray:
+        """Time-sorted events whose type is one of ``types``."""
+        codes = [self.code(t) for t in types]
+        return self.events[np.isin(self.events["type"], codes)]
+
+    def label(self, code: int) -> str:
+        """Label behind an interned code ("" for missing/unknown)."""
+        return self._labels[code] if 0 <= code < len(self._labels) else ""
+
+    def participant_id_for(self, puuid: str) -> int | None:
+        return self._puuids.get(puuid)
+
+    @property
+    def nbytes(self) -> int:
+        return int(
+            self.timestamps.nbytes
+            + self.values.nbytes
+            + self.has.nbytes
+            + self.present.nbytes
+            + self.events.nbytes
+        )
@@ -0,0 +1,208 @@
+"""Shared teamfight detection over a `CompactTimeline`.
+
+One pass computes, for every frame at once, the blue-vs-red distance matrix
+(``frames x blue x red``) and from it which participants have an enemy within
+the contact radius. Fight windows are seeded from kill/objective events and
+merged in a single sweep over the already time-sorted event array; each window
+is then resolved to frames with a binary search and reduced with cumulative
+sums, so the cost is linear in frames + events instead of windows x frames x
+players. SR teamfight summaries and ARAM teamfight metrics both read from the
+resulting `Teamfight` list.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from src.core.scoring.compact_timeline import CompactTimeline
+
+BLUE, RED = 100, 200
+
+
+@dataclass(frozen=True, slots=True)
+class Teamfight:
+    """One detected fight; timestamps in ms, masks indexed by participant ID."""
+
+    window_start_ms: int
+    window_end_ms: int
+    start_ms: int  # first frame with both teams in contact
+    end_ms: int  # last frame with both teams in contact
+    frames: range
+    kills: int
+    objectives: tuple[str, ...]  # elite monsters taken in the window, in time order
+    engaged: np.ndarray  # bool[width]: had an enemy within the radius in a contact frame
+    involved: np.ndarray  # bool[width]: killer, victim or assist on a kill in the window
+    blue_centroid: tuple[float, float] | None  # blue positions at the window midpoint
+
+    @property
+    def duration_ms(self) -> int:
+        return self.end_ms - self.start_ms
+
+    def participated(self, pid: int) -> bool:
+        return 0 < pid < len(self.engaged) and bool(self.engaged[pid] or self.involved[pid])
+
+
+def team_ids(
+    timeline: CompactTimeline,
+    match_details: Mapping[str, Any] | None,
+    *,
+    fallback: bool = True,
+) -> np.ndarray:
+    """``int16[width]`` team ID per participant ID (0 = unknown).
+
+    Reads Match-V5 details; when they carry no teams and ``fallback`` is set,
+    uses Riot's fixed layout for 5v5 queues (participants 1-5 blue, 6-10 red).
+    """
+    teams = np.zeros(timeline.width, dtype=np.int16)
+    info = (match_details or {}).get("info")
+    if isinstance(info, Mapping):
+        for p in info.get("participants", []) or []:
+            try:
+                pid = int(p.get("participantId", 0) or 0)
+                tid = int(p.get("teamId", 0) or 0)
+            except (TypeError, ValueError, AttributeError):
+                continue
+            if 0 < pid < timeline.width and tid in (BLUE, RED):
+                teams[pid] = tid
+    if fallback and not teams.any():
+        teams[1 : min(6, timeline.width)] = BLUE
+        teams[6 : min(11, timeline.width)] = RED
+    return teams
+
+
+def _merged_windows(seed_ts: np.ndarray, reach_ms: int) -> list[tuple[int, int]]:
+    """Merge ``[ts - reach, ts + reach]`` intervals of time-sorted seeds in one sweep."""
+    windows: list[tuple[int, int]] = []
+    for ts in seed_ts.tolist():
+        start, end = ts - reach_ms, ts + reach_ms
+        if windows and start <= windows[-1][1]:
+            windows[-1] = (windows[-1][0], max(windows[-1][1], end))
+        else:
+            windows.append((start, end))
+    return windows
+
+
+def engagement(
+    timeline: CompactTimeline, teams: np.ndarray, radius: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """Per-frame engagement from blue-red distance matrices.
+
+    Returns ``(engaged, contact_counts)``: ``engaged`` is ``bool[frames, width]``
+    (participant has a present enemy within ``radius``); ``contact_counts`` is
+    ``int[frames, 2]`` with the number of engaged blue and red participants.
+    """
+    blue = np.flatnonzero(teams == BLUE)
+    red = np.flatnonzero(teams == RED)
+    n_frames = timeline.n_frames
+    engaged = np.zeros((n_frames, timeline.width), dtype=bool)
+    counts = np.zeros((n_frames, 2), dtype=np.int64)
+    if not len(blue) or not len(red) or not n_frames:
+        return engaged, counts
+
+    xy = np.stack((timeline.column("position_x"), timeline.column("position_y")), axis=-1).astype(
+        np.float64
+    )
+    delta = xy[:, blue, None, :] - xy[:, None, red, :]  # (F, B, R, 2)
+    dist = np.hypot(delta[..., 0], delta[..., 1])
+    present = timeline.present
+    dist[~(present[:, blue, None] & present[:, None, red])] = np.inf
+
+    close = dist <= radius
+    engaged[:, blue] = close.any(axis=2)
+    engaged[:, red] = close.any(axis=1)
+    counts[:, 0] = engaged[:, blue].sum(axis=1)
+    counts[:, 1] = engaged[:, red].sum(axis=1)
+    return engaged, counts
+
+
+def detect_teamfights(
+    timeline: CompactTimeline,
+    teams: np.ndarray,
+    *,
+    radius: float = 950.0,
+    min_engaged: int = 2,
+    seed_reach_ms: int = 10_000,
+) -> list[Teamfight]:
+    """Detect fights seeded by CHAMPION_KILL / ELITE_MONSTER_KILL events.
+
+    A window becomes a fight when at least one of its frames has
+    ``min_engaged`` participants of each team within ``radius`` of an enemy.
+    """
+    if not timeline.n_frames:
+        return []
+    seeds = timeline.events_of("CHAMPION_KILL", "ELITE_MONSTER_KILL")
+    if not len(seeds):
+        return []
+
+    engaged, counts = engagement(timeline, teams, radius)
+    contact = (counts[:, 0] >= min_engaged) & (counts[:, 1] >= min_engaged)
+
+    kill_code = timeline.code("CHAMPION_KILL")
+    is_kill = seeds["type"] == kill_code
+    kills_per_frame = np.bincount(seeds["frame"][is_kill], minlength=timeline.n_frames)
+    kills_cum = np.concatenate(([0], np.cumsum(kills_per_frame)))
+
+    windows = _merged_windows(seeds["timestamp"], seed_reach_ms)
+    starts = np.searchsorted(timeline.timestamps, [w[0] for w in windows], side="left")
+    stops = np.searchsorted(timeline.timestamps, [w[1] for w in windows], side="right")
+
+    blue = teams == BLUE
+    fights: list[Teamfight] = []
+    for (w_start, w_end), lo, hi in zip(windows, starts.tolist(), stops.tolist(), strict=True):
+        if lo >= hi:
+            continue
+        hits = np.flatnonzero(contact[lo:hi])
+        if not len(hits):
+            continue
+        first, last = lo + int(hits[0]), lo + int(hits[-1])
+
+        in_window = seeds[(seeds["frame"] >= lo) & (seeds["frame"] < hi)]
+        objectives = tuple(
+            timeline.label(monster)
+            for monster in in_window["monster"][in_window["type"] != kill_code].tolist()
+        )
+
+        involved = np.zeros(timeline.width, dtype=bool)
+        window_kills = in_window[in_window["type"] == kill_code]
+        for field in ("killer", "victim"):
+            ids = window_kills[field]
+            involved[ids[(ids > 0) & (ids < timeline.width)]] = True
+        assist_bits = int(np.bitwise_or.reduce(window_kills["assists"])) if len(window_kills) else 0
+        for pid in range(1, timeline.width):
+            if assist_bits >> pid & 1:
+                involved[pid] = True
+
+        mid = lo + (hi - lo) // 2
+        members = blue & timeline.present[mid]
+        centroid = None
+        if members.any():
+            pts = timeline.positions(mid)[members].astype(np.float64)
+            centroid = (float(pts[:, 0].mean()), float(pts[:, 1].mean()))
+
+        fights.append(
+            Teamfight(
+                window_start_ms=w_start,
+                window_end_ms=w_end,
+                start_ms=int(timeline.timestamps[first]),
+                end_ms=int(timeline.timestamps[last]),
+                frames=range(lo, hi),
+                kills=int(kills_cum[hi] - kills_cum[lo]),
+                objectives=objectives,
+                engaged=np.asarray(engaged[lo:hi][contact[lo:hi]].any(axis=0), dtype=bool),
+                involved=involved,
+                blue_centroid=centroid,
+            )
+        )
+    return fights
+
+
+def participation_counts(fights: list[Teamfight], width: int) -> np.ndarray:
+    """``int[width]``: number of fights each participant took part in."""
+    counts = np.zeros(width, dtype=np.int64)
+    for fight in fights:
+        counts[: len(fight.engaged)] += fight.engaged | fight.involved
+    return counts
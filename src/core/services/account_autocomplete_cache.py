@@ -0,0 +1,139 @@
+"""In-memory per-user cache backing slash-command autocomplete.
+
+Discord fires an autocomplete request for every character typed and drops the
+response after 3 seconds, so the handler must not query Postgres per keystroke.
+Bound accounts are cached per Discord user for a short TTL; an expired entry is
+still served while a single background refresh reloads it, and concurrent
+misses for the same user share one load. `DatabaseAdapter` invalidates entries
+when accounts are bound, removed or re-prioritised.
+
+Riot IDs a user recently analysed via `Name#TAG` are remembered alongside so
+they can be offered again without another lookup.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+AccountLoader = Callable[[str], Awaitable[list[dict[str, Any]]]]
+
+
+@dataclass
+class _Entry:
+    accounts: list[dict[str, Any]] | None = None
+    loaded_at: float = 0.0
+    recent: list[tuple[str, float]] = field(default_factory=list)
+    inflight: asyncio.Future[list[dict[str, Any]]] | None = None
+    generation: int = 0
+
+
+class AccountAutocompleteCache:
+    """Per-user bound-account and recent Riot ID cache (single process)."""
+
+    def __init__(
+        self,
+        loader: AccountLoader,
+        *,
+        ttl_seconds: float = 60.0,
+        recent_ttl_seconds: float = 1800.0,
+        max_recent: int = 5,
+        max_users: int = 4096,
+        cold_wait_seconds: float = 1.5,
+    ) -> None:
+        self._loader = loader
+        self._ttl = ttl_seconds
+        self._recent_ttl = recent_ttl_seconds
+        self._max_recent = max_recent
+        self._max_users = max_users
+        self._cold_wait = cold_wait_seconds
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+
+    def _entry(self, discord_id: str) -> _Entry:
+        entry = self._entries.get(discord_id)
+        if entry is None:
+            entry = self._entries[discord_id] = _Entry()
+            while len(self._entries) > self._max_users:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(discord_id)
+        return entry
+
+    async def accounts(self, discord_id: str) -> list[dict[str, Any]] | None:
+        """Cached accounts for the user; None when a cold load misses the wait budget.
+
+        Fresh entries return immediately. Stale entries return immediately and
+        trigger one background refresh. Cold entries wait (bounded) on a load
+        shared with any concurrent caller.
+        """
+        entry = self._entry(discord_id)
+        now = time.monotonic()
+        if entry.accounts is not None:
+            if now - entry.loaded_at >= self._ttl:
+                self._start_load(discord_id, entry)
+            return entry.accounts
+
+        future = self._start_load(discord_id, entry)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout=self._cold_wait)
+        except TimeoutError:
+            return None
+        except Exception as exc:
+            logger.warning(f"Autocomplete account load failed for user {discord_id}: {exc}")
+            return None
+
+    def _start_load(self, discord_id: str, entry: _Entry) -> asyncio.Future[list[dict[str, Any]]]:
+        if entry.inflight is not None and not entry.inflight.done():
+            return entry.inflight
+        generation = entry.generation
+        task = asyncio.ensure_future(self._loader(discord_id))
+
+        def _store(done: asyncio.Future[list[dict[str, Any]]]) -> None:
+            if entry.inflight is done:
+                entry.inflight = None
+            if done.cancelled():
+                return
+            if done.exception() is not None:
+                logger.debug(f"Account reload failed for user {discord_id}: {done.exception()}")
+                return
+            # An invalidation during the load makes its result stale
+            if entry.generation == generation:
+                entry.accounts = list(done.result() or [])
+                entry.loaded_at = time.monotonic()
+
+        task.add_done_callback(_store)
+        entry.inflight = task
+        return task
+
+    def invalidate(self, discord_id: str) -> None:
+        """Drop cached accounts for the user (recent Riot IDs are kept)."""
+        entry = self._entries.get(str(discord_id))
+        if entry is None:
+            return
+        entry.generation += 1
+        entry.accounts = None
+        entry.inflight = None
+
+    def remember_riot_id(self, discord_id: str, riot_id: str) -> None:
+        riot_id = riot_id.strip()
+        if not riot_id:
+            return
+        entry = self._entry(discord_id)
+        recent = [(rid, ts) for rid, ts in entry.recent if rid.lower() != riot_id.lower()]
+        recent.insert(0, (riot_id, time.monotonic()))
+        entry.recent = recent[: self._max_recent]
+
+    def recent_riot_ids(self, discord_id: str) -> list[str]:
+        entry = self._entries.get(discord_id)
+        if entry is None:
+            return []
+        cutoff = time.monotonic() - self._recent_ttl
+        entry.recent = [(rid, ts) for rid, ts in entry.recent if ts >= cutoff]
+        return [rid for rid, _ in entry.recent]
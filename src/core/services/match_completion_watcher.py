@@ -8,6 +8,7 @@ from typing import Any
 from collections.abc import Iterable
 
 from src.core.ports import CachePort, DatabasePort, RiotAPIPort
+from src.core.services.match_history_service import match_ids_cache_key
 
 logger = logging.getLogger(__name__)
 
@@ -94,6 +95,8 @@ class MatchCompletionWatcher:
                 )
             )
             await self._cache_set(key, latest_match_id)
+            # /讲道理 must see the new game immediately, not after the list TTL
+            await self._cache_delete(match_ids_cache_key(binding.puuid))
 
         return events
 
@@ -119,6 +122,13 @@ class MatchCompletionWatcher:
             except Exception:
                 logger.debug("Cache set failed for key=%s", key, exc_info=True)
 
+    async def _cache_delete(self, key: str) -> None:
+        if self._cache:
+            try:
+                await self._cache.delete(key)
+            except Exception:
+                logger.debug("Cache delete failed for key=%s", key, exc_info=True)
+
 
 @dataclass(frozen=True)
 class _Binding:
@@ -6,37 +6,96 @@ Used by DiscordAdapter to implement the /讲道理 command flow.
 
 from __future__ import annotations
 
+import logging
+from typing import TYPE_CHECKING, Any
 
-from src.adapters.database import DatabaseAdapter
-from src.adapters.riot_api import RiotAPIAdapter
+from src.config.settings import get_settings
 from src.core.ports.match_history_port import IMatchHistoryService
 
+if TYPE_CHECKING:
+    from src.adapters.database import DatabaseAdapter
+    from src.adapters.riot_api import RiotAPIAdapter
+    from src.core.ports import CachePort
+
+logger = logging.getLogger(__name__)
+
+MATCH_IDS_KEY_PREFIX = "chimera:match_ids"
+
+
+def match_ids_cache_key(puuid: str) -> str:
+    return f"{MATCH_IDS_KEY_PREFIX}:{puuid}"
+
+
+def _status_from_record(record: dict[str, Any]) -> dict[str, str]:
+    status = str(record.get("status", "unknown"))
+    created_at = str(record.get("created_at")) if record.get("created_at") else ""
+    # Optional: result presence indicator; keep payload small
+    has_result = "llm_narrative" in record or "score_data" in record
+
+    return {
+        "status": status,
+        "created_at": created_at,
+        "has_result": "true" if has_result else "false",
+    }
+
 
 class MatchHistoryService(IMatchHistoryService):
-    """Production implementation of match history service."""
+    """Production implementation of match history service.
+
+    When a cache is supplied, recent match-ID lists are kept per PUUID for
+    `match_id_list_cache_ttl` seconds; `MatchCompletionWatcher` drops the entry
+    as soon as it sees a new match.
+    """
 
-    def __init__(self, riot_api: RiotAPIAdapter, db: DatabaseAdapter) -> None:
+    def __init__(
+        self, riot_api: RiotAPIAdapter, db: DatabaseAdapter, cache: CachePort | None = None
+    ) -> None:
         self.riot_api = riot_api
         self.db = db
+        self.cache = cache
 
     async def get_match_id_list(self, puuid: str, region: str, count: int = 20) -> list[str]:
-        return await self.riot_api.get_match_history(puuid=puuid, region=region, count=count)
+        key = match_ids_cache_key(puuid)
+        if self.cache is not None:
+            try:
+                cached = await self.cache.get(key)
+                # Entries remember the requested count: a shorter list is complete history
+                if isinstance(cached, dict) and int(cached.get("count", 0)) >= count:
+                    return list(cached.get("ids") or [])[:count]
+            except Exception as exc:
+                logger.debug("match_id_list_cache_read_failed: %s", exc)
+
+        match_ids = await self.riot_api.get_match_history(puuid=puuid, region=region, count=count)
+
+        ttl = get_settings().match_id_list_cache_ttl
+        if self.cache is not None and match_ids and ttl > 0:
+            try:
+                await self.cache.set(key, {"count": count, "ids": list(match_ids)}, ttl=ttl)
+            except Exception as exc:
+                logger.debug("match_id_list_cache_write_failed: %s", exc)
+        return match_ids
+
+    async def invalidate_match_ids(self, puuid: str) -> None:
+        if self.cache is None:
+            return
+        try:
+            await self.cache.delete(match_ids_cache_key(puuid))
+        except Exception as exc:
+            logger.debug("match_id_list_cache_delete_failed: %s", exc)
 
     async def get_analysis_status(self, match_id: str) -> dict[str, str] | None:
         record = await self.db.get_analysis_result(match_id)
         if not record:
             return None
+        return _status_from_record(record)
 
-        status = str(record.get("status", "unknown"))
-        created_at = str(record.get("created_at")) if record.get("created_at") else ""
-        # Optional: result presence indicator; keep payload small
-        has_result = "llm_narrative" in record or "score_data" in record
-
-        return {
-            "status": status,
-            "created_at": created_at,
-            "has_result": "true" if has_result else "false",
-        }
+    async def get_analysis_bundle(
+        self, match_id: str
+    ) -> tuple[dict[str, str] | None, dict[str, Any] | None, dict[str, Any] | None]:
+        record, match_row = await self.db.get_analysis_with_match(match_id)
+        if not record:
+            return None, None, None
+        return _status_from_record(record), record, match_row
 
     async def get_puuid_by_riot_id(self, game_name: str, tag_line: str) -> str | None:
         """Resolve a Riot ID (game_name#tag) to a PUUID using Account-V1.
@@ -23,6 +23,7 @@ from src.contracts.v21_prescriptive_analysis import (
     V21PrescriptiveAnalysisReport,
 )
 from src.contracts.v22_user_profile import V22UserProfile
+from src.prompts.compiler import CompiledPrompt, compile_prompt
 
 if TYPE_CHECKING:
     from src.adapters.gemini_llm import GeminiLLMAdapter
@@ -44,7 +45,7 @@ class PersonalizationService:
                 (e.g., v22_coaching_competitive.txt, v22_coaching_casual.txt)
         """
         self.prompt_templates_dir = prompt_templates_dir
-        self._prompt_cache: dict[str, str] = {}
+        self._prompt_cache: dict[str, CompiledPrompt] = {}
 
     def select_prompt_template(self, user_profile: V22UserProfile) -> str:
         """Select appropriate prompt template based on user profile.
@@ -83,6 +84,17 @@ class PersonalizationService:
         Returns:
             Prompt template content as string
 
+        Raises:
+            FileNotFoundError: If template file doesn't exist
+        """
+        return self.load_compiled_template(template_filename).source
+
+    def load_compiled_template(self, template_filename: str) -> CompiledPrompt:
+        """Load a prompt template parsed into segments and slots (cached per filename).
+
+        ``render(**fields)`` matches ``str.format`` on the raw template, and
+        ``prefix_hash`` identifies its static head for provider-side caching.
+
         Raises:
             FileNotFoundError: If template file doesn't exist
         """
@@ -99,12 +111,12 @@ class PersonalizationService:
             )
 
         with open(template_path, encoding="utf-8") as f:
-            content = f.read()
+            compiled = compile_prompt(f.read())
 
         # Cache for future use
-        self._prompt_cache[template_filename] = content
+        self._prompt_cache[template_filename] = compiled
 
-        return content
+        return compiled
 
     def generate_user_context(
         self,
@@ -0,0 +1,74 @@
+"""Cache of fully rendered /讲道理 interaction messages.
+
+The analysis task renders the final message (embed JSON, component layout and
+attachment references) once at completion and stores it here; the bot's
+analysis-cache hit path PATCHes it back verbatim instead of reloading the DB
+record, re-parsing metadata, resolving DDragon icons and re-rendering.
+
+Entries carry `render_version` (see `rendered_message_version`); a mismatch is
+a miss, so view changes never serve stale embeds.
+"""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Any
+
+from src.adapters.discord_webhook import rendered_message_version
+from src.config.settings import get_settings
+from src.contracts.tasks import RenderedDiscordMessage
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "chimera:rendered_message"
+
+
+def rendered_message_key(match_id: str) -> str:
+    return f"{KEY_PREFIX}:{match_id}"
+
+
+class RenderedMessageCache:
+    """Redis-backed store keyed by match ID (any adapter with async get/set/delete)."""
+
+    def __init__(self, cache: Any) -> None:
+        self.cache = cache
+
+    async def get(self, match_id: str) -> RenderedDiscordMessage | None:
+        """Return the cached message when it matches the current renderer, else None."""
+        try:
+            raw = await self.cache.get(rendered_message_key(match_id))
+            if not isinstance(raw, dict):
+                return None
+            message = RenderedDiscordMessage.model_validate(raw)
+        except Exception as exc:
+            logger.debug("rendered_message_cache_read_failed", extra={"error": str(exc)})
+            return None
+
+        if message.render_version != rendered_message_version():
+            return None
+        # Attachment files live on shared storage; a missing PNG means a broken image
+        if any(not Path(p).exists() for p in message.attachment_paths):
+            return None
+        return message
+
+    async def put(self, message: RenderedDiscordMessage) -> bool:
+        if not message.match_id:
+            return False
+        try:
+            return bool(
+                await self.cache.set(
+                    rendered_message_key(message.match_id),
+                    message.model_dump(mode="json"),
+                    ttl=get_settings().rendered_message_cache_ttl,
+                )
+            )
+        except Exception as exc:
+            logger.warning("rendered_message_cache_write_failed", extra={"error": str(exc)})
+            return False
+
+    async def invalidate(self, match_id: str) -> None:
+        try:
+            await self.cache.delete(rendered_message_key(match_id))
+        except Exception as exc:
+            logger.debug("rendered_message_cache_delete_failed", extra={"error": str(exc)})
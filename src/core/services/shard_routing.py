@@ -0,0 +1,137 @@
+"""Guild → shard ownership for multi-process bot deployments.
+
+Discord assigns every guild to exactly one gateway shard,
+``(guild_id >> 22) % shard_count``, and only the process holding that shard
+sees the guild's voice states and can join its voice channels. When shards are
+spread over several bot processes (``DISCORD_SHARD_IDS`` per process), voice
+broadcasts for a guild must run on its owner; `ShardRouter` answers "is this
+guild mine?" and "which process serves it?" from configuration alone.
+
+Peers are configured as ``DISCORD_SHARD_PEERS="0-3=http://bot-0:3000;4-7=http://bot-1:3000"``,
+mapping shard ranges to the callback server (``/broadcast``) of the process
+that runs them.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+# Set on forwarded /broadcast requests so a misconfigured peer map cannot bounce them forever
+FORWARDED_HEADER = "X-Chimera-Shard-Forwarded"
+
+
+def shard_for_guild(guild_id: int, shard_count: int) -> int:
+    """Shard that owns ``guild_id`` (Discord's sharding formula)."""
+    return (int(guild_id) >> 22) % shard_count
+
+
+def parse_shard_ids(spec: str | None) -> tuple[int, ...] | None:
+    """Parse ``"0-3,8,10-11"`` into sorted shard IDs; None/blank means unset."""
+    if spec is None or not spec.strip():
+        return None
+    ids: set[int] = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        start, sep, end = part.partition("-")
+        try:
+            lo = int(start)
+            hi = int(end) if sep else lo
+        except ValueError as exc:
+            raise ValueError(f"Invalid shard range {part!r}") from exc
+        if lo < 0 or hi < lo:
+            raise ValueError(f"Invalid shard range {part!r}")
+        ids.update(range(lo, hi + 1))
+    return tuple(sorted(ids))
+
+
+def parse_shard_peers(spec: str | None) -> dict[int, str]:
+    """Parse ``"0-3=http://a:3000;4-7=http://b:3000"`` into shard → base URL."""
+    peers: dict[int, str] = {}
+    if spec is None:
+        return peers
+    for entry in spec.split(";"):
+        entry = entry.strip()
+        if not entry:
+            continue
+        shards, sep, url = entry.partition("=")
+        url = url.strip().rstrip("/")
+        ids = parse_shard_ids(shards)
+        if not sep or not url or not ids:
+            raise ValueError(f"Invalid shard peer entry {entry!r}")
+        for shard_id in ids:
+            peers[shard_id] = url
+    return peers
+
+
+class ShardRouter:
+    """Decide which bot process owns a guild.
+
+    Without an explicit ``shard_count`` + ``shard_ids`` (single process, or
+    AutoShardedBot running every shard) every guild is local.
+    """
+
+    def __init__(
+        self,
+        *,
+        shard_count: int | None = None,
+        shard_ids: Iterable[int] | None = None,
+        peers: Mapping[int, str] | None = None,
+        default_url: str | None = None,
+    ) -> None:
+        ids = tuple(sorted(set(shard_ids))) if shard_ids is not None else None
+        if shard_count is not None and shard_count < 1:
+            raise ValueError("shard_count must be positive")
+        if ids is not None:
+            if shard_count is None:
+                raise ValueError("DISCORD_SHARD_IDS requires DISCORD_SHARD_COUNT")
+            if not ids or ids[-1] >= shard_count:
+                raise ValueError(f"Shard IDs {ids} out of range for {shard_count} shards")
+        self.shard_count = shard_count
+        self.shard_ids = ids
+        self._local = frozenset(ids) if ids is not None else None
+        self._peers = dict(peers or {})
+        self._default_url = default_url.rstrip("/") if default_url else None
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> ShardRouter:
+        return cls(
+            shard_count=settings.discord_shard_count,
+            shard_ids=parse_shard_ids(settings.discord_shard_ids),
+            peers=parse_shard_peers(settings.discord_shard_peers),
+            default_url=settings.broadcast_server_url,
+        )
+
+    @property
+    def partitioned(self) -> bool:
+        """True when this process runs only part of the shards."""
+        return self._local is not None and len(self._local) < (self.shard_count or 0)
+
+    def local_shards(self) -> tuple[int, ...] | None:
+        """Shards run by this process; None when unsharded or Discord picks the count."""
+        if self.shard_ids is not None:
+            return self.shard_ids
+        if self.shard_count:
+            return tuple(range(self.shard_count))
+        return None
+
+    def shard_for(self, guild_id: int) -> int | None:
+        if not self.shard_count:
+            return None
+        return shard_for_guild(guild_id, self.shard_count)
+
+    def is_local(self, guild_id: int) -> bool:
+        if self._local is None:
+            return True
+        return shard_for_guild(guild_id, self.shard_count or 1) in self._local
+
+    def owner_url(self, guild_id: int) -> str | None:
+        """Callback server of the peer that owns ``guild_id``; None if unknown."""
+        shard = self.shard_for(guild_id)
+        return self._peers.get(shard) if shard is not None else None
+
+    def broadcast_base_url(self, guild_id: int) -> str | None:
+        """Where to POST ``/broadcast`` for ``guild_id``: its owner, else the default server."""
+        return self.owner_url(guild_id) or self._default_url
@@ -2,7 +2,11 @@ from __future__ import annotations
 
 import json
 import logging
-from typing import Any
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from src.core.scoring.compact_timeline import CompactTimeline
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +16,9 @@ def _log_event(
 ) -> None:
     """Emit diagnostics with event name and structured payload even when extra fields are suppressed."""
 
+    # Serialising the payload is the expensive part; skip it when nobody listens
+    if not logger.isEnabledFor(level):
+        return
     data = {"event": event, **payload}
     try:
         serialized = json.dumps(payload, ensure_ascii=False)
@@ -20,214 +27,330 @@ def _log_event(
     logger.log(level, "%s %s", event, serialized, extra=data, **log_kwargs)
 
 
+def _frames_with(timeline: CompactTimeline, pids: list[int] | None) -> np.ndarray:
+    """``bool[frames]``: frames with participant data (for all of ``pids`` when given)."""
+    valid = timeline.present.any(axis=1)
+    for pid in pids or ():
+        if not 0 < pid < timeline.width:
+            return np.zeros(timeline.n_frames, dtype=bool)
+        valid = valid & timeline.present[:, pid]
+    return np.asarray(valid, dtype=bool)
+
+
+def _nearest_valid_frames(
+    timeline: CompactTimeline,
+    target_ms: int,
+    valid: np.ndarray,
+    *,
+    window_ms: int,
+    expand: bool,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Frame selection for every column of ``valid`` (``bool[frames, k]``) at once.
+
+    The closest frames on either side of ``target_ms`` are found by binary
+    search; a column takes the nearer one that is valid and within
+    ``window_ms`` (the later frame wins ties). Columns left without a frame
+    fall back, when ``expand`` is set, to the nearest valid frame anywhere
+    (the earlier frame wins ties).
+
+    Returns ``(frames, deltas, expanded)``: ``int64[k]`` frame indices (-1 when
+    none), signed ``frame timestamp - target_ms`` and whether the expanded
+    search picked the frame.
+    """
+    k = valid.shape[1]
+    frames = np.full(k, -1, dtype=np.int64)
+    deltas = np.zeros(k, dtype=np.int64)
+    expanded = np.zeros(k, dtype=bool)
+    timestamps = timeline.timestamps.astype(np.int64)
+
+    after = timeline.first_frame_at_or_after(target_ms)
+    before = timeline.last_frame_at_or_before(target_ms)
+    ok_after = np.zeros(k, dtype=bool)
+    ok_before = np.zeros(k, dtype=bool)
+    delta_after = delta_before = 0
+    if after is not None:
+        delta_after = int(timestamps[after]) - target_ms
+        ok_after = valid[after] & (delta_after <= window_ms)
+    if before is not None:
+        delta_before = int(timestamps[before]) - target_ms
+        ok_before = valid[before] & (-delta_before <= window_ms)
+        if after is not None and abs(delta_after) <= abs(delta_before):
+            ok_before = ok_before & ~ok_after
+
+    frames[ok_after] = after if after is not None else -1
+    deltas[ok_after] = delta_after
+    frames[ok_before] = before if before is not None else -1
+    deltas[ok_before] = delta_before
+
+    missing = np.flatnonzero(frames < 0)
+    if expand and len(missing) and len(timestamps):
+        distance = np.abs(timestamps - target_ms)
+        cost = np.where(valid[:, missing], distance[:, None], np.iinfo(np.int64).max)
+        best = np.argmin(cost, axis=0)
+        found = valid[best, missing]
+        cols = missing[found]
+        frames[cols] = best[found]
+        deltas[cols] = timestamps[best[found]] - target_ms
+        expanded[cols] = True
+    return frames, deltas, expanded
+
+
+def _frame_metadata(delta: int, expanded: bool) -> dict[str, Any] | None:
+    """Fallback metadata for a selected frame; None for an exact hit."""
+    if delta == 0 and not expanded:
+        return None
+    direction = "after" if delta > 0 else "before"
+    metadata: dict[str, Any] = {"delta_ms": delta, "direction": direction}
+    if expanded:
+        metadata["reason"] = f"expanded_search_fallback_by_{abs(delta)}ms"
+    elif delta:
+        metadata["reason"] = f"nearest_valid_frame_{direction}_by_{abs(delta)}ms"
+    return metadata
+
+
 def _find_frame_with_tolerance(
-    frames: list[dict[str, Any]],
+    timeline: CompactTimeline,
     target_ms: int,
     *,
     window_ms: int = 15_000,
     require_participants: list[int] | None = None,
-) -> tuple[dict[str, Any] | None, dict[str, Any] | None]:
+) -> tuple[int | None, dict[str, Any] | None]:
     """Resolve the closest frame to ``target_ms`` within a tolerance window.
 
     Args:
-        frames: List of timeline frames to search
+        timeline: Compact timeline to search
         target_ms: Target timestamp in milliseconds
         window_ms: Maximum allowed deviation from target (default 15s)
         require_participants: Optional list of participant IDs that must have data
 
     Returns:
-        Tuple of (selected_frame, metadata) or (None, None) if no valid frame found
+        Tuple of (frame_index, metadata) or (None, None) if no valid frame found
         metadata includes delta_ms, direction, and fallback_reason if applicable
     """
-
-    def _has_participant_data(frame: dict[str, Any], pids: list[int] | None) -> bool:
-        """Verify frame contains non-empty participant data."""
-        if not frame:
-            return False
-        participant_frames = frame.get("participant_frames", {})
-        if not participant_frames:
-            return False
-        if pids is None:
-            return True
-        return all(str(pid) in participant_frames and participant_frames[str(pid)] for pid in pids)
-
-    if not frames:
+    if not timeline.n_frames:
         return None, None
 
-    # First pass: find closest frame by time
-    candidate_after: dict[str, Any] | None = None
-    delta_after: int | None = None
-
-    for fr in frames:
-        ts = int(fr.get("timestamp", 0))
-        if ts >= target_ms:
-            candidate_after = fr
-            delta_after = ts - target_ms
-            break
-
-    # Exact match with valid data
-    if (
-        candidate_after is not None
-        and delta_after == 0
-        and _has_participant_data(candidate_after, require_participants)
-    ):
-        return candidate_after, None
-
-    candidate_before: dict[str, Any] | None = None
-    delta_before: int | None = None
-
-    for fr in reversed(frames):
-        ts = int(fr.get("timestamp", 0))
-        if ts <= target_ms:
-            candidate_before = fr
-            delta_before = target_ms - ts
-            break
-
-    # Select closest frame within window that has valid participant data
-    chosen: dict[str, Any] | None = None
-    signed_delta: int | None = None
-    fallback_reason: str | None = None
-
-    def _maybe_select(frame: dict[str, Any] | None, delta: int | None, direction: str) -> None:
-        nonlocal chosen, signed_delta, fallback_reason
-        if frame is None or delta is None:
-            return
-        if abs(delta) > window_ms:
-            return
-
-        # Check if frame has required participant data
-        if not _has_participant_data(frame, require_participants):
+    valid = _frames_with(timeline, require_participants)
+    frames, deltas, expanded = _nearest_valid_frames(
+        timeline,
+        target_ms,
+        valid[:, None],
+        window_ms=window_ms,
+        expand=bool(require_participants),
+    )
+    chosen = int(frames[0])
+
+    if logger.isEnabledFor(logging.WARNING):
+        timestamps = timeline.timestamps
+        for frame_idx, direction in (
+            (timeline.first_frame_at_or_after(target_ms), "after"),
+            (timeline.last_frame_at_or_before(target_ms), "before"),
+        ):
+            if frame_idx is None or valid[frame_idx]:
+                continue
+            delta = int(timestamps[frame_idx]) - target_ms
+            if abs(delta) > window_ms:
+                continue
             _log_event(
                 "sr_enrichment_frame_missing_participants",
                 {
-                    "frame_timestamp": frame.get("timestamp"),
+                    "frame_timestamp": int(timestamps[frame_idx]),
                     "target_ms": target_ms,
                     "delta_ms": delta,
                     "direction": direction,
-                    "participant_frames_count": len(frame.get("participant_frames", {})),
+                    "participant_frames_count": int(timeline.present[frame_idx].sum()),
                     "required_participants": require_participants,
                 },
                 level=logging.WARNING,
             )
-            return
 
-        if chosen is None or abs(delta) < abs(signed_delta if signed_delta is not None else delta):
-            chosen = frame
-            signed_delta = delta
-            if abs(delta) > 0:
-                fallback_reason = f"nearest_valid_frame_{direction}_by_{abs(delta)}ms"
+        if expanded[0] or (chosen < 0 and require_participants):
+            _log_event(
+                "sr_enrichment_expanding_frame_search",
+                {
+                    "target_ms": target_ms,
+                    "initial_window_ms": window_ms,
+                    "required_participants": require_participants,
+                    "total_frames": timeline.n_frames,
+                },
+                level=logging.WARNING,
+            )
+            # DIAGNOSTIC: Check all frames to see why none are valid
+            _log_event(
+                "sr_enrichment_expanded_search_diagnostics",
+                {
+                    "target_ms": target_ms,
+                    "total_frames": timeline.n_frames,
+                    "frames_with_any_participants": int(timeline.present.any(axis=1).sum()),
+                    "frames_with_required_participants": int(valid.sum()),
+                    "required_participants": require_participants,
+                    "sample_frame_timestamps": [int(ts) for ts in timestamps[:5]],
+                    "sample_frame_participant_counts": [
+                        int(n) for n in timeline.present[:5].sum(axis=1)
+                    ],
+                },
+                level=logging.WARNING,
+            )
 
-    _maybe_select(candidate_after, delta_after, "after")
-    if delta_before is not None:
-        _maybe_select(candidate_before, -delta_before, "before")
+    if chosen < 0:
+        return None, None
+    return chosen, _frame_metadata(int(deltas[0]), bool(expanded[0]))
 
-    # If no valid frame found within primary window, expand search
-    if chosen is None and require_participants:
-        _log_event(
-            "sr_enrichment_expanding_frame_search",
-            {
-                "target_ms": target_ms,
-                "initial_window_ms": window_ms,
-                "required_participants": require_participants,
-                "total_frames": len(frames),
-            },
-            level=logging.WARNING,
-        )
 
-        # DIAGNOSTIC: Check all frames to see why none are valid
-        valid_frames_count = 0
-        frames_with_any_participants = 0
-        frames_with_required_participants = 0
+MILESTONE_MINUTES: tuple[int, ...] = (10, 15)
 
-        for fr in frames:
-            participant_frames = fr.get("participant_frames", {})
-            if participant_frames:
-                frames_with_any_participants += 1
-                if _has_participant_data(fr, require_participants):
-                    valid_frames_count += 1
-                    frames_with_required_participants += 1
 
-        _log_event(
-            "sr_enrichment_expanded_search_diagnostics",
-            {
-                "target_ms": target_ms,
-                "total_frames": len(frames),
-                "frames_with_any_participants": frames_with_any_participants,
-                "frames_with_required_participants": frames_with_required_participants,
-                "required_participants": require_participants,
-                "sample_frame_timestamps": [int(f.get("timestamp", 0)) for f in frames[:5]],
-                "sample_frame_participant_counts": [
-                    len(f.get("participant_frames", {})) for f in frames[:5]
-                ],
-            },
-            level=logging.WARNING,
+class MilestoneSnapshots:
+    """CS, gold and XP for every participant at fixed minute marks.
+
+    Built in one pass per mark: the frame is resolved for all participants at
+    once with the same rules as `_find_frame_with_tolerance`, and the stats are
+    gathered with a single fancy index. Matrices are ``[marks, width]`` and
+    indexed by participant ID; ``frames`` is -1 where no frame carries the
+    participant, and ``gold`` / ``xp`` are only meaningful where ``has_gold`` /
+    ``has_xp`` is set.
+    """
+
+    __slots__ = (
+        "minutes",
+        "frames",
+        "deltas",
+        "expanded",
+        "cs",
+        "gold",
+        "has_gold",
+        "xp",
+        "has_xp",
+    )
+
+    def __init__(
+        self,
+        minutes: tuple[int, ...],
+        frames: np.ndarray,
+        deltas: np.ndarray,
+        expanded: np.ndarray,
+        cs: np.ndarray,
+        gold: np.ndarray,
+        has_gold: np.ndarray,
+        xp: np.ndarray,
+        has_xp: np.ndarray,
+    ) -> None:
+        self.minutes = minutes
+        self.frames = frames
+        self.deltas = deltas  # frame timestamp - mark
+        self.expanded = expanded  # picked by the expanded (whole-game) search
+        self.cs = cs
+        self.gold = gold
+        self.has_gold = has_gold
+        self.xp = xp
+        self.has_xp = has_xp
+
+    @classmethod
+    def from_timeline(
+        cls,
+        timeline: CompactTimeline,
+        minutes: tuple[int, ...] = MILESTONE_MINUTES,
+        *,
+        window_ms: int = 15_000,
+    ) -> MilestoneSnapshots:
+        marks = tuple(int(m) for m in minutes)
+        shape = (len(marks), timeline.width)
+        frames = np.full(shape, -1, dtype=np.int64)
+        deltas = np.zeros(shape, dtype=np.int64)
+        expanded = np.zeros(shape, dtype=bool)
+        if not timeline.n_frames:
+            zeros = np.zeros(shape, dtype=np.int64)
+            no = np.zeros(shape, dtype=bool)
+            return cls(marks, frames, deltas, expanded, zeros, zeros, no, zeros, no)
+
+        for row, minute in enumerate(marks):
+            frames[row], deltas[row], expanded[row] = _nearest_valid_frames(
+                timeline, minute * 60_000, timeline.present, window_ms=window_ms, expand=True
+            )
+
+        found = frames >= 0
+        at = (np.where(found, frames, 0), np.arange(timeline.width)[None, :])
+
+        def gather(name: str) -> np.ndarray:
+            return np.where(found, timeline.column(name)[at], 0).astype(np.int64)
+
+        return cls(
+            minutes=marks,
+            frames=frames,
+            deltas=deltas,
+            expanded=expanded,
+            cs=gather("minions_killed") + gather("jungle_minions_killed"),
+            gold=gather("total_gold"),
+            has_gold=found & timeline.has_column("total_gold")[at],
+            xp=gather("xp"),
+            has_xp=found & timeline.has_column("xp")[at],
         )
 
-        # Expand search to all frames, prioritizing proximity
-        for fr in frames:
-            ts = int(fr.get("timestamp", 0))
-            delta = ts - target_ms
-            if _has_participant_data(fr, require_participants) and (
-                chosen is None
-                or abs(delta) < abs(signed_delta if signed_delta is not None else delta)
-            ):
-                chosen = fr
-                signed_delta = delta
-                fallback_reason = f"expanded_search_fallback_by_{abs(delta)}ms"
-
-    if chosen is None:
-        return None, None
+    def _cell(self, minute: int, pid: int) -> tuple[int, int] | None:
+        if minute not in self.minutes or not 0 < pid < self.frames.shape[1]:
+            return None
+        return self.minutes.index(minute), pid
 
-    metadata: dict[str, Any] = {
-        "delta_ms": signed_delta,
-        "direction": "after" if signed_delta and signed_delta > 0 else "before",
-    }
-    if fallback_reason:
-        metadata["reason"] = fallback_reason
-    return chosen, metadata
+    def frame(self, minute: int, pid: int) -> int | None:
+        cell = self._cell(minute, pid)
+        if cell is None or self.frames[cell] < 0:
+            return None
+        return int(self.frames[cell])
+
+    def shared_frame(self, minute: int, pids: list[int]) -> int | None:
+        """The frame picked for every one of ``pids``, or None when they differ."""
+        picked = {self.frame(minute, pid) for pid in pids}
+        if len(picked) != 1:
+            return None
+        return picked.pop()
+
+    def metadata(self, minute: int, pid: int) -> dict[str, Any] | None:
+        cell = self._cell(minute, pid)
+        if cell is None or self.frames[cell] < 0:
+            return None
+        return _frame_metadata(int(self.deltas[cell]), bool(self.expanded[cell]))
 
+    def cs_at(self, minute: int, pid: int) -> int | None:
+        cell = self._cell(minute, pid)
+        return int(self.cs[cell]) if cell is not None and self.frames[cell] >= 0 else None
 
-def _cs_from_frame_participant(pf: dict[str, Any]) -> int:
-    """Aggregate lane + jungle CS from raw timeline frames.
+    def gold_at(self, minute: int, pid: int) -> int | None:
+        cell = self._cell(minute, pid)
+        return int(self.gold[cell]) if cell is not None and self.has_gold[cell] else None
 
-    Riot Timeline API returns camelCase fields (e.g. ``minionsKilled``) while some
-    internal fixtures still use snake_case. Accept both to remain resilient across
-    data sources and cast to ``int`` defensively."""
+    def xp_at(self, minute: int, pid: int) -> int | None:
+        cell = self._cell(minute, pid)
+        return int(self.xp[cell]) if cell is not None and self.has_xp[cell] else None
 
-    def _value(*keys: str) -> int:
-        for key in keys:
-            if key in pf and pf[key] is not None:
-                try:
-                    return int(pf[key])
-                except (TypeError, ValueError):
-                    continue
-        return 0
 
-    lane_cs = _value("minions_killed", "minionsKilled")
-    jungle_cs = _value("jungle_minions_killed", "jungleMinionsKilled")
+def _cs_at(timeline: CompactTimeline, frame_idx: int, pid: int) -> int:
+    """Lane + jungle CS for one participant (missing fields count as 0)."""
+    lane_cs = timeline.stat("minions_killed", frame_idx, pid) or 0
+    jungle_cs = timeline.stat("jungle_minions_killed", frame_idx, pid) or 0
     return lane_cs + jungle_cs
 
 
-def _frame_has_participants(frame: dict[str, Any] | None, required_ids: list[int]) -> bool:
-    if not frame:
+def _frame_has_participants(
+    timeline: CompactTimeline, frame_idx: int | None, required_ids: list[int]
+) -> bool:
+    if frame_idx is None:
         return False
-    pf = frame.get("participant_frames") or {}
-    if not pf:
+    if not timeline.present[frame_idx].any():
         return False
-    return all(str(pid) in pf for pid in required_ids)
+    return timeline.has_participants(frame_idx, required_ids)
 
 
 def _ensure_frame_participants(
-    frames: list[dict[str, Any]],
+    timeline: CompactTimeline,
     target_ms: int,
     required_ids: list[int],
     *,
-    current_frame: dict[str, Any] | None,
+    current_frame: int | None,
     current_meta: dict[str, Any] | None,
     label: str,
     window_ms: int = 15_000,
-) -> tuple[dict[str, Any] | None, dict[str, Any] | None]:
-    """Return a frame that contains ``required_ids`` within tolerance.
+) -> tuple[int | None, dict[str, Any] | None]:
+    """Return a frame index that contains ``required_ids`` within tolerance.
 
     If the initially selected frame lacks any required participant, search the
     surrounding window for the closest frame containing them and record the
@@ -238,21 +361,18 @@ def _ensure_frame_participants(
     if current_meta and "reason" not in current_meta:
         current_meta = {**current_meta, "reason": "time_delta"}
 
-    if _frame_has_participants(current_frame, required_ids):
+    if _frame_has_participants(timeline, current_frame, required_ids):
         return current_frame, current_meta
 
-    best_frame: dict[str, Any] | None = None
+    best_frame: int | None = None
     best_delta: int | None = None
 
-    for fr in frames:
-        ts = int(fr.get("timestamp", 0))
-        delta = ts - target_ms
-        if abs(delta) > window_ms:
-            continue
-        if not _frame_has_participants(fr, required_ids):
+    for f in timeline.frames_between(target_ms - window_ms, target_ms + window_ms):
+        if not _frame_has_participants(timeline, f, required_ids):
             continue
+        delta = int(timeline.timestamps[f]) - target_ms
         if best_frame is None or abs(delta) < abs(best_delta if best_delta is not None else delta):
-            best_frame = fr
+            best_frame = f
             best_delta = delta
 
     if best_frame is not None:
@@ -268,7 +388,7 @@ def _ensure_frame_participants(
                 "label": label,
                 "target_ms": target_ms,
                 "required_ids": required_ids,
-                "chosen_timestamp": int(best_frame.get("timestamp", 0)),
+                "chosen_timestamp": int(timeline.timestamps[best_frame]),
                 "delta_ms": meta["delta_ms"],
                 "direction": meta["direction"],
             },
@@ -301,212 +421,297 @@ def _participant_team_from_details(
     return None
 
 
-def extract_sr_enrichment(
-    timeline_data: dict[str, Any],
-    match_details: dict[str, Any],
-    participant_id: int,
-) -> dict[str, Any]:
-    """Extract SR-focused enrichment metrics for LLM/view.
+_OBJECTIVE_KEYS = ("towers", "drakes", "heralds", "barons", "inhibitors", "voidgrubs", "atakhans")
 
-    Returns keys:
-      - cs_at_10, cs_at_15
-      - ward_rate_per_min
-      - post_kill_objective_conversions (count)
-      - team_kills_considered (count)
-      - conversion_rate (0.0-1.0)
-      - objective_breakdown: {towers, drakes, heralds, barons}
-      - gold/xp diffs vs lane opponent at 10/15: gold_diff_10, xp_diff_10, gold_diff_15, xp_diff_15
-    """
-    info = (timeline_data or {}).get("info", {})
-    frames: list[dict[str, Any]] = info.get("frames", []) or []
-    last_ts = int(frames[-1].get("timestamp", 0)) if frames else 0
-    duration_min = max(last_ts / 60000.0, 1.0)
 
-    # CS milestones
-    cs10: int | None = None
-    cs15: int | None = None
-
-    # DIAGNOSTIC: Log frame availability
-    _log_event(
-        "sr_enrichment_frame_search",
-        {
-            "total_frames": len(frames),
-            "frame_timestamps": [int(f.get("timestamp", 0)) for f in frames[:5]] if frames else [],
-            "target_10min_ms": 10 * 60000,
-            "target_15min_ms": 15 * 60000,
-            "participant_id": participant_id,
-        },
-    )
+class _TeamObjectives(NamedTuple):
+    total: dict[str, int]  # objectives taken over the whole game (for display)
+    conversion: dict[str, int]  # objectives taken within 120s of a team kill
+    conversions: int
+    team_kills: int
 
-    target_10 = 10 * 60000
-    target_15 = 15 * 60000
 
-    # Find frames with valid participant data (Phase 1: only player)
-    fr10, fr10_meta = _find_frame_with_tolerance(
-        frames, target_10, require_participants=[participant_id]
-    )
-    fr15, fr15_meta = _find_frame_with_tolerance(
-        frames, target_15, require_participants=[participant_id]
+def _lane_opponent(parts: list[dict[str, Any]], me: dict[str, Any]) -> int | None:
+    my_team = int(me.get("teamId", 0))
+    my_lane = str(me.get("individualPosition", ""))
+    opp = next(
+        (
+            p
+            for p in parts
+            if int(p.get("teamId", 0)) != my_team
+            and str(p.get("individualPosition", "")) == my_lane
+        ),
+        None,
     )
-
-    # Lane opponent resolution from Details API
-    parts = match_details.get("info", {}).get("participants", []) if match_details else []
-    me = next((p for p in parts if int(p.get("participantId", 0)) == int(participant_id)), None)
-    my_team = int(me.get("teamId", 0)) if me else None
-    my_lane = str(me.get("individualPosition", "")) if me else ""
-
-    opponent_id = None
-    if me:
+    if opp is None:
+        # Fallback: enemy with same lane reported by 'teamPosition'
         opp = next(
             (
                 p
                 for p in parts
                 if int(p.get("teamId", 0)) != my_team
-                and str(p.get("individualPosition", "")) == my_lane
+                and str(p.get("teamPosition", "")) == str(me.get("teamPosition", ""))
             ),
             None,
         )
-        if opp is None:
-            # Fallback: enemy with same lane reported by 'teamPosition'
-            opp = next(
-                (
-                    p
-                    for p in parts
-                    if int(p.get("teamId", 0)) != my_team
-                    and str(p.get("teamPosition", "")) == str(me.get("teamPosition", ""))
-                ),
-                None,
+    if opp is None:
+        # Last resort: enemy mid (common proxy)
+        opp = next(
+            (
+                p
+                for p in parts
+                if int(p.get("teamId", 0)) != my_team
+                and str(p.get("individualPosition", "")) in ("MIDDLE", "MID")
+            ),
+            None,
+        )
+    return int(opp.get("participantId", 0)) if opp else None
+
+
+def _team_objectives(
+    timeline: CompactTimeline, parts: list[dict[str, Any]], team_id: int | None
+) -> _TeamObjectives:
+    """Objective totals and post-kill conversions for one team."""
+    total_objectives = dict.fromkeys(_OBJECTIVE_KEYS, 0)
+    conversion_objectives = dict.fromkeys(_OBJECTIVE_KEYS, 0)
+    conv_count = 0
+    team_kills = 0
+
+    building_code = timeline.code("BUILDING_KILL")
+    monster_code = timeline.code("ELITE_MONSTER_KILL")
+    kill_code = timeline.code("CHAMPION_KILL")
+
+    def _count_objective(ev: np.void, target_dict: dict[str, int]) -> None:
+        """Count objective in the target dictionary."""
+        if ev["type"] == building_code:
+            building_type = timeline.label(int(ev["building"]))
+            if building_type == "TOWER_BUILDING":
+                target_dict["towers"] += 1
+            elif building_type == "INHIBITOR_BUILDING":
+                target_dict["inhibitors"] += 1
+        elif ev["type"] == monster_code:
+            m = timeline.label(int(ev["monster"]))
+            if m == "DRAGON":
+                target_dict["drakes"] += 1
+            elif m == "BARON_NASHOR":
+                target_dict["barons"] += 1
+            elif m in ("RIFTHERALD", "HORDE_RIFTHERALD"):
+                target_dict["heralds"] += 1
+            elif m in ("HORDE", "VOIDGRUB"):  # S14 Voidgrubs
+                target_dict["voidgrubs"] += 1
+            elif m in ("ATAKHAN", "RUINOUS_ATAKHAN", "VORACIOUS_ATAKHAN"):  # S15 Atakhan
+                target_dict["atakhans"] += 1
+
+    try:
+        if team_id:
+            # Events are already time-sorted in the compact timeline
+            events = timeline.events
+
+            our_part_ids = {
+                int(p.get("participantId", 0)) for p in parts if int(p.get("teamId", 0)) == team_id
+            }
+            ours = np.isin(events["killer"], list(our_part_ids))
+
+            # teamId = team that OWNS the destroyed building (not the attacker!)
+            # So we count when teamId != our team (we destroyed enemy buildings)
+            is_building = events["type"] == building_code
+            is_monster = events["type"] == monster_code
+            objective_idx = np.flatnonzero(
+                (is_building & (events["team"] != team_id)) | (is_monster & ours)
             )
-        if opp is None:
-            # Last resort: enemy mid (common proxy)
-            opp = next(
-                (
-                    p
-                    for p in parts
-                    if int(p.get("teamId", 0)) != my_team
-                    and str(p.get("individualPosition", "")) in ("MIDDLE", "MID")
-                ),
-                None,
+
+            # First pass: count ALL objectives taken by team (for display)
+            if logger.isEnabledFor(logging.INFO):
+                _log_event(
+                    "sr_enrichment_events_diagnostic",
+                    {
+                        "total_events": int(len(events)),
+                        "sample_events": [
+                            {
+                                "type": timeline.label(int(ev["type"])),
+                                "timestamp": int(ev["timestamp"]),
+                                "teamId": int(ev["team"]),
+                                "buildingType": timeline.label(int(ev["building"])),
+                                "monsterType": timeline.label(int(ev["monster"])),
+                                "killerId": int(ev["killer"]),
+                            }
+                            for ev in events[:10]
+                        ],
+                        "building_kill_events": int(is_building.sum()),
+                        "elite_monster_kill_events": int(is_monster.sum()),
+                        "our_team_id": team_id,
+                        "our_participant_ids": list(our_part_ids),
+                    },
+                )
+            for idx in objective_idx:
+                _count_objective(events[idx], total_objectives)
+
+            # Second pass: conversion rate calculation (first objective within 120s after
+            # each kill, found by binary search over the objective positions)
+            kill_idx = np.flatnonzero((events["type"] == kill_code) & ours)
+            team_kills = int(len(kill_idx))
+            if team_kills and len(objective_idx):
+                nxt = np.searchsorted(objective_idx, kill_idx, side="right")
+                for k, n in zip(kill_idx, nxt, strict=True):
+                    if n >= len(objective_idx):
+                        continue
+                    obj = events[objective_idx[n]]
+                    if int(obj["timestamp"]) <= int(events["timestamp"][k]) + 120_000:
+                        conv_count += 1
+                        _count_objective(obj, conversion_objectives)
+
+            # DIAGNOSTIC: Log total objectives
+            _log_event(
+                "sr_enrichment_objectives_counted",
+                {
+                    "total_objectives": total_objectives,
+                    "conversion_objectives": conversion_objectives,
+                    "team_id": team_id,
+                },
             )
-        if opp:
-            opponent_id = int(opp.get("participantId", 0))
+    except Exception:
+        _log_event("sr_enrichment_objective_counting_failed", {}, exc_info=True)
+
+    return _TeamObjectives(total_objectives, conversion_objectives, conv_count, team_kills)
+
+
+def _milestone_frame(
+    timeline: CompactTimeline, milestones: MilestoneSnapshots, minute: int, pids: list[int]
+) -> tuple[int | None, dict[str, Any] | None]:
+    """Frame for ``pids`` at ``minute``: the precomputed pick when all of them share
+    it (always the case for complete frames), else a joint search."""
+    frame = milestones.shared_frame(minute, pids)
+    if frame is not None:
+        return frame, milestones.metadata(minute, pids[0])
+    return _find_frame_with_tolerance(timeline, minute * 60_000, require_participants=pids)
 
-    # Phase 2: Re-find frames if opponent found, requiring both participants
-    if opponent_id:
-        fr10, fr10_meta = _find_frame_with_tolerance(
-            frames, target_10, require_participants=[participant_id, opponent_id]
-        )
-        fr15, fr15_meta = _find_frame_with_tolerance(
-            frames, target_15, require_participants=[participant_id, opponent_id]
-        )
 
-    if fr10:
-        pf_container = fr10.get("participant_frames", {}) or {}
-        pf10 = pf_container.get(str(participant_id)) or {}
-        if pf10:
-            cs10 = _cs_from_frame_participant(pf10)
-    if fr15:
-        pf_container = fr15.get("participant_frames", {}) or {}
-        pf15 = pf_container.get(str(participant_id)) or {}
-        if pf15:
-            cs15 = _cs_from_frame_participant(pf15)
+def _extract_for_participant(
+    timeline: CompactTimeline,
+    match_details: dict[str, Any],
+    participant_id: int,
+    milestones: MilestoneSnapshots,
+    team_cache: dict[int | None, _TeamObjectives],
+) -> dict[str, Any]:
+    participant_id = int(participant_id)
+    duration_min = max(timeline.duration_ms / 60000.0, 1.0)
 
+    # DIAGNOSTIC: Log frame availability
     _log_event(
-        "sr_enrichment_fr10_result",
+        "sr_enrichment_frame_search",
         {
-            "fr10_found": fr10 is not None,
-            "fr10_timestamp": int(fr10.get("timestamp", 0)) if fr10 else None,
-            "fr10_has_participant": _frame_has_participants(fr10, [participant_id]),
-            "fr10_has_opponent": _frame_has_participants(fr10, [participant_id, opponent_id])
-            if opponent_id
-            else None,
-            "fallback_used": fr10_meta is not None,
-            "fallback_delta_ms": (fr10_meta or {}).get("delta_ms"),
-            "fallback_direction": (fr10_meta or {}).get("direction"),
-            "fallback_reason": (fr10_meta or {}).get("reason"),
+            "total_frames": timeline.n_frames,
+            "frame_timestamps": [int(ts) for ts in timeline.timestamps[:5]],
+            "target_10min_ms": 10 * 60000,
+            "target_15min_ms": 15 * 60000,
+            "participant_id": participant_id,
         },
     )
 
-    if fr10_meta:
-        _log_event(
-            "sr_enrichment_fallback_frame",
-            {
-                "target_label": "10min",
-                "target_ms": target_10,
-                "resolved_timestamp": int(fr10.get("timestamp", 0)) if fr10 else None,
-                "delta_ms": fr10_meta.get("delta_ms"),
-                "direction": fr10_meta.get("direction"),
-                "participant_id": participant_id,
-                "reason": fr10_meta.get("reason"),
-            },
-        )
-
-    if fr15_meta:
-        _log_event(
-            "sr_enrichment_fallback_frame",
-            {
-                "target_label": "15min",
-                "target_ms": target_15,
-                "resolved_timestamp": int(fr15.get("timestamp", 0)) if fr15 else None,
-                "delta_ms": fr15_meta.get("delta_ms"),
-                "direction": fr15_meta.get("direction"),
-                "participant_id": participant_id,
-                "reason": fr15_meta.get("reason"),
-            },
+    # Lane opponent resolution from Details API
+    parts = match_details.get("info", {}).get("participants", []) if match_details else []
+    me = next((p for p in parts if int(p.get("participantId", 0)) == participant_id), None)
+    my_team = int(me.get("teamId", 0)) if me else None
+    my_lane = str(me.get("individualPosition", "")) if me else ""
+    opponent_id = _lane_opponent(parts, me) if me else None
+
+    # Frames with valid participant data: both laners when the opponent is
+    # known, so CS and diffs read the same snapshot
+    required = [participant_id, opponent_id] if opponent_id else [participant_id]
+    resolved = {m: _milestone_frame(timeline, milestones, m, required) for m in (10, 15)}
+    fr10, fr10_meta = resolved[10]
+
+    def _frame_ts(frame_idx: int | None) -> int | None:
+        return int(timeline.timestamps[frame_idx]) if frame_idx is not None else None
+
+    def _snapshot(minute: int, pid: int) -> tuple[int | None, int | None, int | None]:
+        """(cs, gold, xp) at the resolved frame, None where the frame lacks the data."""
+        fr = resolved[minute][0]
+        if fr is None or not timeline.has_participants(fr, [pid]):
+            return None, None, None
+        if milestones.frame(minute, pid) == fr:
+            return (
+                milestones.cs_at(minute, pid),
+                milestones.gold_at(minute, pid),
+                milestones.xp_at(minute, pid),
+            )
+        return (
+            _cs_at(timeline, fr, pid),
+            timeline.stat("total_gold", fr, pid),
+            timeline.stat("xp", fr, pid),
         )
 
-    # Gold/XP diffs at 10/15
-    gold_diff_10: int | None = None
-    xp_diff_10: int | None = None
-    gold_diff_15: int | None = None
-    xp_diff_15: int | None = None
-
-    def _gx(fr: dict[str, Any], pid: int) -> tuple[int | None, int | None]:
-        pf = fr.get("participant_frames", {}).get(str(pid), {}) if fr else {}
-
-        def _stat(*keys: str) -> int | None:
-            for key in keys:
-                if key in pf and pf[key] is not None:
-                    try:
-                        return int(pf[key])
-                    except (TypeError, ValueError):
-                        continue
-            return None
+    snapshots = {(m, pid): _snapshot(m, pid) for m in resolved for pid in required}
+    cs_at = {m: snapshots[m, participant_id][0] for m in resolved}
 
-        # DIAGNOSTIC: retain structured view of raw frame data for field verification
+    if logger.isEnabledFor(logging.INFO):
         _log_event(
-            "sr_enrichment_raw_frame_data",
+            "sr_enrichment_fr10_result",
             {
-                "participant_id": pid,
-                "frame_timestamp": fr.get("timestamp") if fr else None,
-                "participant_frame_keys": list(pf.keys()) if pf else [],
-                "participant_frame_sample": {
-                    k: pf.get(k)
-                    for k in ["totalGold", "total_gold", "goldEarned", "xp", "level", "currentGold"]
-                }
-                if pf
-                else {},
-                "all_participant_ids": list(fr.get("participant_frames", {}).keys()) if fr else [],
+                "fr10_found": fr10 is not None,
+                "fr10_timestamp": _frame_ts(fr10),
+                "fr10_has_participant": _frame_has_participants(timeline, fr10, [participant_id]),
+                "fr10_has_opponent": _frame_has_participants(
+                    timeline, fr10, [participant_id, opponent_id]
+                )
+                if opponent_id
+                else None,
+                "fallback_used": fr10_meta is not None,
+                "fallback_delta_ms": (fr10_meta or {}).get("delta_ms"),
+                "fallback_direction": (fr10_meta or {}).get("direction"),
+                "fallback_reason": (fr10_meta or {}).get("reason"),
             },
         )
 
-        if not pf:
-            return None, None
+        for minute, (fr, meta) in resolved.items():
+            if meta:
+                _log_event(
+                    "sr_enrichment_fallback_frame",
+                    {
+                        "target_label": f"{minute}min",
+                        "target_ms": minute * 60000,
+                        "resolved_timestamp": _frame_ts(fr),
+                        "delta_ms": meta.get("delta_ms"),
+                        "direction": meta.get("direction"),
+                        "participant_id": participant_id,
+                        "reason": meta.get("reason"),
+                    },
+                )
 
-        gold_val = _stat("total_gold", "totalGold", "gold", "goldEarned")
-        xp_val = _stat("xp", "experience", "totalExperience")
+    def _gx(minute: int, pid: int) -> tuple[int | None, int | None]:
+        fr = resolved[minute][0]
+        _, gold_val, xp_val = snapshots[minute, pid]
 
-        if gold_val is None or xp_val is None:
+        # DIAGNOSTIC: retain structured view of frame data for field verification
+        if logger.isEnabledFor(logging.INFO):
+            present = fr is not None and timeline.has_participants(fr, [pid])
             _log_event(
-                "sr_enrichment_partial_frame_data",
+                "sr_enrichment_raw_frame_data",
                 {
                     "participant_id": pid,
-                    "frame_timestamp": fr.get("timestamp") if fr else None,
-                    "missing_gold": gold_val is None,
-                    "missing_xp": xp_val is None,
+                    "frame_timestamp": _frame_ts(fr),
+                    "participant_frame_sample": {
+                        name: timeline.stat(name, fr, pid)
+                        for name in ("total_gold", "xp", "level", "current_gold")
+                    }
+                    if present and fr is not None
+                    else {},
+                    "all_participant_ids": [str(p) for p in timeline.participants_in(fr)]
+                    if fr is not None
+                    else [],
                 },
-                level=logging.WARNING,
             )
+            if present and (gold_val is None or xp_val is None):
+                _log_event(
+                    "sr_enrichment_partial_frame_data",
+                    {
+                        "participant_id": pid,
+                        "frame_timestamp": _frame_ts(fr),
+                        "missing_gold": gold_val is None,
+                        "missing_xp": xp_val is None,
+                    },
+                    level=logging.WARNING,
+                )
 
         return gold_val, xp_val
 
@@ -519,87 +724,53 @@ def extract_sr_enrichment(
             "my_lane": my_lane,
             "opponent_id": opponent_id,
             "has_fr10": fr10 is not None,
-            "has_fr15": fr15 is not None,
+            "has_fr15": resolved[15][0] is not None,
         },
     )
 
+    # Gold/XP diffs at 10/15
+    gold_diff: dict[int, int | None] = {10: None, 15: None}
+    xp_diff: dict[int, int | None] = {10: None, 15: None}
     if opponent_id:
-        if fr10:
-            my_g10, my_x10 = _gx(fr10, participant_id)
-            op_g10, op_x10 = _gx(fr10, opponent_id)
-
-            if my_g10 is not None and op_g10 is not None:
-                gold_diff_10 = my_g10 - op_g10
-            if my_x10 is not None and op_x10 is not None:
-                xp_diff_10 = my_x10 - op_x10
-
-            if gold_diff_10 is not None or xp_diff_10 is not None:
+        for minute, (fr, meta) in resolved.items():
+            if fr is None:
                 _log_event(
-                    "sr_enrichment_gold_xp_diff_10",
-                    {
-                        "my_gold": my_g10,
-                        "op_gold": op_g10,
-                        "gold_diff": gold_diff_10,
-                        "my_xp": my_x10,
-                        "op_xp": op_x10,
-                        "xp_diff": xp_diff_10,
-                        "fallback_delta_ms": (fr10_meta or {}).get("delta_ms"),
-                    },
+                    f"sr_enrichment_fr{minute}_missing",
+                    {"participant_id": participant_id, "opponent_id": opponent_id},
                 )
-            else:
-                _log_event(
-                    "sr_enrichment_gold_xp_diff_10_missing",
-                    {
-                        "participant_id": participant_id,
-                        "opponent_id": opponent_id,
-                        "frame_timestamp": int(fr10.get("timestamp", 0)) if fr10 else None,
-                    },
-                    level=logging.WARNING,
-                )
-        else:
-            _log_event(
-                "sr_enrichment_fr10_missing",
-                {"participant_id": participant_id, "opponent_id": opponent_id},
-            )
+                continue
 
-        if fr15:
-            my_g15, my_x15 = _gx(fr15, participant_id)
-            op_g15, op_x15 = _gx(fr15, opponent_id)
+            my_gold, my_xp = _gx(minute, participant_id)
+            op_gold, op_xp = _gx(minute, opponent_id)
+            if my_gold is not None and op_gold is not None:
+                gold_diff[minute] = my_gold - op_gold
+            if my_xp is not None and op_xp is not None:
+                xp_diff[minute] = my_xp - op_xp
 
-            if my_g15 is not None and op_g15 is not None:
-                gold_diff_15 = my_g15 - op_g15
-            if my_x15 is not None and op_x15 is not None:
-                xp_diff_15 = my_x15 - op_x15
-
-            if gold_diff_15 is not None or xp_diff_15 is not None:
+            if gold_diff[minute] is not None or xp_diff[minute] is not None:
                 _log_event(
-                    "sr_enrichment_gold_xp_diff_15",
+                    f"sr_enrichment_gold_xp_diff_{minute}",
                     {
-                        "my_gold": my_g15,
-                        "op_gold": op_g15,
-                        "gold_diff": gold_diff_15,
-                        "my_xp": my_x15,
-                        "op_xp": op_x15,
-                        "xp_diff": xp_diff_15,
-                        "fallback_delta_ms": (fr15_meta or {}).get("delta_ms"),
+                        "my_gold": my_gold,
+                        "op_gold": op_gold,
+                        "gold_diff": gold_diff[minute],
+                        "my_xp": my_xp,
+                        "op_xp": op_xp,
+                        "xp_diff": xp_diff[minute],
+                        "fallback_delta_ms": (meta or {}).get("delta_ms"),
                     },
                 )
             else:
                 _log_event(
-                    "sr_enrichment_gold_xp_diff_15_missing",
+                    f"sr_enrichment_gold_xp_diff_{minute}_missing",
                     {
                         "participant_id": participant_id,
                         "opponent_id": opponent_id,
-                        "frame_timestamp": int(fr15.get("timestamp", 0)) if fr15 else None,
+                        "frame_timestamp": _frame_ts(fr),
                     },
                     level=logging.WARNING,
                 )
-        else:
-            _log_event(
-                "sr_enrichment_fr15_missing",
-                {"participant_id": participant_id, "opponent_id": opponent_id},
-            )
-    else:
+    elif logger.isEnabledFor(logging.INFO):
         _log_event(
             "sr_enrichment_no_opponent_found",
             {
@@ -621,156 +792,15 @@ def extract_sr_enrichment(
         except Exception:
             pass
 
-    # Objective conversion within 120s after our team kills
-    conv_count = 0
-    team_kills = 0
-
-    # Total objectives taken by team (entire game) - for display in UI
-    total_objectives = {
-        "towers": 0,
-        "drakes": 0,
-        "heralds": 0,
-        "barons": 0,
-        "inhibitors": 0,
-        "voidgrubs": 0,
-        "atakhans": 0,
-    }
-
-    # Conversion objectives (within 120s window) - for conversion rate calculation
-    conversion_objectives = {
-        "towers": 0,
-        "drakes": 0,
-        "heralds": 0,
-        "barons": 0,
-        "inhibitors": 0,
-        "voidgrubs": 0,
-        "atakhans": 0,
-    }
-
-    def _count_objective(e2: dict[str, Any], target_dict: dict[str, int]) -> None:
-        """Count objective in the target dictionary."""
-        t = e2.get("type")
-        if t == "BUILDING_KILL":
-            building_type = str(e2.get("buildingType", ""))
-            if building_type == "TOWER_BUILDING":
-                target_dict["towers"] += 1
-            elif building_type == "INHIBITOR_BUILDING":
-                target_dict["inhibitors"] += 1
-        elif t == "ELITE_MONSTER_KILL":
-            m = str(e2.get("monsterType", ""))
-            if m == "DRAGON":
-                target_dict["drakes"] += 1
-            elif m == "BARON_NASHOR":
-                target_dict["barons"] += 1
-            elif m in ("RIFTHERALD", "HORDE_RIFTHERALD"):
-                target_dict["heralds"] += 1
-            elif m in ("HORDE", "VOIDGRUB"):  # S14 Voidgrubs
-                target_dict["voidgrubs"] += 1
-            elif m in ("ATAKHAN", "RUINOUS_ATAKHAN", "VORACIOUS_ATAKHAN"):  # S15 Atakhan
-                target_dict["atakhans"] += 1
-
-    try:
-        team_id = my_team
-        if team_id:
-            # Flatten events
-            events: list[dict[str, Any]] = []
-            for fr in frames:
-                for ev in fr.get("events", []) or []:
-                    if isinstance(ev, dict):
-                        events.append(ev)
-            events.sort(key=lambda e: int(e.get("timestamp", 0)))
-
-            our_part_ids = {
-                int(p.get("participantId", 0)) for p in parts if int(p.get("teamId", 0)) == team_id
-            }
-
-            # First pass: count ALL objectives taken by team (for display)
-            _log_event(
-                "sr_enrichment_events_diagnostic",
-                {
-                    "total_events": len(events),
-                    "sample_events": [
-                        {
-                            "type": ev.get("type"),
-                            "timestamp": ev.get("timestamp"),
-                            "teamId": ev.get("teamId"),
-                            "team_id": ev.get("team_id"),
-                            "buildingType": ev.get("buildingType"),
-                            "building_type": ev.get("building_type"),
-                            "monsterType": ev.get("monsterType"),
-                            "monster_type": ev.get("monster_type"),
-                            "killerId": ev.get("killerId"),
-                            "killer_id": ev.get("killer_id"),
-                        }
-                        for ev in events[:10]
-                    ],
-                    "building_kill_events": sum(
-                        1 for ev in events if ev.get("type") == "BUILDING_KILL"
-                    ),
-                    "elite_monster_kill_events": sum(
-                        1 for ev in events if ev.get("type") == "ELITE_MONSTER_KILL"
-                    ),
-                    "our_team_id": team_id,
-                    "our_participant_ids": list(our_part_ids),
-                },
-            )
-            for ev in events:
-                if ev.get("type") == "BUILDING_KILL":
-                    # teamId = team that OWNS the destroyed building (not the attacker!)
-                    # So we count when teamId != our team (we destroyed enemy buildings)
-                    if int(ev.get("teamId", 0)) != team_id:
-                        _count_objective(ev, total_objectives)
-                elif (
-                    ev.get("type") == "ELITE_MONSTER_KILL"
-                    and int(ev.get("killerId", 0)) in our_part_ids
-                ):
-                    _count_objective(ev, total_objectives)
-
-            # Second pass: conversion rate calculation (objectives within 120s after kills)
-            for i, ev in enumerate(events):
-                if ev.get("type") == "CHAMPION_KILL" and int(ev.get("killerId", 0)) in our_part_ids:
-                    team_kills += 1
-                    t0 = int(ev.get("timestamp", 0))
-                    t1 = t0 + 120_000
-                    converted = False
-                    j = i + 1
-                    while j < len(events) and int(events[j].get("timestamp", 0)) <= t1:
-                        e2 = events[j]
-                        et = e2.get("type")
-                        if et == "BUILDING_KILL":
-                            # teamId = team that OWNS the destroyed building (not the attacker!)
-                            # So we count when teamId != our team (we destroyed enemy buildings)
-                            if int(e2.get("teamId", 0)) != team_id:
-                                converted = True
-                                _count_objective(e2, conversion_objectives)
-                                break
-                        elif (
-                            et == "ELITE_MONSTER_KILL"
-                            and int(e2.get("killerId", 0)) in our_part_ids
-                        ):
-                            converted = True
-                            _count_objective(e2, conversion_objectives)
-                            break
-                        j += 1
-                    if converted:
-                        conv_count += 1
-
-            # DIAGNOSTIC: Log total objectives
-            _log_event(
-                "sr_enrichment_objectives_counted",
-                {
-                    "total_objectives": total_objectives,
-                    "conversion_objectives": conversion_objectives,
-                    "team_id": team_id,
-                },
-            )
-    except Exception:
-        _log_event("sr_enrichment_objective_counting_failed", {}, exc_info=True)
+    # Objective conversion within 120s after our team kills (shared by teammates)
+    if my_team not in team_cache:
+        team_cache[my_team] = _team_objectives(timeline, parts, my_team)
+    team = team_cache[my_team]
 
-    rate = (conv_count / team_kills) if team_kills > 0 else 0.0
+    rate = (team.conversions / team.team_kills) if team.team_kills > 0 else 0.0
 
     # Preferred conversion path suggestion (based on conversion objectives, not total)
-    order = sorted(conversion_objectives.items(), key=lambda kv: kv[1], reverse=True)
+    order = sorted(team.conversion.items(), key=lambda kv: kv[1], reverse=True)
     preferred_path = (
         ">".join([k[:2].capitalize() for k, v in order if v > 0])
         if any(v > 0 for _, v in order)
@@ -778,18 +808,73 @@ def extract_sr_enrichment(
     )
 
     return {
-        "cs_at_10": int(cs10) if cs10 is not None else None,
-        "cs_at_15": int(cs15) if cs15 is not None else None,
+        "cs_at_10": int(cs_at[10]) if cs_at[10] is not None else None,
+        "cs_at_15": int(cs_at[15]) if cs_at[15] is not None else None,
         "ward_rate_per_min": float(round(ward_rate, 2)),
-        "post_kill_objective_conversions": int(conv_count),
-        "team_kills_considered": int(team_kills),
+        "post_kill_objective_conversions": int(team.conversions),
+        "team_kills_considered": int(team.team_kills),
         "conversion_rate": float(round(rate, 3)),
-        "objective_breakdown": total_objectives,  # Total objectives for display
-        "conversion_breakdown": conversion_objectives,  # Conversion objectives for analysis
+        "objective_breakdown": dict(team.total),  # Total objectives for display
+        "conversion_breakdown": dict(team.conversion),  # Conversion objectives for analysis
         "preferred_conversion_path": preferred_path,
-        "gold_diff_10": int(gold_diff_10) if gold_diff_10 is not None else None,
-        "xp_diff_10": int(xp_diff_10) if xp_diff_10 is not None else None,
-        "gold_diff_15": int(gold_diff_15) if gold_diff_15 is not None else None,
-        "xp_diff_15": int(xp_diff_15) if xp_diff_15 is not None else None,
+        "gold_diff_10": int(gold_diff[10]) if gold_diff[10] is not None else None,
+        "xp_diff_10": int(xp_diff[10]) if xp_diff[10] is not None else None,
+        "gold_diff_15": int(gold_diff[15]) if gold_diff[15] is not None else None,
+        "xp_diff_15": int(xp_diff[15]) if xp_diff[15] is not None else None,
         "duration_min": float(round(duration_min, 1)),
     }
+
+
+def extract_sr_enrichment(
+    timeline_data: dict[str, Any] | CompactTimeline,
+    match_details: dict[str, Any],
+    participant_id: int,
+    *,
+    milestones: MilestoneSnapshots | None = None,
+) -> dict[str, Any]:
+    """Extract SR-focused enrichment metrics for LLM/view.
+
+    ``timeline_data`` may be a prebuilt `CompactTimeline` and ``milestones``
+    prebuilt `MilestoneSnapshots` so one parse can be shared across players
+    and extractors; for a whole lobby prefer
+    `extract_sr_enrichment_for_participants`.
+
+    Returns keys:
+      - cs_at_10, cs_at_15
+      - ward_rate_per_min
+      - post_kill_objective_conversions (count)
+      - team_kills_considered (count)
+      - conversion_rate (0.0-1.0)
+      - objective_breakdown: {towers, drakes, heralds, barons}
+      - gold/xp diffs vs lane opponent at 10/15: gold_diff_10, xp_diff_10, gold_diff_15, xp_diff_15
+    """
+    timeline = CompactTimeline.coerce(timeline_data)
+    if milestones is None:
+        milestones = MilestoneSnapshots.from_timeline(timeline)
+    return _extract_for_participant(timeline, match_details, participant_id, milestones, {})
+
+
+def extract_sr_enrichment_for_participants(
+    timeline_data: dict[str, Any] | CompactTimeline,
+    match_details: dict[str, Any],
+    participant_ids: list[int] | None = None,
+) -> dict[int, dict[str, Any]]:
+    """`extract_sr_enrichment` for several players (default: everyone in the details).
+
+    The compact timeline, the milestone snapshots and each team's objective
+    counting are computed once and shared, so the whole lobby costs about as
+    much as a single player.
+    """
+    timeline = CompactTimeline.coerce(timeline_data)
+    if participant_ids is None:
+        parts = match_details.get("info", {}).get("participants", []) if match_details else []
+        participant_ids = [int(p.get("participantId", 0)) for p in parts]
+        if not any(participant_ids):
+            participant_ids = [int(pid) for pid in np.flatnonzero(timeline.present.any(axis=0))]
+    milestones = MilestoneSnapshots.from_timeline(timeline)
+    team_cache: dict[int | None, _TeamObjectives] = {}
+    return {
+        int(pid): _extract_for_participant(timeline, match_details, pid, milestones, team_cache)
+        for pid in participant_ids
+        if pid
+    }
@@ -29,6 +29,7 @@ from src.contracts.v23_multi_mode_analysis import (
 )
 from src.core.services.strategies.fallback_strategy import FallbackStrategy
 from src.core.scoring.aram_v1_lite import generate_aram_analysis_report
+from src.prompts.compiler import compile_prompt_file
 
 logger = logging.getLogger(__name__)
 
@@ -95,7 +96,8 @@ class ARAMStrategy(AnalysisStrategy):
             from pathlib import Path
 
             prompt_path = Path(__file__).resolve().parents[3] / "prompts" / "v23_aram_analysis.txt"
-            system_prompt = prompt_path.read_text(encoding="utf-8")
+            # Parsed once per file version instead of re-read on every analysis
+            system_prompt = compile_prompt_file(prompt_path).source
 
             user_prompt = (
                 f"召唤师: {base_report.summoner_name}\n"
@@ -22,6 +22,7 @@ from src.contracts.v23_multi_mode_analysis import (
 from src.core.compliance import check_arena_text_compliance, ComplianceError
 from src.core.scoring.arena_v1_lite import generate_arena_analysis_report
 from src.core.services.strategies.fallback_strategy import FallbackStrategy
+from src.prompts.compiler import compile_prompt_file
 
 logger = logging.getLogger(__name__)
 
@@ -78,7 +79,8 @@ class ArenaStrategy(AnalysisStrategy):
             from pathlib import Path
 
             prompt_path = Path(__file__).resolve().parents[3] / "prompts" / "v23_arena_analysis.txt"
-            system_prompt = prompt_path.read_text(encoding="utf-8")
+            # Parsed once per file version instead of re-read on every analysis
+            system_prompt = compile_prompt_file(prompt_path).source
 
             rounds_json = [r.model_dump(mode="json") for r in base_report.round_performances]
             user_prompt = (
@@ -96,7 +96,7 @@ class SRStrategy(AnalysisStrategy):
 
         try:
             # Step 1: Calculate V1 scores for all 10 players (baseline)
-            timeline_model = MatchTimeline(**timeline_data)
+            timeline_model = MatchTimeline.from_trusted(timeline_data)
             analysis_output = generate_llm_input(timeline_model)
 
             # Step 2: Identify requester's participant index (0-9)
@@ -286,7 +286,7 @@ class SRStrategy(AnalysisStrategy):
                 }
             )
             # Generate V1 fallback
-            timeline_model = MatchTimeline(**timeline_data)
+            timeline_model = MatchTimeline.from_trusted(timeline_data)
             # Degrade to V1 but enrich from Match-V5 details for better raw_stats
             result["score_data"] = generate_llm_input(
                 timeline_model,
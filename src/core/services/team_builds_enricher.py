@@ -41,9 +41,10 @@ from io import BytesIO
 from pathlib import Path
 from typing import Any
 
-import aioboto3
 from PIL import Image, ImageDraw, ImageFont, ImageOps
 
+from src.adapters.local_artifact_store import record_local_artifact
+from src.adapters.object_storage import get_object_storage, write_local_file
 from src.core.observability import trace_adapter
 from src.config.settings import get_settings
 import contextlib
@@ -1029,58 +1030,15 @@ class TeamBuildsEnricher:
         output.save(img_buffer, format="PNG", optimize=True)
         image_data = img_buffer.getvalue()
 
-        # S3 配置检查
-        s3_bucket = getattr(settings, "audio_s3_bucket", None)
-        s3_access_key = getattr(settings, "audio_s3_access_key", None)
-        s3_secret_key = getattr(settings, "audio_s3_secret_key", None)
-        s3_endpoint = getattr(settings, "audio_s3_endpoint", None)
-
         s3_url: str | None = None
         object_key: str | None = None
 
-        # 优先上传 S3
-        if all([s3_bucket, s3_access_key, s3_secret_key, s3_endpoint]):
+        # 优先上传 S3（共享连接池客户端）
+        storage = get_object_storage()
+        if storage is not None:
             try:
                 object_key = f"builds/{date_prefix}/{filename}"
-
-                session = aioboto3.Session()
-                client_kwargs: dict[str, Any] = {
-                    "endpoint_url": s3_endpoint,
-                    "aws_access_key_id": s3_access_key,
-                    "aws_secret_access_key": s3_secret_key,
-                }
-                region = getattr(settings, "audio_s3_region", None)
-                if region:
-                    client_kwargs["region_name"] = region
-
-                async with session.client("s3", **client_kwargs) as s3:
-                    put_kwargs: dict[str, Any] = {
-                        "Bucket": s3_bucket,
-                        "Key": object_key,
-                        "Body": image_data,
-                        "ContentType": "image/png",
-                    }
-                    with contextlib.suppress(Exception):
-                        put_kwargs["ACL"] = "public-read"
-
-                    await s3.put_object(**put_kwargs)
-
-                # 构建 S3 公共 URL
-                public_base = getattr(settings, "audio_s3_public_base_url", None)
-                if public_base:
-                    s3_url = f"{public_base.rstrip('/')}/{object_key}"
-                else:
-                    endpoint = s3_endpoint.rstrip("/")
-                    if getattr(settings, "audio_s3_path_style", True):
-                        s3_url = f"{endpoint}/{s3_bucket}/{object_key}"
-                    else:
-                        # Virtual-hosted style: https://bucket.s3.region.amazonaws.com/key
-                        https_prefix = f"https://{s3_bucket}."
-                        http_prefix = f"http://{s3_bucket}."
-                        endpoint_with_bucket = endpoint.replace("https://", https_prefix).replace(
-                            "http://", http_prefix
-                        )
-                        s3_url = f"{endpoint_with_bucket}/{object_key}"
+                s3_url = await storage.put_bytes(object_key, image_data, content_type="image/png")
 
                 logger.info(
                     "build_visual_s3_upload_success",
@@ -1105,17 +1063,12 @@ class TeamBuildsEnricher:
         local_path: str | None = None
         relative_url: str | None = None
         if not s3_url:
-            # S3 失败或未配置，保存本地
+            # S3 失败或未配置，保存本地（线程池写入，不阻塞事件循环）
             base_dir = Path(settings.build_visual_storage_path)
             if not base_dir.is_absolute():
                 base_dir = Path.cwd() / base_dir
-            subdir = Path(date_prefix)
-            dest_dir = base_dir / subdir
-            dest_dir.mkdir(parents=True, exist_ok=True)
-
-            file_path = dest_dir / filename
-            with open(file_path, "wb") as f:
-                f.write(image_data)
+            file_path = await write_local_file(base_dir / date_prefix / filename, image_data)
+            await record_local_artifact(file_path, len(image_data))
 
             local_path = str(file_path)
             relative_url = f"/static/builds/{date_prefix}/{filename}"
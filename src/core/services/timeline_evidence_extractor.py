@@ -1,4 +1,10 @@
+from __future__ import annotations
+
 import logging
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
 from typing import Any, Literal
 
 from src.contracts.v2_1_timeline_evidence import (
@@ -36,68 +42,167 @@ def _label(x: int, y: int) -> str | None:
     return None
 
 
-def extract_ward_control_evidence(
-    timeline_data: dict[str, Any],
-    target_participant_id: int,
-) -> WardControlEvidence:
-    total_placed = 0
-    control_placed = 0
-    destroyed = 0
-    events: list[WardPlacementEvent] = []
+_FLASH_SPELL_ID = 4
+_ABILITY_WINDOW_MS = 10_000
+_MAX_EVENTS = 5
+_WARD_TYPES = ("YELLOW_TRINKET", "CONTROL_WARD", "BLUE_TRINKET", "SIGHT_WARD")
 
-    try:
-        frames = timeline_data.get("info", {}).get("frames", [])
-        for frame in frames:
+
+def _int(value: Any) -> int:
+    return int(value or 0)
+
+
+@dataclass(slots=True)
+class _Kill:
+    timestamp: int
+    killer: int
+    victim: int
+    assists: tuple[int, ...]
+    x: int
+    y: int
+
+
+@dataclass(slots=True)
+class _Ward:
+    timestamp: int
+    ward_type: str
+    x: int
+    y: int
+
+
+class TimelineEventIndex:
+    """Time-sorted, per-participant index of the events evidence is built from.
+
+    Built in one pass over the timeline; extraction for any participant then
+    only touches that participant's kills, wards and (bisected) Flash casts, so
+    evidence for a whole lobby costs about the same as one legacy extraction.
+    """
+
+    __slots__ = ("kills", "kills_by_participant", "flash_times", "wards", "ward_kills", "pids")
+
+    def __init__(self, timeline_data: dict[str, Any]) -> None:
+        self.kills: list[_Kill] = []
+        self.kills_by_participant: dict[int, list[_Kill]] = defaultdict(list)
+        self.flash_times: dict[int, list[int]] = defaultdict(list)
+        self.wards: dict[int, list[_Ward]] = defaultdict(list)
+        self.ward_kills: dict[int, int] = defaultdict(int)
+
+        info = timeline_data.get("info", {})
+        flashes: list[tuple[int, int]] = []
+        for frame in info.get("frames", []):
             for ev in frame.get("events", []):
                 et = ev.get("type")
-                if et == "WARD_PLACED" and ev.get("creatorId") == target_participant_id:
-                    total_placed += 1
-                    wt = ev.get("wardType") or "SIGHT_WARD"
-                    if wt == "CONTROL_WARD":
-                        control_placed += 1
+                if et == "CHAMPION_KILL":
+                    pos = ev.get("position", {}) or {}
+                    self.kills.append(
+                        _Kill(
+                            timestamp=_int(ev.get("timestamp")),
+                            killer=_int(ev.get("killerId")),
+                            victim=_int(ev.get("victimId")),
+                            assists=tuple(int(a) for a in ev.get("assistingParticipantIds") or ()),
+                            x=_int(pos.get("x")),
+                            y=_int(pos.get("y")),
+                        )
+                    )
+                elif et == "SUMMONER_SPELL_USED":
+                    if _int(ev.get("spellId")) == _FLASH_SPELL_ID:
+                        flashes.append((_int(ev.get("timestamp")), _int(ev.get("participantId"))))
+                elif et == "WARD_PLACED":
                     pos = ev.get("position", {}) or {}
-                    x = int(pos.get("x", 0) or 0)
-                    y = int(pos.get("y", 0) or 0)
-                    ts = int(ev.get("timestamp", 0) or 0)
-                    # Type coercion: ensure ward type is valid before creating event
-                    # API should only return these types, but we default to SIGHT_WARD if unknown
-                    if str(wt) not in (
-                        "YELLOW_TRINKET",
-                        "CONTROL_WARD",
-                        "BLUE_TRINKET",
-                        "SIGHT_WARD",
-                    ):
-                        wt = "SIGHT_WARD"
-                    ward_type_literal: Literal[
-                        "YELLOW_TRINKET", "CONTROL_WARD", "BLUE_TRINKET", "SIGHT_WARD"
-                    ] = str(wt)  # type: ignore[assignment]
-                    events.append(
-                        WardPlacementEvent(
-                            timestamp_ms=ts,
-                            timestamp_display=_fmt_ts(ts),
-                            ward_type=ward_type_literal,
-                            position_x=x,
-                            position_y=y,
-                            position_label=_label(x, y),
+                    self.wards[_int(ev.get("creatorId"))].append(
+                        _Ward(
+                            timestamp=_int(ev.get("timestamp")),
+                            ward_type=str(ev.get("wardType") or "SIGHT_WARD"),
+                            x=_int(pos.get("x")),
+                            y=_int(pos.get("y")),
                         )
                     )
-                    if len(events) > 5:
-                        events.pop(0)
-                elif et == "WARD_KILL" and ev.get("killerId") == target_participant_id:
-                    destroyed += 1
+                elif et == "WARD_KILL":
+                    self.ward_kills[_int(ev.get("killerId"))] += 1
+
+        self.kills.sort(key=lambda k: k.timestamp)
+        for kill in self.kills:
+            for pid in {kill.killer, kill.victim, *kill.assists}:
+                self.kills_by_participant[pid].append(kill)
+        flashes.sort()
+        for ts, pid in flashes:
+            self.flash_times[pid].append(ts)
+
+        self.pids = sorted(
+            {
+                int(p.get("participant_id", p.get("participantId", 0)) or 0)
+                for p in info.get("participants", []) or []
+                if isinstance(p, dict)
+            }
+            - {0}
+        ) or list(range(1, 11))
+
+    @classmethod
+    def coerce(cls, timeline: TimelineEventIndex | dict[str, Any]) -> TimelineEventIndex:
+        return timeline if isinstance(timeline, TimelineEventIndex) else cls(timeline)
+
+    def flashes_near(self, pid: int, ts: int, window_ms: int = _ABILITY_WINDOW_MS) -> list[int]:
+        """Flash timestamps of ``pid`` within ``±window_ms`` of ``ts`` (bisect window)."""
+        times = self.flash_times.get(pid)
+        if not times:
+            return []
+        return times[bisect_left(times, ts - window_ms) : bisect_right(times, ts + window_ms)]
+
+
+def _empty_ward_evidence() -> WardControlEvidence:
+    return WardControlEvidence(
+        total_wards_placed=0,
+        control_wards_placed=0,
+        wards_destroyed=0,
+        critical_objective_wards=0,
+        ward_events=[],
+    )
+
+
+def _empty_combat_evidence() -> CombatEvidence:
+    return CombatEvidence(
+        total_kills=0,
+        total_deaths=0,
+        total_assists=0,
+        solo_kills=0,
+        early_flash_usage_count=0,
+        kill_events=[],
+    )
+
+
+def extract_ward_control_evidence(
+    timeline_data: dict[str, Any] | TimelineEventIndex,
+    target_participant_id: int,
+) -> WardControlEvidence:
+    try:
+        index = TimelineEventIndex.coerce(timeline_data)
+        placed = index.wards.get(target_participant_id, [])
+        events: list[WardPlacementEvent] = []
+        for ward in placed[-_MAX_EVENTS:]:
+            # API should only return these types, but we default to SIGHT_WARD if unknown
+            wt = ward.ward_type if ward.ward_type in _WARD_TYPES else "SIGHT_WARD"
+            ward_type_literal: Literal[
+                "YELLOW_TRINKET", "CONTROL_WARD", "BLUE_TRINKET", "SIGHT_WARD"
+            ] = wt  # type: ignore[assignment]
+            events.append(
+                WardPlacementEvent(
+                    timestamp_ms=ward.timestamp,
+                    timestamp_display=_fmt_ts(ward.timestamp),
+                    ward_type=ward_type_literal,
+                    position_x=ward.x,
+                    position_y=ward.y,
+                    position_label=_label(ward.x, ward.y),
+                )
+            )
+        control_placed = sum(1 for w in placed if w.ward_type == "CONTROL_WARD")
+        destroyed = index.ward_kills.get(target_participant_id, 0)
     except Exception as e:
         logger.warning(f"Error extracting ward control evidence: {e}")
-        return WardControlEvidence(
-            total_wards_placed=0,
-            control_wards_placed=0,
-            wards_destroyed=0,
-            critical_objective_wards=0,
-            ward_events=[],
-        )
+        return _empty_ward_evidence()
 
     critical = sum(1 for e in events if (e.position_label or "").startswith(("Dragon", "Baron")))
     return WardControlEvidence(
-        total_wards_placed=total_placed,
+        total_wards_placed=len(placed),
         control_wards_placed=control_placed,
         wards_destroyed=destroyed,
         critical_objective_wards=critical,
@@ -106,7 +211,7 @@ def extract_ward_control_evidence(
 
 
 def extract_combat_evidence(
-    timeline_data: dict[str, Any],
+    timeline_data: dict[str, Any] | TimelineEventIndex,
     target_participant_id: int,
 ) -> CombatEvidence:
     kills = deaths = assists = solo = 0
@@ -114,87 +219,62 @@ def extract_combat_evidence(
     kill_events: list[ChampionKillEvent] = []
 
     try:
-        frames = timeline_data.get("info", {}).get("frames", [])
-        all_events = [ev for f in frames for ev in f.get("events", [])]
+        index = TimelineEventIndex.coerce(timeline_data)
+        pid = target_participant_id
+        involved = index.kills_by_participant.get(pid, [])
 
-        for ev in all_events:
-            if ev.get("type") != "CHAMPION_KILL":
-                continue
-            killer = int(ev.get("killerId", 0) or 0)
-            victim = int(ev.get("victimId", 0) or 0)
-            assists_ids = [int(a) for a in (ev.get("assistingParticipantIds") or [])]
-            pos = ev.get("position", {}) or {}
-            x = int(pos.get("x", 0) or 0)
-            y = int(pos.get("y", 0) or 0)
-            ts = int(ev.get("timestamp", 0) or 0)
-
-            is_killer = killer == target_participant_id
-            is_victim = victim == target_participant_id
-            is_assist = target_participant_id in assists_ids
+        for n, kill in enumerate(involved):
+            ts = kill.timestamp
+            is_killer = kill.killer == pid
+            is_victim = kill.victim == pid
+            is_assist = pid in kill.assists
 
             if is_killer:
                 kills += 1
-                if not assists_ids:
+                if not kill.assists:
                     solo += 1
             if is_victim:
                 deaths += 1
             if is_assist:
                 assists += 1
 
-            if not (is_killer or is_victim or is_assist):
-                continue
-
             abilities: list[AbilityUsage] = []
-            for oe in all_events:
-                t2 = int(oe.get("timestamp", 0) or 0)
-                if abs(t2 - ts) > 10000:
-                    continue
-                if (
-                    oe.get("type") == "SUMMONER_SPELL_USED"
-                    and int(oe.get("participantId", 0) or 0) == target_participant_id
-                ):
-                    spell_id = int(oe.get("spellId", 0) or 0)
-                    if spell_id == 4:  # Flash
-                        before_death_ms = (ts - t2) if is_victim and t2 < ts else None
-                        if before_death_ms is not None and before_death_ms < 5000:
-                            early_flash += 1
-                        abilities.append(
-                            AbilityUsage(
-                                ability_type="FLASH",
-                                used_by_victim=is_victim,
-                                timestamp_before_death_ms=before_death_ms,
-                            )
+            for t2 in index.flashes_near(pid, ts):
+                before_death_ms = (ts - t2) if is_victim and t2 < ts else None
+                if before_death_ms is not None and before_death_ms < 5000:
+                    early_flash += 1
+                # Only the last few kills are reported; earlier ones just count
+                if n >= len(involved) - _MAX_EVENTS:
+                    abilities.append(
+                        AbilityUsage(
+                            ability_type="FLASH",
+                            used_by_victim=is_victim,
+                            timestamp_before_death_ms=before_death_ms,
                         )
+                    )
 
+            if n < len(involved) - _MAX_EVENTS:
+                continue
             kill_events.append(
                 ChampionKillEvent(
                     timestamp_ms=ts,
                     timestamp_display=_fmt_ts(ts),
-                    victim_participant_id=victim,
-                    killer_participant_id=killer,
+                    victim_participant_id=kill.victim,
+                    killer_participant_id=kill.killer,
                     was_target_player_victim=is_victim,
                     was_target_player_killer=is_killer,
                     was_target_player_assist=is_assist,
                     kill_bounty=None,
                     abilities_used=abilities,
-                    position_x=x,
-                    position_y=y,
-                    position_label=_label(x, y),
+                    position_x=kill.x,
+                    position_y=kill.y,
+                    position_label=_label(kill.x, kill.y),
                 )
             )
-            if len(kill_events) > 5:
-                kill_events.pop(0)
 
     except Exception as e:
         logger.warning(f"Error extracting combat evidence: {e}")
-        return CombatEvidence(
-            total_kills=0,
-            total_deaths=0,
-            total_assists=0,
-            solo_kills=0,
-            early_flash_usage_count=0,
-            kill_events=[],
-        )
+        return _empty_combat_evidence()
 
     return CombatEvidence(
         total_kills=kills,
@@ -207,13 +287,14 @@ def extract_combat_evidence(
 
 
 def extract_timeline_evidence(
-    timeline_data: dict[str, Any],
+    timeline_data: dict[str, Any] | TimelineEventIndex,
     target_participant_id: int,
     match_id: str,
 ) -> V2_1_TimelineEvidence:
     try:
-        ward = extract_ward_control_evidence(timeline_data, target_participant_id)
-        combat = extract_combat_evidence(timeline_data, target_participant_id)
+        index = TimelineEventIndex.coerce(timeline_data)
+        ward = extract_ward_control_evidence(index, target_participant_id)
+        combat = extract_combat_evidence(index, target_participant_id)
         return V2_1_TimelineEvidence(
             match_id=match_id,
             target_player_participant_id=target_participant_id,
@@ -225,19 +306,17 @@ def extract_timeline_evidence(
         return V2_1_TimelineEvidence(
             match_id=match_id,
             target_player_participant_id=target_participant_id,
-            ward_control_evidence=WardControlEvidence(
-                total_wards_placed=0,
-                control_wards_placed=0,
-                wards_destroyed=0,
-                critical_objective_wards=0,
-                ward_events=[],
-            ),
-            combat_evidence=CombatEvidence(
-                total_kills=0,
-                total_deaths=0,
-                total_assists=0,
-                solo_kills=0,
-                early_flash_usage_count=0,
-                kill_events=[],
-            ),
+            ward_control_evidence=_empty_ward_evidence(),
+            combat_evidence=_empty_combat_evidence(),
         )
+
+
+def extract_timeline_evidence_for_participants(
+    timeline_data: dict[str, Any] | TimelineEventIndex,
+    match_id: str,
+    participant_ids: Iterable[int] | None = None,
+) -> dict[int, V2_1_TimelineEvidence]:
+    """Evidence for several participants (default: everyone) from one event index."""
+    index = TimelineEventIndex.coerce(timeline_data)
+    pids = index.pids if participant_ids is None else participant_ids
+    return {int(pid): extract_timeline_evidence(index, int(pid), match_id) for pid in pids}
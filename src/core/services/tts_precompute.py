@@ -0,0 +1,93 @@
+"""Hand-off between precomputed TTS in the analysis worker and the voice paths.
+
+The analysis task synthesizes a match's narration concurrently with its final
+webhook PATCH, so the result card (and its voice button) usually reaches the
+user before the audio exists. While that synthesis runs, the worker holds a
+short-lived Redis marker. A voice request arriving meanwhile waits for the
+precomputed URL instead of starting a second, identical synthesis. It falls
+back to lazy synthesis only if the worker gives up (marker cleared without a
+URL) or the wait times out.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+PENDING_PREFIX = "chimera:tts:pending"
+
+
+def tts_pending_key(match_id: str) -> str:
+    return f"{PENDING_PREFIX}:{match_id}"
+
+
+def stored_tts_audio_url(record: dict[str, Any] | None) -> str | None:
+    """``tts_audio_url`` from an analysis record's llm_metadata (dict or JSON string)."""
+    meta = (record or {}).get("llm_metadata")
+    if isinstance(meta, str):
+        try:
+            meta = json.loads(meta)
+        except ValueError:
+            return None
+    url = meta.get("tts_audio_url") if isinstance(meta, dict) else None
+    return url if isinstance(url, str) and url else None
+
+
+async def mark_tts_pending(cache: Any, match_id: str, ttl_seconds: int) -> None:
+    """Announce an in-flight synthesis (expires on its own if the worker dies)."""
+    try:
+        await cache.set(tts_pending_key(match_id), "1", ttl=ttl_seconds)
+    except Exception:
+        logger.debug("tts_pending_mark_failed", extra={"match_id": match_id}, exc_info=True)
+
+
+async def clear_tts_pending(cache: Any, match_id: str) -> None:
+    try:
+        await cache.delete(tts_pending_key(match_id))
+    except Exception:
+        logger.debug("tts_pending_clear_failed", extra={"match_id": match_id}, exc_info=True)
+
+
+async def await_precomputed_tts(
+    cache: Any,
+    db: Any,
+    match_id: str,
+    *,
+    timeout: float,
+    poll_interval: float = 0.5,
+) -> str | None:
+    """Wait for the worker's in-flight synthesis of ``match_id``; its URL or None.
+
+    Returns None straight away when nothing is pending, so callers only pay a
+    single Redis read on the usual path.
+    """
+    if cache is None:
+        return None
+    try:
+        pending = await cache.get(tts_pending_key(match_id))
+    except Exception:
+        return None
+    if not pending:
+        return None
+
+    started = time.perf_counter()
+    deadline = started + timeout
+    while True:
+        await asyncio.sleep(poll_interval)
+        url = stored_tts_audio_url(await db.get_analysis_result(match_id))
+        still_pending = await cache.get(tts_pending_key(match_id))
+        if url or not still_pending or time.perf_counter() >= deadline:
+            logger.info(
+                "tts_precompute_awaited",
+                extra={
+                    "match_id": match_id,
+                    "ready": bool(url),
+                    "waited_ms": round((time.perf_counter() - started) * 1000, 1),
+                },
+            )
+            return url
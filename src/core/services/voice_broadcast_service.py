@@ -1,11 +1,16 @@
 import asyncio
 import logging
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 import contextlib
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from src.adapters.discord_adapter import DiscordAdapter
+    from src.core.services.shard_routing import ShardRouter
+
+# (payload, base_url=...) -> (ok, message); see VoiceBroadcastHttpClient.post
+ForwardBroadcast = Callable[..., Awaitable[tuple[bool, str]]]
 
 
 logger = logging.getLogger(__name__)
@@ -26,14 +31,28 @@ class VoiceJob:
 class VoiceBroadcastService:
     """Per‑guild single-lane voice broadcast with FIFO queue.
 
-    KISS: Minimal queue + worker per guild; each item connects, plays, disconnects.
+    KISS: Minimal queue + worker per guild; the adapter keeps the guild's voice
+    session open between items and drops it after an idle timeout.
     YAGNI: No persistence or complex state management until required.
     SOLID: Single responsibility (queue + ordering); playback delegated to adapter.
     DRY: Reuse DiscordAdapter.play_tts_in_voice_channel for actual playback.
+    Back-to-back: while one clip plays, the next job's FFmpeg decoder is spawned
+    via DiscordAdapter.build_voice_source so it starts without a warm-up gap.
+    Sharding: with a `ShardRouter`, jobs for guilds on another process's shards
+    are handed to that process's /broadcast endpoint (URL jobs) or refused
+    (in-memory audio), since only the owning shard can join the guild's voice.
     """
 
-    def __init__(self, discord_adapter: "DiscordAdapter") -> None:
+    def __init__(
+        self,
+        discord_adapter: "DiscordAdapter",
+        *,
+        router: "ShardRouter | None" = None,
+        forward: ForwardBroadcast | None = None,
+    ) -> None:
         self._adapter = discord_adapter
+        self._router = router
+        self._forward = forward
         self._queues: dict[int, asyncio.Queue[VoiceJob]] = {}
         self._workers: dict[int, asyncio.Task[None]] = {}
         self._lock = asyncio.Lock()
@@ -68,6 +87,8 @@ class VoiceBroadcastService:
         Returns:
             True if job was successfully enqueued, False otherwise
         """
+        if not self._owns(guild_id):
+            return await self._forward_to_owner(guild_id, channel_id, audio_url)
         try:
             job = VoiceJob(
                 guild_id=guild_id,
@@ -132,6 +153,13 @@ class VoiceBroadcastService:
         Returns:
             True if job was successfully enqueued, False otherwise
         """
+        if not self._owns(guild_id):
+            # Raw audio cannot ride the JSON /broadcast endpoint to the owning process
+            logger.warning(
+                "voice_job_bytes_not_owned",
+                extra={"guild_id": guild_id, "shard_id": self._router_shard(guild_id)},
+            )
+            return False
         try:
             job = VoiceJob(
                 guild_id=guild_id,
@@ -173,51 +201,104 @@ class VoiceBroadcastService:
             )
             return False
 
+    def _owns(self, guild_id: int) -> bool:
+        return self._router is None or self._router.is_local(guild_id)
+
+    def _router_shard(self, guild_id: int) -> int | None:
+        return self._router.shard_for(guild_id) if self._router is not None else None
+
+    async def _forward_to_owner(self, guild_id: int, channel_id: int, audio_url: str) -> bool:
+        owner = self._router.owner_url(guild_id) if self._router is not None else None
+        extra = {"guild_id": guild_id, "shard_id": self._router_shard(guild_id), "owner": owner}
+        if owner is None or self._forward is None:
+            logger.warning("voice_job_shard_owner_unknown", extra=extra)
+            return False
+        ok, message = await self._forward(
+            {"guild_id": guild_id, "voice_channel_id": channel_id, "audio_url": audio_url},
+            base_url=owner,
+            forwarded=True,
+        )
+        logger.info("voice_job_forwarded", extra={**extra, "ok": ok, "status": message})
+        return ok
+
+    def _prepare(self, job: VoiceJob) -> Any:
+        """Spawn ``job``'s FFmpeg decoder ahead of its turn; None on failure."""
+        try:
+            return self._adapter.build_voice_source(
+                audio_url=job.audio_url,
+                audio_bytes=job.audio_bytes,
+                volume=job.volume,
+                normalize=job.normalize,
+                max_seconds=job.max_seconds,
+            )
+        except Exception:
+            logger.warning("voice_source_prefetch_failed guild=%s", job.guild_id, exc_info=True)
+            return None
+
+    async def _play(self, job: VoiceJob, source: Any) -> bool:
+        # Only hand over a prepared decoder when there is one
+        extra: dict[str, Any] = {"source": source} if source is not None else {}
+        if job.audio_bytes is not None:
+            return await self._adapter.play_tts_bytes_in_voice_channel(
+                guild_id=job.guild_id,
+                voice_channel_id=job.channel_id,
+                audio_bytes=job.audio_bytes,
+                volume=job.volume,
+                normalize=job.normalize,
+                max_seconds=job.max_seconds,
+                **extra,
+            )
+        return await self._adapter.play_tts_in_voice_channel(
+            guild_id=job.guild_id,
+            voice_channel_id=job.channel_id,
+            audio_url=job.audio_url,
+            volume=job.volume,
+            normalize=job.normalize,
+            max_seconds=job.max_seconds,
+            **extra,
+        )
+
     async def _worker(self, guild_id: int) -> None:
         q = self._get_queue(guild_id)
-        while True:
-            try:
-                job = await q.get()
-            except Exception:
-                break
-            try:
-                logger.info(
-                    "Voice job start guild=%s channel=%s url=%s",
-                    job.guild_id,
-                    job.channel_id,
-                    job.audio_url,
-                )
-                if job.audio_bytes is not None:
-                    ok = await self._adapter.play_tts_bytes_in_voice_channel(
-                        guild_id=job.guild_id,
-                        voice_channel_id=job.channel_id,
-                        audio_bytes=job.audio_bytes,
-                        volume=job.volume,
-                        normalize=job.normalize,
-                        max_seconds=job.max_seconds,
-                    )
-                else:
-                    ok = await self._adapter.play_tts_in_voice_channel(
-                        guild_id=job.guild_id,
-                        voice_channel_id=job.channel_id,
-                        audio_url=job.audio_url,
-                        volume=job.volume,
-                        normalize=job.normalize,
-                        max_seconds=job.max_seconds,
+        try:
+            job: VoiceJob | None = await q.get()
+        except Exception:
+            job = None
+        source: Any = None
+        try:
+            while job is not None:
+                # Take the next job now so its decoder warms up while this clip plays
+                next_job = None if q.empty() else q.get_nowait()
+                try:
+                    logger.info(
+                        "Voice job start guild=%s channel=%s url=%s",
+                        job.guild_id,
+                        job.channel_id,
+                        job.audio_url,
                     )
-                if not ok:
-                    logger.warning("Voice job failed guild=%s url=%s", guild_id, job.audio_url)
-                else:
-                    logger.info("Voice job done guild=%s url=%s", guild_id, job.audio_url)
-            except Exception:
-                logger.exception("Voice worker error while playing guild=%s", guild_id)
-            finally:
-                with contextlib.suppress(Exception):
-                    q.task_done()
+                    playing = asyncio.create_task(self._play(job, source))
+                    source = self._prepare(next_job) if next_job is not None else None
+                    ok = await playing
+                    if not ok:
+                        logger.warning("Voice job failed guild=%s url=%s", guild_id, job.audio_url)
+                    else:
+                        logger.info("Voice job done guild=%s url=%s", guild_id, job.audio_url)
+                except Exception:
+                    logger.exception("Voice worker error while playing guild=%s", guild_id)
+                finally:
+                    with contextlib.suppress(Exception):
+                        q.task_done()
 
-            # Exit worker when queue drains to keep footprint small
-            if q.empty():
-                break
+                # Jobs that arrived during playback run on the same (still open) session;
+                # exit when the queue drains to keep footprint small
+                if next_job is None and not q.empty():
+                    next_job = q.get_nowait()
+                job = next_job
+        finally:
+            # A decoder prepared for a job that never ran (worker cancelled)
+            if source is not None:
+                with contextlib.suppress(Exception):
+                    source.cleanup()
 
         # Cleanup
         async with self._lock:
@@ -6,9 +6,7 @@ constraints while keeping markdown/code block delimiters intact.
 
 from __future__ import annotations
 
-from typing import Final
-
-ELLIPSIS: Final[str] = "…"
+from src.core.utils.text_width import ELLIPSIS, truncate_to_width
 
 
 def clamp_text(text: str, limit: int, *, preserve_markdown: bool = False) -> str:
@@ -36,6 +34,15 @@ def clamp_text(text: str, limit: int, *, preserve_markdown: bool = False) -> str
     return _restore_markdown(truncated, original=value)
 
 
+def clamp_width(text: str, width: int) -> str:
+    """Clamp text to ``width`` monospace columns (CJK counts double) for code-block tables."""
+
+    if not text:
+        return ""
+
+    return truncate_to_width(text.strip(), width, ELLIPSIS)
+
+
 def clamp_field(text: str, limit: int = 950) -> str:
     """Clamp a Discord Embed field value (default <= 950 chars for safety)."""
 
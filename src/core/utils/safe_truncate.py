@@ -53,8 +53,9 @@ def safe_truncate(text: str, limit: int) -> str:
     min_length = int(limit * 0.5)  # Maintain at least 50% of target length
 
     for anchor in safe_anchors:
-        p = t.rfind(anchor)
-        if p > cut and p >= min_length:
+        # Only the tail past min_length can yield a usable boundary
+        p = t.rfind(anchor, min_length)
+        if p > cut:
             cut = p
 
     # Check for unclosed fenced code blocks
@@ -0,0 +1,94 @@
+"""Terminal display-width helpers for monospace (code block) layouts.
+
+Discord renders code blocks in a monospace font where East Asian Wide/Fullwidth
+characters occupy two columns and combining marks none. Calling
+`unicodedata.east_asian_width` per character dominates rendering time for long
+CJK narratives, so widths for the Basic Multilingual Plane are precomputed once
+into a 64 KiB `bytes` table; astral characters (emoji, rare CJK) fall back to
+`unicodedata`.
+"""
+
+from __future__ import annotations
+
+import unicodedata
+from functools import lru_cache
+from typing import Final
+
+ELLIPSIS: Final[str] = "…"
+
+_BMP_SIZE: Final[int] = 0x10000
+
+
+def _char_width(ch: str) -> int:
+    if unicodedata.combining(ch):
+        return 0
+    return 2 if unicodedata.east_asian_width(ch) in ("F", "W") else 1
+
+
+@lru_cache(maxsize=1)
+def _bmp_table() -> bytes:
+    return bytes(_char_width(chr(cp)) for cp in range(_BMP_SIZE))
+
+
+@lru_cache(maxsize=4096)
+def _astral_width(ch: str) -> int:
+    return _char_width(ch)
+
+
+def display_width(text: str) -> int:
+    """Number of monospace columns `text` occupies."""
+    if text.isascii():
+        return len(text)
+    table = _bmp_table()
+    width = 0
+    for ch in text:
+        cp = ord(ch)
+        width += table[cp] if cp < _BMP_SIZE else _astral_width(ch)
+    return width
+
+
+def pad_to_width(text: str, width: int, fill: str = " ") -> str:
+    """Right-pad `text` with the single-column `fill` character up to `width` columns."""
+    pad = width - display_width(text)
+    if pad <= 0:
+        return text
+    return text + fill * pad
+
+
+def truncate_to_width(text: str, width: int, ellipsis: str = ELLIPSIS) -> str:
+    """Clamp `text` to at most `width` columns, ending with `ellipsis` when cut.
+
+    Single pass: the cut point for `width - len(ellipsis)` columns is recorded
+    on the way and the scan stops as soon as the text is known not to fit.
+    """
+    if width <= 0 or not text:
+        return ""
+    ascii_text = text.isascii()
+    if ascii_text and len(text) <= width:
+        return text
+
+    ellipsis_width = display_width(ellipsis)
+    if ellipsis_width > width:
+        ellipsis, ellipsis_width = "", 0
+    budget = width - ellipsis_width
+    if ascii_text:
+        return text[:budget] + ellipsis
+    table = _bmp_table()
+    used = 0
+    cut = -1
+    for idx, ch in enumerate(text):
+        cp = ord(ch)
+        used += table[cp] if cp < _BMP_SIZE else _astral_width(ch)
+        if cut < 0 and used > budget:
+            cut = idx
+        if used > width:
+            return text[:cut] + ellipsis
+    return text
+
+
+def fit_to_width(text: str, width: int, ellipsis: str = ELLIPSIS) -> str:
+    """Truncate then pad so `text` occupies exactly `width` columns (fixed-width cells).
+
+    A wide character that would straddle the boundary is replaced by padding.
+    """
+    return pad_to_width(truncate_to_width(text, width, ellipsis), width)
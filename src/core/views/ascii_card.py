@@ -9,7 +9,9 @@ Environment variables:
 
 from typing import Any
 import os
-import unicodedata
+
+from src.core.utils.text_width import display_width as _display_width
+from src.core.utils.text_width import pad_to_width as _pad_to_width
 
 THEMES = {
     "dark": {"border": ("+", "-", "|"), "accent": "🕹️"},
@@ -61,26 +63,6 @@ def _get(obj: Any, key: str, default: Any = None) -> Any:
     return getattr(obj, key, default)
 
 
-def _display_width(text: str) -> int:
-    width = 0
-    for ch in text:
-        if unicodedata.combining(ch):
-            continue
-        east = unicodedata.east_asian_width(ch)
-        if east in ("F", "W"):
-            width += 2
-        else:
-            width += 1
-    return width
-
-
-def _pad_to_width(text: str, width: int) -> str:
-    pad = width - _display_width(text)
-    if pad <= 0:
-        return text
-    return text + (" " * pad)
-
-
 def _bar20(x: float) -> str:
     try:
         v = max(0.0, min(100.0, float(x)))
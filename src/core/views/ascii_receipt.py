@@ -10,6 +10,8 @@ Env toggles:
 from typing import Any
 import os
 
+from src.core.utils.text_width import pad_to_width, truncate_to_width
+
 from .ascii_card import _bar20, _to_float  # reuse utilities
 
 
@@ -82,13 +84,11 @@ def build_ascii_receipt(report: Any) -> str:
 
     # Header
     line = "-" * 54
-    title = f"{_emojify('🧾 ')}CHIMERA {mode_tag} RECEIPT".ljust(54)
-    sub = f"{champ or '-'} · {name or '-'}"[:54]
+    title = pad_to_width(f"{_emojify('🧾 ')}CHIMERA {mode_tag} RECEIPT", 54)
+    sub = truncate_to_width(f"{champ or '-'} · {name or '-'}", 54, ellipsis="")
 
     # Items
-    items: list[str] = [f"{k.ljust(10, '.')} {_fmt1(s)}  {_bar20(s)}" for k, s in dims[:3]] + [
-        f"{k.ljust(10, '.')} {_fmt1(s)}  {_bar20(s)}" for k, s in dims[3:6]
-    ]
+    items: list[str] = [f"{pad_to_width(k, 10, '.')} {_fmt1(s)}  {_bar20(s)}" for k, s in dims[:6]]
 
     # Totals / highlights
     highlights = (
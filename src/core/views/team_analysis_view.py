@@ -6,7 +6,8 @@ from collections.abc import Iterable
 import discord
 
 from src.contracts.team_analysis import TeamAnalysisReport
-from src.core.utils.clamp import clamp_code_block, clamp_field, clamp_text
+from src.core.utils.clamp import clamp_code_block, clamp_field, clamp_text, clamp_width
+from src.core.utils.text_width import pad_to_width
 from src.core.views.emoji_registry import resolve_emoji
 
 _ASCII_TRUE = {"1", "true", "yes", "on"}
@@ -321,13 +322,13 @@ def _format_team_snapshot(
             champ_emoji = resolve_emoji(f"champion:{player.champion_name}", "")
             if champ_emoji:
                 name = f"{champ_emoji} {name}"
-        name = clamp_text(name, 14)
+        name = pad_to_width(clamp_width(name, 14), 14)
         dmg_k = player.damage_dealt / 1000.0
         dmg_display = f"{dmg_k:.1f}k" if dmg_k >= 1 else str(player.damage_dealt)
         kda = f"{player.kills}/{player.deaths}/{player.assists}"
         vs_display = f"{player.vision_score:.1f}" if player.vision_score else "0"
         return (
-            f"#{rank:<2} {name:<14} G{player.overall_score:>5.1f} "
+            f"#{rank:<2} {name} G{player.overall_score:>5.1f} "
             f"C{player.combat_score:>5.0f} T{player.teamplay_score:>5.0f} "
             f"KDA {kda:<9} Dmg {dmg_display:<6} VS {vs_display:>5}"
         )
@@ -335,11 +336,11 @@ def _format_team_snapshot(
     max_rows = max(len(friends_sorted), len(opponents_sorted)) or 0
     header_left = "我方阵容"
     header_right = "敌方阵容"
-    lines = [f"{header_left:<45} | {header_right}"]
+    lines = [f"{pad_to_width(header_left, 45)} | {header_right}"]
     for idx in range(max_rows):
         left = _entry_line(friends_sorted[idx] if idx < len(friends_sorted) else None)
         right = _entry_line(opponents_sorted[idx] if idx < len(opponents_sorted) else None)
-        lines.append(f"{left:<45} | {right}")
+        lines.append(f"{pad_to_width(left, 45)} | {right}")
 
     snapshot = "\n".join(lines)
     return f"```\n{clamp_code_block(snapshot, limit=1800)}\n```"
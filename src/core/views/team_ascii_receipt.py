@@ -1,6 +1,7 @@
 import os
 from typing import Any
 
+from src.core.utils.text_width import pad_to_width, truncate_to_width
 from src.core.views.ascii_card import _bar20  # reuse bar renderer
 
 
@@ -58,7 +59,7 @@ def build_team_receipt(report: Any) -> str:
     title = (
         f"[RECEIPT] TEAM | {mode.upper()}" if ascii_safe else f"🧾 TEAM RECEIPT | {mode.upper()}"
     )
-    sub = f"Target: {target_name}"[:54]
+    sub = truncate_to_width(f"Target: {target_name}", 54, ellipsis="")
     line = "-" * 54
 
     rows = []
@@ -80,7 +81,7 @@ def build_team_receipt(report: Any) -> str:
                 0.0,
             )
             rows.append(
-                f"{label.ljust(8, '.')} {_fmt(val)}  {_bar20(float(val))}  (avg {_fmt(avg)})"
+                f"{pad_to_width(label, 8, '.')} {_fmt(val)}  {_bar20(float(val))}  (avg {_fmt(avg)})"
             )
 
     out = [title, line, sub, line]
@@ -4,10 +4,20 @@ This module contains system prompts and template strings for various
 LLM-powered features in 蔚-上城人.
 """
 
+from src.prompts.compiler import (
+    CompiledPrompt,
+    compile_prompt,
+    compile_prompt_file,
+    static_prompt,
+)
 from src.prompts.jiangli_prompt import JIANGLI_SYSTEM_PROMPT
 from src.prompts.v2_team_relative_prompt import V2_TEAM_RELATIVE_SYSTEM_PROMPT
 
 __all__ = [
+    "CompiledPrompt",
+    "compile_prompt",
+    "compile_prompt_file",
+    "static_prompt",
     "JIANGLI_SYSTEM_PROMPT",
     "V2_TEAM_RELATIVE_SYSTEM_PROMPT",
 ]
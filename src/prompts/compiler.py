@@ -0,0 +1,134 @@
+"""Precompiled prompt templates.
+
+Prompt text is parsed once into a tuple of literal segments and typed slots.
+Rendering is then a single ``"".join``, with no per-request re-scanning of
+the template and no chains of f-string concatenation.
+
+Templates use `str.format` syntax, so the ``.txt`` templates under
+``src/prompts/`` compile unchanged. ``{{``/``}}`` are literal braces,
+``{name:.1f}`` is a formatted slot, and ``{name!r}`` applies a conversion.
+One extra conversion, ``{name!j}``, renders the value as indented JSON
+(``ensure_ascii=False``).
+
+The literal text before the first slot is the template's static prefix. It
+is interned and hashed. `static_prompt` wraps text that is sent verbatim
+(system prompts, which may hold literal JSON braces), so its prefix is the
+whole prompt. `CompiledPrompt.prefix_hash` identifies that prefix, so it can
+key provider-side context caches and be compared across requests.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import string
+import sys
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+_FORMATTER = string.Formatter()
+
+
+def _to_json(value: Any) -> str:
+    return json.dumps(value, indent=2, ensure_ascii=False)
+
+
+_CONVERSIONS: dict[str | None, Callable[[Any], Any]] = {
+    "s": str,
+    "r": repr,
+    "a": ascii,
+    "j": _to_json,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class Slot:
+    """A named placeholder with its conversion and format spec resolved at compile time."""
+
+    name: str
+    conversion: str | None = None
+    format_spec: str = ""
+
+    def render(self, value: Any) -> str:
+        if self.conversion is not None:
+            value = _CONVERSIONS[self.conversion](value)
+        return format(value, self.format_spec)
+
+
+def prefix_hash(text: str) -> str:
+    """Stable short digest of prompt text (process- and host-independent)."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+class CompiledPrompt:
+    """A parsed template: literal segments and `Slot`s, rendered with one join."""
+
+    __slots__ = ("source", "segments", "slot_names", "static_prefix", "prefix_hash")
+
+    def __init__(self, source: str, *, literal: bool = False) -> None:
+        segments: list[str | Slot] = []
+        parsed = [(source, None, None, None)] if literal else _FORMATTER.parse(source)
+        for literal_text, field, spec, conversion in parsed:
+            if literal_text:
+                # Adjacent literals (left by escaped braces) are merged
+                if segments and isinstance(segments[-1], str):
+                    segments[-1] += literal_text
+                else:
+                    segments.append(literal_text)
+            if field is None:
+                continue
+            if not field.isidentifier():
+                raise ValueError(f"Unsupported prompt slot {{{field}}}: use a plain name")
+            if conversion is not None and conversion not in _CONVERSIONS:
+                raise ValueError(f"Unknown conversion !{conversion} on slot {{{field}}}")
+            if spec and "{" in spec:
+                raise ValueError(f"Nested format spec on slot {{{field}}} is not supported")
+            segments.append(Slot(field, conversion, spec or ""))
+
+        self.source = source
+        self.segments: tuple[str | Slot, ...] = tuple(
+            sys.intern(s) if isinstance(s, str) else s for s in segments
+        )
+        self.slot_names = frozenset(s.name for s in self.segments if isinstance(s, Slot))
+        first = self.segments[0] if self.segments else ""
+        self.static_prefix: str = first if isinstance(first, str) else ""
+        self.prefix_hash = prefix_hash(self.static_prefix)
+
+    def render(self, **values: Any) -> str:
+        """Fill every slot; a missing value raises KeyError like `str.format`."""
+        return "".join(
+            seg if isinstance(seg, str) else seg.render(values[seg.name]) for seg in self.segments
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"CompiledPrompt(slots={sorted(self.slot_names)}, "
+            f"prefix_chars={len(self.static_prefix)}, prefix_hash={self.prefix_hash})"
+        )
+
+
+@lru_cache(maxsize=256)
+def compile_prompt(source: str) -> CompiledPrompt:
+    """Compile (or fetch the already compiled) template for this exact text."""
+    return CompiledPrompt(source)
+
+
+@lru_cache(maxsize=256)
+def static_prompt(text: str) -> CompiledPrompt:
+    """Intern a prompt used verbatim (system prompts may contain literal JSON braces)."""
+    return CompiledPrompt(text, literal=True)
+
+
+def compile_prompt_file(path: str | Path) -> CompiledPrompt:
+    """Compile a template file; recompiled only when the file's mtime or size changes."""
+    target = Path(path)
+    st = target.stat()
+    return _compile_file(str(target), st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=64)
+def _compile_file(path: str, mtime_ns: int, size: int) -> CompiledPrompt:
+    return compile_prompt(Path(path).read_text(encoding="utf-8"))
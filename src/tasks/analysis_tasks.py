@@ -26,6 +26,7 @@ from celery import Task
 
 from src.adapters.database import DatabaseAdapter
 from src.adapters.ddragon_adapter import DDragonAdapter
+from src.adapters.object_storage import close_object_storage
 from src.adapters.redis_adapter import RedisAdapter
 from src.adapters.discord_webhook import DiscordWebhookAdapter, DiscordWebhookError
 from src.adapters.gemini_llm import GeminiAPIError, GeminiLLMAdapter
@@ -38,24 +39,35 @@ from src.contracts.analysis_results import (
     FinalAnalysisReport,
     V1ScoreSummary,
 )
+from src.contracts.tasks import RenderedDiscordMessage
 from src.contracts.timeline import MatchTimeline
 from src.core.domain.team_policies import tldr_contains_hallucination
-from src.core.observability import llm_debug_wrapper, set_correlation_id, clear_correlation_id
+from src.core.observability import (
+    StageTimer,
+    clear_correlation_id,
+    llm_debug_wrapper,
+    set_correlation_id,
+)
 from src.core.metrics import (
-    observe_analyze_e2e,
     chimera_riot_api_requests_total,
     mark_llm,
     mark_riot_429,
     chimera_external_api_errors_total,
+    observe_analyze_e2e,
     observe_request_latency,
     mark_request_outcome,
 )
 from src.core.scoring import generate_llm_input
 from src.core.scoring.arena_v1_lite import detect_arena_rounds
+from src.core.scoring.compact_timeline import CompactTimeline
+from src.prompts.compiler import compile_prompt
 from src.prompts.system_prompts import get_system_prompt
 from src.contracts.v23_multi_mode_analysis import detect_game_mode
 from src.tasks.celery_app import celery_app
+from src.tasks.webhook_tasks import make_webhook_adapter
 import os as _os
+from src.core.services.rendered_message_cache import RenderedMessageCache
+from src.core.services.tts_precompute import clear_tts_pending, mark_tts_pending
 from src.core.services.team_builds_enricher import (
     DataDragonClient,
     OPGGAdapter,
@@ -725,6 +737,33 @@ def _format_ms(value: float | int | None) -> str:
         return "—"
 
 
+# Fixed blocks of the sanitized LLM context, compiled once (see src.prompts.compiler)
+_LLM_CONTEXT_OVERVIEW = compile_prompt(
+    "## Target Player Overview\n"
+    "- Summoner: {target_name}\n"
+    "- Champion: {champion_label}\n"
+    "- Match Result: {match_result}\n"
+    "- Duration: {game_duration:.1f} 分钟\n"
+    "\n"
+    "## Performance Scores (0-100)\n"
+    "- Overall: {overall}\n"
+    "- Combat: {combat}\n"
+    "- Economy: {economy}\n"
+    "- Objectives: {objectives}\n"
+    "- Vision: {vision}\n"
+    "- Teamwork: {teamwork}"
+)
+_LLM_CONTEXT_APPENDIX = compile_prompt(
+    "## Appendix (Only consult the appendix if the answer requires extra detail.)\n"
+    "- Match ID: {match_id}\n"
+    "- Region: {region}\n"
+    "- Queue ID: {queue_id}\n"
+    "- Game Mode: {game_mode}\n"
+    "- Correlation Tag: {correlation_tag}\n"
+    "- Discord User: {discord_user}"
+)
+
+
 def _build_llm_context(
     *,
     llm_input: Mapping[str, Any],
@@ -795,18 +834,16 @@ def _build_llm_context(
     strengths = target.get("strengths") or []
     improvements = target.get("improvements") or []
 
-    lines: list[str] = []
-    lines.append("## Target Player Overview")
-    lines.append(f"- Summoner: {target_name}")
-    lines.append(f"- Champion: {champion_label}")
-    lines.append(f"- Match Result: {match_result or 'unknown'}")
-    lines.append(f"- Duration: {game_duration:.1f} 分钟")
-    lines.append("")
-
-    lines.append("## Performance Scores (0-100)")
-    for label, value in score_map.items():
-        lines.append(f"- {label}: {_fmt_score(value)}")
-    lines.append("")
+    lines: list[str] = [
+        _LLM_CONTEXT_OVERVIEW.render(
+            target_name=target_name,
+            champion_label=champion_label,
+            match_result=match_result or "unknown",
+            game_duration=game_duration,
+            **{label.lower(): _fmt_score(value) for label, value in score_map.items()},
+        ),
+        "",
+    ]
 
     metric_lines: list[str] = []
     if kills is not None and deaths is not None and assists is not None:
@@ -849,13 +886,16 @@ def _build_llm_context(
             lines.append(f"- Red Team Avg Score: {_fmt_score(red_avg)}")
         lines.append("")
 
-    lines.append("## Appendix (Only consult the appendix if the answer requires extra detail.)")
-    lines.append(f"- Match ID: {match_id}")
-    lines.append(f"- Region: {region or 'n/a'}")
-    lines.append(f"- Queue ID: {queue_id}")
-    lines.append(f"- Game Mode: {game_mode_label or 'unknown'}")
-    lines.append(f"- Correlation Tag: {_mask_identifier(correlation_id)}")
-    lines.append(f"- Discord User: {_mask_identifier(discord_user_id)}")
+    lines.append(
+        _LLM_CONTEXT_APPENDIX.render(
+            match_id=match_id,
+            region=region or "n/a",
+            queue_id=queue_id,
+            game_mode=game_mode_label or "unknown",
+            correlation_tag=_mask_identifier(correlation_id),
+            discord_user=_mask_identifier(discord_user_id),
+        )
+    )
 
     if workflow_durations:
         duration_parts = [f"{key}={_format_ms(value)}" for key, value in workflow_durations.items()]
@@ -988,7 +1028,8 @@ class AnalyzeMatchTask(Task):
     def webhook_adapter(self) -> DiscordWebhookAdapter:
         """Lazy-init Discord webhook adapter for async responses."""
         if self._webhook_adapter is None:
-            self._webhook_adapter = DiscordWebhookAdapter()
+            # Queued delivery (webhooks queue) when DISCORD_WEBHOOK_QUEUE_ENABLED
+            self._webhook_adapter = make_webhook_adapter()
         return self._webhook_adapter
 
     @property
@@ -1014,10 +1055,35 @@ async def _run_analysis_workflow(
     """Single async context for all async operations.
 
     Runs all async operations in a single event loop to avoid 'Event loop is closed'
-    errors in Celery worker threads.
+    errors in Celery worker threads. Every stage is timed with a StageTimer; per-stage
+    totals and the end-to-end duration are observed once per run and the waterfall is
+    attached to the result.
     """
+    timer = StageTimer("analyze", origin=task_start)
+    try:
+        outcome = await _run_analysis_stages(self, task_payload, task_start, timer)
+    finally:
+        observe_analyze_e2e(timer.elapsed_ms(), timer.stage_totals_ms(), timer.game_mode)
+        # The shared S3 client is bound to this task's private loop; release its pool
+        with suppress(Exception):
+            await close_object_storage()
+    outcome["queue_wait_ms"] = getattr(
+        getattr(self, "request", None), "chimera_queue_wait_ms", None
+    )
+    outcome["stage_waterfall"] = timer.waterfall()
+    return outcome
+
+
+async def _run_analysis_stages(
+    self: AnalyzeMatchTask,
+    task_payload: AnalysisTaskPayload,
+    task_start: float,
+    timer: StageTimer,
+) -> dict[str, Any]:
+    """Execute the /讲道理 stages, recording each one on ``timer``."""
     # Result tracking
     result = AnalysisTaskResult(success=False, match_id=task_payload.match_id)
+    tts_task: asyncio.Task[str | None] | None = None
 
     try:
         await _acquire_match_slot(task_payload.match_id)
@@ -1031,79 +1097,82 @@ async def _run_analysis_workflow(
         except Exception:
             pass
         # ===== STAGE 1: Fetch MatchTimeline =====
-        fetch_start = time.perf_counter()
-        timeline_data = await _fetch_timeline_with_observability(
-            self.riot_adapter,
-            task_payload.match_id,
-            task_payload.region,
-        )
+        with timer.stage("fetch"):
+            timeline_data = await _fetch_timeline_with_observability(
+                self.riot_adapter,
+                task_payload.match_id,
+                task_payload.region,
+            )
         if timeline_data is None:
             result.error_stage = "fetch"
             result.error_message = "Failed to fetch MatchTimeline from Riot API"
             with suppress(Exception):
                 chimera_riot_api_requests_total.labels(endpoint="timeline", status="error").inc()
             return result.model_dump()
-        result.fetch_duration_ms = (time.perf_counter() - fetch_start) * 1000
+        result.fetch_duration_ms = timer.duration_ms("fetch")
 
         # ===== STAGE 2: Fetch Match Details =====
-        try:
-            match_details = await self.riot_adapter.get_match_details(
-                task_payload.match_id, task_payload.region
-            )
-        except Exception:
-            match_details = None
-        # Fallback: try cached match_data from DB if live details unavailable
-        if not match_details:
+        with timer.stage("details"):
             try:
-                await self.db_adapter.connect()
-                cached = await self.db_adapter.get_match_data(task_payload.match_id)
-                match_details = (cached or {}).get("match_data") if cached else None
+                match_details = await self.riot_adapter.get_match_details(
+                    task_payload.match_id, task_payload.region
+                )
             except Exception:
                 match_details = None
-            finally:
-                with suppress(Exception):
-                    await self.db_adapter.disconnect()
+            # Fallback: try cached match_data from DB if live details unavailable
+            if not match_details:
+                try:
+                    await self.db_adapter.connect()
+                    cached = await self.db_adapter.get_match_data(task_payload.match_id)
+                    match_details = (cached or {}).get("match_data") if cached else None
+                except Exception:
+                    match_details = None
+                finally:
+                    with suppress(Exception):
+                        await self.db_adapter.disconnect()
 
         # ===== STAGE 3: Execute V1 Scoring =====
-        scoring_start = time.perf_counter()
-        timeline = MatchTimeline(**timeline_data)
-        analysis_output = generate_llm_input(timeline, match_details)
-        result.scoring_duration_ms = (time.perf_counter() - scoring_start) * 1000
+        with timer.stage("scoring"):
+            timeline = MatchTimeline.from_trusted(timeline_data)
+            analysis_output = generate_llm_input(timeline, match_details)
+        result.scoring_duration_ms = timer.duration_ms("scoring")
 
         # ===== STAGE 4: Persist Results =====
-        save_start = time.perf_counter()
-        # If still no match_details, synthesize minimal structure to allow persistence & downstream rendering
-        if not match_details:
-            match_details = {
-                "metadata": {"matchId": task_payload.match_id},
-                "info": {"participants": []},
-            }
-        try:
-            await self.db_adapter.connect()
-            ok1 = await self.db_adapter.save_match_data(
-                task_payload.match_id,
-                match_details,
-                timeline_data,
-            )
-            if not ok1:
-                logger.warning("save_match_data degraded: proceeding without DB match_data upsert")
+        with timer.stage("save"):
+            # If still no match_details, synthesize minimal structure to allow persistence & downstream rendering
+            if not match_details:
+                match_details = {
+                    "metadata": {"matchId": task_payload.match_id},
+                    "info": {"participants": []},
+                }
+            try:
+                await self.db_adapter.connect()
+                ok1 = await self.db_adapter.save_match_data(
+                    task_payload.match_id,
+                    match_details,
+                    timeline_data,
+                )
+                if not ok1:
+                    logger.warning(
+                        "save_match_data degraded: proceeding without DB match_data upsert"
+                    )
 
-            ok2 = await _save_analysis_with_observability(
-                self.db_adapter,
-                task_payload.match_id,
-                task_payload.puuid,
-                analysis_output.model_dump(mode="json"),
-                task_payload.region,
-                result.scoring_duration_ms,
-            )
-            if not ok2:
-                result.error_stage = "save"
-                result.error_message = "Failed to save analysis result to database"
-                return result.model_dump()
-        finally:
-            with suppress(Exception):
-                await self.db_adapter.disconnect()
-        result.save_duration_ms = (time.perf_counter() - save_start) * 1000
+                ok2 = await _save_analysis_with_observability(
+                    self.db_adapter,
+                    task_payload.match_id,
+                    task_payload.puuid,
+                    analysis_output.model_dump(mode="json"),
+                    task_payload.region,
+                    result.scoring_duration_ms,
+                )
+                if not ok2:
+                    result.error_stage = "save"
+                    result.error_message = "Failed to save analysis result to database"
+                    return result.model_dump()
+            finally:
+                with suppress(Exception):
+                    await self.db_adapter.disconnect()
+        result.save_duration_ms = timer.duration_ms("save")
         result.score_data_saved = True
 
         # ===== Resolve target metadata =====
@@ -1173,13 +1242,14 @@ async def _run_analysis_workflow(
 
         # Champion asset URL (best-effort)
         if champion_id:
-            try:
-                async with DDragonAdapter() as ddrag:
-                    c = await ddrag.get_champion_by_id(champion_id)
-                    if c and c.get("image_url"):
-                        champion_assets_url = str(c["image_url"])
-            except Exception:
-                pass
+            with timer.stage("ddragon"):
+                try:
+                    async with DDragonAdapter() as ddrag:
+                        c = await ddrag.get_champion_by_id(champion_id)
+                        if c and c.get("image_url"):
+                            champion_assets_url = str(c["image_url"])
+                except Exception:
+                    pass
 
         # ===== Build V1 summary for view + emotion =====
         player_score = None
@@ -1268,6 +1338,8 @@ async def _run_analysis_workflow(
         # ===== Mode detection + Arena extras =====
         queue_id = match_details.get("info", {}).get("queueId", 420) if match_details else 420
         game_mode = detect_game_mode(queue_id)
+        timer.game_mode = game_mode.mode
+        enrich_start = time.perf_counter()
 
         # Enrich raw_stats for view & emotion & prompt grounding
         try:
@@ -1279,6 +1351,8 @@ async def _run_analysis_workflow(
             rs["queue_id"] = queue_id
             rs["game_mode"] = game_mode.mode
             rs["is_arena"] = game_mode.mode == "Arena"
+            # One columnar parse shared by the round/SR/teamfight extractors below
+            compact_timeline = CompactTimeline.coerce(timeline_data)
             if game_mode.mode == "Arena" and match_details and "info" in match_details:
                 t_parts = match_details["info"].get("participants", [])
                 t_p = next((p for p in t_parts if p.get("puuid") == task_payload.puuid), None)
@@ -1316,7 +1390,7 @@ async def _run_analysis_workflow(
 
                 # Rounds (best-effort)
                 try:
-                    rounds = detect_arena_rounds(timeline_data, task_payload.puuid)
+                    rounds = detect_arena_rounds(compact_timeline, task_payload.puuid)
                     rs["arena_rounds"] = [
                         {
                             "n": r.round_number,
@@ -1364,18 +1438,6 @@ async def _run_analysis_workflow(
                 except Exception:
                     pass
 
-            elif game_mode.mode == "SR" and participant_id is not None and match_details:
-                try:
-                    from src.core.services.sr_enrichment import extract_sr_enrichment
-
-                    sr_extra = extract_sr_enrichment(
-                        timeline_data, match_details, int(participant_id)
-                    )
-                    if sr_extra:
-                        rs["sr_enrichment"] = sr_extra
-                except Exception:
-                    pass
-
             # SR enrichment diagnostics + extraction
             sr_extract_error: str | None = None
             sr_extra: Mapping[str, Any] | None = None
@@ -1385,7 +1447,7 @@ async def _run_analysis_workflow(
                         from src.core.services.sr_enrichment import extract_sr_enrichment
 
                         sr_extra = extract_sr_enrichment(
-                            timeline_data, match_details, int(participant_id)
+                            compact_timeline, match_details, int(participant_id)
                         )
                         if sr_extra:
                             rs["sr_enrichment"] = sr_extra
@@ -1408,7 +1470,7 @@ async def _run_analysis_workflow(
                             extract_teamfight_summaries,
                         )
 
-                        tf_lines = extract_teamfight_summaries(timeline_data, match_details)
+                        tf_lines = extract_teamfight_summaries(compact_timeline, match_details)
                         if tf_lines:
                             rs.setdefault("sr_enrichment", {})["teamfight_paths"] = tf_lines
                     except Exception:
@@ -1443,6 +1505,7 @@ async def _run_analysis_workflow(
                         )
         except Exception:
             pass
+        timer.record("enrichment", enrich_start)
 
         # ===== STAGE 4: LLM Narrative =====
         tts_audio_url: str | None = None
@@ -1691,53 +1754,72 @@ async def _run_analysis_workflow(
                 base_llm_metadata["sanitized_context"] = sanitized_context_str
 
             persisted_llm_metadata: dict[str, Any] = dict(base_llm_metadata)
-
-            async def _save_metadata(meta: dict[str, Any]) -> None:
+            metadata_lock = asyncio.Lock()
+
+            async def _save_metadata(updates: dict[str, Any] | None = None) -> None:
+                # TTS precompute and the builds stage may persist concurrently:
+                # merge into one dict and write it (and use the DB adapter) under a lock
+                async with metadata_lock:
+                    if updates:
+                        persisted_llm_metadata.update(updates)
+                    try:
+                        await self.db_adapter.connect()
+                        await self.db_adapter.update_llm_narrative(
+                            match_id=task_payload.match_id,
+                            llm_narrative=narrative,
+                            llm_metadata=dict(persisted_llm_metadata),
+                        )
+                    finally:
+                        with suppress(Exception):
+                            await self.db_adapter.disconnect()
+
+            await _save_metadata()
+
+            result.llm_duration_ms = timer.record("llm", llm_start)
+
+            # ===== STAGE 4.5: TTS precompute (optional) =====
+            # Summary generation and synthesis/upload run as a sub-pipeline next to
+            # builds enrichment and the final webhook PATCH; voice requests arriving
+            # meanwhile wait on the pending marker instead of synthesizing again.
+            async def _precompute_tts() -> str | None:
+                tts_start = time.perf_counter()
+                tts_outcome: TtsSummaryOutcome | None = None
+                await mark_tts_pending(
+                    self.cache_adapter,
+                    task_payload.match_id,
+                    settings.tts_precompute_pending_ttl_seconds,
+                )
                 try:
-                    await self.db_adapter.connect()
-                    await self.db_adapter.update_llm_narrative(
-                        match_id=task_payload.match_id,
-                        llm_narrative=narrative,
-                        llm_metadata=meta,
+                    # Generate TTS-optimized summary (200-300 chars) to prevent timeout
+                    summary_start = time.perf_counter()
+                    tts_outcome = await _generate_tts_summary(
+                        self.llm_adapter,
+                        narrative,
+                        v1_summary,
+                        emotion,
+                        champion_name,
+                        (game_mode.mode if game_mode else None),
                     )
-                finally:
-                    with suppress(Exception):
-                        await self.db_adapter.disconnect()
-
-            await _save_metadata(persisted_llm_metadata)
+                    timer.record("tts_summary", summary_start)
 
-            result.llm_duration_ms = (time.perf_counter() - llm_start) * 1000
-
-            # ===== STAGE 4.5: TTS (optional) =====
-            tts_start = time.perf_counter()
-            tts_outcome: TtsSummaryOutcome | None = None
-            try:
-                # Generate TTS-optimized summary (200-300 chars) to prevent timeout
-                tts_outcome = await _generate_tts_summary(
-                    self.llm_adapter,
-                    narrative,
-                    v1_summary,
-                    emotion,
-                    champion_name,
-                    (game_mode.mode if game_mode else None),
-                )
+                    # Silent degradation: Skip TTS if summary generation failed
+                    if tts_outcome is None:
+                        logger.info(
+                            "TTS summary generation returned None, skipping TTS synthesis (silent degradation)"
+                        )
+                        return None
 
-                # Silent degradation: Skip TTS if summary generation failed
-                if tts_outcome is None:
-                    logger.info(
-                        "TTS summary generation returned None, skipping TTS synthesis (silent degradation)"
-                    )
-                    result.tts_duration_ms = (time.perf_counter() - tts_start) * 1000
-                else:
                     tts_text = tts_outcome.text
                     tts_options = dict(emotion_profile or {})
                     tts_options["match_id"] = task_payload.match_id
-                    tts_audio_url = await _synthesize_tts_with_observability(
+                    synthesis_start = time.perf_counter()
+                    audio_url = await _synthesize_tts_with_observability(
                         self.tts_adapter,
                         tts_text,
                         emotion,
                         tts_options,
                     )
+                    timer.record("tts_synthesis", synthesis_start)
                     metadata_debug = {
                         key: value
                         for key, value in {
@@ -1759,58 +1841,52 @@ async def _run_analysis_workflow(
                         metadata_debug["tts_speed_ratio"] = round(voice_settings.speed_ratio, 3)
                         metadata_debug["tts_pitch_ratio"] = round(voice_settings.pitch_ratio, 3)
                         metadata_debug["tts_volume_ratio"] = round(voice_settings.volume_ratio, 3)
-                    if tts_audio_url:
-                        persisted_llm_metadata = {
-                            **persisted_llm_metadata,
-                            "tts_audio_url": tts_audio_url,
-                            **metadata_debug,
-                        }
-                        await _save_metadata(persisted_llm_metadata)
-                        logger.info(f"TTS synthesis succeeded: {tts_audio_url}")
+                    if audio_url:
+                        await _save_metadata({"tts_audio_url": audio_url, **metadata_debug})
+                        logger.info(f"TTS synthesis succeeded: {audio_url}")
                     else:
                         logger.info("TTS synthesis returned None (graceful degradation)")
-                        persisted_llm_metadata = {
-                            **persisted_llm_metadata,
-                            **metadata_debug,
+                        await _save_metadata(metadata_debug)
+                    return audio_url
+                except TTSError as e:
+                    logger.warning(f"TTS synthesis failed (degraded): {e}", exc_info=True)
+                    if tts_outcome:
+                        updates: dict[str, Any] = {
+                            "tts_summary": tts_outcome.text,
+                            "tts_summary_source": tts_outcome.source,
                         }
-                        await _save_metadata(persisted_llm_metadata)
-                    result.tts_duration_ms = (time.perf_counter() - tts_start) * 1000
-            except TTSError as e:
-                logger.warning(f"TTS synthesis failed (degraded): {e}", exc_info=True)
-                if tts_outcome:
-                    persisted_llm_metadata = {
-                        **persisted_llm_metadata,
-                        "tts_summary": tts_outcome.text,
-                        "tts_summary_source": tts_outcome.source,
-                    }
-                    if tts_outcome.soft_hints:
-                        persisted_llm_metadata["tts_summary_soft_hints"] = list(
-                            tts_outcome.soft_hints
-                        )
-                    await _save_metadata(persisted_llm_metadata)
-                result.tts_duration_ms = (time.perf_counter() - tts_start) * 1000
-            except Exception as e:
-                # Generic exception handler for any TTS-related failures
-                # (e.g., LLM API errors, network timeouts, unexpected ValueError)
-                logger.warning(
-                    "TTS stage failed with unhandled exception (graceful degradation)",
-                    exc_info=True,
-                    extra={"error": str(e), "error_type": type(e).__name__},
-                )
-                if tts_outcome:
-                    persisted_llm_metadata = {
-                        **persisted_llm_metadata,
-                        "tts_summary": tts_outcome.text,
-                        "tts_summary_source": tts_outcome.source,
-                        "tts_error": str(e),
-                        "tts_error_type": type(e).__name__,
-                    }
-                    if tts_outcome.soft_hints:
-                        persisted_llm_metadata["tts_summary_soft_hints"] = list(
-                            tts_outcome.soft_hints
-                        )
-                    await _save_metadata(persisted_llm_metadata)
-                result.tts_duration_ms = (time.perf_counter() - tts_start) * 1000
+                        if tts_outcome.soft_hints:
+                            updates["tts_summary_soft_hints"] = list(tts_outcome.soft_hints)
+                        await _save_metadata(updates)
+                    return None
+                except Exception as e:
+                    # Generic exception handler for any TTS-related failures
+                    # (e.g., LLM API errors, network timeouts, unexpected ValueError)
+                    logger.warning(
+                        "TTS stage failed with unhandled exception (graceful degradation)",
+                        exc_info=True,
+                        extra={"error": str(e), "error_type": type(e).__name__},
+                    )
+                    if tts_outcome:
+                        updates = {
+                            "tts_summary": tts_outcome.text,
+                            "tts_summary_source": tts_outcome.source,
+                            "tts_error": str(e),
+                            "tts_error_type": type(e).__name__,
+                        }
+                        if tts_outcome.soft_hints:
+                            updates["tts_summary_soft_hints"] = list(tts_outcome.soft_hints)
+                        with suppress(Exception):
+                            await _save_metadata(updates)
+                    return None
+                finally:
+                    result.tts_duration_ms = timer.record("tts", tts_start)
+                    # Lazy synthesis in the voice paths takes over if no URL was saved
+                    await clear_tts_pending(self.cache_adapter, task_payload.match_id)
+
+            tts_task = asyncio.create_task(_precompute_tts())
+            if not settings.tts_precompute_parallel:
+                tts_audio_url = await tts_task
 
         except GeminiAPIError as e:
             logger.error(
@@ -1879,6 +1955,7 @@ async def _run_analysis_workflow(
 
             builds_summary_text: str | None = None
             builds_metadata: dict[str, Any] | None = None
+            builds_start = time.perf_counter()
             try:
                 env_flag = str(_os.getenv("CHIMERA_TEAM_BUILD_ENRICH", "")).strip().lower()
                 feature_enabled = (
@@ -1930,15 +2007,16 @@ async def _run_analysis_workflow(
                     },
                 )
 
+            timer.record("builds", builds_start)
+
             if builds_summary_text or builds_metadata:
-                updated_meta: dict[str, Any] = dict(persisted_llm_metadata)
+                updated_meta: dict[str, Any] = {}
                 if builds_summary_text:
                     updated_meta["builds_summary_text"] = builds_summary_text
                 if builds_metadata:
                     updated_meta["builds_metadata"] = builds_metadata
                 # Persist once to expose在缓存命中/语音播放场景下的出装数据
-                persisted_llm_metadata = updated_meta
-                await _save_metadata(persisted_llm_metadata)
+                await _save_metadata(updated_meta)
 
             report = FinalAnalysisReport(
                 match_id=task_payload.match_id,
@@ -1952,18 +2030,31 @@ async def _run_analysis_workflow(
                 champion_assets_url=champion_assets_url,
                 processing_duration_ms=processing_duration_ms,
                 algorithm_version=algorithm_version,
-                tts_audio_url=locals().get("tts_audio_url", None),
+                tts_audio_url=tts_audio_url,
                 trace_task_id=str(getattr(self.request, "id", "") or ""),
                 builds_summary_text=builds_summary_text,
                 builds_metadata=builds_metadata,
             )
 
+            # Render once: the same message is sent now and replayed on cache hits
+            rendered: RenderedDiscordMessage | None = None
+            try:
+                rendered = self.webhook_adapter.render_match_analysis(report)
+                await RenderedMessageCache(self.cache_adapter).put(rendered)
+            except Exception as render_err:
+                logger.warning(
+                    "rendered_message_cache_skipped",
+                    extra={"match_id": task_payload.match_id, "error": str(render_err)},
+                )
+
+            webhook_start = time.perf_counter()
             webhook_success = await _send_final_report_webhook(
                 self.webhook_adapter,
                 task_payload.application_id,
                 task_payload.interaction_token,
                 report,
                 task_payload.channel_id,
+                rendered,
             )
             if not webhook_success:
                 result.error_stage = "webhook"
@@ -1971,7 +2062,43 @@ async def _run_analysis_workflow(
                 result.webhook_delivered = False
             else:
                 result.webhook_delivered = True
-            result.webhook_duration_ms = (time.perf_counter() - webhook_start) * 1000
+            result.webhook_duration_ms = timer.record("webhook", webhook_start)
+
+            # Join the TTS precompute; any remaining wait is all it still adds to the path
+            if tts_task is not None and not tts_audio_url:
+                join_start = time.perf_counter()
+                tts_audio_url = await tts_task
+                result.tts_join_wait_ms = timer.record("tts_join", join_start)
+                logger.info(
+                    "tts_precompute_joined",
+                    extra={
+                        "match_id": task_payload.match_id,
+                        "tts_ms": result.tts_duration_ms,
+                        "join_wait_ms": result.tts_join_wait_ms,
+                        "ready": bool(tts_audio_url),
+                    },
+                )
+                if tts_audio_url and rendered is not None:
+                    # Cache replays should carry the audio the live message got too late for
+                    with suppress(Exception):
+                        report = report.model_copy(update={"tts_audio_url": tts_audio_url})
+                        rendered = self.webhook_adapter.render_match_analysis(report)
+                        await RenderedMessageCache(self.cache_adapter).put(rendered)
+                    # Edit the "🔊 语音播报" field into the live message while the token
+                    # is valid. A queued first PATCH may still land after this edit and
+                    # overwrite it, so only inline deliveries are re-sent.
+                    if result.webhook_delivered and not settings.discord_webhook_queue_enabled:
+                        repatched = False
+                        with suppress(Exception):
+                            repatched = await self.webhook_adapter.publish_rendered_message(
+                                task_payload.application_id,
+                                task_payload.interaction_token,
+                                rendered,
+                            )
+                        logger.info(
+                            "tts_precompute_repatched",
+                            extra={"match_id": task_payload.match_id, "success": repatched},
+                        )
 
             # Auto TTS playback (single-match) using broadcast service
             if (
@@ -1992,9 +2119,12 @@ async def _run_analysis_workflow(
                     try:
                         from aiohttp import ClientSession
 
-                        server = getattr(
-                            settings, "broadcast_server_url", "http://localhost:8080"
-                        ).rstrip("/")
+                        from src.core.services.shard_routing import ShardRouter
+
+                        # Straight to the bot process that owns the guild's shard
+                        server = ShardRouter.from_settings(settings).broadcast_base_url(
+                            guild_id_int
+                        )
                         broadcast_url = f"{server}/broadcast"
                         headers = {"Content-Type": "application/json"}
                         if settings.broadcast_webhook_secret:
@@ -2004,12 +2134,21 @@ async def _run_analysis_workflow(
                             "guild_id": guild_id_int,
                             "user_id": user_id_int,
                         }
-                        async with (
-                            ClientSession() as session,
-                            session.post(broadcast_url, json=payload, headers=headers) as resp,
-                        ):
-                            await resp.text()
-                            status = resp.status
+                        if settings.voice_broadcast_stream_enabled:
+                            from src.adapters.voice_broadcast_stream import (
+                                publish_voice_broadcast,
+                            )
+
+                            # Queued for the owning bot process; no HTTP request held open
+                            await publish_voice_broadcast(payload)
+                            status = 202
+                        else:
+                            async with (
+                                ClientSession() as session,
+                                session.post(broadcast_url, json=payload, headers=headers) as resp,
+                            ):
+                                await resp.text()
+                                status = resp.status
                         logger.info(
                             f"match_auto_tts_triggered http_status={status}",
                             extra={
@@ -2026,33 +2165,28 @@ async def _run_analysis_workflow(
             result.error_stage = "webhook"
             result.error_message = f"Webhook error: {e}"
             result.webhook_delivered = False
-            result.webhook_duration_ms = (time.perf_counter() - webhook_start) * 1000
+            result.webhook_duration_ms = timer.record("webhook", webhook_start)
             with suppress(Exception):
                 chimera_external_api_errors_total.labels("discord", "webhook_error").inc()
 
-        # ===== SUCCESS =====
-        try:
-            await self.db_adapter.connect()
-            await self.db_adapter.update_analysis_status(
-                task_payload.match_id, status="completed", error_message=None
-            )
-        finally:
+        # Webhook errors skip the join above; let the synthesis finish and persist
+        if tts_task is not None and not tts_task.done():
             with suppress(Exception):
-                await self.db_adapter.disconnect()
+                await tts_task
+
+        # ===== SUCCESS =====
+        with timer.stage("finalize"):
+            try:
+                await self.db_adapter.connect()
+                await self.db_adapter.update_analysis_status(
+                    task_payload.match_id, status="completed", error_message=None
+                )
+            finally:
+                with suppress(Exception):
+                    await self.db_adapter.disconnect()
 
         result.success = True
         result.total_duration_ms = (time.perf_counter() - task_start) * 1000
-        observe_analyze_e2e(
-            total_ms=result.total_duration_ms,
-            stages_ms={
-                "fetch": result.fetch_duration_ms,
-                "score": result.scoring_duration_ms,
-                "save": result.save_duration_ms,
-                "llm": result.llm_duration_ms,
-                "webhook": result.webhook_duration_ms,
-                "tts": result.tts_duration_ms,
-            },
-        )
         mark_request_outcome("analyze", "success")
         observe_request_latency("analyze", result.total_duration_ms / 1000.0)
         return result.model_dump()
@@ -2085,6 +2219,11 @@ async def _run_analysis_workflow(
         mark_request_outcome("analyze", "failed")
         return result.model_dump()
     finally:
+        # Failures after the precompute started skip the join: let it finish (and clear
+        # its pending marker) before the caller closes storage and the loop
+        if tts_task is not None and not tts_task.done():
+            with suppress(Exception):
+                await tts_task
         # Ensure correlation id does not leak across tasks
         with suppress(Exception):
             _release_match_slot(task_payload.match_id)
@@ -2889,6 +3028,7 @@ async def _send_final_report_webhook(
     interaction_token: str,
     report: FinalAnalysisReport,
     channel_id: str | None,
+    rendered: RenderedDiscordMessage | None = None,
 ) -> bool:
     """Send FinalAnalysisReport via webhook (P5 contract)."""
     return await webhook_adapter.publish_match_analysis(
@@ -2896,6 +3036,7 @@ async def _send_final_report_webhook(
         interaction_token=interaction_token,
         analysis_report=report,
         channel_id=channel_id,
+        rendered=rendered,
     )
 
 
@@ -5,12 +5,23 @@ sets up task autodiscovery, and defines worker configuration.
 """
 
 import logging
+import time
+from typing import Any
 
 from celery import Celery
-from celery.signals import after_task_publish, task_prerun, task_postrun, task_failure
+from celery.signals import (
+    after_task_publish,
+    before_task_publish,
+    task_failure,
+    task_postrun,
+    task_prerun,
+    worker_process_shutdown,
+)
 
 from src.config.settings import settings
+from src.core.metrics import mark_process_dead, observe_queue_wait
 from src.core.observability import configure_stdlib_json_logging
+from src.core.profiling import start_task_profile, stop_task_profile
 import contextlib
 
 logger = logging.getLogger(__name__)
@@ -46,6 +57,8 @@ celery_app.conf.update(
         # Route analysis/AI heavy tasks to dedicated queue for isolation
         "src.tasks.analysis_tasks.*": {"queue": "ai"},
         "src.tasks.team_tasks.*": {"queue": "ai"},
+        # Discord deliveries never wait behind LLM work
+        "src.tasks.webhook_tasks.*": {"queue": "webhooks"},
     },
     # Task tracking
     task_track_started=True,
@@ -89,6 +102,32 @@ def _extract_kwargs_from_body(body: object) -> dict:
     return {}
 
 
+# Message header carrying the publish wall-clock time (epoch seconds).
+# Workers use it to derive queue wait (publish → start) in task_prerun.
+PUBLISHED_AT_HEADER = "chimera_published_at"
+
+
+def _published_at(task: object) -> float | None:
+    """Read the publish timestamp stamped by _stamp_publish_time, if any."""
+    request = getattr(task, "request", None)
+    if request is None:
+        return None
+    raw = getattr(request, PUBLISHED_AT_HEADER, None)
+    if raw is None:
+        raw = (getattr(request, "headers", None) or {}).get(PUBLISHED_AT_HEADER)
+    try:
+        return float(raw) if raw is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+@before_task_publish.connect  # type: ignore[untyped-decorator]
+def _stamp_publish_time(headers: dict[str, Any] | None = None, **_: Any) -> None:
+    with contextlib.suppress(Exception):
+        if headers is not None:
+            headers.setdefault(PUBLISHED_AT_HEADER, time.time())
+
+
 @after_task_publish.connect
 def _on_task_published(
     sender=None, body=None, exchange=None, routing_key=None, headers=None, **kwargs
@@ -116,20 +155,35 @@ def _on_task_published(
 def _on_task_prerun(task=None, task_id=None, args=None, kwargs=None, **_):
     try:
         correlation_id = (kwargs or {}).get("correlation_id")
+        queue_wait_ms: float | None = None
+        published_at = _published_at(task)
+        if published_at is not None:
+            wait_s = max(0.0, time.time() - published_at)
+            queue_wait_ms = wait_s * 1000
+            observe_queue_wait(str(getattr(task, "name", "unknown")), wait_s)
+            # Expose to the task body so results can carry it in their stage breakdown
+            task.request.chimera_queue_wait_ms = queue_wait_ms
         logger.info(
             "celery_task_started",
             extra={
                 "task_id": task_id,
                 "task_name": getattr(task, "name", None),
                 "correlation_id": correlation_id,
+                "queue_wait_ms": queue_wait_ms,
             },
         )
     except Exception:
         pass
+    with contextlib.suppress(Exception):
+        if task_id:
+            start_task_profile(str(getattr(task, "name", "unknown")), task_id)
 
 
 @task_postrun.connect
 def _on_task_postrun(task=None, task_id=None, retval=None, state=None, **_):
+    with contextlib.suppress(Exception):
+        if task_id:
+            stop_task_profile(str(getattr(task, "name", "unknown")), task_id)
     with contextlib.suppress(Exception):
         logger.info(
             "celery_task_finished",
@@ -161,3 +215,11 @@ def _on_task_failure(
                 "error": str(exception) if exception else None,
             },
         )
+
+
+@worker_process_shutdown.connect  # type: ignore[untyped-decorator]
+def _release_metrics_files(pid: int | None = None, **_: Any) -> None:
+    """Let the multiprocess collector drop live gauges of an exiting pool child."""
+    import os
+
+    mark_process_dead(pid or os.getpid())
@@ -22,6 +22,7 @@ import json
 import logging
 import os
 import time
+from collections.abc import Mapping
 from typing import Any, Literal
 
 from celery import Task
@@ -29,6 +30,7 @@ from pydantic import ValidationError
 
 from src.adapters.database import DatabaseAdapter
 from src.adapters.gemini_llm import GeminiLLMAdapter
+from src.adapters.object_storage import close_object_storage
 from src.adapters.riot_api import RateLimitError, RiotAPIAdapter, RiotAPIError
 from src.config.settings import settings
 from src.contracts.timeline import MatchTimeline
@@ -38,7 +40,12 @@ from src.core.domain.team_policies import (
     should_run_team_full_token,
     tldr_contains_hallucination,
 )
-from src.core.observability import clear_correlation_id, llm_debug_wrapper, set_correlation_id
+from src.core.observability import (
+    StageTimer,
+    clear_correlation_id,
+    llm_debug_wrapper,
+    set_correlation_id,
+)
 
 # 测试健壮性：在缺少科学计算依赖（如numpy）时，延迟/宽容导入
 try:
@@ -51,13 +58,17 @@ except Exception:  # pragma: no cover - 测试环境可跳过重计算
 
 from src.core.metrics import (
     mark_request_outcome,
+    observe_analyze_e2e,
     observe_request_latency,
 )
 from src.core.services.ab_testing import PromptSelectorService
-from src.core.services.timeline_evidence_extractor import extract_timeline_evidence
+from src.core.services.timeline_evidence_extractor import (
+    extract_timeline_evidence_for_participants,
+)
 from src.core.services.user_profile_service import UserProfileService
 from src.prompts.v2_team_relative_prompt import V2_TEAM_RELATIVE_SYSTEM_PROMPT
 from src.tasks.celery_app import celery_app
+from src.tasks.webhook_tasks import make_webhook_adapter
 
 logger = logging.getLogger(__name__)
 
@@ -291,6 +302,7 @@ def analyze_team_task(
         Dict with processing metrics and outcome flags
     """
     started = time.perf_counter()
+    timer = StageTimer("team_analyze", origin=started)
     metrics: dict[str, Any] = {"success": False, "match_id": match_id}
     # Align parameter naming with payload contract (puuid) while
     # keeping internal variable name requester_puuid for clarity.
@@ -310,18 +322,21 @@ def analyze_team_task(
         # Connect DB if not connected
         loop.run_until_complete(self.db.connect())
 
-        match_details = loop.run_until_complete(self.riot.get_match_details(match_id, region))
+        with timer.stage("fetch_details"):
+            match_details = loop.run_until_complete(self.riot.get_match_details(match_id, region))
         if not match_details:
             metrics.update({"error_stage": "fetch_match", "error": "match_details_none"})
             return metrics
 
-        timeline = loop.run_until_complete(self.riot.get_match_timeline(match_id, region))
+        with timer.stage("fetch_timeline"):
+            timeline = loop.run_until_complete(self.riot.get_match_timeline(match_id, region))
         if not timeline:
             metrics.update({"error_stage": "fetch_timeline", "error": "timeline_none"})
             return metrics
 
         # Persist raw match + timeline
-        loop.run_until_complete(self.db.save_match_data(match_id, match_details, timeline))
+        with timer.stage("save_match"):
+            loop.run_until_complete(self.db.save_match_data(match_id, match_details, timeline))
 
         # ===== V2.3 Game Mode Detection & Strategy Selection =====
         # Detect game mode for by-mode monitoring and strategy routing
@@ -339,6 +354,7 @@ def analyze_team_task(
             # Early unification using both sources
             resolved_label = _resolve_mode_label_by_sources(qid, raw_gamemode, participants_len)
             metrics["game_mode"] = resolved_label
+            timer.game_mode = resolved_label
 
             # Get appropriate strategy with factory double-guard (queueId + gameMode + participants)
             factory = AnalysisStrategyFactory()
@@ -372,7 +388,9 @@ def analyze_team_task(
             strategy = FallbackStrategy()
 
         # ===== V2.1 Timeline Evidence Extraction (feature-flagged) =====
+        # One event index serves the whole lobby; the TL;DR stage reuses it below
         timeline_evidence: V2_1_TimelineEvidence | None = None
+        lobby_evidence: dict[int, V2_1_TimelineEvidence] = {}
         if settings.feature_v21_prescriptive_enabled:
             try:
                 # Determine target participant ID (1-10 in Riot API)
@@ -383,11 +401,11 @@ def analyze_team_task(
                 if target_participant:
                     target_participant_id = target_participant.get("participantId", 0)
                     if target_participant_id > 0:
-                        timeline_evidence = extract_timeline_evidence(
-                            timeline_data=timeline,
-                            target_participant_id=target_participant_id,
-                            match_id=match_id,
-                        )
+                        with timer.stage("evidence"):
+                            lobby_evidence = extract_timeline_evidence_for_participants(
+                                timeline, match_id
+                            )
+                        timeline_evidence = lobby_evidence[target_participant_id]
                         logger.info(
                             "v2.1_evidence_extracted",
                             extra={
@@ -410,12 +428,13 @@ def analyze_team_task(
         if settings.feature_v22_personalization_enabled:
             try:
                 profile_service = UserProfileService(db_adapter=self.db)
-                user_profile = loop.run_until_complete(
-                    profile_service.get_or_create_profile(
-                        discord_user_id=discord_user_id,
-                        puuid=requester_puuid,
+                with timer.stage("profile"):
+                    user_profile = loop.run_until_complete(
+                        profile_service.get_or_create_profile(
+                            discord_user_id=discord_user_id,
+                            puuid=requester_puuid,
+                        )
                     )
-                )
                 # Generate simple user context for V2 prompt injection
                 user_profile_context = _generate_user_profile_context(user_profile)
                 logger.info(
@@ -435,29 +454,31 @@ def analyze_team_task(
 
         # ===== V2.3 Strategy-Based Analysis (Multi-Mode Support) =====
         # Execute mode-specific analysis using Strategy Pattern
-        strategy_result = loop.run_until_complete(
-            strategy.execute_analysis(
-                match_data=match_details,
-                timeline_data=timeline,
-                requester_puuid=requester_puuid,
-                discord_user_id=discord_user_id,
-                user_profile_context=user_profile_context,
-                timeline_evidence=timeline_evidence,
+        with timer.stage("strategy"):
+            strategy_result = loop.run_until_complete(
+                strategy.execute_analysis(
+                    match_data=match_details,
+                    timeline_data=timeline,
+                    requester_puuid=requester_puuid,
+                    discord_user_id=discord_user_id,
+                    user_profile_context=user_profile_context,
+                    timeline_evidence=timeline_evidence,
+                )
             )
-        )
         metrics.update(strategy_result["metrics"])
 
         # Upsert processed score_data as one JSONB blob per match
-        loop.run_until_complete(
-            self.db.save_analysis_result(
-                match_id=match_id,
-                puuid=requester_puuid,  # anchor row by requester
-                score_data=strategy_result["score_data"],
-                region=region,
-                status="completed",
-                processing_duration_ms=None,
+        with timer.stage("save_analysis"):
+            loop.run_until_complete(
+                self.db.save_analysis_result(
+                    match_id=match_id,
+                    puuid=requester_puuid,  # anchor row by requester
+                    score_data=strategy_result["score_data"],
+                    region=region,
+                    status="completed",
+                    processing_duration_ms=None,
+                )
             )
-        )
 
         metrics["participants"] = len(match_details.get("info", {}).get("participants", []))
         metrics["success"] = True
@@ -465,24 +486,23 @@ def analyze_team_task(
         # ===== V2.4 P0 Fix: Webhook Delivery =====
         # Deliver TEAM overview as the main message (distinct from single-player view)
         try:
-            from src.adapters.discord_webhook import DiscordWebhookAdapter
-
-            # Build TeamAnalysisReport for TEAM-first UI
-            team_report = asyncio.get_event_loop().run_until_complete(
-                _build_team_overview_report(
-                    match_details=match_details,
-                    timeline_data=timeline,
-                    requester_puuid=requester_puuid,
-                    region=region,
-                    resolved_game_mode=metrics.get("game_mode"),
-                    arena_score_data=(
-                        strategy_result.get("score_data")
-                        if metrics.get("game_mode") == "arena"
-                        else None
-                    ),
-                    workflow_metrics=metrics,
+            # Build TeamAnalysisReport for TEAM-first UI (DDragon, builds, visuals)
+            with timer.stage("report_build"):
+                team_report = asyncio.get_event_loop().run_until_complete(
+                    _build_team_overview_report(
+                        match_details=match_details,
+                        timeline_data=timeline,
+                        requester_puuid=requester_puuid,
+                        region=region,
+                        resolved_game_mode=metrics.get("game_mode"),
+                        arena_score_data=(
+                            strategy_result.get("score_data")
+                            if metrics.get("game_mode") == "arena"
+                            else None
+                        ),
+                        workflow_metrics=metrics,
+                    )
                 )
-            )
             # Attach Celery task id for observability (footer trace)
             with contextlib.suppress(Exception):
                 team_report.trace_task_id = str(getattr(self.request, "id", "") or "")
@@ -491,11 +511,13 @@ def analyze_team_task(
             # Skip for Arena - Arena有专门的双人分析，不走Team TLDR
             if metrics.get("game_mode") != "arena":
                 try:
-                    ft = _run_full_token_team_analysis(
-                        match_details=match_details,
-                        timeline_data=timeline,
-                        requester_puuid=requester_puuid,
-                    )
+                    with timer.stage("llm_tldr"):
+                        ft = _run_full_token_team_analysis(
+                            match_details=match_details,
+                            timeline_data=timeline,
+                            requester_puuid=requester_puuid,
+                            timeline_evidence=lobby_evidence,
+                        )
                     # Prefer TL;DR when available; otherwise fall back to compressed narrative
                     summary = (ft.get("tldr") or ft.get("ai_narrative_text") or "").strip()
                     if summary:
@@ -514,9 +536,10 @@ def analyze_team_task(
                                 from src.adapters.gemini_llm import GeminiLLMAdapter
 
                                 llm_for_tts = GeminiLLMAdapter()
-                                tts_summary = loop.run_until_complete(
-                                    _generate_team_tts_summary(llm_for_tts, summary)
-                                )
+                                with timer.stage("tts_summary"):
+                                    tts_summary = loop.run_until_complete(
+                                        _generate_team_tts_summary(llm_for_tts, summary)
+                                    )
                                 logger.info(
                                     "team_tts_summary_generated_for_storage",
                                     extra={
@@ -647,7 +670,8 @@ def analyze_team_task(
 
                 # Use raw Riot timeline/detail
                 if team_report.game_mode == "summoners_rift":
-                    tf_lines = extract_teamfight_summaries(timeline, match_details)
+                    with timer.stage("teamfights"):
+                        tf_lines = extract_teamfight_summaries(timeline, match_details)
                     if tf_lines:
                         tf_line = f"• 团战: {tf_lines[0]}"
                         if getattr(team_report, "summary_text", None):
@@ -658,15 +682,16 @@ def analyze_team_task(
             except Exception:
                 pass
 
-            webhook_adapter = DiscordWebhookAdapter()
-            webhook_success = loop.run_until_complete(
-                webhook_adapter.publish_team_overview(
-                    application_id=application_id,
-                    interaction_token=interaction_token,
-                    team_report=team_report,
-                    channel_id=channel_id,
+            webhook_adapter = make_webhook_adapter()
+            with timer.stage("webhook"):
+                webhook_success = loop.run_until_complete(
+                    webhook_adapter.publish_team_overview(
+                        application_id=application_id,
+                        interaction_token=interaction_token,
+                        team_report=team_report,
+                        channel_id=channel_id,
+                    )
                 )
-            )
             loop.run_until_complete(webhook_adapter.close())
 
             metrics["webhook_delivered"] = webhook_success
@@ -706,9 +731,10 @@ def analyze_team_task(
             ):
                 from aiohttp import ClientSession
 
-                server = getattr(settings, "broadcast_server_url", "http://localhost:8080").rstrip(
-                    "/"
-                )
+                from src.core.services.shard_routing import ShardRouter
+
+                # Straight to the bot process that owns the guild's shard
+                server = ShardRouter.from_settings(settings).broadcast_base_url(int(guild_id))
                 url = f"{server}/broadcast"
                 headers = {"Content-Type": "application/json"}
                 if settings.broadcast_webhook_secret:
@@ -720,12 +746,19 @@ def analyze_team_task(
                 }
 
                 async def _post():
+                    if settings.voice_broadcast_stream_enabled:
+                        from src.adapters.voice_broadcast_stream import publish_voice_broadcast
+
+                        # Queued for the owning bot process; no HTTP request held open
+                        await publish_voice_broadcast(payload)
+                        return 202
                     async with ClientSession() as sess:
                         async with sess.post(url, json=payload, headers=headers) as resp:
                             _ = await resp.text()
                             return resp.status
 
-                status = loop.run_until_complete(_post())
+                with timer.stage("auto_tts"):
+                    status = loop.run_until_complete(_post())
                 # Log http_status inside message for environments that don't render `extra` fields.
                 logger.info(
                     f"team_auto_tts_triggered http_status={status}",
@@ -784,11 +817,20 @@ def analyze_team_task(
         # Preserve earlier computed duration if present; otherwise compute now
         if "duration_ms" not in metrics:
             metrics["duration_ms"] = (time.perf_counter() - started) * 1000
+        # Stage breakdown: histograms + compact waterfall on the returned metrics
+        with contextlib.suppress(Exception):
+            observe_analyze_e2e(
+                timer.elapsed_ms(), timer.stage_totals_ms(), timer.game_mode, timer.pipeline
+            )
+            metrics["stage_waterfall"] = timer.waterfall()
+            metrics["queue_wait_ms"] = getattr(self.request, "chimera_queue_wait_ms", None)
         # Ensure network sessions are closed and loop cleaned up to avoid cross-loop reuse
         with contextlib.suppress(Exception):
             loop.run_until_complete(self.riot.close())
         with contextlib.suppress(Exception):
             loop.run_until_complete(self.db.disconnect())
+        with contextlib.suppress(Exception):
+            loop.run_until_complete(close_object_storage())
         with contextlib.suppress(Exception):
             loop.close()
 
@@ -812,7 +854,7 @@ def analyze_team_task(
                     workflow_metrics=metrics,
                 )
             )
-            webhook_adapter = DiscordWebhookAdapter()
+            webhook_adapter = make_webhook_adapter()
             webhook_success = loop.run_until_complete(
                 webhook_adapter.publish_team_overview(
                     application_id=application_id,
@@ -1166,12 +1208,14 @@ def _run_full_token_team_analysis(
     match_details: dict[str, Any],
     timeline_data: dict[str, Any],
     requester_puuid: str,
+    timeline_evidence: Mapping[int, V2_1_TimelineEvidence] | None = None,
 ) -> dict[str, Any]:
     """Build a full-token team context and ask LLM to generate a team-relative narrative.
 
     Returns a score_data-like dict with keys compatible to _build_final_analysis_report
     (ai_narrative_text, llm_sentiment_tag optional, team_summary optional), while raw_stats
-    will be constructed downstream from match_details.
+    will be constructed downstream from match_details. `timeline_evidence` is the lobby's
+    evidence by participant id, when the caller already extracted it.
     """
     from src.adapters.gemini_llm import GeminiLLMAdapter
     from src.core.scoring import generate_llm_input
@@ -1179,7 +1223,7 @@ def _run_full_token_team_analysis(
     from src.prompts.v2_team_full_token_prompt import TEAM_FULL_TOKEN_SYSTEM_PROMPT
 
     # Build V1-allplayers scores from timeline
-    analysis_output = generate_llm_input(MatchTimeline(**timeline_data))
+    analysis_output = generate_llm_input(MatchTimeline.from_trusted(timeline_data))
     analysis_output.model_dump(mode="json")
 
     # Build per-player compact dict (10 players)
@@ -1519,7 +1563,8 @@ def _run_full_token_team_analysis(
     # Stage 2: Key-events focus (V2.1 evidence → 2-3 行关键片段)
     try:
         evidence = (
-            extract_timeline_evidence(timeline_data, target_pid, full_payload["match_id"])
+            (timeline_evidence or {}).get(target_pid)
+            or extract_timeline_evidence(timeline_data, target_pid, full_payload["match_id"])
             if target_pid
             else None
         )
@@ -2088,7 +2133,7 @@ def _build_final_analysis_report(
                     from src.core.scoring.calculator import generate_llm_input
 
                     ao_all = generate_llm_input(
-                        MatchTimeline(**timeline_data), match_details=match_data
+                        MatchTimeline.from_trusted(timeline_data), match_details=match_data
                     )
                     idx = {int(ps.participant_id): ps for ps in ao_all.player_scores}
                     for p in team_parts:
@@ -2401,7 +2446,7 @@ async def _build_team_overview_report(
     gm_label: Literal["summoners_rift", "aram", "arena", "unknown"] = gm_label_str  # type: ignore[assignment]
 
     # Scores for 10 players (SR path). For Arena this may be partial (1..10)
-    ao = generate_llm_input(MatchTimeline(**timeline_data), match_details=match_details)
+    ao = generate_llm_input(MatchTimeline.from_trusted(timeline_data), match_details=match_details)
     idx = {int(ps.participant_id): ps for ps in ao.player_scores}
 
     # Helper: normalize role to contract literal
@@ -3045,7 +3090,6 @@ def _send_error_webhook(
         channel_id: Discord channel ID (optional, for webhook fallback)
     """
     try:
-        from src.adapters.discord_webhook import DiscordWebhookAdapter
         from src.contracts.analysis_results import AnalysisErrorReport
 
         error_report = AnalysisErrorReport(
@@ -3055,7 +3099,7 @@ def _send_error_webhook(
             retry_suggested=True,
         )
 
-        webhook_adapter = DiscordWebhookAdapter()
+        webhook_adapter = make_webhook_adapter()
         loop.run_until_complete(
             webhook_adapter.send_error_notification(
                 application_id=application_id,
@@ -0,0 +1,99 @@
+"""Discord webhook delivery tasks.
+
+Analysis workers render their interaction response, enqueue it here and return
+instead of blocking on Discord. Deliveries run on the dedicated `webhooks`
+queue: each request waits for its rate-limit bucket, short back-offs are
+absorbed in-process and longer ones reschedule the task (with jitter) until the
+interaction token's 15-minute window closes. Deliveries still pending then are
+posted to the channel with the bot token instead.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from datetime import UTC, datetime
+from typing import Any
+
+from src.adapters.discord_webhook import DiscordRetryableError, DiscordWebhookAdapter
+from src.config.settings import settings
+from src.contracts.tasks import TASK_DELIVER_WEBHOOK, WebhookDeliveryPayload
+from src.core.metrics import observe_discord_delivery
+from src.tasks.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_webhook_delivery(delivery: WebhookDeliveryPayload) -> bool:
+    """Publish a delivery onto the `webhooks` queue; False when the broker is unavailable."""
+    try:
+        celery_app.send_task(
+            TASK_DELIVER_WEBHOOK,
+            kwargs={"delivery": delivery.model_dump(mode="json")},
+            # Outlive the deadline so late deliveries still reach the channel fallback
+            expires=datetime.fromtimestamp(
+                delivery.deadline + settings.discord_webhook_fallback_window_seconds, tz=UTC
+            ),
+        )
+    except Exception as exc:
+        logger.warning(
+            "webhook_delivery_enqueue_failed",
+            extra={"kind": delivery.kind, "match_id": delivery.match_id, "error": str(exc)},
+        )
+        return False
+    return True
+
+
+def make_webhook_adapter() -> DiscordWebhookAdapter:
+    """Adapter for analysis tasks: queued delivery when enabled, inline otherwise."""
+    if settings.discord_webhook_queue_enabled:
+        return DiscordWebhookAdapter(enqueue=enqueue_webhook_delivery)
+    return DiscordWebhookAdapter()
+
+
+@celery_app.task(  # type: ignore[untyped-decorator]
+    name=TASK_DELIVER_WEBHOOK,
+    bind=True,
+    max_retries=None,  # bounded by the interaction deadline instead
+    acks_late=True,
+)
+def deliver_webhook_task(self: Any, delivery: dict[str, Any]) -> dict[str, Any]:
+    """Send one queued interaction response to Discord."""
+    payload = WebhookDeliveryPayload.model_validate(delivery)
+    adapter = DiscordWebhookAdapter()
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        delivered = loop.run_until_complete(adapter.deliver_prepared(payload))
+    except DiscordRetryableError as exc:
+        countdown = exc.retry_after + random.uniform(0, max(0.25, exc.retry_after * 0.25))
+        if time.time() + countdown < payload.deadline:
+            logger.info(
+                "webhook_delivery_rescheduled",
+                extra={
+                    "kind": payload.kind,
+                    "match_id": payload.match_id,
+                    "countdown": round(countdown, 2),
+                    "attempt": self.request.retries,
+                },
+            )
+            raise self.retry(countdown=countdown) from exc
+        logger.warning(
+            "webhook_delivery_deadline_exceeded",
+            extra={"kind": payload.kind, "match_id": payload.match_id},
+        )
+        # The token can no longer be used: post to the channel if we know it
+        delivered = loop.run_until_complete(adapter.deliver_fallback(payload))
+    except Exception as exc:
+        observe_discord_delivery(payload.kind, "failed", time.time() - payload.enqueued_at)
+        logger.error(
+            "webhook_delivery_error",
+            extra={"kind": payload.kind, "match_id": payload.match_id, "error": str(exc)},
+            exc_info=True,
+        )
+        delivered = False
+    finally:
+        loop.run_until_complete(adapter.close())
+        loop.close()
+
+    return {"success": delivered, "kind": payload.kind, "match_id": payload.match_id}
@@ -0,0 +1,83 @@
+"""AccountAutocompleteCache unit tests."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from src.core.services.account_autocomplete_cache import AccountAutocompleteCache
+
+
+class _Loader:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.calls = 0
+        self.delay = delay
+        self.accounts: list[dict[str, Any]] = [{"summoner_name": "Faker#KR", "is_primary": True}]
+
+    async def __call__(self, discord_id: str) -> list[dict[str, Any]]:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return list(self.accounts)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_cold_requests_share_one_load() -> None:
+    loader = _Loader(delay=0.01)
+    cache = AccountAutocompleteCache(loader)
+
+    results = await asyncio.gather(*(cache.accounts("1") for _ in range(5)))
+
+    assert loader.calls == 1
+    assert all(r == loader.accounts for r in results)
+    assert await cache.accounts("1") == loader.accounts
+    assert loader.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_served_while_refreshing() -> None:
+    loader = _Loader()
+    cache = AccountAutocompleteCache(loader, ttl_seconds=0.0)
+    await cache.accounts("1")
+    loader.accounts = [{"summoner_name": "Hide#KR", "is_primary": True}]
+
+    stale = await cache.accounts("1")
+    await asyncio.sleep(0.01)
+
+    assert stale[0]["summoner_name"] == "Faker#KR"
+    assert loader.calls == 2
+    assert (await cache.accounts("1"))[0]["summoner_name"] == "Hide#KR"
+
+
+@pytest.mark.asyncio
+async def test_invalidate_discards_inflight_result() -> None:
+    loader = _Loader(delay=0.01)
+    cache = AccountAutocompleteCache(loader)
+    first = asyncio.ensure_future(cache.accounts("1"))
+    await asyncio.sleep(0)
+
+    cache.invalidate("1")
+    loader.accounts = []
+    await first
+
+    assert await cache.accounts("1") == []
+    assert loader.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_cold_load_over_budget_returns_none() -> None:
+    cache = AccountAutocompleteCache(_Loader(delay=0.05), cold_wait_seconds=0.001)
+
+    assert await cache.accounts("1") is None
+
+
+def test_recent_riot_ids_deduplicated_and_bounded() -> None:
+    cache = AccountAutocompleteCache(_Loader(), max_recent=2)
+    cache.remember_riot_id("1", "A#NA1")
+    cache.remember_riot_id("1", "B#NA1")
+    cache.remember_riot_id("1", "a#na1")
+    cache.remember_riot_id("1", "C#NA1")
+
+    assert cache.recent_riot_ids("1") == ["C#NA1", "a#na1"]
+    assert cache.recent_riot_ids("2") == []
@@ -117,3 +117,21 @@ async def test_ignores_bindings_without_puuid() -> None:
 
     assert events == []
     riot_api.get_match_history.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_new_match_invalidates_cached_match_id_list() -> None:
+    database = AsyncMock()
+    database.list_user_bindings = AsyncMock(return_value=[_binding()])
+
+    riot_api = AsyncMock()
+    riot_api.get_match_history = AsyncMock(return_value=["NA1_101", "NA1_100"])
+
+    cache = _InMemoryCache()
+    await cache.set("match_watcher:last:123:PUUID", "NA1_100")
+    await cache.set("chimera:match_ids:PUUID", {"count": 20, "ids": ["NA1_100"]})
+
+    watcher = MatchCompletionWatcher(database=database, riot_api=riot_api, cache=cache)
+    await watcher.poll_new_matches()
+
+    assert await cache.get("chimera:match_ids:PUUID") is None
@@ -0,0 +1,81 @@
+"""MatchHistoryService unit tests (match-ID list cache, joined analysis lookup)."""
+
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.core.services.match_history_service import MatchHistoryService, match_ids_cache_key
+
+
+class _InMemoryCache:
+    def __init__(self) -> None:
+        self._store: dict[str, Any] = {}
+
+    async def get(self, key: str) -> Any | None:
+        return self._store.get(key)
+
+    async def set(self, key: str, value: Any, ttl: int | None = None) -> bool:  # noqa: ARG002
+        self._store[key] = value
+        return True
+
+    async def delete(self, key: str) -> bool:
+        self._store.pop(key, None)
+        return True
+
+
+def _service(cache: _InMemoryCache | None = None) -> tuple[MatchHistoryService, AsyncMock]:
+    riot_api = AsyncMock()
+    riot_api.get_match_history = AsyncMock(return_value=["NA1_3", "NA1_2", "NA1_1"])
+    return MatchHistoryService(riot_api=riot_api, db=AsyncMock(), cache=cache), riot_api
+
+
+@pytest.mark.asyncio
+async def test_match_id_list_served_from_cache_until_invalidated() -> None:
+    cache = _InMemoryCache()
+    service, riot_api = _service(cache)
+
+    assert await service.get_match_id_list("PUUID", "na1", count=20) == ["NA1_3", "NA1_2", "NA1_1"]
+    assert await service.get_match_id_list("PUUID", "na1", count=2) == ["NA1_3", "NA1_2"]
+    assert riot_api.get_match_history.await_count == 1
+
+    await service.invalidate_match_ids("PUUID")
+    assert await cache.get(match_ids_cache_key("PUUID")) is None
+    await service.get_match_id_list("PUUID", "na1", count=20)
+    assert riot_api.get_match_history.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_larger_count_than_cached_refetches() -> None:
+    cache = _InMemoryCache()
+    service, riot_api = _service(cache)
+
+    await service.get_match_id_list("PUUID", "na1", count=5)
+    await service.get_match_id_list("PUUID", "na1", count=20)
+
+    assert riot_api.get_match_history.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_analysis_bundle_uses_single_joined_query() -> None:
+    service, _ = _service()
+    record = {"status": "completed", "llm_narrative": "gg", "created_at": None}
+    match_row = {"match_data": {"info": {"participants": []}}}
+    service.db.get_analysis_with_match = AsyncMock(return_value=(record, match_row))
+
+    status, got_record, got_match = await service.get_analysis_bundle("NA1_3")
+
+    assert status == {"status": "completed", "created_at": "", "has_result": "true"}
+    assert got_record is record and got_match is match_row
+    service.db.get_analysis_result.assert_not_called()
+    service.db.get_match_data.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_analysis_bundle_missing_record() -> None:
+    service, _ = _service()
+    service.db.get_analysis_with_match = AsyncMock(return_value=(None, None))
+
+    assert await service.get_analysis_bundle("NA1_3") == (None, None, None)
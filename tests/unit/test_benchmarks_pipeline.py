@@ -0,0 +1,43 @@
+"""Tests for the offline benchmark fixtures and baseline comparison."""
+
+from __future__ import annotations
+
+from benchmarks.fixtures import synthetic_match
+from benchmarks.run_pipeline import _percentiles, compare
+
+
+def test_synthetic_match_is_deterministic_and_consistent() -> None:
+    first, again = synthetic_match(3), synthetic_match(3)
+    assert first.details == again.details
+    assert first.timeline == again.timeline
+
+    kills = sum(
+        1
+        for frame in first.timeline["info"]["frames"]
+        for event in frame["events"]
+        if event["type"] == "CHAMPION_KILL"
+    )
+    participants = first.details["info"]["participants"]
+    assert sum(p["kills"] for p in participants) == kills
+    assert sum(p["deaths"] for p in participants) == kills
+    assert first.target_puuid == participants[0]["puuid"]
+
+
+def test_compare_flags_latency_and_throughput_regressions() -> None:
+    def report(total_p50: float, throughput: float) -> dict:
+        return {
+            "peak_rss_mb": 200.0,
+            "pipelines": {
+                "match": {
+                    "throughput_per_s": throughput,
+                    "total_ms": _percentiles([total_p50] * 10),
+                    "stages_ms": {"scoring": _percentiles([10.0] * 10)},
+                }
+            },
+        }
+
+    rows = {r["metric"]: r for r in compare(report(130.0, 7.0), report(100.0, 10.0), 10.0)}
+    assert rows["match.total_ms.p50"]["regression"]
+    assert rows["match.throughput_per_s"]["regression"]
+    assert not rows["match.scoring.p50"]["regression"]
+    assert not rows["peak_rss_mb"]["regression"]
@@ -0,0 +1,99 @@
+"""Tests for the array-backed CompactTimeline and the extractors running on it."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from src.core.scoring.compact_timeline import CompactTimeline
+
+
+def _timeline() -> dict[str, Any]:
+    return {
+        "info": {
+            "participants": [
+                {"participant_id": 1, "puuid": "p1"},
+                {"participant_id": 6, "puuid": "p6"},
+            ],
+            "frames": [
+                {
+                    "timestamp": 0,
+                    "participant_frames": {
+                        "1": {"total_gold": 500, "xp": 0, "position": {"x": 10, "y": 20}},
+                        "6": {"totalGold": 500, "minionsKilled": 0},
+                    },
+                    "events": [],
+                },
+                {
+                    "timestamp": 60_000,
+                    "participant_frames": {
+                        "1": {
+                            "total_gold": 900,
+                            "xp": 280,
+                            "minions_killed": 7,
+                            "damage_stats": {"total_damage_done_to_champions": 300},
+                        },
+                        "6": {},
+                    },
+                    "events": [
+                        {"type": "WARD_PLACED", "timestamp": 59_000, "creatorId": 1},
+                        {
+                            "type": "CHAMPION_KILL",
+                            "timestamp": 45_000,
+                            "killerId": 6,
+                            "victimId": 1,
+                            "assistingParticipantIds": [7, 8],
+                        },
+                        {
+                            "type": "ELITE_MONSTER_KILL",
+                            "timestamp": 50_000,
+                            "killerId": 1,
+                            "monsterType": "DRAGON",
+                        },
+                    ],
+                },
+            ],
+        }
+    }
+
+
+def test_stats_accept_both_key_styles_and_track_missing_fields() -> None:
+    tl = CompactTimeline.from_timeline(_timeline())
+
+    assert tl.n_frames == 2
+    assert tl.stat("total_gold", 0, 6) == 500  # camelCase source
+    assert tl.stat("xp", 0, 6) is None
+    assert tl.stat("damage_to_champions", 1, 1) == 300
+    assert list(tl.series("total_gold", 1)) == [500, 900]
+    assert tl.positions(0)[1].tolist() == [10, 20]
+    # An empty participant frame does not count as present
+    assert tl.has_participants(0, [1, 6])
+    assert not tl.has_participants(1, [1, 6])
+    assert tl.participant_id_for("p6") == 6
+
+
+def test_events_are_time_sorted_typed_columns() -> None:
+    tl = CompactTimeline.from_timeline(_timeline())
+
+    assert tl.events["timestamp"].tolist() == [45_000, 50_000, 59_000]
+    kill = tl.events_of("CHAMPION_KILL")[0]
+    assert (int(kill["killer"]), int(kill["victim"]), int(kill["frame"])) == (6, 1, 1)
+    assert int(kill["assists"]) == (1 << 7) | (1 << 8)
+    monster = tl.events_of("ELITE_MONSTER_KILL")[0]
+    assert tl.label(int(monster["monster"])) == "DRAGON"
+    assert len(tl.events_of("BUILDING_KILL")) == 0
+
+
+def test_frame_lookup_by_timestamp() -> None:
+    tl = CompactTimeline.from_timeline(_timeline())
+
+    assert tl.first_frame_at_or_after(30_000) == 1
+    assert tl.first_frame_at_or_after(61_000) is None
+    assert tl.last_frame_at_or_before(59_999) == 0
+    assert tl.last_frame_at_or_before(-1) is None
+    assert list(tl.frames_between(0, 60_000)) == [0, 1]
+
+
+def test_coerce_reuses_compact_instances() -> None:
+    tl = CompactTimeline.from_timeline(_timeline())
+    assert CompactTimeline.coerce(tl) is tl
+    assert CompactTimeline.coerce(None).n_frames == 0
@@ -225,14 +225,27 @@ async def test_play_tts_in_voice_channel_rejects_invalid_channel() -> None:
     )
     adapter.bot = MagicMock()
 
+    source = MagicMock()
     result = await adapter.play_tts_in_voice_channel(
         guild_id=123,
         voice_channel_id="-1",
         audio_url="https://cdn.example.com/invalid.mp3",
+        source=source,
     )
 
     assert result is False
     adapter.bot.get_guild.assert_not_called()
+    # A decoder prefetched by the queue is not left running
+    source.cleanup.assert_called_once()
+
+    source = MagicMock()
+    assert (
+        await adapter.play_tts_bytes_in_voice_channel(
+            guild_id=123, voice_channel_id="abc", audio_bytes=b"mp3", source=source
+        )
+        is False
+    )
+    source.cleanup.assert_called_once()
 
 
 @pytest.mark.asyncio
@@ -507,3 +520,27 @@ async def test_handle_voice_play_interaction_user_not_in_voice(mock_discord_bot:
         assert "⚠️" in call_args.args[0]
         assert "不在任何语音频道" in call_args.args[0]
         assert call_args.kwargs["ephemeral"] is True
+
+
+def test_build_voice_source_streams_cached_opus_clip(tmp_path: Any, monkeypatch: Any) -> None:
+    """Clips already in the Opus cache skip PCM decoding and re-encoding."""
+    import discord
+
+    from src.adapters.discord_adapter import DiscordAdapter
+    from src.adapters.voice_opus_cache import OpusClipCache
+
+    adapter = DiscordAdapter(rso_adapter=MagicMock(), db_adapter=MagicMock())
+    adapter.opus_cache = OpusClipCache(tmp_path)
+    params = {"volume": 0.5, "normalize": False, "max_seconds": 90}
+    url = "https://cdn.example.com/audio.mp3"
+    cached = adapter.opus_cache.path_for(OpusClipCache.key(url, **params))
+    cached.parent.mkdir(parents=True)
+    cached.write_bytes(b"OggS")
+
+    opus_audio = MagicMock()
+    monkeypatch.setattr(discord, "FFmpegOpusAudio", opus_audio)
+
+    source = adapter.build_voice_source(audio_url=url, **params)
+
+    opus_audio.assert_called_once_with(str(cached), codec="copy")
+    assert source is opus_audio.return_value
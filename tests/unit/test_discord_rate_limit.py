@@ -0,0 +1,251 @@
+"""Unit tests for Discord rate-limit buckets and queued webhook delivery."""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any
+
+import pytest
+
+from src.adapters.discord_rate_limit import DiscordRateLimiter, get_rate_limiter, route_key
+from src.adapters.discord_webhook import DiscordRetryableError, DiscordWebhookAdapter
+from src.config.settings import get_settings
+from src.contracts.analysis_results import AnalysisErrorReport
+from src.contracts.tasks import WebhookDeliveryPayload
+
+WEBHOOK_URL = "https://discord.com/api/v10/webhooks/app/tok/messages/@original"
+
+
+class _Resp:
+    def __init__(self, status: int, headers: dict[str, str] | None = None, text: str = "") -> None:
+        self.status = status
+        self.headers = headers or {}
+        self._text = text
+
+    async def text(self) -> str:
+        return self._text
+
+
+class _ScriptedSession:
+    """Returns queued responses in order and records every call."""
+
+    def __init__(self, responses: list[_Resp]) -> None:
+        self._responses = list(responses)
+        self.calls: list[tuple[str, str]] = []
+        self.closed = False
+
+    def _next(self, method: str, url: str):
+        self.calls.append((method, url))
+
+        @asynccontextmanager
+        async def _ctx():
+            yield self._responses.pop(0)
+
+        return _ctx()
+
+    def patch(self, url: str, **kwargs: Any):
+        return self._next("PATCH", url)
+
+    def post(self, url: str, **kwargs: Any):
+        return self._next("POST", url)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_limiter():
+    get_rate_limiter().reset()
+    yield
+    get_rate_limiter().reset()
+
+
+def _adapter_with(session: _ScriptedSession, **kwargs: Any) -> DiscordWebhookAdapter:
+    adapter = DiscordWebhookAdapter(**kwargs)
+    adapter._session = session  # type: ignore[assignment]
+    adapter._session_loop = asyncio.get_running_loop()
+    return adapter
+
+
+def _error_report() -> AnalysisErrorReport:
+    return AnalysisErrorReport(
+        match_id="NA1_1", error_type="x", error_message="boom", retry_suggested=True
+    )
+
+
+def test_route_key_strips_api_prefix() -> None:
+    assert route_key("patch", WEBHOOK_URL) == "PATCH webhooks/app/tok/messages/@original"
+
+
+def test_exhausted_bucket_delays_routes_with_same_major_parameter() -> None:
+    limiter = DiscordRateLimiter()
+    route = route_key("PATCH", WEBHOOK_URL)
+    headers = {
+        "X-RateLimit-Bucket": "abc",
+        "X-RateLimit-Remaining": "0",
+        "X-RateLimit-Reset-After": "2.5",
+    }
+    assert limiter.update(route, 200, headers, now=100.0) is None
+
+    assert limiter.delay_for(route, now=100.0) == pytest.approx(2.5)
+    assert limiter.delay_for(route, now=103.0) == 0.0
+    # Another interaction token is a different major parameter → separate budget
+    other = route_key("PATCH", WEBHOOK_URL.replace("/tok/", "/tok2/"))
+    limiter.update(other, 200, {"X-RateLimit-Bucket": "abc"}, now=100.0)
+    assert limiter.delay_for(other, now=100.0) == 0.0
+
+
+def test_global_429_blocks_every_route() -> None:
+    limiter = DiscordRateLimiter()
+    delay = limiter.update(
+        "POST channels/1/messages",
+        429,
+        {"Retry-After": "3", "X-RateLimit-Global": "true"},
+        now=50.0,
+    )
+    assert delay == 3.0
+    assert limiter.delay_for("PATCH webhooks/a/b/messages/@original", now=51.0) == 2.0
+
+
+@pytest.mark.asyncio
+async def test_send_retries_429_then_succeeds(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(get_settings(), "discord_webhook_inline_wait_seconds", 1.0)
+    session = _ScriptedSession(
+        [
+            _Resp(429, {"Retry-After": "0.01"}, '{"retry_after": 0.01, "global": false}'),
+            _Resp(200, {"X-RateLimit-Bucket": "abc", "X-RateLimit-Remaining": "4"}),
+        ]
+    )
+    adapter = _adapter_with(session)
+
+    status, _ = await adapter._send("PATCH", WEBHOOK_URL, {"content": "hi"})
+
+    assert status == 200
+    assert len(session.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_send_raises_retryable_when_wait_exceeds_budget() -> None:
+    session = _ScriptedSession([_Resp(429, {"Retry-After": "30"})])
+    adapter = _adapter_with(session)
+
+    with pytest.raises(DiscordRetryableError) as exc_info:
+        await adapter._send("PATCH", WEBHOOK_URL, {}, max_wait=1.0)
+
+    assert exc_info.value.retry_after == 30.0
+    # Follow-up requests on the bucket wait instead of hitting Discord again
+    with pytest.raises(DiscordRetryableError):
+        await adapter._send("PATCH", WEBHOOK_URL, {}, max_wait=1.0)
+    assert len(session.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_enqueue_mode_returns_without_calling_discord() -> None:
+    queued: list[WebhookDeliveryPayload] = []
+    session = _ScriptedSession([])
+    adapter = _adapter_with(session, enqueue=lambda d: queued.append(d) is None)
+
+    ok = await adapter.send_error_notification("app", "tok", _error_report(), channel_id="9")
+
+    assert ok is True
+    assert session.calls == []
+    assert len(queued) == 1
+    delivery = queued[0]
+    assert delivery.kind == "error"
+    assert delivery.channel_id == "9"
+    assert delivery.payload["embeds"]
+    assert delivery.deadline > delivery.enqueued_at
+
+
+@pytest.mark.asyncio
+async def test_deliver_prepared_falls_back_to_channel_on_expired_token() -> None:
+    session = _ScriptedSession([_Resp(404, text="Unknown Webhook"), _Resp(200)])
+    adapter = _adapter_with(session)
+    now = time.time()
+    delivery = WebhookDeliveryPayload(
+        kind="match_analysis",
+        application_id="app",
+        interaction_token="tok",
+        payload={"embeds": [{"title": "t"}]},
+        channel_id="9",
+        enqueued_at=now,
+        deadline=now + 60,
+    )
+
+    assert await adapter.deliver_prepared(delivery) is True
+    assert [method for method, _ in session.calls] == ["PATCH", "POST"]
+
+
+@pytest.mark.asyncio
+async def test_deliver_prepared_posts_to_channel_after_deadline() -> None:
+    session = _ScriptedSession([_Resp(200)])
+    adapter = _adapter_with(session)
+    now = time.time()
+    delivery = WebhookDeliveryPayload(
+        kind="match_analysis",
+        application_id="app",
+        interaction_token="tok",
+        payload={"embeds": [{"title": "t"}]},
+        channel_id="9",
+        enqueued_at=now - 900,
+        deadline=now - 1,
+    )
+
+    assert await adapter.deliver_prepared(delivery) is True
+    assert session.calls == [("POST", "https://discord.com/api/v10/channels/9/messages")]
+
+    # Without a channel there is nothing left to try
+    assert await adapter.deliver_prepared(delivery.model_copy(update={"channel_id": None})) is False
+    assert len(session.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_inline_delivery_waits_out_long_retry_after(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(get_settings(), "discord_webhook_inline_wait_seconds", 0.0)
+    slept: list[float] = []
+
+    async def _sleep(delay: float) -> None:
+        slept.append(delay)
+
+    monkeypatch.setattr("src.adapters.discord_webhook.asyncio.sleep", _sleep)
+    session = _ScriptedSession([_Resp(429, {"Retry-After": "5"}), _Resp(200)])
+    adapter = _adapter_with(session)
+    delivery = adapter._new_delivery("error", "app", "tok", {"embeds": [{"title": "t"}]})
+
+    assert await adapter._deliver_or_enqueue(delivery, []) == (200, "")
+    assert len(session.calls) == 2 and slept and slept[0] >= 5.0
+
+
+def test_queued_delivery_outlives_deadline_and_falls_back(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    from src.tasks import webhook_tasks
+
+    sent: list[dict[str, Any]] = []
+    monkeypatch.setattr(
+        webhook_tasks.celery_app, "send_task", lambda name, **kwargs: sent.append(kwargs)
+    )
+    now = time.time()
+    delivery = WebhookDeliveryPayload(
+        kind="match_analysis",
+        application_id="app",
+        interaction_token="tok",
+        payload={"embeds": [{"title": "t"}]},
+        channel_id="9",
+        enqueued_at=now - 900,
+        deadline=now - 1,
+    )
+
+    assert webhook_tasks.enqueue_webhook_delivery(delivery) is True
+    # The broker must not revoke it at the deadline, or the fallback never runs
+    assert sent[0]["expires"].timestamp() > delivery.deadline
+
+    fallbacks: list[WebhookDeliveryPayload] = []
+
+    class _Adapter(DiscordWebhookAdapter):
+        async def _post_fallback(self, d: WebhookDeliveryPayload) -> bool:
+            fallbacks.append(d)
+            return True
+
+    monkeypatch.setattr(webhook_tasks, "DiscordWebhookAdapter", _Adapter)
+    result = webhook_tasks.deliver_webhook_task.apply(kwargs=sent[0]["kwargs"]).get()
+
+    assert result["success"] is True
+    assert [d.channel_id for d in fallbacks] == ["9"]
@@ -0,0 +1,115 @@
+"""Unit tests for per-guild voice session reuse."""
+
+import asyncio
+import threading
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import discord
+import pytest
+
+from src.adapters.discord_voice_session import VoiceSessionManager
+
+
+class _FakeVoiceClient(discord.VoiceClient):
+    guild: Any = None  # shadows VoiceClient.guild (a property of the live connection)
+
+    def __init__(self, guild: Any, channel: Any) -> None:
+        self.guild = guild
+        self.channel = channel
+        self.connected = True
+        self.played: list[Any] = []
+        self.disconnect = AsyncMock(side_effect=self._disconnect)
+        self.move_to = AsyncMock(side_effect=self._move_to)
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+    def play(self, source: Any, *, after: Any) -> None:
+        self.played.append(source)
+        # discord.py calls ``after`` from its audio thread once the source ends
+        threading.Timer(0.01, after, args=(None,)).start()
+
+    async def _disconnect(self) -> None:
+        self.connected = False
+
+    async def _move_to(self, channel: Any) -> None:
+        self.channel = channel
+
+
+def _setup(idle_timeout: float) -> tuple[VoiceSessionManager, Any, Any, list[Any]]:
+    bot = MagicMock()
+    bot.voice_clients = []
+    guild = MagicMock()
+    guild.id = 1
+    channel = MagicMock()
+    channel.id = 10
+
+    async def connect() -> _FakeVoiceClient:
+        vc = _FakeVoiceClient(guild, channel)
+        bot.voice_clients.append(vc)
+        return vc
+
+    channel.connect = AsyncMock(side_effect=connect)
+    return VoiceSessionManager(bot, idle_timeout=idle_timeout), guild, channel, bot.voice_clients
+
+
+async def _clip(manager: VoiceSessionManager, guild: Any, channel: Any, source: Any) -> Any:
+    async with manager.lock(guild.id):
+        vc = await manager.connect(guild, channel)
+        await manager.play(vc, source)
+        await manager.release(guild.id)
+    return vc
+
+
+@pytest.mark.asyncio
+async def test_back_to_back_clips_share_one_connection() -> None:
+    manager, guild, channel, clients = _setup(idle_timeout=0.05)
+
+    first = await _clip(manager, guild, channel, "a")
+    second = await _clip(manager, guild, channel, "b")
+
+    assert first is second
+    assert channel.connect.await_count == 1
+    assert first.played == ["a", "b"]
+    assert first.is_connected()
+
+    # Idle timer drops the session once nothing else plays
+    await asyncio.sleep(0.1)
+    assert not first.is_connected()
+    assert len(clients) == 1
+
+
+@pytest.mark.asyncio
+async def test_new_clip_cancels_pending_idle_disconnect() -> None:
+    manager, guild, channel, _ = _setup(idle_timeout=0.05)
+
+    vc = await _clip(manager, guild, channel, "a")
+    await asyncio.sleep(0.03)
+    await _clip(manager, guild, channel, "b")
+    await asyncio.sleep(0.03)
+
+    # 60ms after the first clip, but only 30ms after the second
+    assert vc.is_connected()
+    vc.disconnect.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_zero_idle_timeout_disconnects_after_each_clip() -> None:
+    manager, guild, channel, _ = _setup(idle_timeout=0)
+
+    vc = await _clip(manager, guild, channel, "a")
+
+    assert not vc.is_connected()
+
+
+@pytest.mark.asyncio
+async def test_player_error_is_raised_after_playback_stops() -> None:
+    manager, guild, channel, _ = _setup(idle_timeout=0)
+    vc = await manager.connect(guild, channel)
+    vc.play = lambda source, *, after: threading.Thread(
+        target=after, args=(RuntimeError("ffmpeg died"),)
+    ).start()
+
+    with pytest.raises(RuntimeError, match="ffmpeg died"):
+        await manager.play(vc, "a")
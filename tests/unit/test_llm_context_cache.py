@@ -0,0 +1,216 @@
+"""Provider-side system-prompt caching: handle lifetimes and adapter wiring."""
+
+import types
+from typing import Any
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.adapters.gemini_llm import GeminiLLMAdapter
+from src.adapters.llm_context_cache import GeminiContextCache, static_system_prompt_hashes
+from src.prompts.compiler import static_prompt
+from src.prompts.system_prompts import DEFAULT_SYSTEM_PROMPT
+
+SYSTEM = static_prompt("你是一位英雄联盟分析师。" * 200)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _FakeProvider:
+    """Stands in for ``caching.CachedContent.create`` and the resources it returns."""
+
+    def __init__(self, refuse: bool = False) -> None:
+        self.refuse = refuse
+        self.created: list[dict[str, Any]] = []
+        self.updates: list[Any] = []
+
+    def create(self, **kwargs: Any) -> Any:
+        if self.refuse:
+            raise ValueError("Cached content is too small. min_total_token_count=4096")
+        self.created.append(kwargs)
+        return types.SimpleNamespace(
+            name=f"cachedContents/{len(self.created)}",
+            update=lambda ttl: self.updates.append(ttl),
+        )
+
+
+def _cache(provider: _FakeProvider, clock: _Clock) -> GeminiContextCache:
+    return GeminiContextCache(
+        ttl_seconds=600,
+        refresh_margin_seconds=60,
+        create=provider.create,
+        clock=clock,
+        cacheable={SYSTEM.prefix_hash},
+    )
+
+
+def test_handle_is_reused_then_refreshed_before_expiry() -> None:
+    provider, clock = _FakeProvider(), _Clock()
+    cache = _cache(provider, clock)
+
+    handle = cache.acquire("gemini-2.5-flash", SYSTEM)
+    assert handle is not None and handle.name == "cachedContents/1"
+    assert provider.created[0]["model"] == "models/gemini-2.5-flash"
+    assert provider.created[0]["system_instruction"] == SYSTEM.source
+
+    clock.now += 500
+    assert cache.acquire("gemini-2.5-flash", SYSTEM) is handle
+    assert provider.updates == []
+
+    # Inside the refresh margin: the TTL is extended, not a new resource
+    clock.now += 60
+    assert cache.acquire("gemini-2.5-flash", SYSTEM) is handle
+    assert len(provider.updates) == 1 and handle.expires_at == clock.now + 600
+
+    # Handles are per model
+    assert cache.acquire("gemini-2.5-pro", SYSTEM) is not handle
+    assert len(provider.created) == 2
+
+    cache.invalidate("gemini-2.5-flash", SYSTEM.prefix_hash)
+    assert cache.acquire("gemini-2.5-flash", SYSTEM).name == "cachedContents/3"
+
+
+def test_refused_prompt_is_not_retried_until_backoff() -> None:
+    provider, clock = _FakeProvider(refuse=True), _Clock()
+    calls = Mock(side_effect=provider.create)
+    cache = GeminiContextCache(
+        ttl_seconds=600,
+        refresh_margin_seconds=60,
+        create=calls,
+        failure_backoff_seconds=300,
+        clock=clock,
+        cacheable={SYSTEM.prefix_hash},
+    )
+
+    assert cache.acquire("gemini-2.5-flash", SYSTEM) is None
+    assert cache.acquire("gemini-2.5-flash", SYSTEM) is None
+    assert calls.call_count == 1
+
+    clock.now += 301
+    provider.refuse = False
+    assert cache.acquire("gemini-2.5-flash", SYSTEM) is not None
+
+
+def test_only_registered_prompts_get_a_handle_and_stale_entries_are_pruned() -> None:
+    provider, clock = _FakeProvider(), _Clock()
+    cache = _cache(provider, clock)
+
+    # A per-request prompt (TTS script, key-moment summary) is never cached
+    one_shot = static_prompt("为这场对局写一段语音播报：" * 200)
+    assert cache.acquire("gemini-2.5-flash", one_shot) is None
+    assert provider.created == []
+    assert static_prompt(DEFAULT_SYSTEM_PROMPT).prefix_hash in static_system_prompt_hashes()
+
+    cache.acquire("gemini-2.5-flash", SYSTEM)
+    provider.refuse = True
+    cache.acquire("gemini-2.5-pro", SYSTEM)
+    assert len(cache._handles) == 1 and len(cache._refused_until) == 1
+
+    # Expired handles and elapsed refusals are dropped on the next acquire
+    clock.now += 3600 + 1
+    provider.refuse = False
+    cache.acquire("gemini-2.5-flash", SYSTEM)
+    assert list(cache._handles) == [("gemini-2.5-flash", SYSTEM.prefix_hash)]
+    assert cache._refused_until == {}
+
+
+@pytest.fixture
+def cache_settings():
+    with patch("src.adapters.gemini_llm.settings") as mock:
+        mock.gemini_api_key = "test_api_key_1234567890"
+        mock.gemini_model = "gemini-2.5-flash"
+        mock.gemini_temperature = 0.7
+        mock.gemini_max_output_tokens = 2048
+        mock.llm_provider = "gemini"
+        mock.openai_api_base = None
+        mock.openai_api_key = None
+        mock.llm_context_cache_enabled = True
+        mock.openai_prompt_cache_key_enabled = True
+        mock.finops_prompt_token_price_usd = 0.001
+        mock.finops_cached_prompt_token_price_usd = 0.00025
+        mock.finops_completion_token_price_usd = 0.002
+        yield mock
+
+
+@pytest.mark.asyncio
+async def test_adapter_sends_only_user_turn_with_cached_prompt(cache_settings) -> None:
+    provider = _FakeProvider()
+    cache = _cache(provider, _Clock())
+    cached_model = Mock()
+    cached_model.generate_content.side_effect = [
+        types.SimpleNamespace(text="cached"),
+        RuntimeError("403 CachedContent not found (or permission denied)"),
+    ]
+    with (
+        patch("src.adapters.gemini_llm.genai"),
+        patch("src.adapters.gemini_llm.GenerativeModel") as generative_model,
+        patch("src.adapters.gemini_llm.get_gemini_context_cache", return_value=cache),
+    ):
+        generative_model.from_cached_content.return_value = cached_model
+        adapter = GeminiLLMAdapter()
+        adapter.model.generate_content.return_value = types.SimpleNamespace(text="inline")
+
+        response = await adapter._generate_gemini(SYSTEM, "match data", json_mode=False)
+        assert response.text == "cached"
+        cached_model.generate_content.assert_called_once_with(
+            [{"role": "user", "parts": ["match data"]}]
+        )
+
+        # Provider dropped the handle: forget it and send the prompt inline
+        response = await adapter._generate_gemini(SYSTEM, "match data", json_mode=False)
+        assert response.text == "inline"
+        sent = adapter.model.generate_content.call_args.args[0]
+        assert sent[0] == {"role": "system", "parts": [SYSTEM.source]}
+        assert cache.acquire("gemini-2.5-flash", SYSTEM).name == "cachedContents/2"
+
+
+def test_usage_splits_cached_and_uncached_prompt_tokens(cache_settings) -> None:
+    with (
+        patch("src.adapters.gemini_llm.genai"),
+        patch("src.adapters.gemini_llm.add_llm_tokens") as add_tokens,
+        patch("src.adapters.gemini_llm.add_llm_cost_usd") as add_cost,
+    ):
+        adapter = GeminiLLMAdapter()
+        usage = types.SimpleNamespace(
+            prompt_token_count=5000, candidates_token_count=400, cached_content_token_count=4000
+        )
+        adapter._record_gemini_usage(types.SimpleNamespace(usage_metadata=usage), None)
+
+        recorded = {c.args[0]: c.args[2] for c in add_tokens.call_args_list}
+        assert recorded == {
+            "prompt": 5000,
+            "prompt_cached": 4000,
+            "prompt_uncached": 1000,
+            "completion": 400,
+        }
+        assert add_cost.call_args.args[1] == pytest.approx(
+            1.0 * 0.001 + 4.0 * 0.00025 + 0.4 * 0.002
+        )
+        assert adapter._openai_cache_hint(SYSTEM.prefix_hash) == {
+            "prompt_cache_key": f"chimera-{SYSTEM.prefix_hash}"
+        }
+
+
+def test_usage_with_game_mode_is_counted_once(cache_settings) -> None:
+    with (
+        patch("src.adapters.gemini_llm.genai"),
+        patch("src.adapters.gemini_llm.add_llm_tokens") as add_tokens,
+        patch("src.adapters.gemini_llm.add_llm_tokens_by_mode") as add_tokens_by_mode,
+        patch("src.adapters.gemini_llm.add_llm_cost_usd") as add_cost,
+        patch("src.adapters.gemini_llm.add_llm_cost_usd_by_mode") as add_cost_by_mode,
+    ):
+        adapter = GeminiLLMAdapter()
+        adapter._record_usage(
+            "m", "sr", prompt_tokens=1000, completion_tokens=10, cached_tokens=None
+        )
+
+        assert add_tokens.call_count == 0 and add_cost.call_count == 0
+        recorded = {c.args[0]: c.args[3] for c in add_tokens_by_mode.call_args_list}
+        assert recorded == {"prompt": 1000, "prompt_uncached": 1000, "completion": 10}
+        assert add_cost_by_mode.call_count == 1
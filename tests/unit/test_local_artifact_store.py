@@ -0,0 +1,178 @@
+"""Local artifact index: O(1) lookups, reconcile from disk, TTL and size-budget eviction."""
+
+import os
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from src.adapters.local_artifact_store import (
+    INDEX_KEY,
+    LocalArtifactIndex,
+    LocalStorageJanitor,
+    local_audio_available,
+)
+
+
+class _Pipeline:
+    def __init__(self, redis: "FakeIndexRedis") -> None:
+        self._redis = redis
+        self._calls: list[tuple[str, tuple[Any, ...], dict[str, Any]]] = []
+
+    async def __aenter__(self) -> "_Pipeline":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        return None
+
+    def __getattr__(self, name: str) -> Any:
+        def queue(*args: Any, **kwargs: Any) -> None:
+            self._calls.append((name, args, kwargs))
+
+        return queue
+
+    async def execute(self) -> list[Any]:
+        return [await getattr(self._redis, n)(*a, **kw) for n, a, kw in self._calls]
+
+
+class FakeIndexRedis:
+    """The sorted-set and hash commands the index uses."""
+
+    def __init__(self) -> None:
+        self.zsets: dict[str, dict[str, float]] = {}
+        self.hashes: dict[str, dict[str, str]] = {}
+
+    def pipeline(self, transaction: bool = True) -> _Pipeline:
+        return _Pipeline(self)
+
+    async def zadd(
+        self, key: str, mapping: dict[str, float], nx: bool = False, xx: bool = False
+    ) -> int:
+        zset = self.zsets.setdefault(key, {})
+        added = 0
+        for member, score in mapping.items():
+            if (nx and member in zset) or (xx and member not in zset):
+                continue
+            added += member not in zset
+            zset[member] = float(score)
+        return added
+
+    async def zscore(self, key: str, member: str) -> float | None:
+        return self.zsets.get(key, {}).get(member)
+
+    def _sorted(self, key: str) -> list[tuple[str, float]]:
+        return sorted(self.zsets.get(key, {}).items(), key=lambda kv: kv[1])
+
+    async def zrangebyscore(
+        self, key: str, lo: Any, hi: Any, start: int | None = None, num: int | None = None
+    ) -> list[str]:
+        members = [m for m, s in self._sorted(key) if s <= float(hi)]
+        if start is not None and num is not None:
+            members = members[start : start + num]
+        return members
+
+    async def zrange(self, key: str, start: int, end: int) -> list[str]:
+        return [m for m, _ in self._sorted(key)][start : end + 1]
+
+    async def zrem(self, key: str, *members: str) -> int:
+        zset = self.zsets.get(key, {})
+        return sum(zset.pop(m, None) is not None for m in members)
+
+    async def hset(
+        self, key: str, field: str | None = None, value: Any = None, mapping: Any = None
+    ) -> int:
+        h = self.hashes.setdefault(key, {})
+        items = dict(mapping or {})
+        if field is not None:
+            items[field] = value
+        h.update({k: str(v) for k, v in items.items()})
+        return len(items)
+
+    async def hgetall(self, key: str) -> dict[str, str]:
+        return dict(self.hashes.get(key, {}))
+
+    async def hmget(self, key: str, fields: list[str]) -> list[str | None]:
+        h = self.hashes.get(key, {})
+        return [h.get(f) for f in fields]
+
+    async def hdel(self, key: str, *fields: str) -> int:
+        h = self.hashes.get(key, {})
+        return sum(h.pop(f, None) is not None for f in fields)
+
+
+def _write(root: Path, rel: str, size: int, age: float = 0.0) -> Path:
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    if age:
+        stamp = time.time() - age
+        os.utime(path, (stamp, stamp))
+    return path
+
+
+def _index(tmp_path: Path, redis: FakeIndexRedis, **kwargs: Any) -> LocalArtifactIndex:
+    roots = {"audio": tmp_path / "audio", "builds": tmp_path / "builds"}
+    return LocalArtifactIndex(redis, roots, **{"ttl_seconds": 3600, **kwargs})
+
+
+@pytest.mark.asyncio
+async def test_recorded_clip_is_found_by_url_without_touching_disk(tmp_path: Path) -> None:
+    index = _index(tmp_path, FakeIndexRedis())
+    settings = SimpleNamespace(
+        audio_base_url="http://bot:3000/static/audio/",
+        audio_storage_path=str(tmp_path / "audio"),
+    )
+    assert await index.record(tmp_path / "audio" / "2026/01/01/a.mp3", 10)
+    assert not await index.record(tmp_path / "elsewhere.mp3", 10)
+
+    # The file was never written: a hit can only come from the index
+    url = "http://bot:3000/static/audio/2026/01/01/a.mp3"
+    assert await local_audio_available(index, url, settings) is True
+    assert await local_audio_available(index, url.replace("a.mp3", "b.mp3"), settings) is False
+    assert await local_audio_available(index, "https://cdn/a.mp3", settings) is None
+
+    # An unindexed file on disk is still served, and indexed on the way
+    unindexed = tmp_path / "audio" / "2026/01/01/c.mp3"
+    unindexed.parent.mkdir(parents=True)
+    unindexed.write_bytes(b"mp3")
+    assert await local_audio_available(index, url.replace("a.mp3", "c.mp3"), settings) is True
+    assert await index.contains("audio", "2026/01/01/c.mp3")
+
+
+@pytest.mark.asyncio
+async def test_janitor_indexes_disk_and_evicts_expired_then_lru(tmp_path: Path) -> None:
+    redis = FakeIndexRedis()
+    index = _index(tmp_path, redis, max_bytes=250)
+    expired = _write(tmp_path / "audio", "old/expired.mp3", 100, age=7200)
+    lru = _write(tmp_path / "audio", "new/lru.mp3", 100, age=60)
+    recent = _write(tmp_path / "builds", "new/recent.png", 100, age=30)
+    fresh = _write(tmp_path / "audio", "new/fresh.mp3", 100)
+    _write(tmp_path / "audio", "new/.fresh.mp3.tmp", 5)  # in-flight write
+    await index.record(tmp_path / "audio" / "gone.mp3", 50, at=time.time() - 10)
+
+    stats = await LocalStorageJanitor(index, interval_seconds=60).run_once()
+
+    assert (stats.indexed, stats.dropped, stats.expired, stats.over_budget) == (4, 1, 1, 1)
+    assert not expired.exists() and not lru.exists()
+    assert recent.exists() and fresh.exists()
+    assert stats.total_bytes == 200
+    assert set(redis.zsets[INDEX_KEY]) == {"builds:new/recent.png", "audio:new/fresh.mp3"}
+
+
+@pytest.mark.asyncio
+async def test_access_keeps_artifact_from_lru_eviction(tmp_path: Path) -> None:
+    redis = FakeIndexRedis()
+    index = _index(tmp_path, redis, max_bytes=100)
+    first = _write(tmp_path / "audio", "first.mp3", 100)
+    second = _write(tmp_path / "audio", "second.mp3", 100)
+    now = time.time()
+    await index.record(first, 100, at=now - 20)
+    await index.record(second, 100, at=now - 10)
+
+    await index.touch("audio", "/first.mp3")
+    stats = await index.evict()
+
+    assert stats.over_budget == 1
+    assert first.exists() and not second.exists()
@@ -0,0 +1,98 @@
+"""Tests for multiprocess metric aggregation and cached queue gauges."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from src.core import metrics
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _run(code: str, multiproc_dir: Path) -> str:
+    env = {
+        **os.environ,
+        "PROMETHEUS_MULTIPROC_DIR": str(multiproc_dir),
+        "RIOT_API_KEY": os.environ.get("RIOT_API_KEY", "test"),
+        "DISCORD_BOT_TOKEN": os.environ.get("DISCORD_BOT_TOKEN", "test"),
+    }
+    out = subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(code)],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return out.stdout
+
+
+def test_render_latest_aggregates_worker_processes(tmp_path: Path) -> None:
+    record = """
+        from src.core.metrics import observe_queue_wait
+        observe_queue_wait("src.tasks.analysis_tasks.analyze_match_task", 0.25)
+    """
+    _run(record, tmp_path)
+    _run(record, tmp_path)
+
+    payload = _run(
+        """
+        from src.core.metrics import render_latest
+        print(render_latest()[0].decode())
+        """,
+        tmp_path,
+    )
+
+    count_lines = [
+        line
+        for line in payload.splitlines()
+        if line.startswith("chimera_celery_queue_wait_seconds_count")
+    ]
+    assert count_lines and count_lines[0].endswith(" 2.0")
+
+
+class _FakePipeline:
+    def __init__(self, client: _FakeRedis) -> None:
+        self._client = client
+        self._queues: list[str] = []
+
+    def llen(self, queue: str) -> None:
+        self._queues.append(queue)
+
+    async def execute(self) -> list[int]:
+        self._client.round_trips += 1
+        return [len(q) for q in self._queues]
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.round_trips = 0
+
+    def pipeline(self, transaction: bool = True) -> _FakePipeline:
+        return _FakePipeline(self)
+
+    async def aclose(self) -> None:
+        return None
+
+
+@pytest.mark.asyncio
+async def test_update_dynamic_gauges_is_throttled(monkeypatch: pytest.MonkeyPatch) -> None:
+    fake = _FakeRedis()
+    monkeypatch.setattr(metrics, "_gauge_redis", fake)
+    monkeypatch.setattr(metrics, "_gauge_last_refresh", 0.0)
+
+    await metrics.update_dynamic_gauges()
+    await metrics.update_dynamic_gauges()
+    assert fake.round_trips == 1
+
+    await metrics.update_dynamic_gauges(force=True)
+    assert fake.round_trips == 2
+
+    value = metrics.chimera_celery_queue_length.labels(queue="matches")._value.get()
+    assert value == len("matches")
@@ -0,0 +1,98 @@
+"""Shared S3 client: pooled uploads, multipart streaming, ACL fallback, local writes."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from benchmarks.fake_s3 import FakeS3Server
+from src.adapters.object_storage import MIN_PART_SIZE, ObjectStorage, write_local_file
+
+
+@pytest.fixture
+def s3_server():
+    with FakeS3Server() as server:
+        yield server
+
+
+def _storage(server: FakeS3Server, **kwargs) -> ObjectStorage:
+    return ObjectStorage(
+        bucket="audio",
+        endpoint_url=server.endpoint_url,
+        access_key="test",
+        secret_key="test",
+        region="us-east-1",
+        multipart_threshold=MIN_PART_SIZE,
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_uploads_reuse_one_client_per_loop(s3_server: FakeS3Server) -> None:
+    storage = _storage(s3_server, public_base_url="https://cdn.example.com/")
+    url = await storage.put_bytes("2026/01/01/a.mp3", b"ID3", content_type="audio/mpeg")
+    client = await storage._client()
+    urls = await storage.put_many([(f"b{i}.png", b"png", "image/png") for i in range(3)])
+    assert await storage._client() is client
+    await storage.aclose()
+
+    assert url == "https://cdn.example.com/2026/01/01/a.mp3"
+    assert urls == [f"https://cdn.example.com/b{i}.png" for i in range(3)]
+    stored = s3_server.get("audio", "2026/01/01/a.mp3")
+    assert stored is not None
+    assert (stored.data, stored.content_type, stored.acl) == (b"ID3", "audio/mpeg", "public-read")
+
+
+@pytest.mark.asyncio
+async def test_large_objects_are_streamed_as_multipart(s3_server: FakeS3Server) -> None:
+    storage = _storage(s3_server, upload_concurrency=2)
+    data = bytes(range(256)) * (MIN_PART_SIZE // 256 * 2 + 1)
+
+    url = await storage.put_bytes("big.mp3", data, content_type="audio/mpeg")
+    await storage.aclose()
+
+    assert url == f"{s3_server.endpoint_url}/audio/big.mp3"
+    assert s3_server.get("audio", "big.mp3").data == data
+    assert s3_server.requests["upload_part"] == 3
+    assert s3_server.requests["put_object"] == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_stream_aborts_multipart_upload(s3_server: FakeS3Server) -> None:
+    storage = _storage(s3_server)
+
+    async def chunks():
+        yield bytes(MIN_PART_SIZE)
+        raise RuntimeError("synthesis stream broke")
+
+    with pytest.raises(RuntimeError):
+        await storage.put_stream("broken.mp3", chunks(), content_type="audio/mpeg")
+    await storage.aclose()
+
+    assert s3_server.requests["abort_multipart_upload"] == 1
+    assert s3_server.get("audio", "broken.mp3") is None
+
+
+@pytest.mark.asyncio
+async def test_acl_is_dropped_once_bucket_rejects_it(s3_server: FakeS3Server) -> None:
+    s3_server.reject_acl = True
+    storage = _storage(s3_server)
+
+    await storage.put_bytes("a.mp3", b"1", content_type="audio/mpeg")
+    await storage.put_bytes("b.mp3", b"2", content_type="audio/mpeg")
+    await storage.aclose()
+
+    # One rejected attempt, then both objects stored without an ACL
+    assert s3_server.requests["put_object"] == 3
+    assert s3_server.get("audio", "b.mp3").acl is None
+
+
+@pytest.mark.asyncio
+async def test_local_write_is_atomic_and_off_loop(tmp_path: Path) -> None:
+    target = tmp_path / "2026" / "01" / "clip.mp3"
+    results = await asyncio.gather(
+        write_local_file(target, b"first"), asyncio.sleep(0, result="loop stayed free")
+    )
+    assert results[1] == "loop stayed free"
+    assert target.read_bytes() == b"first"
+    assert [p.name for p in target.parent.iterdir()] == ["clip.mp3"]
@@ -46,3 +46,99 @@ async def test_llm_debug_wrapper_includes_correlation_id() -> None:
     assert len(events) >= 1, f"Expected at least 1 log event, got: {events}"
     # Verify execution_id is present (from llm_debug_wrapper)
     assert any("execution_id" in e for e in events), f"Expected execution_id in logs, got: {events}"
+
+
+@pytest.mark.asyncio
+async def test_llm_debug_wrapper_unsampled_calls_skip_logging() -> None:
+    """sample_rate=0 takes the fast path: no entry/exit logs, errors still logged."""
+    from structlog.testing import capture_logs
+
+    @llm_debug_wrapper(sample_rate=0.0)
+    async def _ok(payload: dict[str, Any]) -> dict[str, Any]:
+        return payload
+
+    @llm_debug_wrapper(sample_rate=0.0)
+    def _boom() -> None:
+        raise ValueError("boom")
+
+    with capture_logs() as cap:
+        assert await _ok({"a": 1}) == {"a": 1}
+    assert cap == [], f"Unsampled call should not log, got: {cap}"
+
+    with capture_logs() as cap:
+        with pytest.raises(ValueError):
+            _boom()
+    assert [e["log_level"] for e in cap] == ["error"]
+    assert cap[0]["error_type"] == "ValueError"
+
+
+def test_serialize_value_is_size_bounded() -> None:
+    """Large payloads are clipped without serializing the whole structure."""
+    from src.core.observability import _serialize_value
+
+    big = {f"k{i}": "x" * 500 for i in range(10_000)}
+    out = _serialize_value(big, max_length=1000)
+
+    assert isinstance(out, dict)
+    assert len(out) < 10, f"Expected truncated dict, got {len(out)} keys"
+    assert "..." in out
+
+    assert _serialize_value("y" * 50, max_length=10) == "y" * 10 + "..."
+    assert _serialize_value({"a": [1, 2, None]}) == {"a": [1, 2, None]}
+
+
+def test_stage_timer_waterfall_and_emit(monkeypatch: pytest.MonkeyPatch) -> None:
+    """StageTimer records stages in start order and emits each one exactly once."""
+    import src.core.observability as obs
+
+    observed: list[tuple[str, str, str]] = []
+    monkeypatch.setattr(
+        obs,
+        "observe_stage_latency",
+        lambda pipeline, stage, game_mode, _s: observed.append((pipeline, stage, game_mode)),
+    )
+
+    timer = obs.StageTimer("analyze")
+    with timer.stage("fetch"):
+        pass
+    with pytest.raises(RuntimeError):
+        with timer.stage("llm"):
+            raise RuntimeError("llm down")
+    timer.game_mode = "SR"
+    timer.emit()
+    timer.emit()
+
+    assert [w["stage"] for w in timer.waterfall()] == ["fetch", "llm"]
+    assert timer.duration_ms("llm") is not None
+    assert timer.duration_ms("tts") is None
+    assert observed == [("analyze", "fetch", "SR"), ("analyze", "llm", "SR")]
+
+
+def test_stage_totals_feed_analyze_e2e(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Repeated stages are summed and the run total is observed as stage "total"."""
+    import src.core.metrics as metrics
+    import src.core.observability as obs
+
+    observed: dict[str, float] = {}
+    monkeypatch.setattr(
+        metrics,
+        "observe_stage_latency",
+        lambda _pipeline, stage, _mode, seconds: observed.__setitem__(stage, seconds),
+    )
+
+    timer = obs.StageTimer("analyze", origin=0.0)
+    timer.record("llm", 1.0, 1.5)
+    timer.record("webhook", 1.5, 1.75)
+    timer.record("llm", 2.0, 2.5)
+    assert timer.stage_totals_ms() == {"llm": 1000.0, "webhook": 250.0}
+
+    metrics.observe_analyze_e2e(3000.0, timer.stage_totals_ms(), "SR")
+    assert observed == {"llm": 1.0, "webhook": 0.25, "total": 3.0}
+
+    # The team task records its totals under its own pipeline label
+    pipelines: list[str] = []
+    monkeypatch.setattr(
+        metrics, "observe_stage_latency", lambda pipeline, *_: pipelines.append(pipeline)
+    )
+    metrics.observe_analyze_e2e(3000.0, {"strategy": 5.0}, "SR", "team_analyze")
+    assert pipelines == ["team_analyze", "team_analyze"]
@@ -0,0 +1,57 @@
+"""Tests for the Celery task sampling profiler."""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+
+from src.config.settings import get_settings
+from src.core import profiling
+
+
+def _busy_scoring_loop(duration_s: float) -> int:
+    total = 0
+    deadline = time.perf_counter() + duration_s
+    while time.perf_counter() < deadline:
+        total += sum(range(200))
+    return total
+
+
+@pytest.fixture
+def profiler_settings(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    settings = get_settings()
+    monkeypatch.setattr(settings, "profiling_enabled", True)
+    monkeypatch.setattr(settings, "profiling_sample_rate", 1.0)
+    monkeypatch.setattr(settings, "profiling_interval_ms", 1)
+    monkeypatch.setattr(settings, "profiling_output_dir", str(tmp_path))
+    monkeypatch.setattr(profiling, "_profiles", {})
+    return tmp_path
+
+
+def test_profile_writes_collapsed_stacks(profiler_settings: Path) -> None:
+    task_name = "src.tasks.team_tasks.analyze_team_task"
+    assert profiling.start_task_profile(task_name, "task-1")
+    _busy_scoring_loop(0.2)
+    profiling.stop_task_profile(task_name, "task-1")
+
+    files = list(profiler_settings.glob("analyze_team_task.*.collapsed"))
+    assert len(files) == 1
+
+    collapsed = profiling.load_collapsed("analyze_team_task")
+    lines = collapsed.splitlines()
+    assert lines
+    assert any("test_profiling:_busy_scoring_loop" in line for line in lines)
+    stack, count = lines[0].rsplit(" ", 1)
+    assert ";" in stack and int(count) > 0
+    assert profiling.load_collapsed("analyze_match_task") == ""
+
+
+def test_profile_disabled_or_unlisted_task_is_skipped(
+    profiler_settings: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    assert not profiling.start_task_profile("src.tasks.other.cleanup_task", "task-2")
+    monkeypatch.setattr(get_settings(), "profiling_enabled", False)
+    assert not profiling.start_task_profile("src.tasks.analysis_tasks.analyze_match_task", "t3")
+    assert profiling._active == {}
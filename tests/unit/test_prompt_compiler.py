@@ -0,0 +1,57 @@
+"""Precompiled prompt templates: str.format parity, typed slots, stable prefix hashes."""
+
+from pathlib import Path
+
+import pytest
+
+from src.core.services.personalization_service import PersonalizationService
+from src.prompts.compiler import compile_prompt, compile_prompt_file, static_prompt
+
+PROMPTS_DIR = Path(__file__).resolve().parents[2] / "src" / "prompts"
+
+
+@pytest.mark.parametrize("path", sorted(PROMPTS_DIR.glob("*.txt")), ids=lambda p: p.name)
+def test_shipped_templates_render_like_str_format(path: Path) -> None:
+    compiled = compile_prompt_file(path)
+    values = {name: f"<{name}>" for name in compiled.slot_names}
+
+    assert compiled.render(**values) == path.read_text(encoding="utf-8").format(**values)
+    assert compile_prompt_file(path) is compiled
+
+
+def test_typed_slots_and_json_conversion() -> None:
+    compiled = compile_prompt("Score {score:.1f} | {name!r}\n{data!j}")
+
+    rendered = compiled.render(score=71.26, name="阿狸", data={"中": [1]})
+
+    assert rendered == "Score 71.3 | '阿狸'\n" + '{\n  "中": [\n    1\n  ]\n}'
+    assert compiled.slot_names == {"score", "name", "data"}
+    with pytest.raises(KeyError):
+        compiled.render(score=1.0, name="x")
+
+
+def test_prefix_hash_tracks_only_the_static_head() -> None:
+    first = compile_prompt("You are a coach.\n\nPlayer: {name}")
+    second = compile_prompt("You are a coach.\n\nPlayer: {name} ({champion})")
+
+    assert first.static_prefix == "You are a coach.\n\nPlayer: "
+    assert first.prefix_hash == second.prefix_hash
+    assert compile_prompt("You are a referee.\n\nPlayer: {name}").prefix_hash != first.prefix_hash
+
+    # System prompts go out verbatim, JSON braces included
+    system = static_prompt('Return {"match_id": "..."} only.')
+    assert system.render() == system.source == system.static_prefix
+    with pytest.raises(ValueError):
+        compile_prompt('Return {"match_id": "..."} only.')
+
+
+def test_personalization_service_caches_compiled_templates() -> None:
+    service = PersonalizationService(prompt_templates_dir=PROMPTS_DIR)
+
+    compiled = service.load_compiled_template("v22_coaching_casual.txt")
+
+    assert service.load_compiled_template("v22_coaching_casual.txt") is compiled
+    assert service.load_prompt_template("v22_coaching_casual.txt") == compiled.source
+    assert "user_profile_context" in compiled.slot_names
+    with pytest.raises(FileNotFoundError):
+        service.load_compiled_template("missing.txt")
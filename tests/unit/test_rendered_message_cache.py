@@ -0,0 +1,113 @@
+"""Unit tests for pre-rendered analysis messages (render once, replay on cache hits)."""
+
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.adapters.discord_webhook import DiscordWebhookAdapter, rendered_message_version
+from src.contracts.analysis_results import FinalAnalysisReport, V1ScoreSummary
+from src.contracts.tasks import RenderedDiscordMessage
+from src.core.services.rendered_message_cache import RenderedMessageCache, rendered_message_key
+
+
+class _DictCache:
+    def __init__(self) -> None:
+        self.store: dict[str, Any] = {}
+
+    async def get(self, key: str) -> Any:
+        return self.store.get(key)
+
+    async def set(self, key: str, value: Any, ttl: int | None = None) -> bool:
+        self.store[key] = value
+        return True
+
+    async def delete(self, key: str) -> bool:
+        return self.store.pop(key, None) is not None
+
+
+def _report() -> FinalAnalysisReport:
+    return FinalAnalysisReport(
+        match_id="NA1_42",
+        match_result="victory",
+        summoner_name="Tester#NA1",
+        champion_name="Ahri",
+        champion_id=103,
+        ai_narrative_text="漂亮的一局。",
+        llm_sentiment_tag="鼓励",
+        v1_score_summary=V1ScoreSummary(
+            combat_score=80.0,
+            economy_score=70.0,
+            vision_score=60.0,
+            objective_score=50.0,
+            teamplay_score=75.0,
+            growth_score=65.0,
+            tankiness_score=40.0,
+            damage_composition_score=55.0,
+            survivability_score=60.0,
+            cc_contribution_score=45.0,
+            overall_score=72.0,
+        ),
+        champion_assets_url="https://cdn.example.com/ahri.png",
+        processing_duration_ms=1000.0,
+        algorithm_version="v1",
+    )
+
+
+def _message(**overrides: Any) -> RenderedDiscordMessage:
+    fields: dict[str, Any] = {
+        "payload": {"embeds": [{"title": "t"}], "components": []},
+        "render_version": rendered_message_version(),
+        "match_id": "NA1_42",
+    }
+    fields.update(overrides)
+    return RenderedDiscordMessage(**fields)
+
+
+@pytest.mark.asyncio
+async def test_round_trip_returns_current_version() -> None:
+    store = _DictCache()
+    cache = RenderedMessageCache(store)
+
+    assert await cache.put(_message()) is True
+    cached = await cache.get("NA1_42")
+
+    assert cached is not None
+    assert cached.payload["embeds"][0]["title"] == "t"
+    assert rendered_message_key("NA1_42") in store.store
+
+
+@pytest.mark.asyncio
+async def test_stale_render_version_is_a_miss() -> None:
+    cache = RenderedMessageCache(_DictCache())
+    await cache.put(_message(render_version="old-view"))
+
+    assert await cache.get("NA1_42") is None
+
+
+@pytest.mark.asyncio
+async def test_missing_attachment_file_is_a_miss(tmp_path) -> None:
+    cache = RenderedMessageCache(_DictCache())
+    await cache.put(_message(attachment_paths=[str(tmp_path / "gone.png")]))
+
+    assert await cache.get("NA1_42") is None
+
+
+@pytest.mark.asyncio
+async def test_publish_reuses_rendered_payload() -> None:
+    adapter = DiscordWebhookAdapter()
+    rendered = adapter.render_match_analysis(_report())
+    assert rendered.render_version == rendered_message_version()
+    assert rendered.payload["embeds"]
+
+    response = MagicMock(status=200)
+    response.__aenter__ = AsyncMock(return_value=response)
+    response.__aexit__ = AsyncMock()
+    session = MagicMock(closed=False)
+    session.patch.return_value = response
+    adapter._session = session
+    adapter._session_loop = asyncio.get_running_loop()
+
+    assert await adapter.publish_rendered_message("app", "tok", rendered) is True
+    assert session.patch.call_args.kwargs["json"] == rendered.payload
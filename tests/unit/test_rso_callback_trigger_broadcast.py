@@ -417,3 +417,28 @@ async def test_broadcast_match_user_id_fallbacks_to_user_voice_channel(
         audio_url="https://cdn.example.com/already.mp3",
     )
     mock_discord_adapter.play_tts_in_voice_channel.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_trigger_broadcast_rejects_missing_or_malformed_ids(
+    callback_server: RSOCallbackServer,
+    mock_discord_adapter: Any,
+    monkeypatch: Any,
+) -> None:
+    """Verify trigger_broadcast answers 400 instead of failing on int(None)."""
+    monkeypatch.setattr(callback_server, "_authorize_broadcast", lambda request: True)
+
+    async with TestClient(TestServer(callback_server.app)) as client:
+        for body in (
+            {"audio_url": "https://cdn.example.com/audio.mp3", "user_id": 789},
+            {"audio_url": "https://cdn.example.com/audio.mp3", "guild_id": 123, "user_id": "x"},
+        ):
+            resp = await client.post("/broadcast", json=body)
+            assert resp.status == 400
+            assert await resp.json() == {"ok": False, "error": "missing required fields"}
+
+    mock_discord_adapter.play_tts_to_user_channel.assert_not_awaited()
+    assert await callback_server.execute_broadcast({"audio_url": "a.mp3"}) == {
+        "ok": False,
+        "error": "missing required fields",
+    }
@@ -0,0 +1,140 @@
+"""Shard ownership, broadcast forwarding between bot processes, and sharded bot setup."""
+
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+from src.adapters.discord_adapter import ChimeraBot, ShardedChimeraBot, create_bot
+from src.api.rso_callback import RSOCallbackServer
+from src.core.services.shard_routing import (
+    FORWARDED_HEADER,
+    ShardRouter,
+    parse_shard_ids,
+    parse_shard_peers,
+    shard_for_guild,
+)
+from src.core.services.voice_broadcast_service import VoiceBroadcastService
+
+# (guild_id >> 22) % 4: shard 1 and shard 2
+GUILD_SHARD_1 = 1 << 22
+GUILD_SHARD_2 = 2 << 22
+
+
+def test_parsing_and_ownership() -> None:
+    assert parse_shard_ids(" ") is None
+    assert parse_shard_ids("3, 0-1,1") == (0, 1, 3)
+    assert parse_shard_peers("0-1=http://a:3000/; 2-3=http://b:3000") == {
+        0: "http://a:3000",
+        1: "http://a:3000",
+        2: "http://b:3000",
+        3: "http://b:3000",
+    }
+    with pytest.raises(ValueError):
+        parse_shard_ids("3-1")
+    with pytest.raises(ValueError):
+        parse_shard_peers("0-1")
+    with pytest.raises(ValueError):
+        ShardRouter(shard_ids=[0])
+    with pytest.raises(ValueError):
+        ShardRouter(shard_count=2, shard_ids=[2])
+
+    router = ShardRouter(
+        shard_count=4,
+        shard_ids=[0, 1],
+        peers=parse_shard_peers("2-3=http://b:3000"),
+        default_url="http://lb:3000/",
+    )
+    assert router.partitioned
+    assert shard_for_guild(GUILD_SHARD_2, 4) == 2
+    assert router.is_local(GUILD_SHARD_1)
+    assert not router.is_local(GUILD_SHARD_2)
+    assert router.owner_url(GUILD_SHARD_2) == "http://b:3000"
+    assert router.broadcast_base_url(GUILD_SHARD_1) == "http://lb:3000"
+
+    # Unsharded, or one process running every shard: everything is local
+    assert ShardRouter().is_local(GUILD_SHARD_2)
+    assert not ShardRouter(shard_count=4, shard_ids=range(4)).partitioned
+
+
+def test_create_bot_picks_sharded_client_only_when_configured() -> None:
+    settings = MagicMock(discord_auto_shard=False)
+    assert type(create_bot(settings, ShardRouter())) is ChimeraBot
+
+    bot = create_bot(settings, ShardRouter(shard_count=4, shard_ids=[2, 3]))
+    assert isinstance(bot, ShardedChimeraBot)
+    assert (bot.shard_count, bot.shard_ids) == (4, [2, 3])
+
+    settings.discord_auto_shard = True
+    auto = create_bot(settings, ShardRouter())
+    assert isinstance(auto, ShardedChimeraBot)
+    assert auto.shard_count is None
+
+
+def _server(router: ShardRouter, adapter: Any) -> RSOCallbackServer:
+    server = RSOCallbackServer(
+        rso_adapter=MagicMock(),
+        db_adapter=MagicMock(),
+        redis_adapter=MagicMock(),
+        discord_adapter=adapter,
+    )
+    server.shard_router = router
+    server._authorize_broadcast = lambda request: True  # type: ignore[method-assign]
+    return server
+
+
+@pytest.mark.asyncio
+async def test_broadcast_is_forwarded_to_owning_process() -> None:
+    received: list[tuple[dict[str, Any], dict[str, str]]] = []
+
+    async def owner_broadcast(request: web.Request) -> web.Response:
+        received.append((await request.json(), dict(request.headers)))
+        return web.json_response({"ok": True, "queued": True})
+
+    owner_app = web.Application()
+    owner_app.router.add_post("/broadcast", owner_broadcast)
+    async with TestClient(TestServer(owner_app)) as owner:
+        owner_url = str(owner.make_url("")).rstrip("/")
+        adapter = MagicMock()
+        adapter.enqueue_tts_playback = AsyncMock(return_value=True)
+        router = ShardRouter(shard_count=4, shard_ids=[0, 1], peers={2: owner_url})
+        server = _server(router, adapter)
+
+        payload = {"audio_url": "https://cdn/a.mp3", "guild_id": GUILD_SHARD_2, "user_id": 7}
+        async with TestClient(TestServer(server.app)) as client:
+            resp = await client.post("/broadcast", json=payload, headers={"X-Auth-Token": "secret"})
+            assert resp.status == 200
+            assert await resp.json() == {"ok": True, "queued": True}
+
+            # A request that was already forwarded is not bounced again
+            resp = await client.post("/broadcast", json=payload, headers={FORWARDED_HEADER: "1"})
+            assert resp.status == 421
+            assert (await resp.json())["error"] == "shard_not_owned"
+
+    assert len(received) == 1
+    body, headers = received[0]
+    assert body == payload
+    assert headers["X-Auth-Token"] == "secret"
+    assert headers[FORWARDED_HEADER] == "1"
+    adapter.play_tts_to_user_channel.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_voice_service_forwards_url_jobs_and_refuses_foreign_bytes() -> None:
+    adapter = MagicMock()
+    forward = AsyncMock(return_value=(True, "unknown"))
+    router = ShardRouter(shard_count=4, shard_ids=[0, 1], peers={2: "http://b:3000"})
+    service = VoiceBroadcastService(adapter, router=router, forward=forward)
+
+    assert await service.enqueue(guild_id=GUILD_SHARD_2, channel_id=5, audio_url="https://a")
+    forward.assert_awaited_once_with(
+        {"guild_id": GUILD_SHARD_2, "voice_channel_id": 5, "audio_url": "https://a"},
+        base_url="http://b:3000",
+        forwarded=True,
+    )
+    assert not await service.enqueue_bytes(guild_id=GUILD_SHARD_2, channel_id=5, audio_bytes=b"x")
+    # Shard 3 has no known owner
+    assert not await service.enqueue(guild_id=3 << 22, channel_id=5, audio_url="https://a")
+    assert service._workers == {}
@@ -0,0 +1,127 @@
+"""Milestone snapshots and lobby-wide SR enrichment."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+import pytest
+
+from src.core.scoring.compact_timeline import CompactTimeline
+from src.core.services import sr_enrichment
+from src.core.services.sr_enrichment import (
+    MilestoneSnapshots,
+    extract_sr_enrichment,
+    extract_sr_enrichment_for_participants,
+)
+
+
+def _frame(ts: int, stats: dict[int, dict[str, int]]) -> dict[str, Any]:
+    return {
+        "timestamp": ts,
+        "participant_frames": {str(pid): s for pid, s in stats.items()},
+        "events": [],
+    }
+
+
+def _stats(gold: int, cs: int) -> dict[str, int]:
+    return {"total_gold": gold, "xp": gold * 2, "minions_killed": cs, "jungle_minions_killed": 1}
+
+
+def _timeline() -> dict[str, Any]:
+    # Participant 6 is missing from the 10:00 frame and only shows up again at 10:08
+    return {
+        "info": {
+            "frames": [
+                _frame(540_000, {1: _stats(3000, 60), 6: _stats(2900, 55)}),
+                _frame(600_000, {1: _stats(4000, 80)}),
+                _frame(608_000, {1: _stats(4100, 81), 6: _stats(3800, 77)}),
+                _frame(900_000, {1: {"xp": 9000, "minions_killed": 120}, 6: _stats(6000, 110)}),
+            ]
+        }
+    }
+
+
+def _details() -> dict[str, Any]:
+    return {
+        "info": {
+            "participants": [
+                {
+                    "participantId": 1,
+                    "teamId": 100,
+                    "individualPosition": "MIDDLE",
+                    "wardsPlaced": 10,
+                },
+                {
+                    "participantId": 6,
+                    "teamId": 200,
+                    "individualPosition": "MIDDLE",
+                    "wardsPlaced": 5,
+                },
+            ]
+        }
+    }
+
+
+def test_snapshots_resolve_each_participant_in_one_pass() -> None:
+    snaps = MilestoneSnapshots.from_timeline(CompactTimeline.from_timeline(_timeline()))
+
+    assert snaps.frame(10, 1) == 1
+    assert snaps.metadata(10, 1) is None  # exact hit
+    assert snaps.frame(10, 6) == 2
+    assert snaps.metadata(10, 6) == {
+        "delta_ms": 8_000,
+        "direction": "after",
+        # Both neighbours of 10:00 are the 10:00 frame itself, so it widens the search
+        "reason": "expanded_search_fallback_by_8000ms",
+    }
+    assert snaps.shared_frame(10, [1, 6]) is None
+    assert (snaps.cs_at(10, 1), snaps.gold_at(10, 1), snaps.xp_at(10, 1)) == (81, 4000, 8000)
+    # Frame carried XP and CS but no gold
+    assert snaps.gold_at(15, 1) is None
+    assert (snaps.cs_at(15, 1), snaps.xp_at(15, 1)) == (120, 9000)
+    # Unknown marks and participants read as missing
+    assert snaps.frame(20, 1) is None
+    assert snaps.cs_at(12, 1) is None
+    assert snaps.frame(10, 42) is None
+
+
+def test_lane_diffs_read_one_frame_carrying_both_laners() -> None:
+    data = extract_sr_enrichment(_timeline(), _details(), 1)
+
+    # 10:00 lacks the opponent, so both sides come from 10:08
+    assert data["cs_at_10"] == 82
+    assert data["gold_diff_10"] == 300
+    assert data["xp_diff_10"] == 600
+    assert data["gold_diff_15"] is None
+    assert data["xp_diff_15"] == -3000
+
+
+def test_lobby_extraction_matches_single_player_calls() -> None:
+    tl = CompactTimeline.from_timeline(_timeline())
+
+    lobby = extract_sr_enrichment_for_participants(tl, _details())
+
+    assert sorted(lobby) == [1, 6]
+    for pid, data in lobby.items():
+        assert data == extract_sr_enrichment(tl, _details(), pid)
+    # Team breakdowns are copies, not shared state
+    lobby[1]["objective_breakdown"]["towers"] = 99
+    assert extract_sr_enrichment(tl, _details(), 1)["objective_breakdown"]["towers"] == 0
+
+
+def test_diagnostics_skip_serialisation_when_level_disabled(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    calls: list[Any] = []
+    monkeypatch.setattr(sr_enrichment.json, "dumps", lambda *a, **k: calls.append(a) or "{}")
+    previous = sr_enrichment.logger.level
+    sr_enrichment.logger.setLevel(logging.WARNING)
+    try:
+        sr_enrichment._log_event("probe", {"a": 1})
+        assert calls == []
+
+        sr_enrichment._log_event("probe", {"a": 1}, level=logging.ERROR)
+        assert calls == [({"a": 1},)]
+    finally:
+        sr_enrichment.logger.setLevel(previous)
@@ -0,0 +1,99 @@
+"""Static media handler: cache headers, range and conditional requests, Opus variants."""
+
+from pathlib import Path
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+from src.api.static_media import StaticMediaHandler, is_content_addressed
+
+BASE_URL = "http://bot:3000/static/audio"
+
+
+async def _client(handler: StaticMediaHandler) -> TestClient:
+    app = web.Application()
+    app.router.add_get("/static/audio/{path:.+}", handler.handle)
+    client = TestClient(TestServer(app))
+    await client.start_server()
+    return client
+
+
+def test_content_addressed_names() -> None:
+    assert is_content_addressed("NA1_123_激动_0123456789ab.mp3")
+    assert is_content_addressed("3f2a9c0d1e4b5a6978c0d1e2f3a4b5c6.opus")
+    assert not is_content_addressed("Ahri_NA1_5012345678_abc123.png")
+
+
+@pytest.mark.asyncio
+async def test_serves_ranges_and_revalidates_with_etag(tmp_path: Path) -> None:
+    clip = tmp_path / "2026/01/01/NA1_1_0123456789ab.mp3"
+    clip.parent.mkdir(parents=True)
+    clip.write_bytes(bytes(range(256)) * 4)
+    (tmp_path / "card.png").write_bytes(b"png")
+    client = await _client(StaticMediaHandler(tmp_path, base_url=BASE_URL))
+    try:
+        resp = await client.get("/static/audio/2026/01/01/NA1_1_0123456789ab.mp3")
+        assert resp.status == 200
+        assert resp.headers["Content-Type"] == "audio/mpeg"
+        assert resp.headers["Content-Length"] == "1024"
+        assert resp.headers["Cache-Control"] == "public, max-age=31536000, immutable"
+        etag = resp.headers["ETag"]
+
+        resp = await client.get(
+            "/static/audio/2026/01/01/NA1_1_0123456789ab.mp3", headers={"Range": "bytes=10-19"}
+        )
+        assert resp.status == 206
+        assert resp.headers["Content-Range"] == "bytes 10-19/1024"
+        assert await resp.read() == bytes(range(10, 20))
+
+        resp = await client.get(
+            "/static/audio/2026/01/01/NA1_1_0123456789ab.mp3", headers={"If-None-Match": etag}
+        )
+        assert resp.status == 304
+
+        resp = await client.get("/static/audio/card.png")
+        assert resp.headers["Cache-Control"] == "public, max-age=3600"
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_rejects_dotfiles_and_paths_outside_root(tmp_path: Path) -> None:
+    root = tmp_path / "audio"
+    root.mkdir()
+    (root / ".clip.mp3.tmp").write_bytes(b"partial")
+    (tmp_path / "secret.txt").write_bytes(b"secret")
+    client = await _client(StaticMediaHandler(root, base_url=BASE_URL))
+    try:
+        for path in ("/static/audio/.clip.mp3.tmp", "/static/audio/%2E%2E/secret.txt"):
+            assert (await client.get(path)).status == 404
+        assert (await client.get("/static/audio/missing.mp3")).status == 404
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_opus_variant_is_served_when_precomputed(tmp_path: Path) -> None:
+    (tmp_path / "clip.mp3").write_bytes(b"mp3")
+    variant = tmp_path / "opus" / "ab" / "abcdef0123456789abcdef0123456789.opus"
+    variant.parent.mkdir(parents=True)
+    variant.write_bytes(b"OggS")
+    seen: list[str] = []
+
+    def lookup(url: str) -> Path | None:
+        seen.append(url)
+        return variant
+
+    client = await _client(StaticMediaHandler(tmp_path, base_url=BASE_URL, variant_lookup=lookup))
+    try:
+        resp = await client.get("/static/audio/clip.mp3?format=opus")
+        assert await resp.read() == b"OggS"
+        assert resp.headers["Content-Type"] == "audio/ogg; codecs=opus"
+        assert resp.headers["Cache-Control"].endswith("immutable")
+        assert seen == [f"{BASE_URL}/clip.mp3"]
+
+        resp = await client.get("/static/audio/clip.mp3")
+        assert await resp.read() == b"mp3"
+    finally:
+        await client.close()
@@ -0,0 +1,108 @@
+"""Tests for the shared teamfight engine and its SR/ARAM consumers."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from src.core.scoring.aram_v1_lite import detect_aram_teamfights
+from src.core.scoring.compact_timeline import CompactTimeline
+from src.core.scoring.teamfight_engine import (
+    detect_teamfights,
+    participation_counts,
+    team_ids,
+)
+from src.core.services.teamfight_reconstructor import extract_teamfight_summaries
+
+
+def _details() -> dict[str, Any]:
+    return {
+        "info": {
+            "participants": [
+                {"participantId": pid, "teamId": 100 if pid <= 5 else 200, "puuid": f"p{pid}"}
+                for pid in range(1, 11)
+            ]
+        }
+    }
+
+
+def _frame(ts: int, near: set[int], events: list[dict[str, Any]]) -> dict[str, Any]:
+    """Participants in ``near`` stand at the dragon pit, everyone else in their base."""
+    frames: dict[str, Any] = {}
+    for pid in range(1, 11):
+        if pid in near:
+            x, y = 10_000 + pid * 50, 4_500
+        else:
+            x, y = (500, 500) if pid <= 5 else (14_300, 14_300)
+        frames[str(pid)] = {"total_gold": 1000, "position": {"x": x, "y": y}}
+    return {"timestamp": ts, "participant_frames": frames, "events": events}
+
+
+def _timeline() -> dict[str, Any]:
+    kill = {"type": "CHAMPION_KILL", "timestamp": 125_000, "killerId": 2, "victimId": 7}
+    kill_2 = {
+        "type": "CHAMPION_KILL",
+        "timestamp": 128_000,
+        "killerId": 8,
+        "victimId": 3,
+        "assistingParticipantIds": [9],
+    }
+    dragon = {
+        "type": "ELITE_MONSTER_KILL",
+        "timestamp": 130_000,
+        "killerId": 1,
+        "monsterType": "DRAGON",
+    }
+    lone = {"type": "CHAMPION_KILL", "timestamp": 300_000, "killerId": 4, "victimId": 10}
+    return {
+        "info": {
+            "participants": [{"participant_id": pid, "puuid": f"p{pid}"} for pid in range(1, 11)],
+            "frames": [
+                _frame(0, set(), []),
+                _frame(60_000, set(), []),
+                _frame(120_000, {1, 2, 3, 7, 8, 9}, [kill, kill_2, dragon]),
+                _frame(180_000, set(), []),
+                _frame(240_000, set(), []),
+                _frame(300_000, set(), [lone]),
+            ],
+        }
+    }
+
+
+def test_detects_contact_window_with_kills_objective_and_participants() -> None:
+    tl = CompactTimeline.from_timeline(_timeline())
+    fights = detect_teamfights(tl, team_ids(tl, _details()))
+
+    # The lone pick at 5:00 has no 2v2 contact and is not a fight
+    assert len(fights) == 1
+    fight = fights[0]
+    assert (fight.start_ms, fight.end_ms) == (120_000, 120_000)
+    assert fight.kills == 2
+    assert fight.objectives == ("DRAGON",)
+    assert [pid for pid in range(1, 11) if fight.participated(pid)] == [1, 2, 3, 7, 8, 9]
+    assert participation_counts(fights, tl.width).tolist() == [0, 1, 1, 1, 0, 0, 0, 1, 1, 1, 0]
+
+
+def test_team_ids_fall_back_to_standard_layout() -> None:
+    tl = CompactTimeline.from_timeline(_timeline())
+    assert team_ids(tl, None).tolist() == [0] + [100] * 5 + [200] * 5
+    assert not team_ids(tl, None, fallback=False).any()
+
+
+def test_sr_summaries_use_engine() -> None:
+    assert extract_teamfight_summaries(_timeline(), _details()) == [
+        "02:00 Jungle | 击杀2 | 目标:小龙"
+    ]
+    assert extract_teamfight_summaries(_timeline(), None) == []
+
+
+def test_aram_teamfights_need_three_engaged_per_team() -> None:
+    data = _timeline()
+    fights = detect_aram_teamfights(data, "p9", _details())
+    assert len(fights) == 1
+    assert fights[0]["kills_in_fight"] == 2
+    assert fights[0]["player_participated"] is True
+    assert detect_aram_teamfights(data, "p5", _details())[0]["player_participated"] is False
+
+    # Only two a side in contact: not an ARAM teamfight
+    data["info"]["frames"][2] = _frame(120_000, {1, 2, 7, 8}, data["info"]["frames"][2]["events"])
+    assert detect_aram_teamfights(data, "p9", _details()) == []
@@ -0,0 +1,55 @@
+"""Unit tests for monospace display-width helpers."""
+
+import unicodedata
+
+from src.core.utils.clamp import clamp_width
+from src.core.utils.text_width import (
+    display_width,
+    fit_to_width,
+    pad_to_width,
+    truncate_to_width,
+)
+
+
+def _reference_width(text: str) -> int:
+    width = 0
+    for ch in text:
+        if unicodedata.combining(ch):
+            continue
+        width += 2 if unicodedata.east_asian_width(ch) in ("F", "W") else 1
+    return width
+
+
+def test_table_matches_unicodedata_across_bmp() -> None:
+    for cp in range(0, 0x10000, 7):
+        ch = chr(cp)
+        assert display_width(ch) == _reference_width(ch), hex(cp)
+
+
+def test_display_width_mixed_text() -> None:
+    text = "久未晴#sky é🟩"
+    assert display_width(text) == _reference_width(text) == 14
+    assert display_width("plain ascii") == 11
+
+
+def test_truncate_respects_columns_and_ellipsis() -> None:
+    assert truncate_to_width("abc", 5) == "abc"
+    assert truncate_to_width("abcdef", 4) == "abc…"
+    assert truncate_to_width("漂亮的一局", 6) == "漂亮…"
+    # A wide character never straddles the limit
+    assert truncate_to_width("漂亮的一局", 5) == "漂亮…"
+    assert truncate_to_width("漂亮的一局", 4, ellipsis="") == "漂亮"
+    assert truncate_to_width("漂亮的一局", 10) == "漂亮的一局"
+    assert truncate_to_width("abc", 0) == ""
+
+
+def test_pad_and_fit_produce_exact_width() -> None:
+    assert pad_to_width("Combat", 10, ".") == "Combat...."
+    assert pad_to_width("一只小猫", 10) == "一只小猫  "
+    for width in range(1, 12):
+        assert display_width(fit_to_width("一只可爱的小猫咪#CN1", width)) == width
+
+
+def test_clamp_width_strips_before_measuring() -> None:
+    assert clamp_width("  一只可爱的小猫咪  ", 8) == "一只可…"
+    assert clamp_width("", 8) == ""
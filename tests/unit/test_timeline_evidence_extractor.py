@@ -0,0 +1,94 @@
+"""Tests for indexed V2.1 timeline evidence extraction."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from src.core.services.timeline_evidence_extractor import (
+    TimelineEventIndex,
+    extract_combat_evidence,
+    extract_timeline_evidence,
+    extract_timeline_evidence_for_participants,
+    extract_ward_control_evidence,
+)
+
+
+def _kill(ts: int, killer: int, victim: int, assists: list[int] | None = None) -> dict[str, Any]:
+    return {
+        "type": "CHAMPION_KILL",
+        "timestamp": ts,
+        "killerId": killer,
+        "victimId": victim,
+        "assistingParticipantIds": assists or [],
+        "position": {"x": 9500, "y": 4000},
+    }
+
+
+def _flash(ts: int, pid: int, spell_id: int = 4) -> dict[str, Any]:
+    return {
+        "type": "SUMMONER_SPELL_USED",
+        "timestamp": ts,
+        "participantId": pid,
+        "spellId": spell_id,
+    }
+
+
+def _timeline() -> dict[str, Any]:
+    events = [
+        _flash(58_000, 6),
+        _kill(60_000, 1, 6),  # 6 flashed 2s before dying
+        _flash(75_000, 1, spell_id=14),  # Ignite: ignored
+        _kill(80_000, 7, 1, [8]),
+        _flash(95_000, 1),  # 15s after the previous kill: outside the window
+        {"type": "WARD_PLACED", "timestamp": 1_000, "creatorId": 1, "wardType": "CONTROL_WARD"},
+        {"type": "WARD_KILL", "timestamp": 2_000, "killerId": 6},
+    ]
+    events.sort(key=lambda e: e["timestamp"])
+    return {
+        "info": {
+            "participants": [{"participant_id": pid, "puuid": f"p{pid}"} for pid in range(1, 11)],
+            "frames": [{"timestamp": 0, "events": events}],
+        }
+    }
+
+
+def test_flash_window_uses_bisect_bounds() -> None:
+    index = TimelineEventIndex(_timeline())
+    assert index.flashes_near(6, 60_000) == [58_000]
+    assert index.flashes_near(1, 80_000) == []
+    assert index.flashes_near(1, 85_000) == [95_000]
+
+
+def test_combat_evidence_for_victim_and_killer() -> None:
+    victim = extract_combat_evidence(_timeline(), 6)
+    assert (victim.total_deaths, victim.early_flash_usage_count) == (1, 1)
+    flash = victim.kill_events[0].abilities_used[0]
+    assert flash.used_by_victim and flash.timestamp_before_death_ms == 2_000
+
+    killer = extract_combat_evidence(_timeline(), 1)
+    assert (killer.total_kills, killer.total_deaths, killer.solo_kills) == (1, 1, 1)
+    assert [e.timestamp_ms for e in killer.kill_events] == [60_000, 80_000]
+    assert extract_combat_evidence(_timeline(), 8).total_assists == 1
+
+
+def test_only_last_five_kills_reported_but_all_counted() -> None:
+    data = _timeline()
+    data["info"]["frames"][0]["events"] = [_kill(i * 30_000, 2, 7) for i in range(1, 9)]
+    evidence = extract_combat_evidence(data, 2)
+    assert evidence.total_kills == 8
+    assert [e.timestamp_ms for e in evidence.kill_events] == [i * 30_000 for i in range(4, 9)]
+
+
+def test_ward_evidence_from_index() -> None:
+    ward = extract_ward_control_evidence(_timeline(), 1)
+    assert (ward.total_wards_placed, ward.control_wards_placed) == (1, 1)
+    assert extract_ward_control_evidence(_timeline(), 6).wards_destroyed == 1
+
+
+def test_all_participants_match_single_extraction() -> None:
+    data = _timeline()
+    lobby = extract_timeline_evidence_for_participants(data, "NA1_1")
+    assert sorted(lobby) == list(range(1, 11))
+    for pid in (1, 6, 8):
+        assert lobby[pid] == extract_timeline_evidence(data, pid, "NA1_1")
+    assert list(extract_timeline_evidence_for_participants(data, "NA1_1", [3])) == [3]
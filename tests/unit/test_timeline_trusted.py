@@ -0,0 +1,59 @@
+"""Tests for the trusted (validation-free) MatchTimeline construction path."""
+
+from __future__ import annotations
+
+import copy
+
+import pytest
+from pydantic import ValidationError
+
+from benchmarks.fixtures import synthetic_match
+from src.adapters.riot_api import convert_match_timeline
+from src.contracts.timeline import MatchTimeline
+from src.core.scoring import generate_llm_input
+
+
+def _converted(minutes: int = 12) -> tuple[dict, dict]:
+    fixture = synthetic_match(1, minutes=minutes)
+    data = convert_match_timeline(fixture.timeline, fixture.match_id, fixture.details)
+    return data, fixture.details
+
+
+def test_trusted_path_scores_identically_to_validated_path() -> None:
+    data, details = _converted()
+    trusted = MatchTimeline.from_trusted(data)
+    validated = MatchTimeline(**data)
+
+    assert trusted.metadata.match_id == validated.metadata.match_id
+    frame = trusted.info.frames[5].participant_frames["3"]
+    strict_frame = validated.info.frames[5].participant_frames["3"]
+    assert frame.total_gold == strict_frame.total_gold
+    assert frame.position.x == strict_frame.position.x
+    assert frame.damage_stats.total_damage_done_to_champions == (
+        strict_frame.damage_stats.total_damage_done_to_champions
+    )
+    assert frame.model_dump() == strict_frame.model_dump()
+
+    assert (
+        generate_llm_input(trusted, details).model_dump()
+        == generate_llm_input(validated, details).model_dump()
+    )
+
+
+def test_trusted_path_falls_back_to_validation_on_malformed_frames() -> None:
+    data, _ = _converted(minutes=3)
+    broken = copy.deepcopy(data)
+    del broken["info"]["frames"][1]["participant_frames"]["2"]["position"]
+
+    with pytest.raises(ValidationError):
+        MatchTimeline.from_trusted(broken)
+
+
+def test_strict_path_accepts_camel_case_participant_id() -> None:
+    data, _ = _converted(minutes=3)
+    frames = data["info"]["frames"][0]["participant_frames"]
+    for pframe in frames.values():
+        pframe["participantId"] = pframe.pop("participant_id")
+
+    timeline = MatchTimeline(**data)
+    assert timeline.info.frames[0].participant_frames["4"].participant_id == 4
@@ -0,0 +1,77 @@
+"""Voice paths wait on the analysis worker's in-flight TTS precompute."""
+
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.core.services.tts_precompute import (
+    await_precomputed_tts,
+    clear_tts_pending,
+    mark_tts_pending,
+    stored_tts_audio_url,
+    tts_pending_key,
+)
+
+
+class FakeCache:
+    def __init__(self) -> None:
+        self.data: dict[str, Any] = {}
+
+    async def get(self, key: str) -> Any:
+        return self.data.get(key)
+
+    async def set(self, key: str, value: Any, ttl: int | None = None) -> bool:
+        self.data[key] = value
+        return True
+
+    async def delete(self, key: str) -> bool:
+        return self.data.pop(key, None) is not None
+
+
+def test_stored_url_reads_dict_and_json_metadata() -> None:
+    assert stored_tts_audio_url({"llm_metadata": {"tts_audio_url": "https://a"}}) == "https://a"
+    assert stored_tts_audio_url({"llm_metadata": '{"tts_audio_url": "https://b"}'}) == "https://b"
+    assert stored_tts_audio_url({"llm_metadata": "not json"}) is None
+    assert stored_tts_audio_url(None) is None
+
+
+@pytest.mark.asyncio
+async def test_nothing_pending_returns_without_touching_db() -> None:
+    db = AsyncMock()
+    assert await await_precomputed_tts(FakeCache(), db, "NA1_1", timeout=5) is None
+    db.get_analysis_result.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_waits_for_precomputed_url() -> None:
+    cache = FakeCache()
+    await mark_tts_pending(cache, "NA1_2", ttl_seconds=60)
+    db = AsyncMock()
+    db.get_analysis_result.side_effect = [
+        {"llm_metadata": {}},
+        {"llm_metadata": {"tts_audio_url": "https://cdn/NA1_2.mp3"}},
+    ]
+
+    url = await await_precomputed_tts(cache, db, "NA1_2", timeout=5, poll_interval=0)
+    assert url == "https://cdn/NA1_2.mp3"
+
+
+@pytest.mark.asyncio
+async def test_gives_up_when_worker_clears_marker_without_url() -> None:
+    cache = FakeCache()
+    await mark_tts_pending(cache, "NA1_3", ttl_seconds=60)
+    db = AsyncMock()
+    db.get_analysis_result.return_value = {"llm_metadata": {}}
+
+    async def worker_fails() -> None:
+        await asyncio.sleep(0)
+        await clear_tts_pending(cache, "NA1_3")
+
+    url, _ = await asyncio.gather(
+        await_precomputed_tts(cache, db, "NA1_3", timeout=5, poll_interval=0.01),
+        worker_fails(),
+    )
+    assert url is None
+    assert tts_pending_key("NA1_3") not in cache.data
@@ -183,3 +183,34 @@ async def test_voice_job_dataclass_defaults() -> None:
     assert job.volume == 0.5  # Default
     assert job.normalize is False  # Default
     assert job.max_seconds is None  # Default
+
+
+@pytest.mark.asyncio
+async def test_next_clip_decoder_is_prepared_while_current_plays(
+    mock_discord_adapter: Any,
+) -> None:
+    """Verify the queued job's source is built during playback and handed over."""
+    events: list[str] = []
+
+    def build_voice_source(**kwargs: Any) -> str:
+        events.append(f"build:{kwargs['audio_url']}")
+        return f"source:{kwargs['audio_url']}"
+
+    async def playback(**kwargs: Any) -> bool:
+        events.append(f"play:{kwargs['audio_url']}")
+        await asyncio.sleep(0.02)
+        return True
+
+    mock_discord_adapter.build_voice_source = MagicMock(side_effect=build_voice_source)
+    mock_discord_adapter.play_tts_in_voice_channel = AsyncMock(side_effect=playback)
+    service = VoiceBroadcastService(mock_discord_adapter)
+
+    for name in ("a", "b", "c"):
+        await service.enqueue(guild_id=1, channel_id=2, audio_url=name)
+    await asyncio.sleep(0.15)
+
+    # Each decoder is spawned before the previous clip has finished playing
+    assert events == ["build:b", "play:a", "build:c", "play:b", "play:c"]
+    calls = mock_discord_adapter.play_tts_in_voice_channel.call_args_list
+    assert "source" not in calls[0].kwargs
+    assert [c.kwargs["source"] for c in calls[1:]] == ["source:b", "source:c"]
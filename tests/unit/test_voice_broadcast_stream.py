@@ -0,0 +1,187 @@
+"""Redis stream broadcast bus: publish, consume, ack, retry and reply."""
+
+import asyncio
+import json
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+from src.adapters.voice_broadcast_stream import (
+    VoiceBroadcastBus,
+    VoiceBroadcastConsumer,
+    VoiceBroadcastStreamClient,
+    stream_key,
+)
+from src.api.rso_callback import RSOCallbackServer
+from src.core.services.shard_routing import ShardRouter
+
+
+class _Pipeline:
+    def __init__(self, redis: "FakeStreamRedis") -> None:
+        self._redis = redis
+        self._ops: list[tuple[str, tuple[Any, ...]]] = []
+
+    async def __aenter__(self) -> "_Pipeline":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        return None
+
+    def rpush(self, key: str, value: str) -> None:
+        self._ops.append(("rpush", (key, value)))
+
+    def expire(self, key: str, ttl: int) -> None:
+        self._ops.append(("expire", (key, ttl)))
+
+    async def execute(self) -> None:
+        for name, args in self._ops:
+            if name == "rpush":
+                self._redis.lists.setdefault(args[0], []).append(args[1])
+
+
+class FakeStreamRedis:
+    """Just enough of redis.asyncio's stream/list API for one consumer group."""
+
+    def __init__(self) -> None:
+        self.streams: dict[str, list[tuple[str, dict[str, str]]]] = {}
+        self.delivered: dict[str, int] = {}  # entry ID → group's last-read position
+        self.pending: dict[str, dict[str, int]] = {}  # stream → entry ID → deliveries
+        self.lists: dict[str, list[str]] = {}
+        self._seq = 0
+
+    async def xadd(self, stream: str, fields: dict[str, str], **_: Any) -> str:
+        self._seq += 1
+        entry_id = f"{self._seq}-0"
+        self.streams.setdefault(stream, []).append((entry_id, fields))
+        return entry_id
+
+    async def xgroup_create(self, stream: str, *_: Any, **__: Any) -> None:
+        self.streams.setdefault(stream, [])
+
+    async def xreadgroup(
+        self, group: str, consumer: str, streams: dict[str, str], count: int, block: int
+    ) -> list[Any]:
+        out = []
+        for stream in streams:
+            pos = self.delivered.get(stream, 0)
+            entries = self.streams.get(stream, [])[pos : pos + count]
+            self.delivered[stream] = pos + len(entries)
+            for entry_id, _ in entries:
+                self.pending.setdefault(stream, {})[entry_id] = 1
+            if entries:
+                out.append([stream, entries])
+        return out
+
+    async def xack(self, stream: str, group: str, *ids: str) -> int:
+        for entry_id in ids:
+            self.pending.get(stream, {}).pop(entry_id, None)
+        return len(ids)
+
+    async def xpending_range(self, stream: str, group: str, **_: Any) -> list[dict[str, Any]]:
+        return [
+            {"message_id": entry_id, "times_delivered": n}
+            for entry_id, n in self.pending.get(stream, {}).items()
+        ]
+
+    async def xclaim(
+        self, stream: str, group: str, consumer: str, idle: int, ids: list[str]
+    ) -> list[Any]:
+        claimed = []
+        for entry_id, fields in self.streams.get(stream, []):
+            if entry_id in ids and entry_id in self.pending.get(stream, {}):
+                self.pending[stream][entry_id] += 1
+                claimed.append((entry_id, fields))
+        return claimed
+
+    async def blpop(self, keys: list[str], timeout: float) -> tuple[str, str] | None:
+        # "Blocks" for a few loop iterations so a consumer in the same test can reply
+        for _ in range(20):
+            for key in keys:
+                if self.lists.get(key):
+                    return key, self.lists[key].pop(0)
+            await asyncio.sleep(0)
+        return None
+
+    def pipeline(self, transaction: bool = True) -> _Pipeline:
+        return _Pipeline(self)
+
+
+async def _drain(consumer: VoiceBroadcastConsumer) -> None:
+    while consumer._jobs:
+        await asyncio.gather(*list(consumer._jobs))
+
+
+@pytest.mark.asyncio
+async def test_job_runs_on_owning_shard_stream_and_replies() -> None:
+    redis = FakeStreamRedis()
+    bus = VoiceBroadcastBus(redis, ShardRouter(shard_count=4))
+    handler = AsyncMock(return_value={"ok": True, "message": "stream_enqueued"})
+    consumer = VoiceBroadcastConsumer(bus, handler, streams=[stream_key(2)], consumer="c1")
+    await consumer.ensure_groups()
+
+    client = VoiceBroadcastStreamClient(bus, reply_timeout=0.0)
+    broadcast = asyncio.create_task(
+        client.broadcast_to_user(guild_id=2 << 22, user_id=7, match_id="NA1_1")
+    )
+    await asyncio.sleep(0)
+    assert len(redis.streams[stream_key(2)]) == 1
+
+    assert await consumer.poll() == 1
+    await _drain(consumer)
+    assert await broadcast == (True, "stream_enqueued")
+    handler.assert_awaited_once_with({"match_id": "NA1_1", "guild_id": 2 << 22, "user_id": 7})
+    assert redis.pending[stream_key(2)] == {}
+
+
+@pytest.mark.asyncio
+async def test_failed_job_is_retried_then_given_up() -> None:
+    redis = FakeStreamRedis()
+    bus = VoiceBroadcastBus(redis, ShardRouter())
+    handler = AsyncMock(side_effect=[RuntimeError("tts down"), RuntimeError("tts down")])
+    consumer = VoiceBroadcastConsumer(
+        bus, handler, streams=[stream_key(None)], max_attempts=2, claim_idle_ms=0
+    )
+    job_id = await bus.publish({"guild_id": 1, "match_id": "NA1_2"}, reply=True)
+
+    await consumer.poll()
+    await _drain(consumer)
+    # Raised: left pending for a retry
+    assert list(redis.pending[stream_key(None)].values()) == [1]
+
+    assert await consumer.reclaim() == 1
+    await _drain(consumer)
+    assert handler.await_count == 2
+
+    # Third delivery would exceed max_attempts: acked and reported as failed
+    assert await consumer.reclaim() == 0
+    assert redis.pending[stream_key(None)] == {}
+    assert await bus.wait_reply(job_id, 0) == {"ok": False, "error": "max_attempts_exceeded"}
+
+
+@pytest.mark.asyncio
+async def test_broadcast_endpoint_only_enqueues_when_stream_enabled() -> None:
+    redis = FakeStreamRedis()
+    adapter = MagicMock()
+    server = RSOCallbackServer(
+        rso_adapter=MagicMock(),
+        db_adapter=MagicMock(),
+        redis_adapter=MagicMock(),
+        discord_adapter=adapter,
+    )
+    server._authorize_broadcast = lambda request: True  # type: ignore[method-assign]
+    server.broadcast_bus = VoiceBroadcastBus(redis, ShardRouter())
+    server.execute_broadcast = AsyncMock()  # type: ignore[method-assign]
+
+    payload = {"match_id": "NA1_3", "guild_id": 5, "user_id": 9}
+    async with TestClient(TestServer(server.app)) as client:
+        resp = await client.post("/broadcast", json=payload)
+        assert resp.status == 202
+        body = await resp.json()
+
+    assert body["queued"] is True
+    ((entry_id, fields),) = redis.streams[stream_key(None)]
+    job = json.loads(fields["job"])
+    assert (job["job_id"], job["payload"]) == (body["job_id"], payload)
+    server.execute_broadcast.assert_not_awaited()
@@ -0,0 +1,77 @@
+"""Unit tests for the pre-transcoded Opus clip cache."""
+
+import asyncio
+import stat
+from pathlib import Path
+
+import pytest
+
+from src.adapters.voice_opus_cache import OpusClipCache
+
+PARAMS = {"volume": 0.5, "normalize": True, "max_seconds": 90}
+
+
+def _fake_ffmpeg(tmp_path: Path, *, exit_code: int = 0) -> Path:
+    """Executable that records its call and writes a dummy Ogg file to the last argument."""
+    script = tmp_path / "ffmpeg"
+    script.write_text(
+        "#!/bin/sh\n"
+        f'echo call >> "{tmp_path}/calls"\n'
+        "sleep 0.05\n"
+        'for last; do :; done\nprintf OggS > "$last"\n'
+        f"exit {exit_code}\n"
+    )
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    return script
+
+
+def test_key_changes_with_every_baked_in_parameter() -> None:
+    base = OpusClipCache.key("https://cdn/a.mp3", **PARAMS)
+
+    assert base == OpusClipCache.key("https://cdn/a.mp3", **PARAMS)
+    assert base != OpusClipCache.key("https://cdn/b.mp3", **PARAMS)
+    assert base != OpusClipCache.key("https://cdn/a.mp3", **{**PARAMS, "volume": 0.6})
+    assert base != OpusClipCache.key("https://cdn/a.mp3", **{**PARAMS, "normalize": False})
+    assert base != OpusClipCache.key("https://cdn/a.mp3", **{**PARAMS, "max_seconds": None})
+
+
+def test_ffmpeg_args_bake_loudness_volume_and_cap(tmp_path: Path) -> None:
+    cache = OpusClipCache(tmp_path, bitrate_kbps=48)
+
+    args = cache.ffmpeg_args("https://cdn/a.mp3", tmp_path / "out", **PARAMS)
+
+    assert args[args.index("-filter:a") + 1] == "loudnorm,volume=0.500"
+    assert args[args.index("-t") + 1] == "90"
+    assert args[args.index("-c:a") + 1] == "libopus"
+    assert args[args.index("-b:a") + 1] == "48k"
+    assert "-reconnect" in args
+    assert args[-3:] == ["-f", "ogg", str(tmp_path / "out")]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_transcode(tmp_path: Path) -> None:
+    cache = OpusClipCache(tmp_path / "opus", executable=str(_fake_ffmpeg(tmp_path)))
+    assert cache.lookup("https://cdn/a.mp3", **PARAMS) is None
+
+    cache.schedule("https://cdn/a.mp3", **PARAMS)
+    first, second = await asyncio.gather(
+        cache.ensure("https://cdn/a.mp3", **PARAMS),
+        cache.ensure("https://cdn/a.mp3", **PARAMS),
+    )
+
+    assert first == second == cache.lookup("https://cdn/a.mp3", **PARAMS)
+    assert first is not None and first.read_bytes() == b"OggS"
+    assert (tmp_path / "calls").read_text().count("call") == 1
+    # No temp files are left next to the published clip
+    assert [p.name for p in first.parent.iterdir()] == [first.name]
+
+
+@pytest.mark.asyncio
+async def test_failed_transcode_publishes_nothing(tmp_path: Path) -> None:
+    cache = OpusClipCache(tmp_path / "opus", executable=str(_fake_ffmpeg(tmp_path, exit_code=1)))
+
+    assert await cache.ensure("https://cdn/a.mp3", **PARAMS) is None
+    assert cache.lookup("https://cdn/a.mp3", **PARAMS) is None
+    assert list((tmp_path / "opus").rglob("*")) == [
+        p for p in (tmp_path / "opus").rglob("*") if p.is_dir()
+    ]